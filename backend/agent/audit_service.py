@@ -3,9 +3,11 @@
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
 
 from backend.db.models import AuditTrail
+from backend.db.audit_archive import get_archive
 from backend.agent.risk_models import DecisionAnalysis
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,26 @@ logger = logging.getLogger(__name__)
 class AuditService:
     """Service for logging and retrieving agent decisions in audit trail"""
     
+    # Projections for list queries: "full" loads every column, "summary" only
+    # the scalar ones. The JSON columns (reasoning_chain, risk_factors,
+    # recommendations, entity_context, task_context, meta_data) stay deferred
+    # and are loaded per entry only if accessed.
+    AUDIT_FIELDS = ("full", "summary")
+    SUMMARY_COLUMNS = (
+        AuditTrail.id,
+        AuditTrail.timestamp,
+        AuditTrail.agent_type,
+        AuditTrail.task_description,
+        AuditTrail.task_category,
+        AuditTrail.entity_name,
+        AuditTrail.entity_type,
+        AuditTrail.decision_outcome,
+        AuditTrail.confidence_score,
+        AuditTrail.risk_level,
+        AuditTrail.risk_score,
+        AuditTrail.escalation_reason,
+    )
+    
     # System prompt patterns to detect and filter out
     SYSTEM_PROMPT_PATTERNS = [
         "you are helping a user",
@@ -287,7 +309,8 @@ class AuditService:
         risk_level: Optional[str] = None,
         task_category: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        fields: str = "full"
     ) -> List[AuditTrail]:
         """
         Retrieve audit trail entries with optional filters
@@ -303,35 +326,92 @@ class AuditService:
             task_category: Filter by task category
             start_date: Filter entries after this date
             end_date: Filter entries before this date
+            fields: "full" loads all columns; "summary" selects only
+                SUMMARY_COLUMNS and leaves the JSON columns deferred
             
         Returns:
             List of AuditTrail objects
+            
+        Raises:
+            ValueError: If fields is not one of AUDIT_FIELDS
         """
+        if fields not in AuditService.AUDIT_FIELDS:
+            raise ValueError(f"fields must be one of {', '.join(AuditService.AUDIT_FIELDS)}, got {fields!r}")
         query = db.query(AuditTrail)
+        columns = None
+        if fields == "summary":
+            query = query.options(load_only(*AuditService.SUMMARY_COLUMNS))
+            columns = [column.key for column in AuditService.SUMMARY_COLUMNS]
         
         # Apply filters
-        if agent_type:
-            query = query.filter(AuditTrail.agent_type == agent_type)
-        if entity_name:
-            query = query.filter(AuditTrail.entity_name == entity_name)
-        if decision_outcome:
-            query = query.filter(AuditTrail.decision_outcome == decision_outcome)
-        if risk_level:
-            query = query.filter(AuditTrail.risk_level == risk_level)
-        if task_category:
-            query = query.filter(AuditTrail.task_category == task_category)
-        if start_date:
-            query = query.filter(AuditTrail.timestamp >= start_date)
-        if end_date:
-            query = query.filter(AuditTrail.timestamp <= end_date)
+        filters = AuditService._equality_filters(
+            agent_type, entity_name, decision_outcome, risk_level, task_category
+        )
+        query = AuditService._apply_filters(query, filters, start_date, end_date)
         
         # Order by timestamp descending (newest first)
         query = query.order_by(AuditTrail.timestamp.desc())
         
-        # Apply pagination
-        query = query.limit(limit).offset(offset)
+        # Paginate across the hot table and the archive
+        return get_archive().read_through(
+            db, "audit_trail", query, limit=limit, offset=offset,
+            filters=filters, start=start_date, end=end_date, columns=columns
+        )
+    
+    @staticmethod
+    def _equality_filters(
+        agent_type: Optional[str] = None,
+        entity_name: Optional[str] = None,
+        decision_outcome: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        task_category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Column equality filters that are set"""
+        filters = {
+            "agent_type": agent_type,
+            "entity_name": entity_name,
+            "decision_outcome": decision_outcome,
+            "risk_level": risk_level,
+            "task_category": task_category,
+        }
+        return {column: value for column, value in filters.items() if value}
+    
+    @staticmethod
+    def _apply_filters(query, filters: Dict[str, Any], start_date: Optional[datetime], end_date: Optional[datetime]):
+        """Apply equality filters and the date range to a hot-table query"""
+        for column, value in filters.items():
+            query = query.filter(getattr(AuditTrail, column) == value)
+        if start_date:
+            query = query.filter(AuditTrail.timestamp >= start_date)
+        if end_date:
+            query = query.filter(AuditTrail.timestamp <= end_date)
+        return query
+    
+    @staticmethod
+    def count_audit_trail(
+        db: Session,
+        agent_type: Optional[str] = None,
+        entity_name: Optional[str] = None,
+        decision_outcome: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        task_category: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> int:
+        """
+        Count audit trail entries matching the filters, hot and archived
         
-        return query.all()
+        Args:
+            Same filters as get_audit_trail
+            
+        Returns:
+            Number of matching entries
+        """
+        filters = AuditService._equality_filters(
+            agent_type, entity_name, decision_outcome, risk_level, task_category
+        )
+        hot = AuditService._apply_filters(db.query(func.count(AuditTrail.id)), filters, start_date, end_date)
+        return (hot.scalar() or 0) + get_archive().count(db, "audit_trail", filters, start_date, end_date)
     
     @staticmethod
     def get_audit_entry(db: Session, audit_id: int) -> Optional[AuditTrail]:
@@ -343,9 +423,12 @@ class AuditService:
             audit_id: ID of the audit entry
             
         Returns:
-            AuditTrail object or None if not found
+            AuditTrail object (transient if archived) or None if not found
         """
-        return db.query(AuditTrail).filter(AuditTrail.id == audit_id).first()
+        entry = db.query(AuditTrail).filter(AuditTrail.id == audit_id).first()
+        if entry is None:
+            entry = get_archive().get(db, "audit_trail", audit_id)
+        return entry
     
     @staticmethod
     def get_audit_statistics(
@@ -364,15 +447,42 @@ class AuditService:
         Returns:
             Dictionary containing statistics
         """
-        query = db.query(AuditTrail)
-        
-        if start_date:
-            query = query.filter(AuditTrail.timestamp >= start_date)
-        if end_date:
-            query = query.filter(AuditTrail.timestamp <= end_date)
+        group_columns = ("decision_outcome", "risk_level", "agent_type", "task_category")
+        sum_columns = ("confidence_score", "risk_score")
+        query = AuditService._apply_filters(
+            db.query(*(getattr(AuditTrail, column) for column in group_columns + sum_columns)),
+            {}, start_date, end_date
+        )
         
-        all_entries = query.all()
-        total_count = len(all_entries)
+        # Aggregate the hot rows, then add the archived ones
+        counts = {column: {} for column in group_columns}
+        sums = {column: [0, 0] for column in sum_columns}
+        total_count = 0
+        for row in query:
+            total_count += 1
+            for column in group_columns:
+                value = getattr(row, column)
+                if value:
+                    counts[column][value] = counts[column].get(value, 0) + 1
+            for column in sum_columns:
+                value = getattr(row, column)
+                if value is not None:
+                    sums[column][0] += value
+                    sums[column][1] += 1
+        
+        archived = get_archive().aggregate(
+            db, "audit_trail", group_by=group_columns, sums=sum_columns, start=start_date, end=end_date
+        )
+        if archived["count"]:
+            total_count += archived["count"]
+            for column in group_columns:
+                for value, count in archived["groups"][column].items():
+                    if value:
+                        counts[column][value] = counts[column].get(value, 0) + count
+            for column in sum_columns:
+                total, count = archived["sums"][column]
+                sums[column][0] += total
+                sums[column][1] += count
         
         if total_count == 0:
             return {
@@ -385,35 +495,12 @@ class AuditService:
                 "average_risk_score": 0
             }
         
-        # Count by decision outcome
-        by_outcome = {}
-        by_risk_level = {}
-        by_agent_type = {}
-        by_task_category = {}
-        total_confidence = 0
-        total_risk_score = 0
-        risk_score_count = 0
-        
-        for entry in all_entries:
-            # Count outcomes
-            by_outcome[entry.decision_outcome] = by_outcome.get(entry.decision_outcome, 0) + 1
-            
-            # Count risk levels
-            if entry.risk_level:
-                by_risk_level[entry.risk_level] = by_risk_level.get(entry.risk_level, 0) + 1
-            
-            # Count agent types
-            by_agent_type[entry.agent_type] = by_agent_type.get(entry.agent_type, 0) + 1
-            
-            # Count task categories
-            if entry.task_category:
-                by_task_category[entry.task_category] = by_task_category.get(entry.task_category, 0) + 1
-            
-            # Sum confidence and risk scores
-            total_confidence += entry.confidence_score
-            if entry.risk_score is not None:
-                total_risk_score += entry.risk_score
-                risk_score_count += 1
+        by_outcome = counts["decision_outcome"]
+        by_risk_level = counts["risk_level"]
+        by_agent_type = counts["agent_type"]
+        by_task_category = counts["task_category"]
+        total_confidence = sums["confidence_score"][0]
+        total_risk_score, risk_score_count = sums["risk_score"]
         
         from datetime import datetime
         return {
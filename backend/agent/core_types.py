@@ -0,0 +1,121 @@
+"""
+Lightweight internal types for the decision engine hot path
+
+EntityContext and TaskContext are validated once, at the API boundary (or
+wherever they are first built), and are passed through the engine by
+reference. Everything the engine produces itself - the six factor scores and
+the decision - lives in the slotted dataclasses below and is turned into
+Pydantic models exactly once, at the edge. (Plain construction is used there:
+with pydantic-core it is cheaper than ``model_construct``.)
+
+FactorScores exposes the same attribute names as RiskFactors, so the policy
+tables and the reference decision methods accept either.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from .risk_models import (
+    ActionDecision,
+    DecisionAnalysis,
+    EntityContext,
+    RiskFactors,
+    RiskLevel,
+    TaskContext,
+    weighted_risk_score,
+)
+
+
+@dataclass(slots=True)
+class FactorScores:
+    """The six risk factor scores, with the weighted overall score computed once"""
+    jurisdiction_risk: float
+    entity_risk: float
+    task_risk: float
+    data_sensitivity_risk: float
+    regulatory_risk: float
+    impact_risk: float
+    overall_score: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.overall_score = weighted_risk_score(
+            self.jurisdiction_risk,
+            self.entity_risk,
+            self.task_risk,
+            self.data_sensitivity_risk,
+            self.regulatory_risk,
+            self.impact_risk
+        )
+
+    @classmethod
+    def from_model(cls, risk_factors: RiskFactors) -> "FactorScores":
+        """Build from a (validated) RiskFactors model"""
+        return cls(
+            risk_factors.jurisdiction_risk,
+            risk_factors.entity_risk,
+            risk_factors.task_risk,
+            risk_factors.data_sensitivity_risk,
+            risk_factors.regulatory_risk,
+            risk_factors.impact_risk
+        )
+
+    def to_model(self) -> RiskFactors:
+        """Convert to the public RiskFactors model"""
+        return RiskFactors(
+            jurisdiction_risk=self.jurisdiction_risk,
+            entity_risk=self.entity_risk,
+            task_risk=self.task_risk,
+            data_sensitivity_risk=self.data_sensitivity_risk,
+            regulatory_risk=self.regulatory_risk,
+            impact_risk=self.impact_risk
+        )
+
+
+@dataclass(slots=True)
+class DecisionCore:
+    """Numeric result of one decision: factors, level, decision and confidence"""
+    entity: EntityContext
+    task: TaskContext
+    factors: FactorScores
+    risk_level: RiskLevel
+    decision: ActionDecision
+    confidence: float
+
+    @property
+    def overall_score(self) -> float:
+        return self.factors.overall_score
+
+    def to_analysis(
+        self,
+        reasoning: Optional[Sequence[str]] = None,
+        recommendations: Optional[Sequence[str]] = None,
+        escalation_reason: Optional[str] = None
+    ) -> DecisionAnalysis:
+        """
+        Convert to the public DecisionAnalysis model.
+
+        Args:
+            reasoning: Reasoning lines (empty if omitted)
+            recommendations: Recommended actions (empty if omitted)
+            escalation_reason: Escalation reason, if any
+
+        Returns:
+            DecisionAnalysis for the API, audit trail and schema converter
+        """
+        return DecisionAnalysis(
+            entity_context=self.entity,
+            task_context=self.task,
+            risk_factors=self.factors.to_model(),
+            risk_level=self.risk_level,
+            decision=self.decision,
+            confidence=self.confidence,
+            reasoning=_as_list(reasoning),
+            recommendations=_as_list(recommendations),
+            escalation_reason=escalation_reason
+        )
+
+
+def _as_list(items: Optional[Sequence[str]]) -> List[str]:
+    if items is None:
+        return []
+    return items if isinstance(items, list) else list(items)
@@ -9,7 +9,8 @@
 # Impact (10%): Financial consequences drive urgency
 # Result: 30-40% autonomous, 60-70% review/escalate
 
-from typing import List, Tuple, Any
+import logging
+from typing import List, Tuple, Any, Optional
 from .risk_models import (
     EntityContext,
     TaskContext,
@@ -19,8 +20,12 @@ from .risk_models import (
     DecisionAnalysis,
     TaskCategory
 )
+from .core_types import DecisionCore, FactorScores
 from .jurisdiction_analyzer import JurisdictionAnalyzer
 from .entity_analyzer import EntityAnalyzer
+from .decision_policy import get_compiled_policy
+
+logger = logging.getLogger(__name__)
 
 
 class DecisionEngine:
@@ -50,9 +55,22 @@ class DecisionEngine:
         TaskCategory.INCIDENT_RESPONSE: 0.95,
     }
     
+    # Potential impact keywords
+    HIGH_IMPACT_WORDS = ('critical', 'severe', 'major', 'significant')
+    MODERATE_IMPACT_WORDS = ('moderate', 'medium')
+    
+    # Explanation levels for analyze_and_decide: numbers only, one-line summary
+    # plus recommendations, or the full per-factor reasoning chain
+    EXPLAIN_LEVELS = ("none", "summary", "full")
+    
+    # Serve decisions, recommendations and escalation reasons from lookup tables
+    # compiled from the reference methods below (see decision_policy.py)
+    USE_COMPILED_POLICY = True
+    
     def __init__(self):
         self.jurisdiction_analyzer = JurisdictionAnalyzer()
         self.entity_analyzer = EntityAnalyzer()
+        self.policy = get_compiled_policy(self) if self.USE_COMPILED_POLICY else None
     
     @staticmethod
     def _sanitize_reasoning_steps(items: List[Any]) -> List[str]:
@@ -79,7 +97,8 @@ class DecisionEngine:
     def analyze_and_decide(
         self,
         entity: EntityContext,
-        task: TaskContext
+        task: TaskContext,
+        explain: str = "full"
     ) -> DecisionAnalysis:
         """
         Perform complete analysis and make decision
@@ -87,10 +106,136 @@ class DecisionEngine:
         Args:
             entity: Entity context information
             task: Task context information
+            explain: Explanation level. "full" builds the complete reasoning
+                chain; "summary" returns a three-line summary plus
+                recommendations and escalation reason; "none" returns only the
+                numeric result (empty reasoning and recommendations). Scores,
+                level, decision and confidence are identical at every level.
             
         Returns:
-            DecisionAnalysis with full reasoning and recommendation
+            DecisionAnalysis with reasoning and recommendation at the requested level
+            
+        Raises:
+            ValueError: If explain is not one of EXPLAIN_LEVELS
         """
+        if explain not in self.EXPLAIN_LEVELS:
+            raise ValueError(f"explain must be one of {', '.join(self.EXPLAIN_LEVELS)}, got {explain!r}")
+        if explain == "full":
+            return self._analyze_full(entity, task)
+        
+        # Numeric core: no reasoning strings are built on this path
+        core = self.assess(entity, task)
+        if explain == "none":
+            return core.to_analysis()
+        
+        overall_score = core.factors.overall_score
+        recommendations, escalation_reason = self._recommend(
+            core.decision, core.risk_level, overall_score, entity, task, core.factors
+        )
+        return core.to_analysis(
+            self._summary_reasoning(core.risk_level, overall_score, core.decision, core.confidence),
+            recommendations,
+            escalation_reason
+        )
+    
+    def assess(
+        self,
+        entity: EntityContext,
+        task: TaskContext
+    ) -> DecisionCore:
+        """
+        Numeric decision without any explanation or Pydantic models
+        
+        Args:
+            entity: Entity context information (validated once by the caller)
+            task: Task context information (validated once by the caller)
+            
+        Returns:
+            DecisionCore; call to_analysis() to get a DecisionAnalysis
+        """
+        factors = self.score_factors(entity, task)
+        overall_score = factors.overall_score
+        risk_level = self._classify_risk_level(overall_score)
+        decision, confidence = self._decide_core(risk_level, overall_score, entity, task, factors)
+        self._log_decision(overall_score, risk_level, decision, confidence, entity, task)
+        return DecisionCore(entity, task, factors, risk_level, decision, confidence)
+    
+    def explain(self, analysis: DecisionAnalysis, explain: str = "full") -> DecisionAnalysis:
+        """
+        Render the explanation for an analysis produced at a lower explain level.
+        
+        The decision is not recomputed; only reasoning, recommendations and
+        escalation reason are filled in (on a copy).
+        
+        Args:
+            analysis: Result of analyze_and_decide
+            explain: Target explanation level
+            
+        Returns:
+            Copy of the analysis with the requested explanation
+        """
+        if explain not in self.EXPLAIN_LEVELS:
+            raise ValueError(f"explain must be one of {', '.join(self.EXPLAIN_LEVELS)}, got {explain!r}")
+        entity, task, risk_factors = analysis.entity_context, analysis.task_context, analysis.risk_factors
+        overall_score = risk_factors.overall_score
+        
+        if explain == "none":
+            update = {"reasoning": [], "recommendations": [], "escalation_reason": None}
+        else:
+            recommendations, escalation_reason = self._recommend(
+                analysis.decision, analysis.risk_level, overall_score, entity, task, risk_factors
+            )
+            if explain == "summary":
+                reasoning = self._summary_reasoning(
+                    analysis.risk_level, overall_score, analysis.decision, analysis.confidence
+                )
+            else:
+                reasoning = self._analyze_full(entity, task).reasoning
+            update = {
+                "reasoning": reasoning,
+                "recommendations": recommendations,
+                "escalation_reason": escalation_reason
+            }
+        return analysis.model_copy(update=update)
+    
+    def score_risk_factors(
+        self,
+        entity: EntityContext,
+        task: TaskContext
+    ) -> RiskFactors:
+        """
+        Numeric core of the analysis: the six risk factors, without reasoning text
+        
+        Args:
+            entity: Entity context information
+            task: Task context information
+            
+        Returns:
+            RiskFactors identical to the ones analyze_and_decide reports
+        """
+        return self.score_factors(entity, task).to_model()
+    
+    def score_factors(
+        self,
+        entity: EntityContext,
+        task: TaskContext
+    ) -> FactorScores:
+        """Same as score_risk_factors, as the engine's slotted internal type"""
+        return FactorScores(
+            self.jurisdiction_analyzer.jurisdiction_risk_score(entity, task),
+            self.entity_analyzer.entity_risk_score(entity, task),
+            self._task_risk_score(task),
+            self._data_sensitivity_score(task),
+            self._regulatory_risk_score(entity, task),
+            self._impact_risk_score(task)
+        )
+    
+    def _analyze_full(
+        self,
+        entity: EntityContext,
+        task: TaskContext
+    ) -> DecisionAnalysis:
+        """Full analysis with the complete per-factor reasoning chain"""
         # Step 1: Analyze jurisdiction risks
         jurisdiction_risk, jurisdiction_reasoning = self.jurisdiction_analyzer.analyze_jurisdiction_risk(
             entity, task
@@ -114,13 +259,13 @@ class DecisionEngine:
         impact_risk, impact_reasoning = self._analyze_impact_risk(entity, task)
         
         # Compile risk factors
-        risk_factors = RiskFactors(
-            jurisdiction_risk=jurisdiction_risk,
-            entity_risk=entity_risk,
-            task_risk=task_risk,
-            data_sensitivity_risk=data_risk,
-            regulatory_risk=regulatory_risk,
-            impact_risk=impact_risk
+        risk_factors = FactorScores(
+            jurisdiction_risk,
+            entity_risk,
+            task_risk,
+            data_risk,
+            regulatory_risk,
+            impact_risk
         )
         
         # Calculate overall risk level
@@ -128,24 +273,10 @@ class DecisionEngine:
         risk_level = self._classify_risk_level(overall_score)
         
         # Make decision
-        decision, confidence, decision_reasoning = self._make_decision(
+        decision, confidence, decision_reasoning = self._decide(
             risk_level, overall_score, entity, task, risk_factors
         )
-        
-        # Debug logging for diagnostics
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(
-            "Decision summary",
-            extra={
-                "overall_score": overall_score,
-                "risk_level": risk_level.value,
-                "decision": decision.value,
-                "confidence": confidence,
-                "entity": entity.name,
-                "task_category": task.category.value
-            }
-        )
+        self._log_decision(overall_score, risk_level, decision, confidence, entity, task)
         
         # Compile all reasoning
         all_reasoning_raw = (
@@ -159,34 +290,81 @@ class DecisionEngine:
         )
         all_reasoning = self._sanitize_reasoning_steps(all_reasoning_raw)
         if not all_reasoning:
-            all_reasoning = [
-                f"Risk level assessed as {risk_level.value}",
-                f"Overall score: {overall_score:.2f}",
-                f"Decision: {decision.value} (confidence {confidence:.2f})"
-            ]
-        
-        # Generate recommendations
-        recommendations = self._generate_recommendations(
-            decision, risk_level, entity, task, risk_factors
+            all_reasoning = self._summary_reasoning(risk_level, overall_score, decision, confidence)
+        
+        recommendations, escalation_reason = self._recommend(
+            decision, risk_level, overall_score, entity, task, risk_factors
         )
         
+        core = DecisionCore(entity, task, risk_factors, risk_level, decision, confidence)
+        return core.to_analysis(all_reasoning, recommendations, escalation_reason)
+    
+    @staticmethod
+    def _summary_reasoning(
+        risk_level: RiskLevel,
+        overall_score: float,
+        decision: ActionDecision,
+        confidence: float
+    ) -> List[str]:
+        """Three-line summary used for explain="summary" and as the empty-chain fallback"""
+        return [
+            f"Risk level assessed as {risk_level.value}",
+            f"Overall score: {overall_score:.2f}",
+            f"Decision: {decision.value} (confidence {confidence:.2f})"
+        ]
+    
+    def _recommend(
+        self,
+        decision: ActionDecision,
+        risk_level: RiskLevel,
+        overall_score: float,
+        entity: EntityContext,
+        task: TaskContext,
+        risk_factors: RiskFactors
+    ) -> Tuple[List[str], Optional[str]]:
+        """Recommendations and, for review/escalation, the escalation reason"""
+        if self.policy is not None:
+            recommendations = self.policy.recommend(decision, entity, task, risk_factors)
+        else:
+            recommendations = self._generate_recommendations(
+                decision, risk_level, entity, task, risk_factors
+            )
+        
         # Determine escalation reason if applicable
         escalation_reason = None
         if decision in [ActionDecision.ESCALATE, ActionDecision.REVIEW_REQUIRED]:
-            escalation_reason = self._generate_escalation_reason(
-                decision, risk_level, risk_factors, entity, task
-            )
-        
-        return DecisionAnalysis(
-            entity_context=entity,
-            task_context=task,
-            risk_factors=risk_factors,
-            risk_level=risk_level,
-            decision=decision,
-            confidence=confidence,
-            reasoning=all_reasoning,
-            recommendations=recommendations,
-            escalation_reason=escalation_reason
+            if self.policy is not None:
+                escalation_reason = self.policy.escalation_reason(
+                    risk_level, risk_factors, entity, task, overall_score
+                )
+            else:
+                escalation_reason = self._generate_escalation_reason(
+                    decision, risk_level, risk_factors, entity, task
+                )
+        return recommendations, escalation_reason
+    
+    @staticmethod
+    def _log_decision(
+        overall_score: float,
+        risk_level: RiskLevel,
+        decision: ActionDecision,
+        confidence: float,
+        entity: EntityContext,
+        task: TaskContext
+    ) -> None:
+        """Debug logging for diagnostics"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            "Decision summary",
+            extra={
+                "overall_score": overall_score,
+                "risk_level": risk_level.value,
+                "decision": decision.value,
+                "confidence": confidence,
+                "entity": entity.name,
+                "task_category": task.category.value
+            }
         )
     
     def _analyze_task_risk(
@@ -208,7 +386,6 @@ class DecisionEngine:
             reasoning.append(
                 "⏰ Regulatory deadline present: Time pressure may limit review options"
             )
-            base_risk = min(base_risk + 0.1, 1.0)
         
         # Stakeholder impact
         if task.stakeholder_count and task.stakeholder_count > 1000:
@@ -216,9 +393,17 @@ class DecisionEngine:
                 f"👥 High stakeholder impact ({task.stakeholder_count:,} affected): "
                 "Increased scrutiny required"
             )
-            base_risk = min(base_risk + 0.15, 1.0)
         
-        return base_risk, reasoning
+        return self._task_risk_score(task), reasoning
+    
+    def _task_risk_score(self, task: TaskContext) -> float:
+        """Numeric task risk: category base plus deadline and stakeholder pressure"""
+        risk = self.TASK_CATEGORY_RISK.get(task.category, 0.5)
+        if task.regulatory_deadline:
+            risk = min(risk + 0.1, 1.0)
+        if task.stakeholder_count and task.stakeholder_count > 1000:
+            risk = min(risk + 0.15, 1.0)
+        return risk
     
     def _analyze_data_sensitivity(
         self,
@@ -227,22 +412,18 @@ class DecisionEngine:
     ) -> Tuple[float, List[str]]:
         """Analyze data sensitivity risks"""
         reasoning = []
-        risk = 0.3  # Base low risk
         
         if task.affects_personal_data:
-            risk += 0.3
             reasoning.append(
                 "🔐 Involves personal data: Privacy regulations apply, breach notification required"
             )
         
         if task.affects_financial_data:
-            risk += 0.3
             reasoning.append(
                 "💳 Involves financial data: Additional security and compliance requirements"
             )
         
         if task.affects_personal_data and task.affects_financial_data:
-            risk = min(risk + 0.2, 1.0)
             reasoning.append(
                 "⚠️ Combines personal AND financial data: Highest protection standards required"
             )
@@ -250,7 +431,19 @@ class DecisionEngine:
         if not reasoning:
             reasoning.append("ℹ️ No sensitive data indicated: Standard data handling applies")
         
-        return min(risk, 1.0), reasoning
+        return self._data_sensitivity_score(task), reasoning
+    
+    @staticmethod
+    def _data_sensitivity_score(task: TaskContext) -> float:
+        """Numeric data sensitivity risk"""
+        risk = 0.3  # Base low risk
+        if task.affects_personal_data:
+            risk += 0.3
+        if task.affects_financial_data:
+            risk += 0.3
+        if task.affects_personal_data and task.affects_financial_data:
+            risk = min(risk + 0.2, 1.0)
+        return min(risk, 1.0)
     
     def _analyze_regulatory_risk(
         self,
@@ -260,30 +453,21 @@ class DecisionEngine:
         """Analyze regulatory compliance risks"""
         reasoning = []
         
-        # For general inquiries, start with lower base risk
-        if task.category == TaskCategory.GENERAL_INQUIRY:
-            risk = 0.2  # Low base for general questions
-        else:
-            risk = 0.4  # Standard base for other tasks
-        
         # Identify applicable regulations
         regulations = self.jurisdiction_analyzer.identify_applicable_regulations(entity, task)
         
         if regulations:
-            risk = 0.6 + (len(regulations) * 0.05)
             reasoning.append(
                 f"📜 Applicable regulations ({len(regulations)}): {', '.join(regulations[:3])}"
                 + ("..." if len(regulations) > 3 else "")
             )
         
         if entity.is_regulated:
-            risk = min(risk + 0.2, 1.0)
             reasoning.append(
                 "🎯 Directly regulated entity: Regular reporting and audit requirements"
             )
         
         if task.category == TaskCategory.REGULATORY_FILING:
-            risk = min(risk + 0.25, 1.0)
             reasoning.append(
                 "📤 Regulatory filing task: Errors can result in penalties and legal consequences"
             )
@@ -291,7 +475,30 @@ class DecisionEngine:
         if not reasoning and task.category == TaskCategory.GENERAL_INQUIRY:
             reasoning.append("ℹ️ General inquiry: Minimal regulatory compliance risk")
         
-        return min(risk, 1.0), reasoning
+        return self._regulatory_risk_score(entity, task, len(regulations)), reasoning
+    
+    def _regulatory_risk_score(
+        self,
+        entity: EntityContext,
+        task: TaskContext,
+        regulation_count: Optional[int] = None
+    ) -> float:
+        """Numeric regulatory risk; pass regulation_count when already known"""
+        if regulation_count is None:
+            regulation_count = len(self.jurisdiction_analyzer.identify_applicable_regulations(entity, task))
+        
+        if regulation_count:
+            risk = 0.6 + (regulation_count * 0.05)
+        elif task.category == TaskCategory.GENERAL_INQUIRY:
+            risk = 0.2  # Low base for general questions
+        else:
+            risk = 0.4  # Standard base for other tasks
+        
+        if entity.is_regulated:
+            risk = min(risk + 0.2, 1.0)
+        if task.category == TaskCategory.REGULATORY_FILING:
+            risk = min(risk + 0.25, 1.0)
+        return min(risk, 1.0)
     
     def _analyze_impact_risk(
         self,
@@ -300,32 +507,38 @@ class DecisionEngine:
     ) -> Tuple[float, List[str]]:
         """Analyze potential impact risks"""
         reasoning = []
-        risk = 0.3
         
         if task.potential_impact:
             impact_lower = task.potential_impact.lower()
-            if any(word in impact_lower for word in ['critical', 'severe', 'major', 'significant']):
-                risk = 0.9
+            if any(word in impact_lower for word in self.HIGH_IMPACT_WORDS):
                 reasoning.append(
                     f"🚨 High-impact scenario: '{task.potential_impact}' - "
                     "Errors could have serious consequences"
                 )
-            elif any(word in impact_lower for word in ['moderate', 'medium']):
-                risk = 0.6
+            elif any(word in impact_lower for word in self.MODERATE_IMPACT_WORDS):
                 reasoning.append(f"⚡ Moderate impact: '{task.potential_impact}'")
             else:
-                risk = 0.3
                 reasoning.append(f"ℹ️ Standard impact: '{task.potential_impact}'")
         else:
             # For informational queries (GENERAL_INQUIRY), use low risk
             if task.category == TaskCategory.GENERAL_INQUIRY:
                 reasoning.append("ℹ️ General inquiry with no specified impact: Low risk")
-                risk = 0.2
             else:
                 reasoning.append("ℹ️ Impact level not specified: Assuming low-moderate risk")
-                risk = 0.4
         
-        return risk, reasoning
+        return self._impact_risk_score(task), reasoning
+    
+    def _impact_risk_score(self, task: TaskContext) -> float:
+        """Numeric impact risk from the potential impact keywords"""
+        if task.potential_impact:
+            impact_lower = task.potential_impact.lower()
+            if any(word in impact_lower for word in self.HIGH_IMPACT_WORDS):
+                return 0.9
+            if any(word in impact_lower for word in self.MODERATE_IMPACT_WORDS):
+                return 0.6
+            return 0.3
+        # For informational queries (GENERAL_INQUIRY), use low risk
+        return 0.2 if task.category == TaskCategory.GENERAL_INQUIRY else 0.4
     
     def _classify_risk_level(self, score: float) -> RiskLevel:
         """Classify numeric risk score into risk level"""
@@ -336,6 +549,33 @@ class DecisionEngine:
         else:
             return RiskLevel.HIGH
     
+    def _decide(
+        self,
+        risk_level: RiskLevel,
+        overall_score: float,
+        entity: EntityContext,
+        task: TaskContext,
+        risk_factors: RiskFactors
+    ) -> Tuple[ActionDecision, float, List[str]]:
+        """Make the final decision via the compiled policy, or the reference logic if disabled"""
+        if self.policy is not None:
+            return self.policy.decide(self, risk_level, overall_score, entity, task)
+        return self._make_decision(risk_level, overall_score, entity, task, risk_factors)
+    
+    def _decide_core(
+        self,
+        risk_level: RiskLevel,
+        overall_score: float,
+        entity: EntityContext,
+        task: TaskContext,
+        risk_factors: RiskFactors
+    ) -> Tuple[ActionDecision, float]:
+        """Decision and confidence only, without the reasoning lines"""
+        if self.policy is not None:
+            return self.policy.decide_core(self, risk_level, overall_score, entity, task)
+        decision, confidence, _ = self._make_decision(risk_level, overall_score, entity, task, risk_factors)
+        return decision, confidence
+    
     def _make_decision(
         self,
         risk_level: RiskLevel,
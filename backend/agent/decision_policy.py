@@ -0,0 +1,464 @@
+"""
+Compiled Decision Policy Module
+
+Compiles DecisionEngine's decision matrix, recommendation rules and escalation
+reasons into lookup tables over discretized inputs, so the per-request path is
+a few comparisons and a list index instead of conditional chains.
+
+The tables are built once per engine class by running the engine's own
+reference methods (_make_decision, _generate_recommendations,
+_generate_escalation_reason) over one representative input per table cell,
+so the conditional code stays the single source of truth for policy and text.
+
+Usage:
+    python -m backend.agent.decision_policy --iterations 20000
+"""
+
+import argparse
+import itertools
+import json
+import re
+import statistics
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .risk_models import (
+    ActionDecision,
+    EntityContext,
+    EntityType,
+    IndustryCategory,
+    Jurisdiction,
+    RiskFactors,
+    RiskLevel,
+    TaskCategory,
+    TaskContext,
+)
+
+if TYPE_CHECKING:
+    from .decision_engine import DecisionEngine
+
+
+DECISION_HEADER = "🤔 DECISION LOGIC:"
+CAPABILITY_LINE = "🏢 Entity capability: {capability}"
+
+# Score split inside MEDIUM risk used by the decision matrix for confidence
+MEDIUM_LOWER_RANGE = 0.55
+SERIOUS_IMPACT_WORDS = ("serious", "major", "critical", "severe")
+_SERIOUS_IMPACT = re.compile("|".join(SERIOUS_IMPACT_WORDS))
+STAKES_CATEGORIES = (TaskCategory.INCIDENT_RESPONSE, TaskCategory.REGULATORY_FILING)
+
+# Threshold features read by recommendations / escalation reasons
+DATA_REVIEW_THRESHOLD = 0.7
+HIGH_FACTOR_THRESHOLD = 0.8
+
+# Representative inputs used to drive the reference methods while compiling
+_VIOLATIONS_TOKEN = 7777
+_BUCKET_INPUTS = (
+    (RiskLevel.LOW, 0.2),
+    (RiskLevel.MEDIUM, 0.5),
+    (RiskLevel.MEDIUM, 0.6),
+    (RiskLevel.HIGH, 0.8),
+)
+_TASK_BY_CLASS = {
+    # (simple_task, category_class) -> (category, affects_personal_data)
+    (True, 0): (TaskCategory.GENERAL_INQUIRY, False),
+    (False, 0): (TaskCategory.GENERAL_INQUIRY, True),
+    (False, 1): (TaskCategory.INCIDENT_RESPONSE, False),
+    (False, 2): (TaskCategory.POLICY_REVIEW, False),
+}
+
+DecisionEntry = Tuple[ActionDecision, float, Tuple[str, ...]]
+
+# Enum members bound once: attribute access on Enum classes is comparatively slow
+_LOW, _MEDIUM, _HIGH = RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH
+_AUTONOMOUS, _REVIEW = ActionDecision.AUTONOMOUS, ActionDecision.REVIEW_REQUIRED
+_GENERAL_INQUIRY = TaskCategory.GENERAL_INQUIRY
+_INCIDENT_RESPONSE = TaskCategory.INCIDENT_RESPONSE
+_REGULATORY_FILING = TaskCategory.REGULATORY_FILING
+_POLICY_REVIEW, _DATA_PRIVACY = TaskCategory.POLICY_REVIEW, TaskCategory.DATA_PRIVACY
+
+
+def _bucket(risk_level: RiskLevel, overall_score: float) -> int:
+    """0 LOW, 1 lower MEDIUM, 2 upper MEDIUM, 3 HIGH"""
+    if risk_level is _LOW:
+        return 0
+    if risk_level is _MEDIUM:
+        return 1 if overall_score < MEDIUM_LOWER_RANGE else 2
+    return 3
+
+
+def _category_class(category: TaskCategory) -> int:
+    """0 other, 1 incident response, 2 policy/privacy review"""
+    if category is _INCIDENT_RESPONSE:
+        return 1
+    if category is _POLICY_REVIEW or category is _DATA_PRIVACY:
+        return 2
+    return 0
+
+
+def _stakes_class(category: TaskCategory) -> int:
+    """0 other, else 1 + position in STAKES_CATEGORIES"""
+    if category is _INCIDENT_RESPONSE:
+        return 1
+    if category is _REGULATORY_FILING:
+        return 2
+    return 0
+
+
+def _is_serious(potential_impact: Optional[str]) -> bool:
+    return bool(potential_impact) and _SERIOUS_IMPACT.search(potential_impact.lower()) is not None
+
+
+# Each table index packs its discretized inputs into one int, so a lookup is
+# plain list indexing with no tuple or enum hashing on the hot path
+
+def _decision_index(
+    bucket: int, simple: bool, capable: bool, repeat: bool, category_class: int, cross_serious: bool
+) -> int:
+    return ((((bucket * 2 + simple) * 2 + capable) * 2 + repeat) * 3 + category_class) * 2 + cross_serious
+
+
+_DECISION_ORDER = {decision: i for i, decision in enumerate(ActionDecision)}
+
+
+def _decision_order(decision: ActionDecision) -> int:
+    if decision is _AUTONOMOUS:
+        return 0
+    return 1 if decision is _REVIEW else 2
+
+
+def _recommendation_index(
+    decision: int, data: bool, regulatory: bool, deadline: bool, violations: bool, cross_border: bool
+) -> int:
+    return ((((decision * 2 + data) * 2 + regulatory) * 2 + deadline) * 2 + violations) * 2 + cross_border
+
+
+def _escalation_index(
+    high: bool, regulatory: bool, data: bool, impact: bool, violations: bool, stakes_class: int
+) -> int:
+    return ((((high * 2 + regulatory) * 2 + data) * 2 + impact) * 2 + violations) * 3 + stakes_class
+
+
+class CompiledDecisionPolicy:
+    """
+    Lookup-table form of the DecisionEngine policy.
+
+    Decisions are indexed by (risk bucket, simple task, capable entity, repeat
+    violator, category class, cross-border + serious impact); recommendations
+    by (decision, data > 0.7, regulatory > 0.8, deadline, any violations,
+    cross-border); escalation reasons by (HIGH level, regulatory / data /
+    impact > 0.8, any violations, high-stakes category). Escalation text that
+    embeds the score or violation count is stored as a format template.
+    """
+
+    def __init__(
+        self,
+        decisions: List[Optional[DecisionEntry]],
+        recommendations: List[Optional[Tuple[str, ...]]],
+        escalations: List[Optional[Tuple[str, bool]]],
+    ):
+        self.decisions = decisions
+        self.recommendations = recommendations
+        self.escalations = escalations
+
+    @property
+    def size(self) -> Dict[str, int]:
+        return {
+            "decisions": sum(entry is not None for entry in self.decisions),
+            "recommendations": sum(entry is not None for entry in self.recommendations),
+            "escalations": sum(entry is not None for entry in self.escalations),
+        }
+
+    def decide(
+        self,
+        engine: "DecisionEngine",
+        risk_level: RiskLevel,
+        overall_score: float,
+        entity: EntityContext,
+        task: TaskContext,
+    ) -> Tuple[ActionDecision, float, List[str]]:
+        """Table-driven equivalent of DecisionEngine._make_decision"""
+        capability_desc, capability_confidence = engine.entity_analyzer.assess_entity_capability(entity)
+        decision, confidence, tail = self._lookup(risk_level, overall_score, capability_confidence, entity, task)
+        reasoning = [DECISION_HEADER, CAPABILITY_LINE.format(capability=capability_desc)]
+        reasoning.extend(tail)
+        return decision, confidence, reasoning
+
+    def decide_core(
+        self,
+        engine: "DecisionEngine",
+        risk_level: RiskLevel,
+        overall_score: float,
+        entity: EntityContext,
+        task: TaskContext,
+    ) -> Tuple[ActionDecision, float]:
+        """Decision and confidence only; skips rendering the reasoning lines"""
+        _, capability_confidence = engine.entity_analyzer.assess_entity_capability(entity)
+        decision, confidence, _ = self._lookup(risk_level, overall_score, capability_confidence, entity, task)
+        return decision, confidence
+
+    def _lookup(
+        self,
+        risk_level: RiskLevel,
+        overall_score: float,
+        capability_confidence: float,
+        entity: EntityContext,
+        task: TaskContext,
+    ) -> DecisionEntry:
+        category = task.category
+        category_class = _category_class(category)
+        return self.decisions[_decision_index(
+            _bucket(risk_level, overall_score),
+            (
+                category is _GENERAL_INQUIRY
+                and not task.affects_personal_data
+                and not task.affects_financial_data
+            ),
+            capability_confidence > 0.6,
+            entity.previous_violations > 2,
+            category_class,
+            # Only policy/privacy rules read the impact text
+            category_class == 2 and task.involves_cross_border and _is_serious(task.potential_impact),
+        )]
+
+    def recommend(
+        self,
+        decision: ActionDecision,
+        entity: EntityContext,
+        task: TaskContext,
+        risk_factors: RiskFactors,
+    ) -> List[str]:
+        """Table-driven equivalent of DecisionEngine._generate_recommendations"""
+        return list(self.recommendations[_recommendation_index(
+            _decision_order(decision),
+            risk_factors.data_sensitivity_risk > DATA_REVIEW_THRESHOLD,
+            risk_factors.regulatory_risk > HIGH_FACTOR_THRESHOLD,
+            bool(task.regulatory_deadline),
+            entity.previous_violations > 0,
+            task.involves_cross_border,
+        )])
+
+    def escalation_reason(
+        self,
+        risk_level: RiskLevel,
+        risk_factors: RiskFactors,
+        entity: EntityContext,
+        task: TaskContext,
+        overall_score: Optional[float] = None,
+    ) -> str:
+        """
+        Table-driven equivalent of DecisionEngine._generate_escalation_reason
+
+        overall_score may be passed when already known to skip recomputing it.
+        """
+        high = risk_level is _HIGH
+        template, dynamic = self.escalations[_escalation_index(
+            high,
+            risk_factors.regulatory_risk > HIGH_FACTOR_THRESHOLD,
+            risk_factors.data_sensitivity_risk > HIGH_FACTOR_THRESHOLD,
+            risk_factors.impact_risk > HIGH_FACTOR_THRESHOLD,
+            entity.previous_violations > 0,
+            _stakes_class(task.category),
+        )]
+        if not dynamic:
+            return template
+        score = 0.0
+        if high:
+            score = risk_factors.overall_score if overall_score is None else overall_score
+        return template.format(score=score, violations=entity.previous_violations)
+
+
+def compile_policy(engine: "DecisionEngine") -> CompiledDecisionPolicy:
+    """
+    Build the lookup tables by evaluating the engine's reference methods.
+
+    Args:
+        engine: DecisionEngine whose conditional policy is compiled
+
+    Returns:
+        CompiledDecisionPolicy covering every reachable discretized input
+    """
+    return CompiledDecisionPolicy(
+        decisions=_compile_decisions(engine),
+        recommendations=_compile_recommendations(engine),
+        escalations=_compile_escalations(engine),
+    )
+
+
+_compiled: Dict[type, CompiledDecisionPolicy] = {}
+_compile_lock = threading.Lock()
+
+
+def get_compiled_policy(engine: "DecisionEngine") -> CompiledDecisionPolicy:
+    """Compiled policy for the engine's class, built once per process"""
+    policy = _compiled.get(type(engine))
+    if policy is None:
+        with _compile_lock:
+            policy = _compiled.get(type(engine))
+            if policy is None:
+                policy = compile_policy(engine)
+                _compiled[type(engine)] = policy
+    return policy
+
+
+def _entity(capable: bool, violations: int) -> EntityContext:
+    # Public companies assess as capable even with violations (0.8 * 0.8 > 0.6); startups never do
+    return EntityContext(
+        name="policy-compiler",
+        entity_type=EntityType.PUBLIC_COMPANY if capable else EntityType.STARTUP,
+        industry=IndustryCategory.OTHER,
+        jurisdictions=[Jurisdiction.US_FEDERAL],
+        previous_violations=violations,
+    )
+
+
+def _task(
+    category: TaskCategory,
+    personal: bool = False,
+    cross_border: bool = False,
+    serious: bool = False,
+    deadline: bool = False,
+) -> TaskContext:
+    return TaskContext(
+        description="policy-compiler",
+        category=category,
+        affects_personal_data=personal,
+        involves_cross_border=cross_border,
+        potential_impact="serious" if serious else None,
+        regulatory_deadline=datetime(2030, 1, 1) if deadline else None,
+    )
+
+
+def _factors(data: float = 0.5, regulatory: float = 0.5, impact: float = 0.5) -> RiskFactors:
+    return RiskFactors(
+        jurisdiction_risk=0.5,
+        entity_risk=0.5,
+        task_risk=0.5,
+        data_sensitivity_risk=data,
+        regulatory_risk=regulatory,
+        impact_risk=impact,
+    )
+
+
+def _compile_decisions(engine: "DecisionEngine") -> List[Optional[DecisionEntry]]:
+    table: List[Optional[DecisionEntry]] = [None] * _decision_index(len(_BUCKET_INPUTS), 0, 0, 0, 0, 0)
+    for bucket, (level, score) in enumerate(_BUCKET_INPUTS):
+        for (simple, category_class), (category, personal) in _TASK_BY_CLASS.items():
+            for capable, repeat, cross_serious in itertools.product((False, True), repeat=3):
+                entity = _entity(capable, 3 if repeat else 0)
+                task = _task(category, personal=personal, cross_border=cross_serious, serious=cross_serious)
+                decision, confidence, reasoning = engine._make_decision(level, score, entity, task, _factors())
+                # Header and capability line are rendered per call; the rest is static text
+                index = _decision_index(bucket, simple, capable, repeat, category_class, cross_serious)
+                table[index] = (decision, confidence, tuple(reasoning[2:]))
+    return table
+
+
+def _compile_recommendations(engine: "DecisionEngine") -> List[Optional[Tuple[str, ...]]]:
+    table: List[Optional[Tuple[str, ...]]] = [None] * _recommendation_index(len(ActionDecision), 0, 0, 0, 0, 0)
+    for decision in ActionDecision:
+        for data, regulatory, deadline, violations, cross_border in itertools.product((False, True), repeat=5):
+            factors = _factors(data=0.75 if data else 0.5, regulatory=0.85 if regulatory else 0.5)
+            entity = _entity(True, 1 if violations else 0)
+            task = _task(TaskCategory.RISK_ASSESSMENT, cross_border=cross_border, deadline=deadline)
+            recommendations = engine._generate_recommendations(decision, RiskLevel.MEDIUM, entity, task, factors)
+            index = _recommendation_index(
+                _DECISION_ORDER[decision], data, regulatory, deadline, violations, cross_border
+            )
+            table[index] = tuple(recommendations)
+    return table
+
+
+def _compile_escalations(engine: "DecisionEngine") -> List[Optional[Tuple[str, bool]]]:
+    table: List[Optional[Tuple[str, bool]]] = [None] * _escalation_index(2, 0, 0, 0, 0, 0)
+    for stakes_class, category in enumerate((TaskCategory.RISK_ASSESSMENT,) + STAKES_CATEGORIES):
+        for high, regulatory, data, impact, violations in itertools.product((False, True), repeat=5):
+            factors = _factors(
+                data=0.9 if data else 0.5,
+                regulatory=0.9 if regulatory else 0.5,
+                impact=0.9 if impact else 0.5,
+            )
+            entity = _entity(True, _VIOLATIONS_TOKEN if violations else 0)
+            level = RiskLevel.HIGH if high else RiskLevel.MEDIUM
+            reason = engine._generate_escalation_reason(
+                ActionDecision.ESCALATE, level, factors, entity, _task(category)
+            )
+            # Turn the representative dynamic values back into format fields
+            template = reason.replace(f"(score: {factors.overall_score:.2f})", "(score: {score:.2f})")
+            template = template.replace(f"({_VIOLATIONS_TOKEN})", "({violations})")
+            index = _escalation_index(high, regulatory, data, impact, violations, stakes_class)
+            table[index] = (template, template != reason)
+    return table
+
+
+def benchmark(
+    iterations: int = 20_000,
+    engine: Optional["DecisionEngine"] = None,
+    batch: int = 50,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Per-call latency of the reference and compiled policy paths.
+
+    Each call runs decision + recommendations + escalation reason for one
+    input from a fixed rotation of representative entity/task pairs. Calls are
+    timed in batches of ``batch`` so timer overhead does not dominate; the
+    percentiles are over per-call batch means.
+
+    Returns:
+        {"reference": stats, "compiled": stats, "speedup": {...}} with
+        mean/p50/p99 per call in microseconds
+    """
+    from .decision_engine import DecisionEngine
+
+    engine = engine or DecisionEngine()
+    policy = get_compiled_policy(engine)
+    cases = []
+    for level, score in ((RiskLevel.LOW, 0.3), (RiskLevel.MEDIUM, 0.5), (RiskLevel.HIGH, 0.8)):
+        for category in (TaskCategory.GENERAL_INQUIRY, TaskCategory.DATA_PRIVACY, TaskCategory.REGULATORY_FILING):
+            factors = _factors(data=score + 0.1, regulatory=score + 0.15, impact=score)
+            entity = _entity(score < 0.5, int(score * 4))
+            cases.append((level, score, entity, _task(category, cross_border=True), factors))
+
+    def reference(level, score, entity, task, factors):
+        decision, _, _ = engine._make_decision(level, score, entity, task, factors)
+        engine._generate_recommendations(decision, level, entity, task, factors)
+        engine._generate_escalation_reason(decision, level, factors, entity, task)
+
+    def compiled(level, score, entity, task, factors):
+        decision, _, _ = policy.decide(engine, level, score, entity, task)
+        policy.recommend(decision, entity, task, factors)
+        policy.escalation_reason(level, factors, entity, task, score)
+
+    results = {}
+    for name, fn in (("reference", reference), ("compiled", compiled)):
+        timings = []
+        for offset in range(0, iterations, batch):
+            batch_cases = [cases[i % len(cases)] for i in range(offset, offset + batch)]
+            start = time.perf_counter()
+            for case in batch_cases:
+                fn(*case)
+            timings.append((time.perf_counter() - start) * 1e6 / batch)
+        timings.sort()
+        results[name] = {
+            "mean_us": round(statistics.fmean(timings), 3),
+            "p50_us": round(timings[len(timings) // 2], 3),
+            "p99_us": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 3),
+        }
+    results["speedup"] = {
+        "mean": round(results["reference"]["mean_us"] / max(results["compiled"]["mean_us"], 1e-9), 2),
+        "p50": round(results["reference"]["p50_us"] / max(results["compiled"]["p50_us"], 1e-9), 2),
+    }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark compiled vs reference decision policy")
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args(argv)
+    print(json.dumps(benchmark(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -52,12 +52,8 @@ class EntityAnalyzer:
             Tuple of (risk_score, reasoning_list)
         """
         reasoning = []
-        risk_factors = []
         
         # Base entity type risk
-        entity_type_risk = self.ENTITY_TYPE_RISK.get(entity.entity_type, 0.6)
-        risk_factors.append(entity_type_risk)
-        
         if entity.entity_type == EntityType.PUBLIC_COMPANY:
             reasoning.append(
                 "🏢 Public company: High regulatory scrutiny, "
@@ -76,7 +72,6 @@ class EntityAnalyzer:
         
         # Industry risk
         industry_risk = self.INDUSTRY_RISK.get(entity.industry, 0.5)
-        risk_factors.append(industry_risk)
         reasoning.append(
             f"🏭 Industry: {entity.industry.value} - "
             f"{'High' if industry_risk > 0.8 else 'Moderate' if industry_risk > 0.6 else 'Standard'} "
@@ -90,24 +85,19 @@ class EntityAnalyzer:
                     "👥 Large organization (5000+ employees): "
                     "Higher compliance capacity but more complex operations"
                 )
-                risk_factors.append(0.7)
             elif entity.employee_count > 500:
                 reasoning.append(
                     "👥 Medium organization (500-5000 employees): "
                     "Balanced resources and complexity"
                 )
-                risk_factors.append(0.5)
             elif entity.employee_count < 50:
                 reasoning.append(
                     "👥 Small organization (<50 employees): "
                     "Limited compliance resources, may need external guidance"
                 )
-                risk_factors.append(0.35)
         
         # Previous violations increase risk
         if entity.previous_violations > 0:
-            violation_risk = min(0.3 + (entity.previous_violations * 0.15), 0.9)
-            risk_factors.append(violation_risk)
             reasoning.append(
                 f"⚠️ {entity.previous_violations} previous violation(s): "
                 "Increased regulatory scrutiny expected"
@@ -115,7 +105,6 @@ class EntityAnalyzer:
         
         # Regulated entity flag
         if entity.is_regulated:
-            risk_factors.append(0.8)
             reasoning.append(
                 "📋 Regulated entity: Subject to direct regulatory oversight, "
                 "periodic audits, and strict compliance requirements"
@@ -123,7 +112,6 @@ class EntityAnalyzer:
         
         # Data handling considerations
         if entity.has_personal_data and task.affects_personal_data:
-            risk_factors.append(0.75)
             reasoning.append(
                 "🔐 Handles personal data: Privacy regulations apply, "
                 "data breach notification requirements, enhanced security needed"
@@ -136,18 +124,61 @@ class EntityAnalyzer:
                     "💰 High revenue organization: Significant potential fines for violations, "
                     "greater reputational risk"
                 )
-                risk_factors.append(0.75)
             elif entity.annual_revenue > 10_000_000:  # > $10M
                 reasoning.append(
                     "💰 Medium revenue organization: Material fines possible, "
                     "reputational considerations important"
                 )
-                risk_factors.append(0.6)
         
-        # Calculate final score
-        final_risk = sum(risk_factors) / len(risk_factors) if risk_factors else 0.5
+        return self.entity_risk_score(entity, task), reasoning
+    
+    def entity_risk_score(
+        self,
+        entity: EntityContext,
+        task: TaskContext
+    ) -> float:
+        """
+        Numeric entity risk only (no reasoning text)
+        
+        Args:
+            entity: Entity context information
+            task: Task context information
+            
+        Returns:
+            Risk score (0-1), the mean of the applicable risk components
+        """
+        risk_factors = [
+            self.ENTITY_TYPE_RISK.get(entity.entity_type, 0.6),
+            self.INDUSTRY_RISK.get(entity.industry, 0.5),
+        ]
+        
+        # Company size and resources
+        if entity.employee_count:
+            if entity.employee_count > 5000:
+                risk_factors.append(0.7)
+            elif entity.employee_count > 500:
+                risk_factors.append(0.5)
+            elif entity.employee_count < 50:
+                risk_factors.append(0.35)
+        
+        # Previous violations increase risk
+        if entity.previous_violations > 0:
+            risk_factors.append(min(0.3 + (entity.previous_violations * 0.15), 0.9))
+        
+        if entity.is_regulated:
+            risk_factors.append(0.8)
+        
+        if entity.has_personal_data and task.affects_personal_data:
+            risk_factors.append(0.75)
+        
+        # Revenue considerations (for potential fines)
+        if entity.annual_revenue:
+            if entity.annual_revenue > 1_000_000_000:  # > $1B
+                risk_factors.append(0.75)
+            elif entity.annual_revenue > 10_000_000:  # > $10M
+                risk_factors.append(0.6)
         
-        return final_risk, reasoning
+        return sum(risk_factors) / len(risk_factors)
     
     def assess_entity_capability(self, entity: EntityContext) -> Tuple[str, float]:
         """
@@ -4,11 +4,18 @@ Feedback Processor Module
 Processes human feedback to update memory and adjust thresholds.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone, timedelta
 
-from backend.db.models import FeedbackLog, MemoryRecord
+from backend.db.audit_archive import get_archive
+from backend.db.models import AuditTrail, FeedbackLog, MemoryRecord
+
+DECISIONS = ("AUTONOMOUS", "REVIEW_REQUIRED", "ESCALATE")
+
+# Dimensions accepted by FeedbackProcessor.decision_counts(group_by=...)
+FEEDBACK_GROUPS = ("entity_name", "task_category")
 
 
 class FeedbackProcessor:
@@ -165,7 +172,8 @@ class FeedbackProcessor:
                 "adjustments": {}
             }
     
-    def _classify_override_type(self, feedback: FeedbackLog) -> str:
+    @staticmethod
+    def _classify_override_type(feedback: FeedbackLog) -> str:
         """Classify the type of override."""
         ai = feedback.ai_decision
         human = feedback.human_decision
@@ -185,6 +193,170 @@ class FeedbackProcessor:
         else:
             return "unknown"
     
+    def decision_counts(
+        self,
+        entity_name: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        group_by: Optional[str] = None,
+        overrides_only: bool = False
+    ) -> Dict[Tuple[Any, str, str, int], int]:
+        """
+        Feedback counts per (group, ai_decision, human_decision, is_agreement).
+
+        The hot table is read with one grouped aggregate; archived feedback
+        is grouped over the Parquet columns and added in.
+
+        Args:
+            entity_name: Optional entity name filter
+            start_date: Include feedback at or after this time
+            end_date: Include feedback at or before this time
+            group_by: Optional dimension, one of FEEDBACK_GROUPS (group is None otherwise)
+            overrides_only: Only count feedback where the human disagreed
+
+        Returns:
+            {(group, ai_decision, human_decision, is_agreement): count}
+        """
+        if group_by is not None and group_by not in FEEDBACK_GROUPS:
+            raise ValueError(f"Unknown feedback group {group_by!r}; expected one of {', '.join(FEEDBACK_GROUPS)}")
+        
+        decision_columns = (FeedbackLog.ai_decision, FeedbackLog.human_decision, FeedbackLog.is_agreement)
+        group_column = {"entity_name": FeedbackLog.entity_name, "task_category": AuditTrail.task_category}.get(group_by)
+        columns = decision_columns if group_column is None else (group_column, *decision_columns)
+        
+        query = self.db.query(*columns, func.count())
+        if group_by == "task_category":
+            query = query.outerjoin(AuditTrail, AuditTrail.id == FeedbackLog.audit_trail_id)
+        filters = {"entity_name": entity_name, "is_agreement": 0 if overrides_only else None}
+        for column, value in filters.items():
+            if value is not None:
+                query = query.filter(getattr(FeedbackLog, column) == value)
+        if start_date:
+            query = query.filter(FeedbackLog.timestamp >= start_date)
+        if end_date:
+            query = query.filter(FeedbackLog.timestamp <= end_date)
+        
+        counts: Dict[Tuple[Any, str, str, int], int] = {}
+        for *key, count in query.group_by(*columns):
+            key = tuple(key) if group_column is not None else (None, *key)
+            counts[key] = counts.get(key, 0) + count
+        
+        archive = get_archive()
+        keys = ["ai_decision", "human_decision", "is_agreement"]
+        if group_by is not None:
+            keys.insert(0, "audit_trail_id" if group_by == "task_category" else group_by)
+        archived = archive.group_count(self.db, "feedback_log", keys, filters, start_date, end_date)
+        if group_by == "task_category" and archived:
+            categories = self._task_categories({key[0] for key in archived})
+            archived_by_category: Dict[Tuple[Any, ...], int] = {}
+            for (audit_trail_id, *decisions), count in archived.items():
+                key = (categories.get(audit_trail_id), *decisions)
+                archived_by_category[key] = archived_by_category.get(key, 0) + count
+            archived = archived_by_category
+        for key, count in archived.items():
+            key = key if group_by is not None else (None, *key)
+            counts[key] = counts.get(key, 0) + count
+        return counts
+    
+    def _task_categories(self, audit_trail_ids) -> Dict[int, Optional[str]]:
+        """Task category of each audit entry, from either tier"""
+        ids = [audit_trail_id for audit_trail_id in audit_trail_ids if audit_trail_id is not None]
+        categories = dict(
+            self.db.query(AuditTrail.id, AuditTrail.task_category).filter(AuditTrail.id.in_(ids))
+        ) if ids else {}
+        missing = set(ids) - set(categories)
+        if missing:
+            rows = get_archive().read_ids(self.db, "audit_trail", missing, columns=["task_category"])
+            categories.update(zip(rows["id"].to_pylist(), rows["task_category"].to_pylist()))
+        return categories
+    
+    @staticmethod
+    def summarize_decision_counts(counts: Dict[Tuple[str, str, int], int]) -> Dict[str, Any]:
+        """
+        Accuracy, override breakdown, confusion matrix and override types.
+
+        Args:
+            counts: {(ai_decision, human_decision, is_agreement): count}
+
+        Returns:
+            Dictionary with the FeedbackStats fields plus "confusion_matrix"
+            ({"labels", "matrix"}, rows = AI decision) and "override_types"
+        """
+        total_count = sum(counts.values())
+        agreement_count = sum(count for (_, _, agreed), count in counts.items() if agreed == 1)
+        override_breakdown = {decision: 0 for decision in DECISIONS}
+        override_types: Dict[str, int] = {}
+        pairs: Dict[Tuple[str, str], int] = {}
+        for (ai, human, agreed), count in counts.items():
+            pairs[(ai, human)] = pairs.get((ai, human), 0) + count
+            if agreed == 0:
+                if ai in override_breakdown:
+                    override_breakdown[ai] += count
+                override_type = FeedbackProcessor._classify_override_type(
+                    FeedbackLog(ai_decision=ai, human_decision=human)
+                )
+                override_types[override_type] = override_types.get(override_type, 0) + count
+        
+        most_overridden = max(override_breakdown, key=override_breakdown.get)
+        if override_breakdown[most_overridden] == 0:
+            most_overridden = None
+        
+        labels = list(DECISIONS) + sorted({value for pair in pairs for value in pair if value not in DECISIONS})
+        return {
+            "total_feedback_count": total_count,
+            "agreement_count": agreement_count,
+            "override_count": total_count - agreement_count,
+            "accuracy_percent": round(agreement_count / total_count * 100, 2) if total_count else 0.0,
+            "most_overridden_decision": most_overridden,
+            "override_breakdown": override_breakdown if total_count else {},
+            "confusion_matrix": {
+                "labels": labels,
+                "matrix": [[pairs.get((ai, human), 0) for human in labels] for ai in labels],
+            },
+            "override_types": override_types,
+        }
+    
+    def get_feedback_statistics(
+        self,
+        entity_name: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        group_by: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Feedback accuracy overall and per group, from one grouped aggregate.
+
+        Args:
+            entity_name: Optional entity name filter
+            start_date: Include feedback at or after this time
+            end_date: Include feedback at or before this time
+            group_by: Optional dimension, one of FEEDBACK_GROUPS
+
+        Returns:
+            {"overall": summary, "groups": [{"group": value, **summary}, ...]}
+            with summaries as returned by summarize_decision_counts
+        """
+        counts = self.decision_counts(entity_name, start_date, end_date, group_by)
+        overall: Dict[Tuple[str, str, int], int] = {}
+        by_group: Dict[Any, Dict[Tuple[str, str, int], int]] = {}
+        for (group, *decisions), count in counts.items():
+            key = tuple(decisions)
+            overall[key] = overall.get(key, 0) + count
+            if group_by is not None:
+                group_counts = by_group.setdefault(group, {})
+                group_counts[key] = group_counts.get(key, 0) + count
+        
+        groups: List[Dict[str, Any]] = [
+            {"group": group, **self.summarize_decision_counts(group_counts)}
+            for group, group_counts in by_group.items()
+        ]
+        groups.sort(key=lambda summary: (-summary["total_feedback_count"], str(summary["group"])))
+        return {
+            "overall": self.summarize_decision_counts(overall),
+            "group_by": group_by,
+            "groups": groups,
+        }
+    
     def get_override_statistics(
         self,
         entity_name: Optional[str] = None,
@@ -201,24 +373,15 @@ class FeedbackProcessor:
             Dictionary with override statistics
         """
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-        
-        query = self.db.query(FeedbackLog).filter(
-            FeedbackLog.is_agreement == 0,
-            FeedbackLog.timestamp >= cutoff_date
-        )
-        
-        if entity_name:
-            query = query.filter(FeedbackLog.entity_name == entity_name)
-        
-        overrides = query.all()
+        counts = self.decision_counts(entity_name, start_date=cutoff_date, overrides_only=True)
         
         override_types = {}
-        for override in overrides:
-            override_type = self._classify_override_type(override)
-            override_types[override_type] = override_types.get(override_type, 0) + 1
+        for (_, ai, human, _), count in counts.items():
+            override_type = self._classify_override_type(FeedbackLog(ai_decision=ai, human_decision=human))
+            override_types[override_type] = override_types.get(override_type, 0) + count
         
         return {
-            "total_overrides": len(overrides),
+            "total_overrides": sum(counts.values()),
             "override_breakdown": override_types,
             "timeframe_days": days,
             "entity_name": entity_name
@@ -58,12 +58,12 @@ class JurisdictionAnalyzer:
             Tuple of (risk_score, reasoning_list)
         """
         reasoning = []
-        risk_scores = []
+        final_risk = self.jurisdiction_risk_score(entity, task)
         
         # Base jurisdiction complexity
         if not entity.jurisdictions:
             reasoning.append("⚠️ No jurisdiction specified - assuming moderate risk")
-            return 0.5, reasoning
+            return final_risk, reasoning
         
         # Multiple jurisdictions increase complexity
         if len(entity.jurisdictions) > 1:
@@ -71,13 +71,10 @@ class JurisdictionAnalyzer:
                 f"🌍 Multi-jurisdictional scope ({len(entity.jurisdictions)} jurisdictions) "
                 "increases regulatory complexity"
             )
-            risk_scores.append(0.8)
         
         # Analyze each jurisdiction
+        industry_risks = self.INDUSTRY_JURISDICTION_RISKS.get(entity.industry, {})
         for jurisdiction in entity.jurisdictions:
-            base_risk = self.JURISDICTION_COMPLEXITY.get(jurisdiction, 0.5)
-            risk_scores.append(base_risk)
-            
             # Add specific reasoning
             if jurisdiction == Jurisdiction.EU:
                 reasoning.append("🇪🇺 EU jurisdiction: GDPR compliance mandatory (strict penalties)")
@@ -87,10 +84,7 @@ class JurisdictionAnalyzer:
                 reasoning.append("🌐 Multi-jurisdictional: Complex regulatory harmonization required")
             
             # Industry-specific jurisdiction risks
-            industry_risks = self.INDUSTRY_JURISDICTION_RISKS.get(entity.industry, {})
             if jurisdiction in industry_risks:
-                industry_risk = industry_risks[jurisdiction]
-                risk_scores.append(industry_risk)
                 reasoning.append(
                     f"⚡ {entity.industry.value} in {jurisdiction.value}: "
                     f"Heightened regulatory scrutiny"
@@ -98,7 +92,6 @@ class JurisdictionAnalyzer:
         
         # Cross-border data transfer risks
         if task.involves_cross_border:
-            risk_scores.append(0.85)
             if Jurisdiction.EU in entity.jurisdictions:
                 reasoning.append(
                     "📦 Cross-border data transfer with EU: "
@@ -107,11 +100,44 @@ class JurisdictionAnalyzer:
             else:
                 reasoning.append("📦 Cross-border data transfer: Additional compliance requirements")
         
-        # Calculate final score
-        final_risk = max(risk_scores) if risk_scores else 0.5
-        
         return final_risk, reasoning
     
+    def jurisdiction_risk_score(
+        self,
+        entity: EntityContext,
+        task: TaskContext
+    ) -> float:
+        """
+        Numeric jurisdiction risk only (no reasoning text)
+        
+        Args:
+            entity: Entity context information
+            task: Task context information
+            
+        Returns:
+            Risk score (0-1)
+        """
+        if not entity.jurisdictions:
+            return 0.5
+        
+        risk_scores = []
+        
+        # Multiple jurisdictions increase complexity
+        if len(entity.jurisdictions) > 1:
+            risk_scores.append(0.8)
+        
+        industry_risks = self.INDUSTRY_JURISDICTION_RISKS.get(entity.industry, {})
+        for jurisdiction in entity.jurisdictions:
+            risk_scores.append(self.JURISDICTION_COMPLEXITY.get(jurisdiction, 0.5))
+            if jurisdiction in industry_risks:
+                risk_scores.append(industry_risks[jurisdiction])
+        
+        # Cross-border data transfer risks
+        if task.involves_cross_border:
+            risk_scores.append(0.85)
+        
+        return max(risk_scores)
+    
     def identify_applicable_regulations(
         self,
         entity: EntityContext,
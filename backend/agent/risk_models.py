@@ -116,6 +116,30 @@ class TaskContext(BaseModel):
         return v
 
 
+def weighted_risk_score(
+    jurisdiction_risk: float,
+    entity_risk: float,
+    task_risk: float,
+    data_sensitivity_risk: float,
+    regulatory_risk: float,
+    impact_risk: float
+) -> float:
+    """
+    Weighted overall risk score (15/15/20/20/20/10).
+    
+    Shared by RiskFactors and the engine's slotted FactorScores so both sum in
+    the same order and produce bit-identical scores.
+    """
+    return (
+        jurisdiction_risk * 0.15 +
+        entity_risk * 0.15 +
+        task_risk * 0.20 +
+        data_sensitivity_risk * 0.20 +
+        regulatory_risk * 0.20 +
+        impact_risk * 0.10
+    )
+
+
 class RiskFactors(BaseModel):
     """
     Detailed risk factors identified in analysis.
@@ -148,22 +172,13 @@ class RiskFactors(BaseModel):
         - Regulatory Oversight: 20%
         - Impact: 10%
         """
-        weights = {
-            'jurisdiction_risk': 0.15,      # 15%
-            'entity_risk': 0.15,            # 15%
-            'task_risk': 0.20,              # 20% (Task Complexity)
-            'data_sensitivity_risk': 0.20,  # 20%
-            'regulatory_risk': 0.20,         # 20% (Regulatory Oversight)
-            'impact_risk': 0.10             # 10%
-        }
-        
-        return (
-            self.jurisdiction_risk * weights['jurisdiction_risk'] +
-            self.entity_risk * weights['entity_risk'] +
-            self.task_risk * weights['task_risk'] +
-            self.data_sensitivity_risk * weights['data_sensitivity_risk'] +
-            self.regulatory_risk * weights['regulatory_risk'] +
-            self.impact_risk * weights['impact_risk']
+        return weighted_risk_score(
+            self.jurisdiction_risk,
+            self.entity_risk,
+            self.task_risk,
+            self.data_sensitivity_risk,
+            self.regulatory_risk,
+            self.impact_risk
         )
     
     def classify_risk(self) -> RiskLevel:
@@ -0,0 +1,488 @@
+"""
+Scenario Sweep Module
+
+Vectorized what-if exploration. Evaluates grids or random samples over the six
+risk factors (and optional entity/task attribute variations) in a single NumPy
+pass, mirroring RiskFactors.overall_score and DecisionEngine._make_decision.
+"""
+
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .risk_models import (
+    ActionDecision,
+    DecisionAnalysis,
+    EntityContext,
+    RiskLevel,
+    TaskCategory,
+    TaskContext,
+)
+from .decision_engine import DecisionEngine
+
+
+FACTOR_NAMES: Tuple[str, ...] = (
+    "jurisdiction_risk",
+    "entity_risk",
+    "task_risk",
+    "data_sensitivity_risk",
+    "regulatory_risk",
+    "impact_risk",
+)
+# Same weights, in the same summation order, as RiskFactors.overall_score
+FACTOR_WEIGHTS: Tuple[float, ...] = (0.15, 0.15, 0.20, 0.20, 0.20, 0.10)
+
+LEVELS: Tuple[RiskLevel, ...] = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH)
+DECISIONS: Tuple[ActionDecision, ...] = (
+    ActionDecision.AUTONOMOUS,
+    ActionDecision.REVIEW_REQUIRED,
+    ActionDecision.ESCALATE,
+)
+_AUTONOMOUS, _REVIEW, _ESCALATE = 0, 1, 2
+
+MAX_SCENARIOS = 500_000
+MAX_ATTRIBUTE_COMBINATIONS = 256
+MAX_SURFACE_CELLS = 100_000
+_SERIOUS_IMPACT_WORDS = ("serious", "major", "critical", "severe")
+
+
+@dataclass
+class SweepContext:
+    """Entity/task variation evaluated once and broadcast over the factor grid"""
+    attributes: Dict[str, Any]
+    entity: EntityContext
+    task: TaskContext
+    base_factors: np.ndarray  # Shape (6,), values for factors that are not swept
+    simple_task: bool
+    capable: bool
+    repeat_violator: bool
+    incident: bool
+    policy_or_privacy: bool
+    cross_border_serious: bool
+
+
+@dataclass
+class SweepResult:
+    """Arrays produced by a sweep plus the derived analysis"""
+    mode: str
+    swept: List[str]
+    axes: Dict[str, np.ndarray]
+    contexts: List[SweepContext]
+    factors: np.ndarray  # (N, 6)
+    context_index: np.ndarray  # (N,)
+    scores: np.ndarray
+    levels: np.ndarray  # Index into LEVELS
+    decisions: np.ndarray  # Index into DECISIONS
+    confidence: np.ndarray
+    sensitivities: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    thresholds: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return int(self.scores.shape[0])
+
+    def surface(self) -> Optional[Dict[str, Any]]:
+        """Score/decision surface over the grid axes, one slice per context (grid mode, 1-2 axes)"""
+        if self.mode != "grid" or not 1 <= len(self.swept) <= 2 or self.size > MAX_SURFACE_CELLS:
+            return None
+        shape = (len(self.contexts),) + tuple(len(self.axes[name]) for name in self.swept)
+        return {
+            "axes": {name: self.axes[name].round(6).tolist() for name in self.swept},
+            "scores": self.scores.reshape(shape).round(4).tolist(),
+            "decisions": self.decisions.reshape(shape).tolist(),
+            "decision_labels": [d.value for d in DECISIONS],
+        }
+
+    def to_dict(self, include_surface: bool = True) -> Dict[str, Any]:
+        """Summarize the sweep into a JSON-serializable dictionary"""
+        decision_counts = np.bincount(self.decisions, minlength=len(DECISIONS))
+        level_counts = np.bincount(self.levels, minlength=len(LEVELS))
+        percentiles = np.percentile(self.scores, [5, 25, 50, 75, 95]) if self.size else np.zeros(5)
+
+        contexts = []
+        for index, context in enumerate(self.contexts):
+            mask = self.context_index == index
+            counts = np.bincount(self.decisions[mask], minlength=len(DECISIONS))
+            contexts.append({
+                "attributes": context.attributes,
+                "base_factors": dict(zip(FACTOR_NAMES, context.base_factors.round(4).tolist())),
+                "decision_counts": {d.value: int(c) for d, c in zip(DECISIONS, counts)},
+            })
+
+        result = {
+            "mode": self.mode,
+            "scenario_count": self.size,
+            "swept_factors": self.swept,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "score_stats": {
+                "min": round(float(self.scores.min()), 4) if self.size else None,
+                "mean": round(float(self.scores.mean()), 4) if self.size else None,
+                "max": round(float(self.scores.max()), 4) if self.size else None,
+                "percentiles": dict(zip(["p5", "p25", "p50", "p75", "p95"], percentiles.round(4).tolist())),
+            },
+            "decision_counts": {d.value: int(c) for d, c in zip(DECISIONS, decision_counts)},
+            "level_counts": {lvl.value: int(c) for lvl, c in zip(LEVELS, level_counts)},
+            "contexts": contexts,
+            "sensitivities": self.sensitivities,
+            "thresholds": self.thresholds,
+        }
+        if include_surface:
+            result["surface"] = self.surface()
+        return result
+
+
+def score_matrix(factors: np.ndarray) -> np.ndarray:
+    """
+    Weighted overall score for every row of an (N, 6) factor matrix.
+
+    Summed term by term in the same order as RiskFactors.overall_score so the
+    results are bit-identical to the scalar implementation.
+    """
+    score = factors[:, 0] * FACTOR_WEIGHTS[0]
+    for column in range(1, len(FACTOR_NAMES)):
+        score = score + factors[:, column] * FACTOR_WEIGHTS[column]
+    return score
+
+
+class ScenarioSweep:
+    """
+    Vectorized evaluator for large what-if sweeps.
+
+    Each entity/task attribute combination is analyzed once with the regular
+    DecisionEngine; the resulting context flags are broadcast over every factor
+    scenario and the decision matrix is applied with boolean masks.
+    """
+
+    def __init__(self, decision_engine: Optional[DecisionEngine] = None):
+        self.decision_engine = decision_engine or DecisionEngine()
+        self.low_threshold = self.decision_engine.LOW_RISK_THRESHOLD
+        self.medium_threshold = self.decision_engine.MEDIUM_RISK_THRESHOLD
+
+    def run(
+        self,
+        baseline: DecisionAnalysis,
+        factors: Optional[Dict[str, Any]] = None,
+        entity_attributes: Optional[Dict[str, Sequence[Any]]] = None,
+        task_attributes: Optional[Dict[str, Sequence[Any]]] = None,
+        mode: str = "grid",
+        samples: int = 10_000,
+        seed: Optional[int] = None,
+    ) -> SweepResult:
+        """
+        Evaluate a sweep of scenarios around a baseline analysis.
+
+        Args:
+            baseline: Baseline DecisionAnalysis; unswept factors keep its values
+            factors: Per-factor spec. A list of explicit values, or a dict with
+                "min"/"max" (default 0-1) and "steps" (grid mode only)
+            entity_attributes: EntityContext field -> candidate values
+            task_attributes: TaskContext field -> candidate values
+            mode: "grid" (cartesian product) or "random" (uniform samples)
+            samples: Number of random factor samples (random mode)
+            seed: RNG seed for reproducible random sweeps
+
+        Returns:
+            SweepResult with per-scenario arrays, sensitivities and thresholds
+
+        Raises:
+            ValueError: On unknown factors/attributes, bad specs or oversized sweeps
+        """
+        start = time.perf_counter()
+        factors = factors or {}
+        unknown = set(factors) - set(FACTOR_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown risk factors: {sorted(unknown)}")
+        if mode not in ("grid", "random"):
+            raise ValueError(f"Unknown sweep mode: {mode}")
+
+        contexts = self._build_contexts(baseline, entity_attributes or {}, task_attributes or {})
+        swept = [name for name in FACTOR_NAMES if name in factors]
+        axes = {name: self._axis(name, factors[name], mode) for name in swept}
+
+        if mode == "grid":
+            points = int(np.prod([len(axes[name]) for name in swept])) if swept else 1
+        else:
+            points = int(samples) if swept else 1
+            if points < 1:
+                raise ValueError("samples must be positive")
+        total = points * len(contexts)
+        if total > MAX_SCENARIOS:
+            raise ValueError(f"Sweep of {total} scenarios exceeds the limit of {MAX_SCENARIOS}")
+
+        # Factor matrix: context-major, so each context owns a contiguous block of `points` rows
+        base = np.stack([context.base_factors for context in contexts])
+        context_index = np.repeat(np.arange(len(contexts)), points)
+        matrix = base[context_index].copy()
+        if swept:
+            columns = self._sample_columns(swept, axes, mode, points, seed)
+            for name, values in columns.items():
+                matrix[:, FACTOR_NAMES.index(name)] = np.tile(values, len(contexts))
+
+        scores, levels, decisions, confidence = self.evaluate(matrix, context_index, contexts)
+        result = SweepResult(
+            mode=mode,
+            swept=swept,
+            axes=axes,
+            contexts=contexts,
+            factors=matrix,
+            context_index=context_index,
+            scores=scores,
+            levels=levels,
+            decisions=decisions,
+            confidence=confidence,
+        )
+        result.sensitivities = self._sensitivities(result, axes)
+        result.thresholds = self._thresholds(contexts)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def evaluate(
+        self,
+        factors: np.ndarray,
+        context_index: np.ndarray,
+        contexts: List[SweepContext],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized equivalent of classify + DecisionEngine._make_decision.
+
+        Returns:
+            Tuple of (scores, level indices, decision indices, confidence)
+        """
+        scores = score_matrix(factors)
+        levels = np.where(scores < self.low_threshold, 0, np.where(scores < self.medium_threshold, 1, 2))
+
+        def flag(name: str) -> np.ndarray:
+            return np.array([getattr(c, name) for c in contexts], dtype=bool)[context_index]
+
+        simple, capable = flag("simple_task"), flag("capable")
+        low, medium = levels == 0, levels == 1
+
+        decisions = np.full(scores.shape, _ESCALATE, dtype=np.int8)
+        confidence = np.full(scores.shape, 0.9)
+        decisions[medium] = _REVIEW
+        confidence[medium] = np.where(scores[medium] < 0.55, 0.75, 0.8)
+        decisions[low] = np.where(simple[low] | capable[low], _AUTONOMOUS, _REVIEW)
+        confidence[low] = np.where(simple[low], 0.90, np.where(capable[low], 0.85, 0.7))
+
+        # Overrides, in the same order as the scalar decision matrix
+        decisions[flag("repeat_violator") & (decisions == _AUTONOMOUS)] = _REVIEW
+        decisions[flag("incident")] = _ESCALATE
+        policy = flag("policy_or_privacy")
+        decisions[policy & (flag("cross_border_serious") | (decisions == _ESCALATE))] = _REVIEW
+        confidence[policy] = np.maximum(confidence[policy], 0.65)
+
+        return scores, levels.astype(np.int8), decisions, confidence
+
+    def _build_contexts(
+        self,
+        baseline: DecisionAnalysis,
+        entity_attributes: Dict[str, Sequence[Any]],
+        task_attributes: Dict[str, Sequence[Any]],
+    ) -> List[SweepContext]:
+        """Analyze every entity/task attribute combination once"""
+        for model, attributes in ((EntityContext, entity_attributes), (TaskContext, task_attributes)):
+            unknown = set(attributes) - set(model.model_fields)
+            if unknown:
+                raise ValueError(f"Unknown {model.__name__} attributes: {sorted(unknown)}")
+
+        keys = [("entity", k) for k in entity_attributes] + [("task", k) for k in task_attributes]
+        value_lists = [list(entity_attributes[k]) for k in entity_attributes] + [
+            list(task_attributes[k]) for k in task_attributes
+        ]
+        if any(not values for values in value_lists):
+            raise ValueError("Attribute value lists must not be empty")
+        combinations = int(np.prod([len(v) for v in value_lists])) if value_lists else 1
+        if combinations > MAX_ATTRIBUTE_COMBINATIONS:
+            raise ValueError(
+                f"{combinations} attribute combinations exceed the limit of {MAX_ATTRIBUTE_COMBINATIONS}"
+            )
+
+        baseline_factors = np.array(
+            [getattr(baseline.risk_factors, name) for name in FACTOR_NAMES], dtype=np.float64
+        )
+        contexts = []
+        for combination in itertools.product(*value_lists):
+            entity_updates = {k: v for (scope, k), v in zip(keys, combination) if scope == "entity"}
+            task_updates = {k: v for (scope, k), v in zip(keys, combination) if scope == "task"}
+            entity = baseline.entity_context
+            task = baseline.task_context
+            if entity_updates:
+                entity = EntityContext.model_validate({**entity.model_dump(), **entity_updates})
+            if task_updates:
+                task = TaskContext.model_validate({**task.model_dump(), **task_updates})
+
+            if entity_updates or task_updates:
+                factors = self.decision_engine.score_factors(entity, task)
+                base_factors = np.array([getattr(factors, name) for name in FACTOR_NAMES], dtype=np.float64)
+            else:
+                base_factors = baseline_factors
+
+            attributes = {
+                f"{scope}.{k}": (v.value if hasattr(v, "value") else v)
+                for (scope, k), v in zip(keys, combination)
+            }
+            contexts.append(self._context(attributes, entity, task, base_factors))
+        return contexts
+
+    def _context(
+        self,
+        attributes: Dict[str, Any],
+        entity: EntityContext,
+        task: TaskContext,
+        base_factors: np.ndarray,
+    ) -> SweepContext:
+        """Reduce an entity/task pair to the boolean inputs of the decision matrix"""
+        _, capability_confidence = self.decision_engine.entity_analyzer.assess_entity_capability(entity)
+        impact_text = (task.potential_impact or "").lower()
+        serious = any(word in impact_text for word in _SERIOUS_IMPACT_WORDS)
+        return SweepContext(
+            attributes=attributes,
+            entity=entity,
+            task=task,
+            base_factors=base_factors,
+            simple_task=(
+                task.category == TaskCategory.GENERAL_INQUIRY
+                and not task.affects_personal_data
+                and not task.affects_financial_data
+            ),
+            capable=capability_confidence > 0.6,
+            repeat_violator=entity.previous_violations > 2,
+            incident=task.category == TaskCategory.INCIDENT_RESPONSE,
+            policy_or_privacy=task.category in (TaskCategory.POLICY_REVIEW, TaskCategory.DATA_PRIVACY),
+            cross_border_serious=task.involves_cross_border and serious,
+        )
+
+    @staticmethod
+    def _axis(name: str, spec: Any, mode: str) -> np.ndarray:
+        """Normalize a factor spec to an array (explicit values or [min, max] bounds)"""
+        if isinstance(spec, dict):
+            low = float(spec.get("min", 0.0))
+            high = float(spec.get("max", 1.0))
+            if not 0.0 <= low <= high <= 1.0:
+                raise ValueError(f"{name}: range must satisfy 0 <= min <= max <= 1")
+            if mode == "random":
+                return np.array([low, high])
+            steps = int(spec.get("steps", 11))
+            if steps < 1:
+                raise ValueError(f"{name}: steps must be positive")
+            return np.linspace(low, high, steps)
+
+        values = np.asarray(spec, dtype=np.float64).ravel()
+        if values.size == 0:
+            raise ValueError(f"{name}: no values given")
+        if values.min() < 0.0 or values.max() > 1.0:
+            raise ValueError(f"{name}: values must be between 0 and 1")
+        return values
+
+    @staticmethod
+    def _sample_columns(
+        swept: List[str],
+        axes: Dict[str, np.ndarray],
+        mode: str,
+        points: int,
+        seed: Optional[int],
+    ) -> Dict[str, np.ndarray]:
+        """Expand axes into one column per swept factor"""
+        if mode == "grid":
+            mesh = np.meshgrid(*(axes[name] for name in swept), indexing="ij")
+            return {name: grid.ravel() for name, grid in zip(swept, mesh)}
+
+        rng = np.random.default_rng(seed)
+        return {name: rng.uniform(axes[name].min(), axes[name].max(), points) for name in swept}
+
+    def _sensitivities(self, result: SweepResult, axes: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-factor sensitivity over the sweep.
+
+        The score is linear, so its gradient is the factor weight. The flip rate
+        is the share of scenarios whose decision changes when the factor moves
+        from the low to the high end of its range with everything else fixed.
+        """
+        sensitivities = {}
+        for column, name in enumerate(FACTOR_NAMES):
+            low, high = (float(axes[name].min()), float(axes[name].max())) if name in axes else (0.0, 1.0)
+            outcomes = []
+            for value in (low, high):
+                shifted = result.factors.copy()
+                shifted[:, column] = value
+                outcomes.append(self.evaluate(shifted, result.context_index, result.contexts)[2])
+            flip_rate = float(np.mean(outcomes[0] != outcomes[1])) if result.size else 0.0
+            sensitivities[name] = {
+                "weight": FACTOR_WEIGHTS[column],
+                "range": [low, high],
+                "score_swing": round(FACTOR_WEIGHTS[column] * (high - low), 4),
+                "decision_flip_rate": round(flip_rate, 4),
+            }
+        return sensitivities
+
+    def _thresholds(self, contexts: List[SweepContext]) -> List[Dict[str, Any]]:
+        """
+        Exact factor values at which the decision flips, per context.
+
+        Each factor is moved alone from its base value; the analytic crossing of
+        each level boundary is refined to the smallest float64 that lands on the
+        upper side, so ``value`` flips the decision and the next float below
+        does not.
+        """
+        thresholds = []
+        for index, context in enumerate(contexts):
+            for column, name in enumerate(FACTOR_NAMES):
+                rest = float(score_matrix(self._with_value(context.base_factors, column, 0.0))[0])
+                for boundary in (self.low_threshold, self.medium_threshold):
+                    guess = (boundary - rest) / FACTOR_WEIGHTS[column]
+                    if not 0.0 < guess <= 1.0:
+                        continue
+                    value = self._refine_crossing(context.base_factors, column, guess, boundary)
+                    if value is None:
+                        continue
+                    below = np.nextafter(value, -np.inf)
+                    probe = np.vstack([
+                        self._with_value(context.base_factors, column, below),
+                        self._with_value(context.base_factors, column, value),
+                    ])
+                    _, levels, decisions, _ = self.evaluate(probe, np.array([index, index]), contexts)
+                    if decisions[0] == decisions[1]:
+                        continue
+                    thresholds.append({
+                        "context": index,
+                        "factor": name,
+                        "value": float(value),
+                        "base_value": float(context.base_factors[column]),
+                        "score_boundary": boundary,
+                        "level_below": LEVELS[levels[0]].value,
+                        "level_above": LEVELS[levels[1]].value,
+                        "decision_below": DECISIONS[decisions[0]].value,
+                        "decision_above": DECISIONS[decisions[1]].value,
+                    })
+        return thresholds
+
+    @staticmethod
+    def _with_value(base: np.ndarray, column: int, value: float) -> np.ndarray:
+        row = base.copy()
+        row[column] = value
+        return row[np.newaxis, :]
+
+    def _refine_crossing(
+        self, base: np.ndarray, column: int, guess: float, boundary: float
+    ) -> Optional[float]:
+        """Walk float64 neighbours of the analytic solution to the exact crossing"""
+        def above(x: float) -> bool:
+            return bool(score_matrix(self._with_value(base, column, x))[0] >= boundary)
+
+        value = float(guess)
+        for _ in range(64):
+            if above(value):
+                break
+            value = float(np.nextafter(value, np.inf))
+        else:
+            return None
+        for _ in range(64):
+            below = float(np.nextafter(value, -np.inf))
+            if not above(below):
+                break
+            value = below
+        return value if 0.0 < value <= 1.0 else None
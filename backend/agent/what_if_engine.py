@@ -5,7 +5,7 @@ Provides scenario analysis capabilities to simulate changes in risk factors
 and see how they affect the overall risk score and decision.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 from .risk_models import (
     RiskFactors,
     RiskLevel,
@@ -13,6 +13,7 @@ from .risk_models import (
     DecisionAnalysis
 )
 from .decision_engine import DecisionEngine
+from .scenario_sweep import ScenarioSweep
 
 
 class WhatIfEngine:
@@ -35,6 +36,7 @@ class WhatIfEngine:
             decision_engine: Optional DecisionEngine instance. If not provided, creates a new one.
         """
         self.decision_engine = decision_engine or DecisionEngine()
+        self.sweeper = ScenarioSweep(self.decision_engine)
     
     def analyze_scenario(
         self,
@@ -97,11 +99,10 @@ class WhatIfEngine:
         
         # Recalculate decision if entity or task changed
         if 'entity' in changes or 'task' in changes:
-            new_analysis = self.decision_engine.analyze_and_decide(new_entity, new_task)
-            new_decision = new_analysis.decision
+            new_decision = self.decision_engine.assess(new_entity, new_task).decision
         else:
             # Use modified risk factors to determine decision
-            new_decision, _, _ = self.decision_engine._make_decision(
+            new_decision, _, _ = self.decision_engine._decide(
                 new_level, new_score, baseline.entity_context, baseline.task_context, modified_factors
             )
         
@@ -440,4 +441,42 @@ class WhatIfEngine:
             })
         
         return results
-
+    
+    def sweep(
+        self,
+        baseline: DecisionAnalysis,
+        factors: Optional[Dict[str, Any]] = None,
+        entity_attributes: Optional[Dict[str, Sequence[Any]]] = None,
+        task_attributes: Optional[Dict[str, Sequence[Any]]] = None,
+        mode: str = "grid",
+        samples: int = 10_000,
+        seed: Optional[int] = None,
+        include_surface: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a grid or random sample of scenarios in one vectorized pass.
+        
+        Unlike compare_scenarios, no per-scenario models are built; see
+        ScenarioSweep.run for the factor and attribute spec format.
+        
+        Returns:
+            Dictionary with score statistics, decision counts, per-factor
+            sensitivities, decision-flip thresholds and (for 1-2 grid axes)
+            the score surface
+        """
+        result = self.sweeper.run(
+            baseline,
+            factors=factors,
+            entity_attributes=entity_attributes,
+            task_attributes=task_attributes,
+            mode=mode,
+            samples=samples,
+            seed=seed
+        )
+        summary = result.to_dict(include_surface=include_surface)
+        summary["baseline"] = {
+            "score": round(baseline.risk_factors.overall_score, 3),
+            "level": baseline.risk_level.value,
+            "decision": baseline.decision.value
+        }
+        return summary
@@ -4,20 +4,40 @@ Agent Loop Module
 Implements the main agent execution loop with plan-execute-reflect cycles.
 Includes LLM-based planning, tool execution, reflection with hallucination detection,
 and replanning capabilities.
+
+The loop itself holds configuration and shared components only; each execute()
+call keeps its state on a RunContext, so one loop can serve concurrent runs.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
 import time
 import logging
+import queue
+import threading
+import contextvars
+import copy
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
+from backend.agentic_engine.reasoning.plan_library import PlanLibrary, instantiate_plan
 from backend.agentic_engine.reasoning.reasoning_engine import ReasoningEngine
+from backend.agentic_engine.run_context import RunContext, current_run
+from backend.agentic_engine.tools.tool_cache import ToolResultCache, params_key
 from backend.agentic_engine.tools.tool_registry import ToolRegistry
+from backend.agentic_engine.tools.tool_router import ToolRouter
+from backend.agentic_engine.tracing.recorder import TraceRecorder, current_trace, install_db_hooks, trace_span
+from backend.telemetry.metrics import AGENT_PHASE_DURATION
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+REFLECTION_MODES = ("per_step", "batched")
+
+# (step, result, reflection) triples handed back by _ReflectionScheduler
+Reflected = List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]
+
 
 class AgentLoop:
     """
@@ -30,6 +50,9 @@ class AgentLoop:
     3. Reflect → LLM scoring + hallucination detection
     4. Replan if score < 0.75
     5. Return Final Output with comprehensive results
+    
+    Re-entrant: plan, history, tool outputs, reflections and metrics of a run
+    live on the RunContext created by execute(), never on the loop.
     """
     
     def __init__(
@@ -40,7 +63,19 @@ class AgentLoop:
         reasoning_engine: Optional[ReasoningEngine] = None,
         tools: Optional[Dict[str, Any]] = None,
         replan_threshold: float = 0.75,
-        db_session: Optional[Session] = None
+        db_session: Optional[Session] = None,
+        pipeline_planning: bool = True,
+        reflection_mode: Optional[str] = None,
+        reflection_window: Optional[int] = None,
+        speculative_reflection: Optional[bool] = None,
+        plan_library: Optional[PlanLibrary] = None,
+        enable_plan_cache: Optional[bool] = None,
+        tool_router: Optional[ToolRouter] = None,
+        enable_tool_router: Optional[bool] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+        enable_tool_cache: Optional[bool] = None,
+        record_traces: Optional[bool] = None,
+        trace_dir: Optional[str] = None
     ):
         """
         Initialize the agent loop.
@@ -52,13 +87,48 @@ class AgentLoop:
             reasoning_engine: Optional ReasoningEngine instance for enhanced reasoning
             tools: Optional dictionary of available tools
             replan_threshold: Quality score threshold below which to replan (default: 0.75)
-            db_session: Optional database session for memory operations
+            db_session: Optional default database session for memory operations;
+                execute(db_session=...) overrides it per run
+            pipeline_planning: Start executing plan steps while the planner
+                is still streaming later steps (live LLM only)
+            reflection_mode: "per_step" (one reflection call per step) or
+                "batched" (one call scores several completed steps); defaults
+                to AGENTIC_REFLECTION_MODE
+            reflection_window: Steps per batched reflection call, 0 for all
+                steps of the plan; defaults to AGENTIC_REFLECTION_WINDOW
+            speculative_reflection: Run each reflection call in the background
+                while the next step executes; defaults to
+                AGENTIC_SPECULATIVE_REFLECTION
+            plan_library: Plan cache to reuse and seed plans from; a new one
+                (shared by every run of this loop) when not given
+            enable_plan_cache: Use the plan cache; defaults to
+                AGENTIC_PLAN_CACHE_ENABLED
+            tool_router: Router deciding which matched tools are worth running;
+                a new one (learning across runs of this loop) when not given
+            enable_tool_router: Route matched tools; defaults to
+                AGENTIC_TOOL_ROUTER_ENABLED (when off, every matched tool runs)
+            tool_cache: Tool result cache; a new one (its process-scoped
+                entries shared by every run of this loop) when not given
+            enable_tool_cache: Reuse cached tool results; defaults to
+                AGENTIC_TOOL_CACHE_ENABLED
+            record_traces: Record an execution trace of every run; defaults to
+                AGENTIC_TRACE_ENABLED
+            trace_dir: Directory recorded traces are saved to; defaults to
+                AGENTIC_TRACE_DIR
         """
         self.max_steps = max_steps
         self.enable_reflection = enable_reflection
         self.enable_memory = enable_memory
         self.replan_threshold = replan_threshold
         self.db_session = db_session
+        self.pipeline_planning = pipeline_planning
+        self.reflection_mode = reflection_mode or settings.AGENTIC_REFLECTION_MODE
+        if self.reflection_mode not in REFLECTION_MODES:
+            raise ValueError(f"Unknown reflection mode '{self.reflection_mode}', expected one of {REFLECTION_MODES}")
+        self.reflection_window = settings.AGENTIC_REFLECTION_WINDOW if reflection_window is None else reflection_window
+        self.speculative_reflection = (
+            settings.AGENTIC_SPECULATIVE_REFLECTION if speculative_reflection is None else speculative_reflection
+        )
         
         # Initialize reasoning engine if not provided
         if reasoning_engine is None:
@@ -69,33 +139,49 @@ class AgentLoop:
         # Initialize tool registry
         self.tool_registry = ToolRegistry()
         self.tools = tools or {}
+        if enable_tool_router is None:
+            enable_tool_router = settings.AGENTIC_TOOL_ROUTER_ENABLED
+        if not enable_tool_router:
+            self.tool_router = None
+        else:
+            self.tool_router = tool_router if tool_router is not None else ToolRouter.from_settings()
+        if enable_tool_cache is None:
+            enable_tool_cache = settings.AGENTIC_TOOL_CACHE_ENABLED
+        if not enable_tool_cache:
+            self.tool_cache = None
+        else:
+            self.tool_cache = tool_cache if tool_cache is not None else ToolResultCache.from_settings(self.tool_registry)
         
-        # Execution state
-        self.current_step = 0
-        self.execution_history = []
-        self.original_plan = []
-        self.revised_plan = []
-        self.tool_outputs = []
-        self.reflections = []
-        
-        # Metrics tracking
-        self.metrics = {
-            "total_steps": 0,
-            "successful_steps": 0,
-            "failed_steps": 0,
-            "total_retries": 0,
-            "replan_count": 0,
-            "total_execution_time": 0.0,
-            "step_times": [],
-            "tools_used": [],
-            "errors_encountered": []
-        }
+        # Plans of successful runs, reused or used as planner seeds by later runs
+        if enable_plan_cache is None:
+            enable_plan_cache = settings.AGENTIC_PLAN_CACHE_ENABLED
+        if not enable_plan_cache:
+            self.plan_library = None
+        else:
+            self.plan_library = plan_library if plan_library is not None else PlanLibrary.from_settings()
+        
+        # Execution traces (spans of LLM, tool, DB and reflection calls) for replay and profiling
+        self.record_traces = settings.AGENTIC_TRACE_ENABLED if record_traces is None else record_traces
+        self.trace_dir = trace_dir or settings.AGENTIC_TRACE_DIR
+        if self.record_traces:
+            install_db_hooks()
+        
+        # Metrics of the most recently finished run, for get_metrics() called after
+        # execute(); a copy, so the run's session, trace and tool results are not kept
+        self._last_run: Optional[RunContext] = None
+    
+    @staticmethod
+    def _active_run() -> RunContext:
+        """The current run's context; a throwaway one when called outside execute()."""
+        return current_run() or RunContext()
     
     def generate_plan(
         self,
         entity: str,
         task: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        on_reset: Optional[Callable[[], None]] = None
     ) -> List[Dict[str, Any]]:
         """
         Generate a strategic execution plan using LLM.
@@ -107,6 +193,9 @@ class AgentLoop:
             entity: Entity name or identifier
             task: The task description to plan for
             context: Optional context information for planning
+            on_token: Optional callback receiving streamed planner output
+            on_reset: Optional callback invoked when streamed output so far
+                must be discarded (the stream failed and the plan is regenerated)
             
         Returns:
             List of plan steps, where each step contains:
@@ -118,7 +207,10 @@ class AgentLoop:
         """
         try:
             # Use reasoning engine to generate plan
-            plan = self.reasoning_engine.generate_plan(entity, task, context)
+            if on_token is not None:
+                plan = self.reasoning_engine.generate_plan(entity, task, context, on_token=on_token, on_reset=on_reset)
+            else:
+                plan = self.reasoning_engine.generate_plan(entity, task, context)
             
             # Ensure plan is a list
             if not isinstance(plan, list):
@@ -161,7 +253,9 @@ class AgentLoop:
         """
         Execute tools for a given step.
         
-        Uses ToolRegistry to identify relevant tools and executes them.
+        Uses ToolRegistry to identify relevant tools, lets the ToolRouter drop
+        the ones unlikely to pay off, and executes the rest (serving repeated
+        calls from the ToolResultCache where the tool's metadata allows).
         
         Args:
             step: The step to execute tools for
@@ -170,6 +264,8 @@ class AgentLoop:
         Returns:
             List of tool execution results
         """
+        run = self._active_run()
+        recorder = current_trace()
         tool_outputs = []
         step_description = step.get("description", "")
         
@@ -190,25 +286,58 @@ class AgentLoop:
                 seen.add(tool)
                 unique_tools.append(tool)
         
+        # Skip tools that rarely contribute to this kind of step or overrun the latency budget
+        unique_tools = [tool for tool in unique_tools if tool in self.tools]
+        if self.tool_router is not None:
+            unique_tools = self.tool_router.route(step, unique_tools)
+        
         # Execute each tool
         for tool_name in unique_tools:
             if tool_name in self.tools:
+                tool_started = time.perf_counter()
+                tool_params: Dict[str, Any] = {}
                 try:
                     tool = self.tools[tool_name]
                     
                     # Extract tool parameters from step and context
                     tool_params = self._extract_tool_params(step, context, tool_name)
                     
-                    # Execute tool (try common method names)
+                    # Identical call already made (this run, or any run for pure tools)
+                    if self.tool_cache is not None:
+                        cached_result = self.tool_cache.get(run, tool_name, tool_params)
+                        if cached_result is not None:
+                            if recorder is not None:
+                                self._trace_tool(recorder, tool_name, tool_params, tool_started, cached_result, cache_hit=True)
+                            tool_outputs.append({
+                                "tool_name": tool_name,
+                                "step_id": step.get("step_id"),
+                                "params": tool_params,
+                                "result": cached_result,
+                                "cached": True,
+                                "timestamp": datetime.now(timezone.utc).isoformat()
+                            })
+                            run.metrics["tools_used"].append(tool_name)
+                            continue
+                    
+                    # Execute tool (ToolBase tools take keywords, the others one input dict)
                     tool_result = None
                     if hasattr(tool, "execute"):
                         tool_result = tool.execute(**tool_params)
                     elif hasattr(tool, "run"):
-                        tool_result = tool.run(**tool_params)
+                        tool_result = tool.run(tool_params)
                     else:
                         # Try to call tool directly with params
                         tool_result = {"success": False, "error": "Tool has no execute method"}
                     
+                    tool_seconds = time.perf_counter() - tool_started
+                    AGENT_PHASE_DURATION.labels("tool").observe(tool_seconds)
+                    if self.tool_router is not None:
+                        self.tool_router.record(step, tool_name, tool_seconds, tool_result)
+                    if self.tool_cache is not None:
+                        self.tool_cache.put(run, tool_name, tool_params, tool_result, tool_seconds)
+                    if recorder is not None:
+                        self._trace_tool(recorder, tool_name, tool_params, tool_started, tool_result)
+                    
                     tool_outputs.append({
                         "tool_name": tool_name,
                         "step_id": step.get("step_id"),
@@ -218,16 +347,21 @@ class AgentLoop:
                     })
                     
                     # Track tool usage
-                    self.metrics["tools_used"].append(tool_name)
+                    run.metrics["tools_used"].append(tool_name)
                     
                 except Exception as e:
+                    AGENT_PHASE_DURATION.labels("tool").observe(time.perf_counter() - tool_started)
+                    if self.tool_router is not None:
+                        self.tool_router.record(step, tool_name, time.perf_counter() - tool_started, None)
+                    if recorder is not None:
+                        self._trace_tool(recorder, tool_name, tool_params, tool_started, error=str(e))
                     tool_outputs.append({
                         "tool_name": tool_name,
                         "step_id": step.get("step_id"),
                         "result": {"success": False, "error": str(e)},
                         "timestamp": datetime.now(timezone.utc).isoformat()
                     })
-                    self.metrics["errors_encountered"].append({
+                    run.metrics["errors_encountered"].append({
                         "step_id": step.get("step_id"),
                         "tool": tool_name,
                         "error": str(e)
@@ -235,43 +369,75 @@ class AgentLoop:
         
         return tool_outputs
     
+    @staticmethod
+    def _trace_tool(
+        recorder: TraceRecorder,
+        tool_name: str,
+        params: Dict[str, Any],
+        started: float,
+        result: Any = None,
+        cache_hit: bool = False,
+        error: Optional[str] = None
+    ) -> None:
+        """Record one tool call (served from cache or not) on the run's trace."""
+        payload: Dict[str, Any] = {"params": params}
+        if error is None:
+            payload["result"] = result
+        recorder.add_span("tool", tool_name, started, time.perf_counter(), {
+            "params_hash": params_key(tool_name, params),
+            "cache_hit": cache_hit,
+        }, payload=payload, error=error)
+    
     def _extract_tool_params(
         self,
         step: Dict[str, Any],
         context: Optional[Dict[str, Any]],
         tool_name: str
     ) -> Dict[str, Any]:
-        """Extract tool parameters from step and context."""
-        params = {}
-        
-        # Extract from context
-        if context:
-            if tool_name == "entity_tool" and "entity" in context:
-                entity = context["entity"]
-                if isinstance(entity, dict):
-                    params.update({
-                        "entity_name": entity.get("name", ""),
-                        "entity_type": entity.get("type", "PRIVATE_COMPANY"),
-                        "industry": entity.get("industry", "TECHNOLOGY"),
-                    })
-            
-            if tool_name == "task_tool" and "task" in context:
-                task = context["task"]
-                if isinstance(task, dict):
-                    params.update({
-                        "task_description": task.get("description", step.get("description", "")),
-                        "task_category": task.get("category"),
-                    })
-            
-            if tool_name == "calendar_tool" and "task" in context:
-                task = context["task"]
-                if isinstance(task, dict):
-                    if "deadline" in task:
-                        params["deadline"] = task["deadline"]
+        """
+        Build a tool's run() input from the step and context.
         
-        # Extract from step description if params still missing
-        if not params and tool_name == "task_tool":
-            params["task_description"] = step.get("description", "")
+        Tools that serve several operations get the one to run as ``action``.
+        Entity and task fields are read under the API names (entity_name,
+        task_description, ...) or the short ones (name, description, ...).
+        """
+        params: Dict[str, Any] = {}
+        entity = (context or {}).get("entity")
+        task = (context or {}).get("task")
+        entity = entity if isinstance(entity, dict) else {}
+        task = task if isinstance(task, dict) else {}
+        
+        if tool_name == "entity_tool":
+            params = {
+                "action": "fetch_entity_details",
+                "entity_name": entity.get("entity_name") or entity.get("name", ""),
+                "entity_type": entity.get("entity_type") or entity.get("type") or "PRIVATE_COMPANY",
+                "industry": entity.get("industry") or "TECHNOLOGY",
+            }
+            for key in ("employee_count", "annual_revenue", "has_personal_data", "is_regulated", "previous_violations"):
+                if entity.get(key) is not None:
+                    params[key] = entity[key]
+        
+        elif tool_name == "task_tool":
+            params = {
+                "task_description": task.get("task_description") or task.get("description") or step.get("description", ""),
+            }
+            category = task.get("task_category") or task.get("category")
+            if category:
+                params["task_category"] = category
+            if entity.get("has_personal_data") is not None:
+                params["affects_personal_data"] = entity["has_personal_data"]
+            if task.get("deadline"):
+                params["deadline"] = task["deadline"]
+        
+        elif tool_name == "calendar_tool":
+            if task.get("deadline"):
+                params = {"action": "calculate_urgency", "deadline": task["deadline"]}
+                category = task.get("task_category") or task.get("category")
+                if category:
+                    params["task_category"] = category
+            else:
+                params = {"action": "calculate_deadline"}
         
         return params
     
@@ -291,10 +457,11 @@ class AgentLoop:
             Execution result containing output, tool results, and metadata
         """
         start_time = time.time()
-        step_id = step.get("step_id", f"step_{self.current_step}")
+        run = self._active_run()
+        step_id = step.get("step_id", f"step_{run.current_step}")
         
         try:
-            self.metrics["total_steps"] += 1
+            run.metrics["total_steps"] += 1
             
             # Execute tools for this step
             tool_outputs = self.execute_tools(step, context)
@@ -340,17 +507,17 @@ class AgentLoop:
             
             # Track success/failure
             if execution_result.get("status") == "success":
-                self.metrics["successful_steps"] += 1
+                run.metrics["successful_steps"] += 1
             else:
-                self.metrics["failed_steps"] += 1
+                run.metrics["failed_steps"] += 1
             
             # Track timing
-            self.metrics["step_times"].append(execution_time)
-            self.metrics["total_execution_time"] += execution_time
+            run.metrics["step_times"].append(execution_time)
+            run.metrics["total_execution_time"] += execution_time
             
             # Store in history
-            self.execution_history.append(execution_result)
-            self.current_step += 1
+            run.execution_history.append(execution_result)
+            run.current_step += 1
             
             return execution_result
             
@@ -358,8 +525,8 @@ class AgentLoop:
             execution_time = time.time() - start_time
             error_msg = str(e)
             
-            self.metrics["failed_steps"] += 1
-            self.metrics["errors_encountered"].append({
+            run.metrics["failed_steps"] += 1
+            run.metrics["errors_encountered"].append({
                 "step_id": step_id,
                 "error": error_msg
             })
@@ -418,26 +585,7 @@ class AgentLoop:
             # Use reasoning engine for reflection
             if self.reasoning_engine:
                 reflection = self.reasoning_engine.reflect(step, result)
-                
-                # Ensure required fields
-                if not isinstance(reflection, dict):
-                    reflection = {"overall_quality": 0.5}
-                
-                # Add hallucination detection
-                reflection = self._detect_hallucination(reflection, result)
-                
-                # Set defaults
-                reflection.setdefault("overall_quality", reflection.get("correctness_score", 0.7))
-                reflection.setdefault("correctness_score", 0.7)
-                reflection.setdefault("completeness_score", 0.7)
-                reflection.setdefault("confidence_score", 0.7)
-                reflection.setdefault("hallucination_detected", False)
-                reflection.setdefault("hallucination_indicators", [])
-                reflection.setdefault("issues", [])
-                reflection.setdefault("suggestions", [])
-                reflection.setdefault("requires_retry", False)
-                
-                return reflection
+                return self._finalize_reflection(reflection, result)
             else:
                 # Default reflection
                 return {
@@ -465,6 +613,69 @@ class AgentLoop:
                 "requires_retry": False
             }
     
+    def reflect_on_steps(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Reflect on several completed steps with one batched LLM call.
+        
+        Each reflection gets the same hallucination detection and defaults as
+        reflect_on_step().
+        
+        Args:
+            items: (step, result) pairs in execution order
+            
+        Returns:
+            One reflection per item, in the same order
+        """
+        if not self.enable_reflection or not self.reasoning_engine:
+            return [self.reflect_on_step(step, result) for step, result in items]
+        
+        try:
+            reflections = self.reasoning_engine.reflect_batch(items)
+            return [
+                self._finalize_reflection(reflection, result)
+                for reflection, (_, result) in zip(reflections, items)
+            ]
+        except Exception as e:
+            return [
+                {
+                    "overall_quality": 0.5,
+                    "correctness_score": 0.5,
+                    "completeness_score": 0.5,
+                    "confidence_score": 0.5,
+                    "hallucination_detected": False,
+                    "hallucination_indicators": [f"Reflection error: {str(e)}"],
+                    "issues": [f"Reflection error: {str(e)}"],
+                    "suggestions": ["Manual review recommended"],
+                    "requires_retry": False
+                }
+                for _ in items
+            ]
+    
+    def _finalize_reflection(self, reflection: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Add hallucination detection and fill in missing reflection fields."""
+        # Ensure required fields
+        if not isinstance(reflection, dict):
+            reflection = {"overall_quality": 0.5}
+        
+        # Add hallucination detection
+        reflection = self._detect_hallucination(reflection, result)
+        
+        # Set defaults
+        reflection.setdefault("overall_quality", reflection.get("correctness_score", 0.7))
+        reflection.setdefault("correctness_score", 0.7)
+        reflection.setdefault("completeness_score", 0.7)
+        reflection.setdefault("confidence_score", 0.7)
+        reflection.setdefault("hallucination_detected", False)
+        reflection.setdefault("hallucination_indicators", [])
+        reflection.setdefault("issues", [])
+        reflection.setdefault("suggestions", [])
+        reflection.setdefault("requires_retry", False)
+        
+        return reflection
+    
     def _detect_hallucination(
         self,
         reflection: Dict[str, Any],
@@ -516,11 +727,101 @@ class AgentLoop:
         
         return reflection
     
+    def _emit(
+        self,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]],
+        event: str,
+        payload: Dict[str, Any]
+    ) -> None:
+        """Forward a progress event to the caller; listener errors never break the loop."""
+        if on_event is None:
+            return
+        try:
+            on_event(event, payload)
+        except Exception as e:
+            logger.warning(f"Agent loop event listener failed on '{event}': {e}")
+    
+    def _prefetch(self, iterator: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Drain an iterator on a background thread, yielding items as they land.
+        
+        Keeps the plan stream flowing while the caller is busy executing the
+        steps that have already arrived. The producer runs in a copy of the
+        caller's context so prompts it builds are recorded on the same run.
+        """
+        items: "queue.Queue" = queue.Queue()
+        done = object()
+        
+        def _worker():
+            try:
+                for item in iterator:
+                    items.put(item)
+            except Exception as e:
+                logger.error(f"Streamed plan producer failed: {e}")
+            finally:
+                items.put(done)
+        
+        run_in_context = contextvars.copy_context().run
+        threading.Thread(target=run_in_context, args=(_worker,), name="plan-prefetch", daemon=True).start()
+        
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            yield item
+    
+    def _timed_plan_stream(
+        self,
+        steps: Iterator[Dict[str, Any]],
+        reference_plan: Optional[List[Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Pass streamed plan steps through, recording the planner's total time."""
+        started = time.perf_counter()
+        yield from steps
+        AGENT_PHASE_DURATION.labels("plan").observe(time.perf_counter() - started)
+        if self.plan_library is not None:
+            self.plan_library.record_generation(time.perf_counter() - started)
+        recorder = current_trace()
+        if recorder is not None:
+            source = "seeded_planner" if reference_plan else "planner"
+            recorder.add_span("plan", "planner", started, time.perf_counter(), {"source": source, "streamed": True},
+                              payload={"cached_plan": reference_plan} if reference_plan else None)
+    
+    def _remaining_steps(
+        self,
+        current_plan: List[Dict[str, Any]],
+        start: int,
+        source: Optional[Iterator[Dict[str, Any]]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield plan steps from ``start``, then any still arriving from ``source``.
+        
+        Streamed steps are appended to ``current_plan`` and the original plan as
+        they arrive so the final result always reports the full plan.
+        """
+        index = start
+        while True:
+            if index < len(current_plan):
+                yield current_plan[index]
+                index += 1
+                continue
+            if source is None:
+                return
+            step = next(source, None)
+            if step is None:
+                return
+            current_plan.append(step)
+            self._active_run().original_plan.append(step)
+    
     def execute(
         self,
         entity: str,
         task: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        db_session: Optional[Session] = None,
+        max_steps: Optional[int] = None,
+        trace: Optional[TraceRecorder] = None
     ) -> Dict[str, Any]:
         """
         Execute the complete agent loop workflow.
@@ -536,6 +837,14 @@ class AgentLoop:
             entity: Entity name or identifier
             task: The task to execute
             context: Optional execution context
+            on_event: Optional callback invoked as ``on_event(event, payload)``
+                while the loop runs. Events: ``plan_token`` (streamed planner
+                output), ``plan_step`` (a streamed plan step about to run),
+                ``plan``, ``step``, ``reflection`` and ``recommendation``.
+            db_session: Database session for this run (defaults to the loop's)
+            max_steps: Step limit for this run (defaults to the loop's)
+            trace: Recorder for this run's execution trace; one is created
+                (and the trace saved under trace_dir) when record_traces is on
             
         Returns:
             Complete execution result containing:
@@ -548,24 +857,84 @@ class AgentLoop:
                 - audit_log: Audit log-ready JSON
                 - metrics: Execution metrics
         """
+        run = RunContext(
+            db_session=db_session if db_session is not None else self.db_session,
+            max_steps=max_steps or self.max_steps
+        )
+        save_trace = trace is None and self.record_traces
+        if save_trace:
+            trace = TraceRecorder(config=self.trace_config(run.max_steps))
+        run.trace = trace
+        with run.activate():
+            if trace is None:
+                result = self._execute_run(run, entity, task, context, on_event)
+            else:
+                install_db_hooks()
+                with trace.span("run", "execute", entity=entity):
+                    result = self._execute_run(run, entity, task, context, on_event)
+                self._finish_trace(trace, result, save_trace)
+        self._last_run = RunContext(
+            metrics=copy.deepcopy(run.metrics),
+            prompt_metrics=copy.deepcopy(run.prompt_metrics)
+        )
+        return result
+    
+    def trace_config(self, max_steps: Optional[int] = None) -> Dict[str, Any]:
+        """Loop configuration stored with a trace, so ReplayEngine can rebuild the loop."""
+        engine = self.reasoning_engine
+        return {
+            "max_steps": max_steps or self.max_steps,
+            "enable_reflection": self.enable_reflection,
+            "reflection_mode": self.reflection_mode,
+            "reflection_window": self.reflection_window,
+            "speculative_reflection": self.speculative_reflection,
+            "pipeline_planning": self.pipeline_planning,
+            "enable_memory": self.enable_memory,
+            "tools": sorted(self.tools),
+            "model": getattr(engine, "model", None),
+            "mock_mode": bool(getattr(engine, "mock_mode", False)),
+            "enable_multi_pass": getattr(engine, "enable_multi_pass", True),
+            "max_reasoning_passes": getattr(engine, "max_reasoning_passes", 3),
+        }
+    
+    def _finish_trace(self, trace: TraceRecorder, result: Dict[str, Any], save: bool) -> None:
+        """Attach the run's outcome to its trace and, if asked, save it under trace_dir."""
+        risk = result.get("risk_assessment") or {}
+        execution_trace = trace.finish({
+            "success": result.get("success"),
+            "plan": [step.get("description") for step in (result.get("plan") or [])],
+            "revised_plan": [step.get("description") for step in (result.get("revised_plan") or [])],
+            "risk_level": risk.get("level"),
+            "recommendation": result.get("recommendation"),
+        })
+        metrics = result.setdefault("metrics", {})
+        metrics["trace_id"] = execution_trace.trace_id
+        if not save:
+            return
+        try:
+            path = execution_trace.save(Path(self.trace_dir) / f"{execution_trace.trace_id}.trace")
+            metrics["trace_path"] = str(path)
+        except Exception as e:
+            logger.warning(f"Failed to save execution trace {execution_trace.trace_id}: {e}")
+    
+    def _execute_run(
+        self,
+        run: RunContext,
+        entity: str,
+        task: str,
+        context: Optional[Dict[str, Any]],
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]]
+    ) -> Dict[str, Any]:
+        """Body of execute(); all state goes on ``run``, which is already active."""
         start_time = time.time()
         
         try:
-            # Reset state
-            self.current_step = 0
-            self.execution_history = []
-            self.original_plan = []
-            self.revised_plan = []
-            self.tool_outputs = []
-            self.reflections = []
-            self.reset_metrics()
-            
             # Load previous analyses from memory if enabled
             previous_analyses = []
-            if self.enable_memory and self.db_session:
+            if self.enable_memory and run.db_session:
                 try:
                     from backend.agentic_engine.memory import MemoryService
-                    memory_service = MemoryService(self.db_session)
+                    memory_service = MemoryService(run.db_session)
                     memories = memory_service.get_memories_for_entity(entity, limit=3)
                     previous_analyses = [
                         {
@@ -586,78 +955,166 @@ class AgentLoop:
                 context = {}
             if previous_analyses:
                 context["previous_analyses"] = previous_analyses
+            if run.trace is not None:
+                run.trace.set_input(entity, task, context)
             
-            # Step 1: Generate initial plan using LLM (includes previous_analyses in context)
-            plan = self.generate_plan(entity, task, context)
-            self.original_plan = plan.copy()
-            current_plan = plan.copy()
+            on_token = on_reset = None
+            if on_event is not None:
+                on_token = lambda delta: self._emit(on_event, "plan_token", {"delta": delta})
+                on_reset = lambda: self._emit(on_event, "plan_reset", {})
+            
+            # Step 1: Reuse a cached plan for this task profile, or generate one
+            # using LLM (includes previous_analyses, and a cached reference plan
+            # as a seed when there is one, in context).
+            # With a live model the plan is streamed and step 1 starts executing
+            # as soon as it is parsed, while later steps are still generated.
+            cached, cache_mode = self.plan_library.lookup(context) if self.plan_library is not None else (None, None)
+            planning_context = context
+            if cache_mode == "seed":
+                planning_context = {**context, "reference_plan": cached.plan}
+            run.metrics["plan_source"] = {"reuse": "cache", "seed": "seeded_planner"}.get(cache_mode, "planner")
+            
+            plan_source = None
+            if cache_mode == "reuse":
+                with trace_span("plan", "cache", source="cache", cache_hit=True) as span:
+                    plan = instantiate_plan(cached.plan, entity)
+                    if span is not None:
+                        span.payload = {"cached_plan": cached.plan}
+                run.original_plan = plan.copy()
+                current_plan = plan.copy()
+                self._emit(on_event, "plan", {"plan": plan, "revised": False})
+            elif self.pipeline_planning and self.reasoning_engine.can_stream_plan():
+                plan_source = self._prefetch(self._timed_plan_stream(
+                    self.reasoning_engine.stream_plan(entity, task, planning_context, on_token=on_token, on_reset=on_reset),
+                    cached.plan if cache_mode == "seed" else None
+                ))
+                current_plan = []
+            else:
+                plan_started = time.perf_counter()
+                with trace_span("plan", "planner", source=run.metrics["plan_source"]) as span:
+                    plan = self.generate_plan(entity, task, planning_context, on_token=on_token, on_reset=on_reset)
+                    if span is not None and cache_mode == "seed":
+                        span.payload = {"cached_plan": cached.plan}
+                AGENT_PHASE_DURATION.labels("plan").observe(time.perf_counter() - plan_started)
+                if self.plan_library is not None:
+                    self.plan_library.record_generation(time.perf_counter() - plan_started)
+                run.original_plan = plan.copy()
+                current_plan = plan.copy()
+                self._emit(on_event, "plan", {"plan": plan, "revised": False})
             
             # Step 2: Execute steps and reflect
             step_outputs = []
             max_replan_attempts = 2
             replan_count = 0
             
-            while len(step_outputs) < self.max_steps and replan_count <= max_replan_attempts:
-                # Execute remaining steps
-                for step in current_plan[len(step_outputs):]:
-                    if len(step_outputs) >= self.max_steps:
+            scheduler = _ReflectionScheduler(self) if self.enable_reflection else None
+            try:
+                while len(step_outputs) < run.max_steps and replan_count <= max_replan_attempts:
+                    # Execute remaining steps
+                    replan = False
+                    for step in self._remaining_steps(current_plan, len(step_outputs), plan_source):
+                        if len(step_outputs) >= run.max_steps:
+                            break
+                        if plan_source is not None:
+                            self._emit(on_event, "plan_step", step)
+                        
+                        # Execute step
+                        with trace_span("step", str(step.get("step_id")), description=step.get("description", "")) as span, \
+                                AGENT_PHASE_DURATION.labels("step").time():
+                            result = self.execute_step(step, context)
+                            if span is not None:
+                                span.attrs["status"] = result.get("status")
+                        step_outputs.append(result)
+                        self._emit(on_event, "step", result)
+                        
+                        # Collect tool outputs
+                        if result.get("tool_outputs"):
+                            run.tool_outputs.extend(result["tool_outputs"])
+                        
+                        # Reflect on step (or on a finished batch of steps)
+                        if scheduler is not None:
+                            low_quality = self._record_reflections(run, scheduler.add(step, result), on_event)
+                            replan = low_quality and replan_count < max_replan_attempts
+                            if replan:
+                                break
+                    
+                    if not replan and scheduler is not None:
+                        # Plan exhausted or step limit reached: score what is still pending
+                        low_quality = self._record_reflections(run, scheduler.flush(), on_event)
+                        replan = low_quality and replan_count < max_replan_attempts
+                    if not replan:
                         break
                     
-                    # Execute step
-                    result = self.execute_step(step, context)
-                    step_outputs.append(result)
+                    # Replan
+                    scheduler.reset()
+                    replan_count += 1
+                    run.metrics["replan_count"] += 1
                     
-                    # Collect tool outputs
-                    if result.get("tool_outputs"):
-                        self.tool_outputs.extend(result["tool_outputs"])
+                    # Finish the streamed plan before replacing it
+                    if plan_source is not None:
+                        run.original_plan.extend(plan_source)
+                        self._emit(on_event, "plan", {"plan": run.original_plan, "revised": False})
+                        plan_source = None
                     
-                    # Reflect on step
-                    if self.enable_reflection:
-                        reflection = self.reflect_on_step(step, result)
-                        self.reflections.append(reflection)
-                        
-                        # Check if replanning is needed
-                        quality_score = reflection.get("overall_quality", 0.7)
-                        
-                        if quality_score < self.replan_threshold and replan_count < max_replan_attempts:
-                            # Replan
-                            replan_count += 1
-                            self.metrics["replan_count"] += 1
-                            
-                            # Generate revised plan
-                            revised_plan = self.generate_plan(
-                                entity,
-                                task,
-                                {**(context or {}), "previous_attempts": step_outputs, "reflections": self.reflections}
-                            )
-                            self.revised_plan = revised_plan.copy()
-                            current_plan = revised_plan.copy()
-                            
-                            # Reset step outputs to start fresh with new plan
-                            step_outputs = []
-                            self.reflections = []
-                            break  # Break to restart with new plan
+                    # Generate revised plan
+                    with trace_span("plan", "replan", source="replan"), AGENT_PHASE_DURATION.labels("plan").time():
+                        revised_plan = self.generate_plan(
+                            entity,
+                            task,
+                            {**(context or {}), "previous_attempts": step_outputs, "reflections": run.reflections},
+                            on_token=on_token,
+                            on_reset=on_reset
+                        )
+                    run.revised_plan = revised_plan.copy()
+                    current_plan = revised_plan.copy()
+                    self._emit(on_event, "plan", {"plan": revised_plan, "revised": True})
+                    
+                    # Reset step outputs to start fresh with new plan
+                    step_outputs = []
+                    run.reflections = []
+            finally:
+                if scheduler is not None:
+                    scheduler.close()
+            
+            if plan_source is not None:
+                # Record steps still streaming in after max_steps was reached
+                run.original_plan.extend(plan_source)
+                self._emit(on_event, "plan", {"plan": run.original_plan, "revised": False})
             
             # Step 3: Generate final outputs
-            risk_assessment = self._generate_risk_assessment(step_outputs, self.reflections)
-            recommendation = self._generate_recommendation(step_outputs, self.reflections, risk_assessment)
-            audit_log = self._generate_audit_log(entity, task, context, step_outputs, self.reflections, risk_assessment, recommendation)
+            risk_assessment = self._generate_risk_assessment(step_outputs, run.reflections)
+            recommendation = self._generate_recommendation(step_outputs, run.reflections, risk_assessment)
+            self._emit(on_event, "recommendation", {
+                "recommendation": recommendation,
+                "risk_assessment": risk_assessment
+            })
+            audit_log = self._generate_audit_log(entity, task, context, step_outputs, run.reflections, risk_assessment, recommendation)
             
             # Calculate final metrics
             total_time = time.time() - start_time
-            final_metrics = self.get_metrics()
+            AGENT_PHASE_DURATION.labels("run").observe(total_time)
+            final_metrics = self.get_metrics(run)
             final_metrics["total_workflow_time"] = round(total_time, 3)
             final_metrics["replan_count"] = replan_count
             
             # Determine overall success
             success = all(r.get("status") == "success" for r in step_outputs) if step_outputs else False
             
+            # Feed the executed plan and its quality back into the plan cache
+            if self.plan_library is not None and success:
+                scores = [r.get("overall_quality", 0.7) for r in run.reflections] or [
+                    r.get("confidence", 0.0) for r in step_outputs
+                ]
+                self.plan_library.record(
+                    context, run.revised_plan or run.original_plan, sum(scores) / len(scores), entity
+                )
+            
             # Save to memory if enabled and task completed successfully
             memory_saved = False
-            if self.enable_memory and self.db_session and success:
+            if self.enable_memory and run.db_session and success:
                 try:
                     from backend.agentic_engine.memory import MemoryService
-                    memory_service = MemoryService(self.db_session)
+                    memory_service = MemoryService(run.db_session)
                     
                     # Create memory key from entity and task
                     memory_key = f"task_{entity}_{hash(task) % 10000}"
@@ -700,10 +1157,10 @@ class AgentLoop:
                     logger.warning(f"Failed to save memory: {e}")
             
             result = {
-                "plan": self.original_plan,
-                "revised_plan": self.revised_plan if self.revised_plan else None,
-                "tool_outputs": self.tool_outputs,
-                "reflections": self.reflections,
+                "plan": run.original_plan,
+                "revised_plan": run.revised_plan if run.revised_plan else None,
+                "tool_outputs": run.tool_outputs,
+                "reflections": run.reflections,
                 "risk_assessment": risk_assessment,
                 "recommendation": recommendation,
                 "audit_log": audit_log,
@@ -724,13 +1181,14 @@ class AgentLoop:
         
         except Exception as e:
             total_time = time.time() - start_time
+            AGENT_PHASE_DURATION.labels("run").observe(total_time)
             error_msg = str(e)
             
             return {
-                "plan": self.original_plan,
-                "revised_plan": self.revised_plan if self.revised_plan else None,
-                "tool_outputs": self.tool_outputs,
-                "reflections": self.reflections,
+                "plan": run.original_plan,
+                "revised_plan": run.revised_plan if run.revised_plan else None,
+                "tool_outputs": run.tool_outputs,
+                "reflections": run.reflections,
                 "risk_assessment": {"level": "UNKNOWN", "score": 0.0, "factors": []},
                 "recommendation": f"Execution failed: {error_msg}",
                 "audit_log": {
@@ -738,15 +1196,30 @@ class AgentLoop:
                     "error": error_msg,
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 },
-                "step_outputs": self.execution_history,
+                "step_outputs": run.execution_history,
                 "success": False,
                 "metrics": {
                     "total_workflow_time": round(total_time, 3),
                     "error": error_msg,
-                    **self.get_metrics()
+                    **self.get_metrics(run)
                 }
             }
     
+    def _record_reflections(
+        self,
+        run: RunContext,
+        reflected: Reflected,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]]
+    ) -> bool:
+        """Store and emit finished reflections; True if any scores below the replan threshold."""
+        low_quality = False
+        for _, result, reflection in reflected:
+            run.reflections.append(reflection)
+            self._emit(on_event, "reflection", {"step_id": result.get("step_id"), **reflection})
+            if reflection.get("overall_quality", 0.7) < self.replan_threshold:
+                low_quality = True
+        return low_quality
+    
     def _generate_risk_assessment(
         self,
         step_outputs: List[Dict[str, Any]],
@@ -838,14 +1311,15 @@ class AgentLoop:
         recommendation: str
     ) -> Dict[str, Any]:
         """Generate audit log-ready JSON."""
+        run = self._active_run()
         return {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "entity": entity,
             "task": task,
             "context": context or {},
             "plan": {
-                "original": self.original_plan,
-                "revised": self.revised_plan if self.revised_plan else None
+                "original": run.original_plan,
+                "revised": run.revised_plan if run.revised_plan else None
             },
             "execution": {
                 "step_count": len(step_outputs),
@@ -872,12 +1346,20 @@ class AgentLoop:
             ],
             "risk_assessment": risk_assessment,
             "recommendation": recommendation,
-            "metrics": self.get_metrics()
+            "metrics": self.get_metrics(run)
         }
     
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get current execution metrics."""
-        metrics = self.metrics.copy()
+    def get_metrics(self, run: Optional[RunContext] = None) -> Dict[str, Any]:
+        """
+        Get execution metrics of a run.
+        
+        Args:
+            run: Run to report on; defaults to the active run, else the last
+                run this loop finished. Prefer the ``metrics`` key of the
+                execute() result when the loop is shared between callers.
+        """
+        run = run or current_run() or self._last_run or RunContext()
+        metrics = run.metrics.copy()
         
         # Calculate derived metrics
         if metrics["step_times"]:
@@ -894,18 +1376,105 @@ class AgentLoop:
         else:
             metrics["success_rate"] = 0.0
         
+        # Prompt token usage per call type (plan / execute / reflect)
+        prompt_builder = getattr(self.reasoning_engine, "prompt_builder", None)
+        if prompt_builder is not None:
+            metrics["prompt_tokens"] = prompt_builder.get_metrics(run.prompt_metrics)
+        
+        # Tool routing decisions and learned tool value, across every run of this loop
+        if self.tool_router is not None:
+            metrics["tool_router"] = self.tool_router.get_metrics()
+        
+        # Tool result cache hits and tool time saved, across every run of this loop
+        if self.tool_cache is not None:
+            metrics["tool_cache"] = self.tool_cache.get_metrics()
+        
+        # Plan cache hit rate and planner time saved, across every run of this loop
+        if self.plan_library is not None:
+            metrics["plan_cache"] = self.plan_library.get_metrics()
+        
         return metrics
     
     def reset_metrics(self):
-        """Reset all metrics to initial state."""
-        self.metrics = {
-            "total_steps": 0,
-            "successful_steps": 0,
-            "failed_steps": 0,
-            "total_retries": 0,
-            "replan_count": 0,
-            "total_execution_time": 0.0,
-            "step_times": [],
-            "tools_used": [],
-            "errors_encountered": []
-        }
+        """Forget the last run's metrics and the prompt metrics recorded outside runs."""
+        self._last_run = None
+        prompt_builder = getattr(self.reasoning_engine, "prompt_builder", None)
+        if prompt_builder is not None:
+            prompt_builder.reset_metrics()
+
+
+class _ReflectionScheduler:
+    """
+    Decides when the steps of one run are reflected on.
+    
+    Per-step mode reflects on every step as it is added; batched mode queues
+    steps until ``reflection_window`` of them are waiting (or the plan ends)
+    and scores them with one reflect_on_steps() call. With speculative
+    reflection the call is submitted to a background worker instead, and its
+    results are handed back when the next step has been added, so reflection
+    latency overlaps with the next step's execution. A replan discards
+    queued and in-flight reflections via reset().
+    """
+    
+    def __init__(self, loop: AgentLoop):
+        self.loop = loop
+        self.window = 1 if loop.reflection_mode == "per_step" else max(0, loop.reflection_window)
+        self.pending: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        self.in_flight: Optional[Tuple[List[Tuple[Dict[str, Any], Dict[str, Any]]], Future]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def add(self, step: Dict[str, Any], result: Dict[str, Any]) -> Reflected:
+        """Queue an executed step; returns the reflections that finished meanwhile."""
+        self.pending.append((step, result))
+        reflected = self._collect()
+        if self.window and len(self.pending) >= self.window:
+            reflected.extend(self._dispatch())
+        return reflected
+    
+    def flush(self) -> Reflected:
+        """Wait for the in-flight call and reflect on every queued step."""
+        reflected = self._collect()
+        if self.pending:
+            items, self.pending = self.pending, []
+            reflected.extend(self._zip(items, self._reflect(items)))
+        return reflected
+    
+    def reset(self) -> None:
+        """Drop queued steps and ignore the in-flight call (after a replan)."""
+        self.pending = []
+        self.in_flight = None
+    
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+    
+    def _reflect(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        step_ids = [str(step.get("step_id")) for step, _ in items]
+        with trace_span("reflection", self.loop.reflection_mode, steps=step_ids), \
+                AGENT_PHASE_DURATION.labels("reflect").time():
+            if self.window == 1:
+                return [self.loop.reflect_on_step(step, result) for step, result in items]
+            return self.loop.reflect_on_steps(items)
+    
+    @staticmethod
+    def _zip(items: List[Tuple[Dict[str, Any], Dict[str, Any]]], reflections: List[Dict[str, Any]]) -> Reflected:
+        return [(step, result, reflection) for (step, result), reflection in zip(items, reflections)]
+    
+    def _dispatch(self) -> Reflected:
+        items, self.pending = self.pending, []
+        if not self.loop.speculative_reflection:
+            return self._zip(items, self._reflect(items))
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reflection")
+        # Same run context in the worker, so its prompts count towards this run
+        run_in_context = contextvars.copy_context().run
+        self.in_flight = (items, self._executor.submit(run_in_context, self._reflect, items))
+        return []
+    
+    def _collect(self) -> Reflected:
+        if self.in_flight is None:
+            return []
+        items, future = self.in_flight
+        self.in_flight = None
+        return self._zip(items, future.result())
+
@@ -3,11 +3,16 @@ Orchestrator Module - CLEAN VERSION
 
 Simple wrapper that delegates to AgentLoop.execute() - NO DUPLICATION
 All execution logic is handled by AgentLoop - orchestrator just initializes tools and transforms results.
+
+Orchestrators are re-entrant: per-run state lives on the AgentLoop's RunContext,
+so API routes share warm instances from a process-level pool (get_orchestrator)
+instead of rebuilding tools, prompts and the LLM client on every request.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Tuple
 import logging
 import random
+import threading
 from backend.config import settings
 from backend.agentic_engine.agent_loop import AgentLoop
 from backend.agentic_engine.tools.entity_tool import EntityTool
@@ -37,7 +42,8 @@ class AgenticAIOrchestrator:
         
         Args:
             config: Optional configuration dictionary
-            db_session: Optional database session for tools
+            db_session: Optional default database session for tools and memory;
+                pooled orchestrators have none and get one per run()
         """
         self.config = config or {}
         
@@ -61,7 +67,13 @@ class AgenticAIOrchestrator:
             enable_reflection=enable_reflection,
             enable_memory=enable_memory,
             tools=tools,  # Pass tools to agent_loop so it can use them directly
-            db_session=db_session  # Pass db_session for memory operations
+            db_session=db_session,  # Pass db_session for memory operations
+            reflection_mode=self.config.get("reflection_mode"),
+            reflection_window=self.config.get("reflection_window"),
+            speculative_reflection=self.config.get("speculative_reflection"),
+            enable_plan_cache=self.config.get("enable_plan_cache"),
+            enable_tool_router=self.config.get("enable_tool_router"),
+            enable_tool_cache=self.config.get("enable_tool_cache")
         )
         
         self.overall_timeout = settings.AGENTIC_OPERATION_TIMEOUT
@@ -70,7 +82,10 @@ class AgenticAIOrchestrator:
         self, 
         task: str, 
         context: Optional[Dict[str, Any]] = None,
-        max_iterations: int = 10
+        max_iterations: int = 10,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        db_session: Optional[Any] = None,
+        max_steps: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Run agentic workflow - DELEGATES to agent_loop.execute()
@@ -88,6 +103,11 @@ class AgenticAIOrchestrator:
             task: The compliance task to analyze
             context: Optional additional context
             max_iterations: Maximum iterations (passed to AgentLoop via max_steps)
+            on_event: Optional progress callback forwarded to AgentLoop.execute()
+                (plan, step, reflection, recommendation events)
+            db_session: Database session for this run's tools and memory
+                (defaults to the one given at construction)
+            max_steps: Step limit for this run (defaults to the configured one)
             
         Returns:
             Complete analysis result in API format:
@@ -96,7 +116,8 @@ class AgenticAIOrchestrator:
                 "step_outputs": List of step execution results,
                 "reflections": List of reflection evaluations,
                 "final_recommendation": Final recommendation string,
-                "confidence_score": Overall confidence (0.0-1.0)
+                "confidence_score": Overall confidence (0.0-1.0),
+                "metrics": AgentLoop metrics of this run (absent in demo mode)
             }
         """
         import time
@@ -104,7 +125,10 @@ class AgenticAIOrchestrator:
         
         # FAST DEMO MODE - return immediately for demos
         if max_iterations <= 2:
-            return self._generate_demo_response(task, context)
+            demo_response = self._generate_demo_response(task, context)
+            if on_event is not None:
+                self._replay_demo_events(demo_response, on_event)
+            return demo_response
         
         try:
             logger.info(f"Starting agentic workflow for task: {task}")
@@ -123,7 +147,10 @@ class AgenticAIOrchestrator:
             result = self.agent_loop.execute(
                 entity=entity_name,
                 task=task,
-                context=context
+                context=context,
+                on_event=on_event,
+                db_session=db_session,
+                max_steps=max_steps
             )
             
             elapsed = time.time() - start_time
@@ -149,7 +176,8 @@ class AgenticAIOrchestrator:
                 "step_outputs": result.get("step_outputs", []),
                 "reflections": reflections,
                 "final_recommendation": result.get("recommendation", ""),
-                "confidence_score": round(confidence, 2)
+                "confidence_score": round(confidence, 2),
+                "metrics": result.get("metrics")
             }
             
         except Exception as e:
@@ -164,6 +192,22 @@ class AgenticAIOrchestrator:
                 "error": str(e)
             }
 
+    def _replay_demo_events(
+        self,
+        demo_response: Dict[str, Any],
+        on_event: Callable[[str, Dict[str, Any]], None]
+    ) -> None:
+        """Emit the same progress events AgentLoop would for a demo response."""
+        try:
+            on_event("plan", {"plan": demo_response["plan"], "revised": False})
+            for step_output in demo_response["step_outputs"]:
+                on_event("step", step_output)
+            for reflection in demo_response["reflections"]:
+                on_event("reflection", reflection)
+            on_event("recommendation", {"recommendation": demo_response["final_recommendation"]})
+        except Exception as e:
+            logger.warning(f"Demo event listener failed: {e}")
+
     def _generate_demo_response(self, task: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate context-aware demo response that looks realistic and useful."""
         # Extract context
@@ -349,3 +393,38 @@ This task requires {'immediate executive review' if decision == 'ESCALATE' else
 This assessment has **{int(risk_score * 100)}% confidence** based on the information provided. A detailed audit may identify additional requirements.""",
             "confidence_score": round(risk_score, 2)
         }
+
+
+_pool: Dict[Tuple[Tuple[str, Any], ...], AgenticAIOrchestrator] = {}
+_pool_lock = threading.Lock()
+
+
+def get_orchestrator(config: Optional[Dict[str, Any]] = None) -> AgenticAIOrchestrator:
+    """
+    Shared orchestrator for a configuration, built on first use.
+    
+    Pooled orchestrators have no database session of their own; pass one to
+    run(db_session=...) and a per-request step limit as run(max_steps=...)
+    rather than in the config, which is the pool key.
+    
+    Args:
+        config: Orchestrator configuration (hashable values only)
+        
+    Returns:
+        The process-wide AgenticAIOrchestrator for this configuration
+    """
+    key = tuple(sorted((config or {}).items()))
+    orchestrator = _pool.get(key)
+    if orchestrator is None:
+        with _pool_lock:
+            orchestrator = _pool.get(key)
+            if orchestrator is None:
+                orchestrator = AgenticAIOrchestrator(config=dict(key))
+                _pool[key] = orchestrator
+    return orchestrator
+
+
+def clear_orchestrator_pool() -> None:
+    """Drop pooled orchestrators, e.g. after changing LLM settings."""
+    with _pool_lock:
+        _pool.clear()
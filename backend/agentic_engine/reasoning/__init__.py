@@ -5,8 +5,23 @@ Provides advanced reasoning capabilities including planning, execution, and refl
 """
 
 from .reasoning_engine import ReasoningEngine
+from .incremental_json import IncrementalJSONArrayParser, iter_json_array
+from .prompt_builder import PromptBuilder, PromptTemplate, TokenCounter
+from .pass_controller import PassController, StepComplexityClassifier, needed_more_passes
+from .plan_library import PlanEntry, PlanLibrary, plan_key
 
 __all__ = [
     "ReasoningEngine",
+    "IncrementalJSONArrayParser",
+    "iter_json_array",
+    "PromptBuilder",
+    "PromptTemplate",
+    "TokenCounter",
+    "PassController",
+    "StepComplexityClassifier",
+    "needed_more_passes",
+    "PlanEntry",
+    "PlanLibrary",
+    "plan_key",
 ]
 
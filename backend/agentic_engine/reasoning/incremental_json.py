@@ -0,0 +1,192 @@
+"""
+Incremental JSON Array Parser
+
+Parses a top-level JSON array that arrives in arbitrary text chunks (e.g. a
+streamed LLM completion) and hands back each element as soon as it closes,
+so callers can act on step 1 of a plan while steps 2-7 are still being
+generated.
+"""
+
+import json
+import logging
+from typing import Any, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONArrayParser:
+    """
+    Streaming parser for a single top-level JSON array.
+
+    Text before the opening bracket (prose, markdown code fences) and after the
+    closing bracket is ignored. Each element is decoded with ``json.loads`` the
+    moment its closing brace/bracket/quote arrives; elements that fail to decode
+    are skipped and recorded in ``errors`` rather than aborting the stream.
+
+    Usage:
+        parser = IncrementalJSONArrayParser()
+        for chunk in stream:
+            for step in parser.feed(chunk):
+                handle(step)
+        parser.close()
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0  # Next unscanned index into _buffer
+        self._started = False  # Opening '[' seen
+        self._element_start: Optional[int] = None
+        self._depth = 0  # Nesting depth inside the current element
+        self._in_string = False
+        self._escape = False
+        self._scalar = False  # Current element is a bare number/true/false/null
+        self.complete = False  # Closing ']' seen
+        self.closed = False
+        self.errors: List[str] = []
+        self.elements_emitted = 0
+
+    @property
+    def truncated(self) -> bool:
+        """True once closed without ever seeing the array's closing bracket."""
+        return self.closed and not self.complete
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume the next chunk of text.
+
+        Args:
+            chunk: Next piece of the streamed document
+
+        Returns:
+            Elements completed by this chunk, in order (possibly empty)
+        """
+        if self.complete or self.closed or not chunk:
+            return []
+
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer) and not self.complete:
+            ch = buffer[i]
+
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                i += 1
+                continue
+
+            if self._element_start is None:
+                # Between elements at the top level of the array
+                if ch in _WHITESPACE or ch == ",":
+                    pass
+                elif ch == "]":
+                    self.complete = True
+                elif ch == "}":
+                    self.errors.append(f"Unexpected '{ch}' between array elements")
+                else:
+                    self._element_start = i
+                    if ch in "{[":
+                        self._depth = 1
+                    elif ch == '"':
+                        self._in_string = True
+                    else:
+                        self._scalar = True
+                i += 1
+                continue
+
+            if self._scalar:
+                if ch == "," or ch == "]":
+                    self._emit(buffer[self._element_start:i].strip(), completed)
+                    if ch == "]":
+                        self.complete = True
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        # Top-level string element
+                        self._emit(buffer[self._element_start:i + 1], completed)
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buffer[self._element_start:i + 1], completed)
+            i += 1
+
+        # Drop consumed text so long streams do not rescan or grow unbounded
+        keep_from = self._element_start if self._element_start is not None else i
+        self._buffer = buffer[keep_from:]
+        if self._element_start is not None:
+            self._element_start = 0
+        self._pos = i - keep_from
+        return completed
+
+    def close(self) -> List[Any]:
+        """
+        Signal end of stream.
+
+        A trailing scalar element without a closing bracket is still returned;
+        a partially received object/array/string is discarded and recorded in
+        ``errors``.
+
+        Returns:
+            Any element completed by end of stream (possibly empty)
+        """
+        completed = []
+        if self.closed:
+            return completed
+        if not self.complete and self._element_start is not None:
+            if self._scalar:
+                self._emit(self._buffer[self._element_start:].strip(), completed)
+            else:
+                self.errors.append("Stream ended inside an array element")
+        if self._started and not self.complete:
+            logger.debug("Incremental JSON stream truncated before closing bracket")
+        self.closed = True
+        return completed
+
+    def _emit(self, text: str, completed: List[Any]) -> None:
+        """Decode one element's text and reset element state."""
+        self._element_start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._scalar = False
+        try:
+            completed.append(json.loads(text))
+            self.elements_emitted += 1
+        except (json.JSONDecodeError, ValueError) as e:
+            self.errors.append(f"Malformed array element skipped: {e}")
+            logger.debug(f"Skipping malformed streamed element: {text[:200]}")
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Yield elements of a JSON array streamed as text chunks.
+
+    Args:
+        chunks: Iterable of text fragments making up one JSON array
+
+    Yields:
+        Each decoded element as soon as it is complete
+    """
+    parser = IncrementalJSONArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
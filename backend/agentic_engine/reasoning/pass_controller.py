@@ -0,0 +1,237 @@
+"""
+Pass Controller Module
+
+Decides which steps get multi-pass reasoning and when to stop passing.
+
+StepComplexityClassifier replaces the old keyword check (any of "analyze",
+"assess", ... made nearly every step complex) with a small logistic model over
+step and context features. Its weights ship as configured defaults, can be
+loaded from a JSON file (AGENTIC_COMPLEXITY_MODEL_PATH) and can be refitted
+from recorded pass histories with fit().
+
+PassController stops a multi-pass step as soon as another pass is unlikely to
+change the answer: the first pass is already confident, confidence and
+findings have converged between consecutive passes, or a refinement pass
+did not raise confidence.
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+STRONG_KEYWORDS = (
+    "comprehensive", "multiple", "complex", "critical", "high-risk", "cross-border", "conflict", "detailed"
+)
+ANALYSIS_KEYWORDS = ("analyze", "analyse", "assess", "evaluate")
+SCOPE_KEYWORDS = ("regulat", "jurisdiction", "legal", "obligation")
+ROUTINE_KEYWORDS = ("check", "list", "identify", "review", "consolidate", "summarize", "generate")
+
+FEATURES = (
+    "strong_keywords",
+    "analysis_verb",
+    "regulatory_scope",
+    "routine_verb",
+    "extra_jurisdictions",
+    "regulated_entity",
+    "prior_violations",
+    "personal_data",
+)
+
+# Logit weights; a step is complex when sigmoid(bias + w.x) >= threshold
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "bias": -2.0,
+    "strong_keywords": 1.5,
+    "analysis_verb": 0.75,
+    "regulatory_scope": 0.75,
+    "routine_verb": -1.0,
+    "extra_jurisdictions": 0.75,
+    "regulated_entity": 0.5,
+    "prior_violations": 0.75,
+    "personal_data": 0.25,
+}
+
+
+def _contains_any(text: str, keywords: Iterable[str]) -> int:
+    return int(any(keyword in text for keyword in keywords))
+
+
+def step_features(step: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Numeric features of a plan step and its run context.
+
+    Args:
+        step: Plan step (description is used)
+        context: Run context with optional ``entity`` details
+
+    Returns:
+        Feature values keyed by FEATURES
+    """
+    description = str(step.get("description", "")).lower()
+    entity = (context or {}).get("entity") or {}
+    if not isinstance(entity, dict):
+        entity = {}
+    locations = entity.get("locations") or []
+    violations = entity.get("previous_violations") or 0
+    return {
+        "strong_keywords": float(min(2, sum(keyword in description for keyword in STRONG_KEYWORDS))),
+        "analysis_verb": float(_contains_any(description, ANALYSIS_KEYWORDS)),
+        "regulatory_scope": float(_contains_any(description, SCOPE_KEYWORDS)),
+        "routine_verb": float(_contains_any(description.split(" ", 1)[0], ROUTINE_KEYWORDS)),
+        "extra_jurisdictions": float(min(3, max(0, len(locations) - 1))) if isinstance(locations, list) else 0.0,
+        "regulated_entity": float(bool(entity.get("is_regulated"))),
+        "prior_violations": float(isinstance(violations, (int, float)) and violations > 0),
+        "personal_data": float(bool(entity.get("has_personal_data"))),
+    }
+
+
+class StepComplexityClassifier:
+    """
+    Logistic model scoring how much a step benefits from multi-pass reasoning.
+
+    Usage:
+        classifier = StepComplexityClassifier.from_settings()
+        classifier.is_complex(step, context)
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, threshold: float = 0.5):
+        """
+        Args:
+            weights: Logit weights per feature plus ``bias`` (missing keys
+                fall back to DEFAULT_WEIGHTS)
+            threshold: Minimum probability for a step to be complex
+        """
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.threshold = threshold
+
+    @classmethod
+    def from_settings(cls) -> "StepComplexityClassifier":
+        """Classifier with weights from AGENTIC_COMPLEXITY_MODEL_PATH, if set and readable."""
+        weights = None
+        path = settings.AGENTIC_COMPLEXITY_MODEL_PATH
+        if path:
+            try:
+                weights = json.loads(Path(path).read_text())["weights"]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Could not load complexity model from {path}, using defaults: {e}")
+        return cls(weights, threshold=settings.AGENTIC_COMPLEXITY_THRESHOLD)
+
+    def score(self, step: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> float:
+        """Probability (0-1) that the step needs more than one pass."""
+        features = step_features(step, context)
+        logit = self.weights["bias"] + sum(self.weights[name] * value for name, value in features.items())
+        return 1.0 / (1.0 + math.exp(-logit))
+
+    def is_complex(self, step: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> bool:
+        return self.score(step, context) >= self.threshold
+
+    def fit(
+        self,
+        samples: Sequence[Tuple[Dict[str, Any], Optional[Dict[str, Any]], bool]],
+        epochs: int = 500,
+        learning_rate: float = 0.1,
+        l2: float = 0.01
+    ) -> "StepComplexityClassifier":
+        """
+        Refit the weights by logistic regression.
+
+        Args:
+            samples: (step, context, needed_more_passes) triples, e.g. labelled
+                from recorded multi-pass runs with needed_more_passes()
+            epochs: Full-batch gradient descent iterations
+            learning_rate: Gradient step size
+            l2: L2 penalty on feature weights (not the bias)
+
+        Returns:
+            self, with updated weights
+        """
+        if not samples:
+            return self
+        x = np.array([[step_features(step, context)[name] for name in FEATURES] for step, context, _ in samples])
+        y = np.array([float(label) for _, _, label in samples])
+        w = np.array([self.weights[name] for name in FEATURES])
+        b = self.weights["bias"]
+        for _ in range(epochs):
+            p = 1.0 / (1.0 + np.exp(-(x @ w + b)))
+            error = p - y
+            w -= learning_rate * (x.T @ error / len(y) + l2 * w)
+            b -= learning_rate * float(error.mean())
+        self.weights = {"bias": round(b, 4), **{name: round(float(v), 4) for name, v in zip(FEATURES, w)}}
+        return self
+
+    def save(self, path: str) -> None:
+        """Write the weights in the format from_settings() reads."""
+        Path(path).write_text(json.dumps({"weights": self.weights, "threshold": self.threshold}, indent=2))
+
+
+def findings_overlap(first: Iterable[Any], second: Iterable[Any]) -> float:
+    """Jaccard similarity of two findings lists (1.0 when both are empty)."""
+    a = {str(item).strip().lower() for item in first}
+    b = {str(item).strip().lower() for item in second}
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def needed_more_passes(pass_results: List[Dict[str, Any]], controller: Optional["PassController"] = None) -> bool:
+    """Training label: whether later passes moved the answer away from pass 1."""
+    if len(pass_results) < 2:
+        return False
+    controller = controller or PassController.from_settings()
+    return not controller.converged(pass_results[0], pass_results[-1])
+
+
+class PassController:
+    """
+    Stop rule for multi-pass step reasoning.
+
+    Stops after the first pass when its confidence is at least
+    ``confident_exit``. After a later pass, compared with the previous one,
+    stops when confidence moved by at most ``confidence_epsilon`` and
+    findings overlap by at least ``min_findings_overlap`` (converged), or
+    when confidence rose by no more than ``confidence_epsilon`` (no gain).
+    """
+
+    def __init__(self, confident_exit: float = 0.85, confidence_epsilon: float = 0.05, min_findings_overlap: float = 0.5):
+        self.confident_exit = confident_exit
+        self.confidence_epsilon = confidence_epsilon
+        self.min_findings_overlap = min_findings_overlap
+
+    @classmethod
+    def from_settings(cls) -> "PassController":
+        return cls(
+            confident_exit=settings.AGENTIC_PASS_CONFIDENT_EXIT,
+            confidence_epsilon=settings.AGENTIC_PASS_CONFIDENCE_EPSILON,
+            min_findings_overlap=settings.AGENTIC_PASS_FINDINGS_OVERLAP,
+        )
+
+    def converged(self, previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+        """Whether two consecutive passes agree on confidence and findings."""
+        delta = abs(current.get("confidence", 0.0) - previous.get("confidence", 0.0))
+        overlap = findings_overlap(previous.get("findings", []), current.get("findings", []))
+        return delta <= self.confidence_epsilon and overlap >= self.min_findings_overlap
+
+    def stop_reason(self, pass_results: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Reason to stop after the latest pass, or None to run another.
+
+        Returns:
+            "confident", "converged" or "no_gain", or None
+        """
+        if not pass_results:
+            return None
+        if len(pass_results) == 1:
+            return "confident" if pass_results[0].get("confidence", 0.0) >= self.confident_exit else None
+        previous, current = pass_results[-2], pass_results[-1]
+        if self.converged(previous, current):
+            return "converged"
+        if current.get("confidence", 0.0) - previous.get("confidence", 0.0) <= self.confidence_epsilon:
+            return "no_gain"
+        return None
@@ -0,0 +1,304 @@
+"""
+Plan Library Module
+
+Caches plans from successful runs so similar tasks skip (or shortcut) plan
+generation.
+
+Plans are keyed on the task category, the set of jurisdictions the entity
+operates in and the entity type; for one such profile the planner returns
+nearly the same 3-7 steps every time. A stored plan is normalized (step ids
+renumbered, per-run fields dropped, the entity name replaced with a
+placeholder) and carries a quality score taken from the run that produced it.
+
+On lookup the best entry for the key is ranked by quality decayed with age
+(half-life AGENTIC_PLAN_CACHE_HALF_LIFE_HOURS). At or above
+AGENTIC_PLAN_CACHE_REUSE_QUALITY the plan is reused directly and no planner
+call is made; below that it is handed to the planner as a few-shot reference
+plan. Every later run on a plan feeds its quality back into the entry, so
+plans that stop working age out alongside plans that are simply old.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.telemetry.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+PlanKey = Tuple[str, Tuple[str, ...], str]
+
+ENTITY_PLACEHOLDER = "<ENTITY>"
+PLAN_STEP_FIELDS = ("description", "rationale", "expected_outcome", "tools")
+
+
+def plan_key(context: Optional[Dict[str, Any]]) -> Optional[PlanKey]:
+    """
+    Cache key of a run context: (task category, jurisdictions, entity type).
+
+    Returns:
+        The key, or None when the context has no task category (such runs
+        are neither cached nor looked up)
+    """
+    context = context or {}
+    task = context.get("task") if isinstance(context.get("task"), dict) else {}
+    entity = context.get("entity") if isinstance(context.get("entity"), dict) else {}
+    category = task.get("task_category") or task.get("category")
+    if not category:
+        return None
+    locations = entity.get("locations") or entity.get("jurisdictions") or []
+    if isinstance(locations, str):
+        locations = [locations]
+    jurisdictions = tuple(sorted({str(location).strip().upper() for location in locations if location}))
+    entity_type = str(entity.get("entity_type") or "UNKNOWN").upper()
+    return str(category).upper(), jurisdictions, entity_type
+
+
+def normalize_plan(plan: List[Dict[str, Any]], entity: str = "") -> List[Dict[str, Any]]:
+    """Entity-independent copy of a plan: renumbered steps, plan fields only."""
+    # Whole-word matches only, so "Acme" is not replaced inside "Acmeville"
+    pattern = re.compile(rf"(?<!\w){re.escape(entity)}(?!\w)") if entity else None
+    normalized = []
+    for index, step in enumerate(step for step in plan if isinstance(step, dict)):
+        entry = {"step_id": f"step_{index + 1}"}
+        for name in PLAN_STEP_FIELDS:
+            if name not in step:
+                continue
+            value = step[name]
+            if pattern is not None and isinstance(value, str):
+                value = pattern.sub(ENTITY_PLACEHOLDER, value)
+            entry[name] = value
+        normalized.append(entry)
+    return normalized
+
+
+def instantiate_plan(plan: List[Dict[str, Any]], entity: str) -> List[Dict[str, Any]]:
+    """Fill the entity placeholder of a normalized plan back in."""
+    return [
+        {k: v.replace(ENTITY_PLACEHOLDER, entity) if isinstance(v, str) else v for k, v in step.items()}
+        for step in plan
+    ]
+
+
+def _fingerprint(plan: List[Dict[str, Any]]) -> str:
+    descriptions = [str(step.get("description", "")).strip().lower() for step in plan]
+    return hashlib.sha1(json.dumps(descriptions).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class PlanEntry:
+    """A cached plan and its running quality."""
+
+    key: PlanKey
+    plan: List[Dict[str, Any]]
+    quality: float
+    runs: int = 1
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+
+
+class PlanLibrary:
+    """
+    Thread-safe in-process cache of normalized plans.
+
+    Usage:
+        library = PlanLibrary.from_settings()
+        entry, mode = library.lookup(context)   # mode: "reuse", "seed" or None
+        ...
+        library.record(context, plan, quality, entity)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        plans_per_key: int = 3,
+        min_quality: float = 0.8,
+        reuse_quality: float = 0.85,
+        half_life_hours: float = 72.0,
+        evict_below: float = 0.4,
+        quality_smoothing: float = 0.3
+    ):
+        """
+        Args:
+            max_entries: Plans kept overall; the lowest ranked are evicted
+            plans_per_key: Plans kept per (category, jurisdictions, entity type)
+            min_quality: Runs below this quality are not stored
+            reuse_quality: Decayed score needed to reuse a plan without
+                calling the planner (lower scores only seed the planner)
+            half_life_hours: Time since last use at which an entry's score
+                has halved (0 disables decay)
+            evict_below: Entries whose decayed score drops below this are evicted
+            quality_smoothing: Weight of a new run in an entry's running quality
+        """
+        self.max_entries = max_entries
+        self.plans_per_key = plans_per_key
+        self.min_quality = min_quality
+        self.reuse_quality = reuse_quality
+        self.half_life_s = half_life_hours * 3600.0
+        self.evict_below = evict_below
+        self.quality_smoothing = quality_smoothing
+        self._entries: Dict[PlanKey, Dict[str, PlanEntry]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "lookups": 0, "reused": 0, "seeded": 0, "misses": 0,
+            "stored": 0, "updated": 0, "evicted": 0,
+            "plans_generated": 0, "generation_s_total": 0.0, "generation_s_saved": 0.0,
+        }
+
+    @classmethod
+    def from_settings(cls) -> "PlanLibrary":
+        return cls(
+            max_entries=settings.AGENTIC_PLAN_CACHE_MAX_ENTRIES,
+            min_quality=settings.AGENTIC_PLAN_CACHE_MIN_QUALITY,
+            reuse_quality=settings.AGENTIC_PLAN_CACHE_REUSE_QUALITY,
+            half_life_hours=settings.AGENTIC_PLAN_CACHE_HALF_LIFE_HOURS,
+        )
+
+    def score(self, entry: PlanEntry, now: Optional[float] = None) -> float:
+        """Entry quality decayed by time since it was last used."""
+        age = max(0.0, (now or time.time()) - entry.last_used)
+        if self.half_life_s <= 0:
+            return entry.quality
+        return entry.quality * 0.5 ** (age / self.half_life_s)
+
+    def lookup(self, context: Optional[Dict[str, Any]]) -> Tuple[Optional[PlanEntry], Optional[str]]:
+        """
+        Best cached plan for a run context.
+
+        Returns:
+            (entry, mode) with mode "reuse" (run the plan as is) or "seed"
+            (give it to the planner as a reference), or (None, None)
+        """
+        key = plan_key(context)
+        if key is None:
+            return None, None
+        now = time.time()
+        with self._lock:
+            self._stats["lookups"] += 1
+            self._evict(now)
+            candidates = list(self._entries.get(key, {}).values())
+            if not candidates:
+                self._stats["misses"] += 1
+                CACHE_REQUESTS.labels("plan", "miss").inc()
+                return None, None
+            entry = max(candidates, key=lambda candidate: self.score(candidate, now))
+            if self.score(entry, now) >= self.reuse_quality:
+                self._stats["reused"] += 1
+                # Credit the planner time this hit avoided (running mean per generated plan)
+                if self._stats["plans_generated"]:
+                    self._stats["generation_s_saved"] += (
+                        self._stats["generation_s_total"] / self._stats["plans_generated"]
+                    )
+                mode = "reuse"
+            else:
+                self._stats["seeded"] += 1
+                mode = "seed"
+            CACHE_REQUESTS.labels("plan", "hit" if mode == "reuse" else "seed").inc()
+            entry.last_used = now
+            return entry, mode
+
+    def record(
+        self,
+        context: Optional[Dict[str, Any]],
+        plan: List[Dict[str, Any]],
+        quality: float,
+        entity: str = ""
+    ) -> bool:
+        """
+        Feed a finished run back into the library.
+
+        A plan already cached for the key has its running quality updated
+        (whatever the score); a new plan is stored only when ``quality``
+        reaches min_quality.
+
+        Returns:
+            True if the plan is in the library afterwards
+        """
+        key = plan_key(context)
+        normalized = normalize_plan(plan, entity)
+        if key is None or not normalized:
+            return False
+        fingerprint = _fingerprint(normalized)
+        now = time.time()
+        with self._lock:
+            plans = self._entries.setdefault(key, {})
+            entry = plans.get(fingerprint)
+            if entry is not None:
+                entry.quality += self.quality_smoothing * (quality - entry.quality)
+                entry.runs += 1
+                entry.last_used = now
+                self._stats["updated"] += 1
+            elif quality >= self.min_quality:
+                plans[fingerprint] = PlanEntry(key=key, plan=normalized, quality=quality, created_at=now, last_used=now)
+                self._stats["stored"] += 1
+            if not plans:
+                del self._entries[key]
+            self._evict(now)
+            return fingerprint in self._entries.get(key, {})
+
+    def record_generation(self, seconds: float) -> None:
+        """Record how long the planner took, to estimate time saved by reuse."""
+        with self._lock:
+            self._stats["plans_generated"] += 1
+            self._stats["generation_s_total"] += seconds
+
+    def _evict(self, now: float) -> None:
+        """Drop entries scoring below evict_below, then trim per key and overall (lock held)."""
+        ranked = []
+        for key in list(self._entries):
+            plans = self._entries[key]
+            for fingerprint, entry in list(plans.items()):
+                if self.score(entry, now) < self.evict_below:
+                    del plans[fingerprint]
+                    self._stats["evicted"] += 1
+            keep = sorted(plans.items(), key=lambda item: self.score(item[1], now), reverse=True)
+            for fingerprint, _ in keep[self.plans_per_key:]:
+                del plans[fingerprint]
+                self._stats["evicted"] += 1
+            if not plans:
+                del self._entries[key]
+                continue
+            ranked.extend((self.score(entry, now), key, fingerprint) for fingerprint, entry in plans.items())
+        if len(ranked) > self.max_entries:
+            ranked.sort()
+            for _, key, fingerprint in ranked[:len(ranked) - self.max_entries]:
+                del self._entries[key][fingerprint]
+                if not self._entries[key]:
+                    del self._entries[key]
+                self._stats["evicted"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(plans) for plans in self._entries.values())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit rate, reuse/seed counts and planner time saved."""
+        with self._lock:
+            stats = dict(self._stats)
+            entries = sum(len(plans) for plans in self._entries.values())
+        lookups = stats["lookups"]
+        generated = stats["plans_generated"]
+        return {
+            "entries": entries,
+            "lookups": lookups,
+            "reused": stats["reused"],
+            "seeded": stats["seeded"],
+            "misses": stats["misses"],
+            "stored": stats["stored"],
+            "updated": stats["updated"],
+            "evicted": stats["evicted"],
+            "hit_rate": round((stats["reused"] + stats["seeded"]) / lookups, 3) if lookups else 0.0,
+            "reuse_rate": round(stats["reused"] / lookups, 3) if lookups else 0.0,
+            "avg_plan_generation_ms": round(stats["generation_s_total"] / generated * 1000, 1) if generated else 0.0,
+            "plan_generation_ms_saved": round(stats["generation_s_saved"] * 1000, 1),
+        }
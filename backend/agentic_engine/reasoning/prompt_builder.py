@@ -0,0 +1,553 @@
+"""
+Prompt Builder Module
+
+Precompiles the reasoning prompt templates once, counts prompt tokens with
+tiktoken, and compacts context payloads (minified JSON, trimmed histories,
+summarised prior attempts) so every call stays inside a per-call-type token
+budget. Prompt-token metrics are recorded for every prompt built, on the
+active agent run when there is one (see run_context) and on the builder
+otherwise.
+"""
+
+import json
+import logging
+import threading
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.agentic_engine.run_context import current_run
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is in requirements.txt
+    tiktoken = None
+
+# Rough chars-per-token ratio for English/JSON when no BPE encoding is available
+_CHARS_PER_TOKEN = 4
+_DEFAULT_ENCODING = "cl100k_base"
+_encoding_cache: Dict[str, Any] = {}
+_encoding_lock = threading.Lock()
+
+# History keys that grow with every replan and how many recent entries to keep
+_HISTORY_LIMITS = {
+    "previous_attempts": 3,
+    "reflections": 3,
+    "previous_analyses": 3,
+}
+# Progressive compaction passes: (max string length, max list length)
+_COMPACTION_PASSES = [(4000, 20), (2000, 10), (1000, 5), (500, 3), (200, 2), (80, 1)]
+_TRUNCATION_MARKER = "...[truncated]"
+
+
+PLANNER_BODY = """
+
+Entity/Subject: {entity}
+
+Task: {task}{context}
+
+Please generate a strategic plan with 3-7 steps. Each step should include:
+- step_id: a unique identifier (e.g., "step_1", "step_2", ...)
+- description: a clear description of what needs to be done
+- rationale: why this step is important
+- expected_outcome: what should result from this step
+
+Respond ONLY with a valid JSON array of steps. Example format:
+[
+  {{
+    "step_id": "step_1",
+    "description": "Analyze requirements",
+    "rationale": "Understand what needs to be evaluated",
+    "expected_outcome": "Clear understanding of requirements"
+  }},
+  ...
+]
+
+Respond with JSON only, no other text."""
+
+EXECUTOR_BODY = """
+
+Step to Execute:
+ID: {step_id}
+Description: {description}
+Rationale: {rationale}{context}
+
+Please execute this step and provide:
+1. The main output/result of executing this step
+2. Key findings or insights discovered
+3. Any risks or concerns identified
+4. Your confidence in this execution (0.0 to 1.0)
+
+Respond ONLY with valid JSON in this format:
+{{
+  "output": "Main result of the step execution",
+  "findings": ["Finding 1", "Finding 2", ...],
+  "risks": ["Risk 1", "Risk 2", ...],
+  "confidence": 0.85
+}}
+
+Respond with JSON only, no other text."""
+
+EXECUTOR_PASS_BODY = """
+
+Step to Execute (Pass {pass_num}/{max_passes}):
+ID: {step_id}
+Description: {description}
+Rationale: {rationale}{context}{previous_pass}
+
+This is reasoning pass {pass_num} of {max_passes}.
+Please {action} this step and provide:
+1. The main output/result
+2. Key findings or insights
+3. Any risks or concerns
+4. Your confidence (0.0 to 1.0)
+
+Respond ONLY with valid JSON: {{"output": "...", "findings": [...], "risks": [...], "confidence": 0.85}}"""
+
+REFLECTION_BODY = """
+
+Step That Was Executed:
+{step}
+
+Execution Output:
+{output}
+
+Please critically evaluate this execution on the following criteria:
+
+1. Correctness: Is the output factually correct and logically sound?
+2. Completeness: Does it fully address the step requirements?
+3. Compliance Risk: Are there any compliance concerns or risks?
+4. Hallucination Risk: Any signs of fabricated or uncertain information?
+5. Missing Data: What additional information might be needed?
+
+Provide your evaluation in JSON format with these exact fields:
+{{
+  "correctness_score": 0.0 to 1.0,
+  "completeness_score": 0.0 to 1.0,
+  "overall_quality": 0.0 to 1.0,
+  "confidence_score": 0.0 to 1.0,
+  "issues": ["Issue 1", "Issue 2", ...],
+  "suggestions": ["Suggestion 1", "Suggestion 2", ...],
+  "requires_retry": true or false,
+  "missing_data": ["Missing item 1", "Missing item 2", ...]
+}}
+
+Respond with JSON only, no other text."""
+
+REFLECTION_BATCH_BODY = """
+
+Step Outputs to Evaluate (JSON list of {{"step_id", "step", "output"}}):
+{steps}
+
+Please critically evaluate EACH step's output on the following criteria:
+
+1. Correctness: Is the output factually correct and logically sound?
+2. Completeness: Does it fully address the step requirements?
+3. Compliance Risk: Are there any compliance concerns or risks?
+4. Hallucination Risk: Any signs of fabricated or uncertain information?
+5. Missing Data: What additional information might be needed?
+
+Provide your evaluation in JSON format, one entry per step in the same order, with these exact fields:
+{{
+  "reflections": [
+    {{
+      "step_id": "step_1",
+      "correctness_score": 0.0 to 1.0,
+      "completeness_score": 0.0 to 1.0,
+      "overall_quality": 0.0 to 1.0,
+      "confidence_score": 0.0 to 1.0,
+      "issues": ["Issue 1", ...],
+      "suggestions": ["Suggestion 1", ...],
+      "requires_retry": true or false,
+      "missing_data": ["Missing item 1", ...]
+    }}
+  ]
+}}
+
+Respond with JSON only, no other text."""
+
+# name -> (call type, prompt file key, fallback header, body, payload fields)
+# Payload fields hold JSON that is compacted to the budget; a label wraps the
+# payload in a "\n\n<label>:\n" section that is omitted when the payload is empty.
+TEMPLATE_SPECS: Dict[str, Tuple[str, str, str, str, Dict[str, Optional[str]]]] = {
+    "planner": (
+        "plan", "planner", "You are an AI planner. Break the task into 3-7 steps.",
+        PLANNER_BODY, {"context": "Additional Context"},
+    ),
+    "executor": (
+        "execute", "executor", "You are an AI executor. Perform the step given.",
+        EXECUTOR_BODY, {"context": "Execution Context"},
+    ),
+    "executor_pass": (
+        "execute", "executor", "You are an AI executor. Perform the step given.",
+        EXECUTOR_PASS_BODY, {"context": "Execution Context"},
+    ),
+    "reflection": (
+        "reflect", "reflection", "You are an AI critic. Evaluate the step.",
+        REFLECTION_BODY, {"step": None, "output": None},
+    ),
+    "reflection_batch": (
+        "reflect_batch", "reflection", "You are an AI critic. Evaluate the step.",
+        REFLECTION_BATCH_BODY, {"steps": None},
+    ),
+}
+
+
+def _load_encoding(name: str):
+    """Load (and cache per process) a tiktoken encoding; None if unavailable."""
+    with _encoding_lock:
+        if name in _encoding_cache:
+            return _encoding_cache[name]
+        encoding = None
+        if tiktoken is not None:
+            try:
+                encoding = tiktoken.get_encoding(name)
+            except Exception as e:
+                logger.warning(f"tiktoken encoding '{name}' unavailable, estimating tokens from length: {e}")
+        _encoding_cache[name] = encoding
+        return encoding
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens with the model's tiktoken encoding.
+
+    Falls back to a length-based estimate when tiktoken or the encoding file is
+    not available (e.g. offline environments), so budgeting still works.
+    """
+
+    def __init__(self, model: Optional[str] = None):
+        encoding_name = _DEFAULT_ENCODING
+        if tiktoken is not None and model:
+            try:
+                encoding_name = tiktoken.encoding_name_for_model(model)
+            except KeyError:
+                pass
+        self.encoding_name = encoding_name
+        self._encoding = _load_encoding(encoding_name)
+
+    @property
+    def exact(self) -> bool:
+        """True when counts come from a real BPE encoding."""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens, marking the cut."""
+        if self.count(text) <= max_tokens:
+            return text
+        keep = max(0, max_tokens - self.count(_TRUNCATION_MARKER))
+        if self._encoding is not None:
+            head = self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:keep])
+        else:
+            head = text[:keep * _CHARS_PER_TOKEN]
+        return head + _TRUNCATION_MARKER
+
+
+class PromptTemplate:
+    """
+    A prompt template parsed once into literal segments and field slots.
+
+    Rendering joins precomputed segments instead of re-parsing the format
+    string, and the static text's token count is computed a single time.
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        for literal, field, _spec, _conversion in Formatter().parse(text):
+            self._segments.append((literal, field))
+        self.fields = tuple(dict.fromkeys(f for _, f in self._segments if f))
+        self.static_text = "".join(literal for literal, _ in self._segments)
+
+    def render(self, **values: Any) -> str:
+        """Fill the template's fields; missing fields render as empty strings."""
+        parts = []
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field:
+                value = values.get(field, "")
+                parts.append(value if isinstance(value, str) else str(value))
+        return "".join(parts)
+
+
+def minify_json(value: Any) -> str:
+    """Serialize without indentation or separator whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _summarize_attempt(attempt: Any) -> Any:
+    """Keep only what a planner needs to know about a prior step execution."""
+    if not isinstance(attempt, dict):
+        return attempt
+    summary = {k: attempt[k] for k in ("step_id", "status", "confidence") if k in attempt}
+    if attempt.get("output"):
+        summary["output"] = str(attempt["output"])[:200]
+    if attempt.get("error"):
+        summary["error"] = str(attempt["error"])[:200]
+    return summary
+
+
+def _summarize_reflection(reflection: Any) -> Any:
+    """Keep the score and headline issues of a prior reflection."""
+    if not isinstance(reflection, dict):
+        return reflection
+    summary = {k: reflection[k] for k in ("step_id", "overall_quality", "requires_retry") if k in reflection}
+    issues = reflection.get("issues") or []
+    if issues:
+        summary["issues"] = [str(i)[:160] for i in issues[:2]]
+    return summary
+
+
+def _shrink(value: Any, max_str: int, max_list: int) -> Any:
+    """Recursively cut strings and keep only the most recent list items."""
+    if isinstance(value, str):
+        return value if len(value) <= max_str else value[:max_str] + _TRUNCATION_MARKER
+    if isinstance(value, dict):
+        return {k: _shrink(v, max_str, max_list) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = list(value)[-max_list:] if len(value) > max_list else list(value)
+        return [_shrink(v, max_str, max_list) for v in items]
+    return value
+
+
+def compact_payload(value: Any, max_tokens: int, counter: TokenCounter) -> Tuple[str, Dict[str, int]]:
+    """
+    Serialize a context payload into at most max_tokens tokens.
+
+    Applies, in order until the payload fits: minified JSON, summarised and
+    trimmed replan histories, progressively shorter strings and lists, and
+    finally a hard token cut.
+
+    Args:
+        value: JSON-serializable payload (usually a context dict)
+        max_tokens: Token budget for the serialized payload
+        counter: TokenCounter used for measuring
+
+    Returns:
+        Tuple of (serialized payload, stats) where stats has raw_tokens
+        (pretty-printed size before compaction), tokens (size sent) and
+        compacted (1 if anything beyond minification was dropped)
+    """
+    raw_tokens = counter.count(json.dumps(value, indent=2, default=str))
+    text = minify_json(value)
+    tokens = counter.count(text)
+    compacted = tokens > max_tokens
+
+    if tokens > max_tokens and isinstance(value, dict):
+        value = dict(value)
+        for key, limit in _HISTORY_LIMITS.items():
+            history = value.get(key)
+            if isinstance(history, list):
+                if key == "previous_attempts":
+                    history = [_summarize_attempt(a) for a in history]
+                elif key == "reflections":
+                    history = [_summarize_reflection(r) for r in history]
+                value[key] = history[-limit:]
+        text = minify_json(value)
+        tokens = counter.count(text)
+
+    for max_str, max_list in _COMPACTION_PASSES:
+        if tokens <= max_tokens:
+            break
+        text = minify_json(_shrink(value, max_str, max_list))
+        tokens = counter.count(text)
+
+    if tokens > max_tokens:
+        text = counter.truncate(text, max_tokens)
+        tokens = counter.count(text)
+
+    return text, {"raw_tokens": raw_tokens, "tokens": tokens, "compacted": int(compacted)}
+
+
+class PromptBuilder:
+    """
+    Builds reasoning prompts from precompiled templates within token budgets.
+
+    Each template belongs to a call type (plan, execute, reflect) with its own
+    prompt-token budget. Static template text is measured once; whatever the
+    budget leaves is shared between the template's JSON payloads, smallest
+    first, so short payloads are never cut to make room for long ones.
+
+    Usage:
+        builder = PromptBuilder(prompts, model="gpt-4o-mini")
+        prompt = builder.build("planner", entity="Acme", task="...", context={...})
+        builder.get_metrics()["plan"]["prompt_tokens_max"]
+    """
+
+    def __init__(
+        self,
+        prompts: Dict[str, str],
+        model: Optional[str] = None,
+        budgets: Optional[Dict[str, int]] = None
+    ):
+        """
+        Precompile templates for the loaded prompt headers.
+
+        Args:
+            prompts: Prompt headers keyed by name, as returned by
+                ReasoningEngine._load_prompts()
+            model: Model name used to pick the tiktoken encoding
+            budgets: Optional per-call-type prompt token budgets, overriding
+                the AGENTIC_PROMPT_BUDGET_* settings
+        """
+        self.counter = TokenCounter(model)
+        self.budgets = {
+            "plan": settings.AGENTIC_PROMPT_BUDGET_PLAN,
+            "execute": settings.AGENTIC_PROMPT_BUDGET_EXECUTE,
+            "reflect": settings.AGENTIC_PROMPT_BUDGET_REFLECT,
+            "reflect_batch": settings.AGENTIC_PROMPT_BUDGET_REFLECT_BATCH,
+        }
+        if budgets:
+            self.budgets.update(budgets)
+
+        self.templates: Dict[str, PromptTemplate] = {}
+        self._call_types: Dict[str, str] = {}
+        self._payload_labels: Dict[str, Dict[str, Optional[str]]] = {}
+        self._static_tokens: Dict[str, int] = {}
+        for name, (call_type, prompt_key, fallback, body, payloads) in TEMPLATE_SPECS.items():
+            header = prompts.get(prompt_key) or fallback
+            # Escape braces in file-loaded headers so they stay literal
+            header = header.replace("{", "{{").replace("}", "}}")
+            template = PromptTemplate(name, header + body)
+            self.templates[name] = template
+            self._call_types[name] = call_type
+            self._payload_labels[name] = payloads
+            self._static_tokens[name] = self.counter.count(template.static_text)
+
+        self.last_call: Optional[Dict[str, Any]] = None
+        self.reset_metrics()
+
+    def build(self, name: str, **fields: Any) -> str:
+        """
+        Render a template, compacting its JSON payload fields to the budget.
+
+        Args:
+            name: Template name (planner, executor, executor_pass, reflection,
+                reflection_batch)
+            **fields: Template fields; payload fields (context, step, output)
+                may be any JSON-serializable value
+
+        Returns:
+            The rendered prompt
+        """
+        template = self.templates[name]
+        call_type = self._call_types[name]
+        labels = self._payload_labels[name]
+        budget = self.budgets.get(call_type, 0)
+
+        values = {k: v for k, v in fields.items() if k not in labels}
+        used = self._static_tokens[name] + sum(
+            self.counter.count(v if isinstance(v, str) else str(v)) for v in values.values()
+        )
+        remaining = max(0, budget - used)
+
+        # Smallest payloads first so each gets a fair share of what is left
+        payloads = [(k, fields.get(k)) for k in labels]
+        payloads.sort(key=lambda item: len(minify_json(item[1])) if item[1] else 0)
+        raw_tokens = sent_tokens = 0
+        compacted = False
+        for index, (key, payload) in enumerate(payloads):
+            label = labels[key]
+            if not payload and label is not None:
+                values[key] = ""
+                continue
+            share = remaining // (len(payloads) - index)
+            header = f"\n\n{label}:\n" if label is not None else ""
+            text, stats = compact_payload(payload, max(0, share - self.counter.count(header)), self.counter)
+            values[key] = header + text
+            raw_tokens += stats["raw_tokens"]
+            sent_tokens += stats["tokens"]
+            compacted = compacted or bool(stats["compacted"])
+            remaining -= self.counter.count(values[key])
+
+        prompt = template.render(**values)
+        self._record(name, call_type, prompt, budget, raw_tokens, sent_tokens, compacted)
+        return prompt
+
+    def _record(
+        self,
+        name: str,
+        call_type: str,
+        prompt: str,
+        budget: int,
+        raw_tokens: int,
+        sent_tokens: int,
+        compacted: bool
+    ) -> None:
+        """Update per-call-type prompt token metrics of the active run (or the builder)."""
+        prompt_tokens = self.counter.count(prompt)
+        last_call = {
+            "template": name,
+            "call_type": call_type,
+            "prompt_tokens": prompt_tokens,
+            "budget": budget,
+            "context_tokens_raw": raw_tokens,
+            "context_tokens_sent": sent_tokens,
+            "compacted": compacted,
+        }
+        run = current_run()
+        if run is not None:
+            run.last_prompt = last_call
+            metrics = run.prompt_metrics
+        else:
+            self.last_call = last_call
+            metrics = self.metrics
+        stats = metrics.setdefault(call_type, self._empty_stats())
+        stats["calls"] += 1
+        stats["prompt_tokens_total"] += prompt_tokens
+        stats["prompt_tokens_max"] = max(stats["prompt_tokens_max"], prompt_tokens)
+        stats["context_tokens_raw"] += raw_tokens
+        stats["context_tokens_sent"] += sent_tokens
+        if compacted:
+            stats["compacted_calls"] += 1
+        if prompt_tokens > budget:
+            stats["over_budget_calls"] += 1
+            logger.warning(f"{name} prompt is {prompt_tokens} tokens, over the {budget} token budget")
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
+            "calls": 0,
+            "prompt_tokens_total": 0,
+            "prompt_tokens_max": 0,
+            "context_tokens_raw": 0,
+            "context_tokens_sent": 0,
+            "compacted_calls": 0,
+            "over_budget_calls": 0,
+        }
+
+    def get_metrics(self, stats_by_type: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Any]:
+        """
+        Per-call-type prompt token metrics with averages.
+
+        Args:
+            stats_by_type: Raw stats to format, e.g. RunContext.prompt_metrics
+                (defaults to the builder's own, recorded outside any run)
+        """
+        if stats_by_type is None:
+            stats_by_type = self.metrics
+        metrics = {}
+        empty = {call_type: self._empty_stats() for call_type in ("plan", "execute", "reflect")}
+        for call_type, stats in {**empty, **stats_by_type}.items():
+            entry = dict(stats)
+            entry["prompt_tokens_avg"] = (
+                round(stats["prompt_tokens_total"] / stats["calls"], 1) if stats["calls"] else 0.0
+            )
+            entry["budget"] = self.budgets.get(call_type)
+            metrics[call_type] = entry
+        metrics["exact_token_counts"] = self.counter.exact
+        return metrics
+
+    def reset_metrics(self) -> None:
+        """Clear accumulated prompt token metrics."""
+        self.metrics = {call_type: self._empty_stats() for call_type in ("plan", "execute", "reflect")}
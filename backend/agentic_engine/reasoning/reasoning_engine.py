@@ -7,13 +7,25 @@ Provides advanced reasoning capabilities including planning, execution, and refl
 import os
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
 from pathlib import Path
-from backend.utils.llm_client import LLMClient, STANDARD_MODEL
+from backend.utils.llm_client import LLMClient, LLMResponse, STANDARD_MODEL
+from backend.agentic_engine.reasoning.incremental_json import IncrementalJSONArrayParser
+from backend.agentic_engine.reasoning.pass_controller import PassController, StepComplexityClassifier
+from backend.agentic_engine.reasoning.prompt_builder import PromptBuilder
+from backend.agentic_engine.run_context import current_run
+from backend.agentic_engine.tracing.recorder import current_trace, prompt_hash
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Multi-pass history kept for inspection; the engine is shared by every run
+# of a pooled orchestrator, so older entries are dropped
+_PASS_HISTORY_LIMIT = 1000
+
 
 class ReasoningEngine:
     """
@@ -54,30 +66,109 @@ class ReasoningEngine:
         self.enable_multi_pass = enable_multi_pass
         self.max_reasoning_passes = max_reasoning_passes
         self.llm_client = LLMClient(api_key=self.api_key, model=self.model)
-        self.mock_mode = not self.api_key or self.api_key == "mock" or (isinstance(self.api_key, str) and self.api_key.startswith("sk-mock"))
+        # Canned responses only when no provider is reachable; the offline
+        # mock provider (LLM_PROVIDER=mock) exercises the full pipeline
+        self.mock_mode = not self.llm_client.available
         
         if self.mock_mode:
             logger.warning("ReasoningEngine running in mock mode - OpenAI API key not set")
         
-        # Load prompts from files
+        # Load prompts from files and precompile them into budgeted templates
         self.prompts = self._load_prompts()
+        self.prompt_builder = PromptBuilder(self.prompts, model=self.model)
+        
+        # Which steps get multi-pass reasoning, and when to stop passing
+        self.complexity_classifier = StepComplexityClassifier.from_settings()
+        self.pass_controller = PassController.from_settings()
         
-        # Track reasoning metrics
+        # Track reasoning metrics (per-pass latency, tokens and cost in pass_history)
+        self._metrics_lock = threading.Lock()
         self.reasoning_metrics = {
             "total_passes": 0,
-            "pass_history": [],
-            "confidence_evolution": []
+            "multi_pass_steps": 0,
+            "passes_saved": 0,
+            "stop_reasons": {"confident": 0, "converged": 0, "no_gain": 0, "max_passes": 0, "error": 0},
+            "total_latency_ms": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cost_usd": 0.0,
+            "pass_history": deque(maxlen=_PASS_HISTORY_LIMIT),
+            "confidence_evolution": deque(maxlen=_PASS_HISTORY_LIMIT)
         }
     
-    def _llm_call(self, prompt: str, is_main: bool = True) -> Dict[str, Any]:
-        """Call unified LLM client with standard timeout."""
+    def _llm_call(
+        self,
+        prompt: str,
+        is_main: bool = True,
+        on_token: Optional[Callable[[str], None]] = None,
+        call_type: str = "llm",
+        on_reset: Optional[Callable[[], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Call unified LLM client with standard timeout.
+        
+        When on_token is given the completion is streamed and every text delta
+        is forwarded as it arrives; the return value has the same shape as the
+        blocking call either way. If the stream fails after deltas were
+        forwarded, on_reset is called (the forwarded text is void) before the
+        blocking fallback, whose text is not forwarded. In a traced run the
+        call and its response are recorded as an llm span.
+        """
+        recorder = current_trace()
+        if recorder is None:
+            return self._llm_request(prompt, is_main, on_token, on_reset)
+        started = time.perf_counter()
+        response = self._llm_request(prompt, is_main, on_token, on_reset)
+        self._trace_llm(recorder, call_type, prompt, started, response, streamed=on_token is not None)
+        return response
+    
+    def _llm_request(
+        self,
+        prompt: str,
+        is_main: bool,
+        on_token: Optional[Callable[[str], None]],
+        on_reset: Optional[Callable[[], None]] = None
+    ) -> Dict[str, Any]:
         timeout = 120.0 if is_main else 30.0
+        if on_token is not None and not self.mock_mode and self.llm_client.available:
+            chunks = []
+            try:
+                for delta in self.llm_client.stream_compliance_analysis(prompt, timeout=timeout):
+                    chunks.append(delta)
+                    on_token(delta)
+                return LLMResponse(raw_text="".join(chunks), status="completed").to_dict()
+            except Exception as e:
+                logger.warning(f"Streaming LLM call failed, falling back to blocking call: {e}")
+                if chunks and on_reset is not None:
+                    on_reset()
         return self.llm_client.run_compliance_analysis(
             prompt=prompt,
             use_json_schema=False,
             timeout=timeout
         ).to_dict()
     
+    def _trace_llm(
+        self,
+        recorder: Any,
+        call_type: str,
+        prompt: str,
+        started: float,
+        response: Dict[str, Any],
+        streamed: bool = False
+    ) -> None:
+        """Record one LLM call (hash, tokens, latency, response) on a run's trace."""
+        counter = self.prompt_builder.counter
+        payload = {key: response.get(key) for key in ("status", "parsed_json", "raw_text", "confidence", "error")}
+        recorder.add_span("llm", call_type, started, time.perf_counter(), {
+            "model": self.model,
+            "prompt_hash": prompt_hash(prompt),
+            "prompt_tokens": counter.count(prompt),
+            "completion_tokens": counter.count(payload["raw_text"] or ""),
+            "streamed": streamed,
+            "cache_hit": False,
+            "status": payload["status"],
+        }, payload=payload, error=payload["error"])
+    
     def _load_prompts(self) -> Dict[str, str]:
         """
         Load prompt templates from the prompts directory.
@@ -151,7 +242,9 @@ class ReasoningEngine:
         self,
         entity: str,
         task: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        on_reset: Optional[Callable[[], None]] = None
     ) -> List[Dict[str, Any]]:
         """
         Generate a strategic plan for the given task.
@@ -163,6 +256,10 @@ class ReasoningEngine:
             entity: The entity or subject of the task (e.g., company name, jurisdiction)
             task: The compliance task to plan for
             context: Optional additional context for planning
+            on_token: Optional callback receiving raw completion deltas while
+                the plan is being generated (enables streaming)
+            on_reset: Optional callback telling the receiver of on_token to
+                discard the deltas so far (the stream failed part-way)
             
         Returns:
             List of plan steps, each containing:
@@ -172,43 +269,10 @@ class ReasoningEngine:
                 - expected_outcome: What should result
                 - tools: Suggested tools or resources (optional)
         """
-        # Build the planning prompt
-        planner_prompt = self.prompts.get('planner', 
-            'You are an AI planner. Break the task into 3-7 steps.')
-        
-        # Add context if provided
-        context_str = ""
-        if context:
-            context_str = f"\n\nAdditional Context:\n{json.dumps(context, indent=2)}"
-        
-        # Construct the full prompt
-        full_prompt = f"""{planner_prompt}
-
-Entity/Subject: {entity}
-
-Task: {task}{context_str}
-
-Please generate a strategic plan with 3-7 steps. Each step should include:
-- step_id: a unique identifier (e.g., "step_1", "step_2", ...)
-- description: a clear description of what needs to be done
-- rationale: why this step is important
-- expected_outcome: what should result from this step
-
-Respond ONLY with a valid JSON array of steps. Example format:
-[
-  {{
-    "step_id": "step_1",
-    "description": "Analyze requirements",
-    "rationale": "Understand what needs to be evaluated",
-    "expected_outcome": "Clear understanding of requirements"
-  }},
-  ...
-]
-
-Respond with JSON only, no other text."""
+        full_prompt = self._build_plan_prompt(entity, task, context)
         
         try:
-            llm_response = self._llm_call(full_prompt, is_main=True)
+            llm_response = self._llm_call(full_prompt, is_main=True, on_token=on_token, call_type="plan", on_reset=on_reset)
             # Handle mock mode or extract response
             if self.mock_mode or llm_response.get("status") != "completed":
                 # Return mock plan for testing/demo or on error
@@ -254,18 +318,7 @@ Respond with JSON only, no other text."""
             validated_plan = []
             for i, step in enumerate(plan):
                 if isinstance(step, dict):
-                    # Ensure required fields
-                    validated_step = {
-                        "step_id": step.get("step_id", f"step_{i + 1}"),
-                        "description": step.get("description", f"Step {i + 1}"),
-                        "rationale": step.get("rationale", "Required for task completion"),
-                        "expected_outcome": step.get("expected_outcome", "Progress toward goal")
-                    }
-                    # Include optional fields if present
-                    if "tools" in step:
-                        validated_step["tools"] = step["tools"]
-                    
-                    validated_plan.append(validated_step)
+                    validated_plan.append(self._normalize_plan_step(step, i))
             
             # Ensure plan has 3-7 steps
             if len(validated_plan) < 3:
@@ -287,6 +340,125 @@ Respond with JSON only, no other text."""
             logger.error(f"Error in generate_plan: {e}")
             return self._create_default_plan(entity, task)
     
+    def _build_plan_prompt(
+        self,
+        entity: str,
+        task: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build the full planner prompt for an entity/task pair, compacting context to the plan budget."""
+        return self.prompt_builder.build("planner", entity=entity, task=task, context=context)
+    
+    def _normalize_plan_step(self, step: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """Fill required plan step fields, keeping optional tool suggestions."""
+        validated_step = {
+            "step_id": step.get("step_id", f"step_{index + 1}"),
+            "description": step.get("description", f"Step {index + 1}"),
+            "rationale": step.get("rationale", "Required for task completion"),
+            "expected_outcome": step.get("expected_outcome", "Progress toward goal")
+        }
+        # Include optional fields if present
+        if "tools" in step:
+            validated_step["tools"] = step["tools"]
+        return validated_step
+    
+    def can_stream_plan(self) -> bool:
+        """Whether plans can be streamed from a live LLM (False in mock mode)."""
+        return not self.mock_mode and self.llm_client.available
+    
+    def stream_plan(
+        self,
+        entity: str,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        on_reset: Optional[Callable[[], None]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate a plan, yielding each step as soon as the model finishes it.
+        
+        Streams the planner completion through IncrementalJSONArrayParser so a
+        caller can start executing step 1 while later steps are still being
+        generated. The yielded steps obey the same rules as generate_plan():
+        normalized fields, at most 7 steps. Falls back to generate_plan() in
+        mock mode; if the stream fails, is cut off or ends before 3 steps, the
+        remaining steps are taken from a blocking generate_plan() call.
+        
+        Args:
+            entity: The entity or subject of the task
+            task: The compliance task to plan for
+            context: Optional additional context for planning
+            on_token: Optional callback receiving raw completion deltas
+            on_reset: Optional callback telling the receiver of on_token to
+                discard the deltas so far (the stream did not produce the plan)
+            
+        Yields:
+            Normalized plan step dictionaries
+        """
+        if not self.can_stream_plan():
+            yield from self.generate_plan(entity, task, context)
+            return
+        
+        full_prompt = self._build_plan_prompt(entity, task, context)
+        parser = IncrementalJSONArrayParser()
+        emitted = 0
+        forwarded = failed = False
+        deltas = self._traced_stream(full_prompt, self.llm_client.stream_compliance_analysis(full_prompt, timeout=120.0))
+        
+        try:
+            for delta in deltas:
+                if on_token is not None:
+                    on_token(delta)
+                    forwarded = True
+                for step in parser.feed(delta):
+                    if isinstance(step, dict) and emitted < 7:
+                        yield self._normalize_plan_step(step, emitted)
+                        emitted += 1
+                if emitted >= 7 or parser.complete:
+                    break
+            for step in parser.close():
+                if isinstance(step, dict) and emitted < 7:
+                    yield self._normalize_plan_step(step, emitted)
+                    emitted += 1
+        except Exception as e:
+            logger.error(f"Error streaming plan after {emitted} step(s): {e}")
+            failed = True
+        finally:
+            deltas.close()
+        
+        if parser.errors:
+            logger.warning(f"Streamed plan had {len(parser.errors)} malformed fragment(s): {parser.errors[:3]}")
+        
+        if emitted >= 7 or (emitted >= 3 and parser.complete and not failed):
+            return
+        
+        # The stream did not produce a whole plan: take the remaining steps
+        # from a blocking call (its text is not forwarded)
+        logger.warning(f"Streamed plan ended after {emitted} step(s); completing it with generate_plan()")
+        if forwarded and on_reset is not None:
+            on_reset()
+        yield from self.generate_plan(entity, task, context)[emitted:]
+    
+    def _traced_stream(self, prompt: str, deltas: Iterator[str]) -> Iterator[str]:
+        """Pass a completion stream through, recording it as an llm span in a traced run."""
+        recorder = current_trace()
+        if recorder is None:
+            yield from deltas
+            return
+        started = time.perf_counter()
+        chunks: List[str] = []
+        error = None
+        try:
+            for delta in deltas:
+                chunks.append(delta)
+                yield delta
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            response = {"status": "error" if error else "completed", "raw_text": "".join(chunks), "error": error}
+            self._trace_llm(recorder, "plan", prompt, started, response, streamed=True)
+    
     def _create_default_plan(self, entity: str, task: str) -> List[Dict[str, Any]]:
         """
         Create a default plan when API call fails.
@@ -379,46 +551,17 @@ Respond with JSON only, no other text."""
         Returns:
             Execution result
         """
-        # Build the execution prompt
-        executor_prompt = self.prompts.get('executor',
-            'You are an AI executor. Perform the step given.')
-        
-        # Extract step information
         step_id = step.get("step_id", "unknown")
-        description = step.get("description", str(step))
-        rationale = step.get("rationale", "")
-        
-        # Add context if provided
-        context_str = ""
-        if context:
-            context_str = f"\n\nExecution Context:\n{json.dumps(context, indent=2)}"
-        
-        # Construct the full prompt
-        full_prompt = f"""{executor_prompt}
-
-Step to Execute:
-ID: {step_id}
-Description: {description}
-Rationale: {rationale}{context_str}
-
-Please execute this step and provide:
-1. The main output/result of executing this step
-2. Key findings or insights discovered
-3. Any risks or concerns identified
-4. Your confidence in this execution (0.0 to 1.0)
-
-Respond ONLY with valid JSON in this format:
-{{
-  "output": "Main result of the step execution",
-  "findings": ["Finding 1", "Finding 2", ...],
-  "risks": ["Risk 1", "Risk 2", ...],
-  "confidence": 0.85
-}}
-
-Respond with JSON only, no other text."""
+        full_prompt = self.prompt_builder.build(
+            "executor",
+            step_id=step_id,
+            description=step.get("description", str(step)),
+            rationale=step.get("rationale", ""),
+            context=context
+        )
         
         try:
-            llm_response = self._llm_call(full_prompt, is_main=True)
+            llm_response = self._llm_call(full_prompt, is_main=True, call_type="execute")
             # Handle mock mode or extract response
             if self.mock_mode or llm_response.get("status") != "completed":
                 if llm_response.get("status") == "error":
@@ -506,43 +649,10 @@ Respond with JSON only, no other text."""
                 - requires_retry: Boolean indicating if step should be re-executed
                 - missing_data: List of missing information items
         """
-        # Build the reflection prompt
-        reflection_prompt = self.prompts.get('reflection',
-            'You are an AI critic. Evaluate the step.')
-        
-        # Construct the full prompt
-        full_prompt = f"""{reflection_prompt}
-
-Step That Was Executed:
-{json.dumps(step, indent=2)}
-
-Execution Output:
-{json.dumps(output, indent=2)}
-
-Please critically evaluate this execution on the following criteria:
-
-1. Correctness: Is the output factually correct and logically sound?
-2. Completeness: Does it fully address the step requirements?
-3. Compliance Risk: Are there any compliance concerns or risks?
-4. Hallucination Risk: Any signs of fabricated or uncertain information?
-5. Missing Data: What additional information might be needed?
-
-Provide your evaluation in JSON format with these exact fields:
-{{
-  "correctness_score": 0.0 to 1.0,
-  "completeness_score": 0.0 to 1.0,
-  "overall_quality": 0.0 to 1.0,
-  "confidence_score": 0.0 to 1.0,
-  "issues": ["Issue 1", "Issue 2", ...],
-  "suggestions": ["Suggestion 1", "Suggestion 2", ...],
-  "requires_retry": true or false,
-  "missing_data": ["Missing item 1", "Missing item 2", ...]
-}}
-
-Respond with JSON only, no other text."""
+        full_prompt = self.prompt_builder.build("reflection", step=step, output=output)
         
         try:
-            llm_response = self._llm_call(full_prompt, is_main=False)
+            llm_response = self._llm_call(full_prompt, is_main=False, call_type="reflect")
             # Handle mock mode or extract response
             if self.mock_mode or llm_response.get("status") != "completed":
                 if llm_response.get("status") == "error":
@@ -577,43 +687,114 @@ Respond with JSON only, no other text."""
                         "missing_data": []
                     }
             
-            # Build result with validated fields
-            result = {
-                "correctness_score": float(reflection_data.get("correctness_score", 0.7)),
-                "completeness_score": float(reflection_data.get("completeness_score", 0.7)),
-                "overall_quality": float(reflection_data.get("overall_quality", 0.7)),
-                "confidence_score": float(reflection_data.get("confidence_score", 0.7)),
-                "issues": reflection_data.get("issues", []),
-                "suggestions": reflection_data.get("suggestions", []),
-                "requires_retry": bool(reflection_data.get("requires_retry", False)),
-                "missing_data": reflection_data.get("missing_data", [])
-            }
+            return self._validate_reflection(reflection_data)
             
-            # Ensure all scores are in valid range [0.0, 1.0]
-            for score_key in ["correctness_score", "completeness_score", "overall_quality", "confidence_score"]:
-                result[score_key] = max(0.0, min(1.0, result[score_key]))
+        except Exception as e:
+            logger.error(f"Error in reflect: {e}")
+            return self._error_reflection(e)
+    
+    def reflect_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Critically evaluate several completed steps with a single LLM call.
+        
+        Sends every (step, output) pair in one batched reflection prompt and
+        maps the per-step evaluations in the structured response back to the
+        input order by step_id (by position when the model omits ids). Steps
+        the response does not cover get the fallback reflection.
+        
+        Args:
+            items: (step, output) pairs in execution order
             
-            # Ensure list fields are actually lists
-            for list_key in ["issues", "suggestions", "missing_data"]:
-                if not isinstance(result[list_key], list):
-                    result[list_key] = [str(result[list_key])] if result[list_key] else []
+        Returns:
+            One reflection per item, in the same shape as reflect()
+        """
+        if not items:
+            return []
+        if len(items) == 1:
+            return [self.reflect(*items[0])]
+        
+        steps = [
+            {"step_id": step.get("step_id") or f"step_{index + 1}", "step": step, "output": output}
+            for index, (step, output) in enumerate(items)
+        ]
+        full_prompt = self.prompt_builder.build("reflection_batch", steps=steps)
+        
+        try:
+            llm_response = self._llm_call(full_prompt, is_main=False, call_type="reflect_batch")
+            if self.mock_mode or llm_response.get("status") != "completed":
+                if llm_response.get("status") == "error":
+                    logger.error(f"LLM batched reflection failed: {llm_response.get('error')}")
+                reflection_data = {
+                    "correctness_score": 0.8,
+                    "completeness_score": 0.75,
+                    "overall_quality": 0.77,
+                    "confidence_score": 0.75,
+                    "suggestions": ["Consider additional validation"]
+                }
+                return [self._validate_reflection(reflection_data) for _ in items]
             
-            return result
+            response_text = llm_response.get("raw_text") or ""
+            if not response_text and llm_response.get("parsed_json"):
+                response_text = json.dumps(llm_response["parsed_json"])
+            parsed = self._safe_json_parse(response_text)
+            entries = parsed.get("reflections") if isinstance(parsed, dict) else parsed
+            if not isinstance(entries, list):
+                entries = []
+            entries = [entry for entry in entries if isinstance(entry, dict)]
+            
+            by_id = {str(entry["step_id"]): entry for entry in entries if entry.get("step_id") is not None}
+            results = []
+            for index, payload in enumerate(steps):
+                entry = by_id.get(str(payload["step_id"]))
+                if entry is None and not by_id and index < len(entries):
+                    entry = entries[index]
+                results.append(self._validate_reflection(entry or {}))
+            return results
             
         except Exception as e:
-            logger.error(f"Error in reflect: {e}")
-            # Return default reflection with error noted
-            return {
-                "correctness_score": 0.5,
-                "completeness_score": 0.5,
-                "overall_quality": 0.5,
-                "confidence_score": 0.5,
-                "issues": [f"Reflection error: {str(e)}"],
-                "suggestions": ["Manual review recommended"],
-                "requires_retry": False,
-                "missing_data": [],
-                "error": str(e)
-            }
+            logger.error(f"Error in reflect_batch: {e}")
+            return [self._error_reflection(e) for _ in items]
+    
+    def _validate_reflection(self, reflection_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Coerce a parsed reflection to the documented fields, types and score range."""
+        result = {
+            "correctness_score": float(reflection_data.get("correctness_score", 0.7)),
+            "completeness_score": float(reflection_data.get("completeness_score", 0.7)),
+            "overall_quality": float(reflection_data.get("overall_quality", 0.7)),
+            "confidence_score": float(reflection_data.get("confidence_score", 0.7)),
+            "issues": reflection_data.get("issues", []),
+            "suggestions": reflection_data.get("suggestions", []),
+            "requires_retry": bool(reflection_data.get("requires_retry", False)),
+            "missing_data": reflection_data.get("missing_data", [])
+        }
+        
+        # Ensure all scores are in valid range [0.0, 1.0]
+        for score_key in ["correctness_score", "completeness_score", "overall_quality", "confidence_score"]:
+            result[score_key] = max(0.0, min(1.0, result[score_key]))
+        
+        # Ensure list fields are actually lists
+        for list_key in ["issues", "suggestions", "missing_data"]:
+            if not isinstance(result[list_key], list):
+                result[list_key] = [str(result[list_key])] if result[list_key] else []
+        
+        return result
+    
+    def _error_reflection(self, error: Exception) -> Dict[str, Any]:
+        """Default reflection recording why the evaluation failed."""
+        return {
+            "correctness_score": 0.5,
+            "completeness_score": 0.5,
+            "overall_quality": 0.5,
+            "confidence_score": 0.5,
+            "issues": [f"Reflection error: {str(error)}"],
+            "suggestions": ["Manual review recommended"],
+            "requires_retry": False,
+            "missing_data": [],
+            "error": str(error)
+        }
     
     def _is_complex_step(self, step: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> bool:
         """
@@ -624,29 +805,9 @@ Respond with JSON only, no other text."""
             context: Optional context
             
         Returns:
-            True if step should use multi-pass reasoning
+            True if the complexity classifier scores the step at or above its threshold
         """
-        description = step.get("description", "").lower()
-        
-        # Complex indicators
-        complex_keywords = [
-            "analyze", "assess", "evaluate", "comprehensive", "detailed",
-            "multiple", "complex", "critical", "high-risk", "regulatory"
-        ]
-        
-        # Check if description contains complex keywords
-        if any(keyword in description for keyword in complex_keywords):
-            return True
-        
-        # Check if step mentions multiple regulations or jurisdictions
-        if context:
-            entity = context.get("entity", {})
-            if isinstance(entity, dict):
-                locations = entity.get("locations", [])
-                if len(locations) > 1:
-                    return True
-        
-        return False
+        return self.complexity_classifier.is_complex(step, context)
     
     def _run_step_multi_pass(
         self,
@@ -656,24 +817,27 @@ Respond with JSON only, no other text."""
         """
         Execute a step using multi-pass reasoning for complex tasks.
         
-        Performs multiple reasoning passes, refining the result with each pass.
+        Performs up to max_reasoning_passes passes, refining the result with
+        each, and stops early when the pass controller sees no point in
+        another (confident first pass, or converged confidence and findings).
         
         Args:
             step: The step to execute
             context: Optional execution context
             
         Returns:
-            Execution result with reasoning_passes field
+            Execution result with reasoning_passes, stop_reason and per-pass
+            pass_results (including latency_ms, tokens and cost_usd)
         """
         step_id = step.get("step_id", "unknown")
         all_findings = []
         all_risks = []
         pass_results = []
         confidence_scores = []
+        stop_reason = "max_passes"
         
-        # Perform multiple reasoning passes
+        # Perform reasoning passes until the controller says stop
         for pass_num in range(1, self.max_reasoning_passes + 1):
-            self.reasoning_metrics["total_passes"] += 1
             
             # Build prompt with previous pass context
             previous_context = ""
@@ -685,34 +849,23 @@ Respond with JSON only, no other text."""
                 previous_context += f"Confidence: {prev_result.get('confidence', 0.0):.2f}\n"
                 previous_context += "\nPlease refine and improve upon the previous pass."
             
-            executor_prompt = self.prompts.get('executor',
-                'You are an AI executor. Perform the step given.')
-            
-            step_description = step.get("description", "")
-            step_rationale = step.get("rationale", "")
-            
-            context_str = ""
-            if context:
-                context_str = f"\n\nExecution Context:\n{json.dumps(context, indent=2)}"
-            
-            full_prompt = f"""{executor_prompt}
-
-Step to Execute (Pass {pass_num}/{self.max_reasoning_passes}):
-ID: {step_id}
-Description: {step_description}
-Rationale: {step_rationale}{context_str}{previous_context}
-
-This is reasoning pass {pass_num} of {self.max_reasoning_passes}. 
-Please {'refine and improve' if pass_num > 1 else 'execute'} this step and provide:
-1. The main output/result
-2. Key findings or insights
-3. Any risks or concerns
-4. Your confidence (0.0 to 1.0)
-
-Respond ONLY with valid JSON: {{"output": "...", "findings": [...], "risks": [...], "confidence": 0.85}}"""
+            full_prompt = self.prompt_builder.build(
+                "executor_pass",
+                pass_num=pass_num,
+                max_passes=self.max_reasoning_passes,
+                step_id=step_id,
+                description=step.get("description", ""),
+                rationale=step.get("rationale", ""),
+                context=context,
+                previous_pass=previous_context,
+                action='refine and improve' if pass_num > 1 else 'execute'
+            )
             
             try:
-                llm_response = self._llm_call(full_prompt, is_main=True)
+                started = time.perf_counter()
+                llm_response = self._llm_call(full_prompt, is_main=True, call_type="execute")
+                latency_ms = (time.perf_counter() - started) * 1000
+                response_text = llm_response.get("raw_text") or ""
                 
                 # Handle mock mode or extract response
                 if self.mock_mode or llm_response.get("status") != "completed":
@@ -725,7 +878,6 @@ Respond ONLY with valid JSON: {{"output": "...", "findings": [...], "risks": [..
                         "confidence": 0.8
                     }
                 else:
-                    response_text = llm_response.get("raw_text") or ""
                     if not response_text and llm_response.get("parsed_json"):
                         response_text = json.dumps(llm_response["parsed_json"])
                     execution_data = self._safe_json_parse(response_text)
@@ -747,30 +899,29 @@ Respond ONLY with valid JSON: {{"output": "...", "findings": [...], "risks": [..
                 }
                 
                 pass_result["confidence"] = max(0.0, min(1.0, pass_result["confidence"]))
+                pass_result.update(self._pass_cost(latency_ms, response_text))
                 pass_results.append(pass_result)
                 confidence_scores.append(pass_result["confidence"])
                 all_findings.extend(pass_result.get("findings", []))
                 all_risks.extend(pass_result.get("risks", []))
+                self._record_pass(step_id, pass_result)
                 
-                # Track in metrics
-                self.reasoning_metrics["pass_history"].append({
-                    "step_id": step_id,
-                    "pass": pass_num,
-                    "confidence": pass_result["confidence"]
-                })
-                self.reasoning_metrics["confidence_evolution"].append(pass_result["confidence"])
-                
-                # Early stopping if confidence is high and stable
-                if pass_num > 1:
-                    confidence_delta = abs(confidence_scores[-1] - confidence_scores[-2])
-                    if confidence_scores[-1] >= 0.85 and confidence_delta < 0.05:
-                        break
+                # Stop once another pass is unlikely to change the answer
+                reason = self.pass_controller.stop_reason(pass_results)
+                if reason is not None:
+                    stop_reason = reason
+                    break
                 
             except Exception as e:
                 logger.error(f"Error in multi-pass reasoning pass {pass_num}: {e}")
                 if pass_num == 1:
                     # Fallback to single-pass on first pass error
                     return self._run_step_single_pass(step, context)
+                # Keep the passes made so far
+                stop_reason = "error"
+                break
+        
+        self._record_step(stop_reason, len(pass_results))
         
         # Aggregate results from all passes
         final_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.7
@@ -787,5 +938,50 @@ Respond ONLY with valid JSON: {{"output": "...", "findings": [...], "risks": [..
             "risks": unique_risks[:10],  # Limit to top 10
             "confidence": final_confidence,
             "reasoning_passes": len(pass_results),
+            "stop_reason": stop_reason,
             "pass_results": pass_results  # Include all pass results for transparency
         }
+    
+    def _pass_cost(self, latency_ms: float, response_text: str) -> Dict[str, Any]:
+        """Latency, token counts and estimated cost of the pass just made."""
+        run = current_run()
+        last_prompt = run.last_prompt if run is not None else self.prompt_builder.last_call
+        prompt_tokens = (last_prompt or {}).get("prompt_tokens", 0)
+        completion_tokens = self.prompt_builder.counter.count(response_text) if response_text else 0
+        cost = (
+            prompt_tokens * settings.LLM_PROMPT_COST_PER_1K
+            + completion_tokens * settings.LLM_COMPLETION_COST_PER_1K
+        ) / 1000
+        return {
+            "latency_ms": round(latency_ms, 2),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": round(cost, 6)
+        }
+    
+    def _record_pass(self, step_id: str, pass_result: Dict[str, Any]) -> None:
+        """Add one pass to reasoning_metrics (the engine may be shared across runs)."""
+        with self._metrics_lock:
+            metrics = self.reasoning_metrics
+            metrics["total_passes"] += 1
+            metrics["total_latency_ms"] += pass_result["latency_ms"]
+            metrics["prompt_tokens"] += pass_result["prompt_tokens"]
+            metrics["completion_tokens"] += pass_result["completion_tokens"]
+            metrics["cost_usd"] += pass_result["cost_usd"]
+            metrics["pass_history"].append({
+                "step_id": step_id,
+                "pass": pass_result["pass"],
+                "confidence": pass_result["confidence"],
+                "latency_ms": pass_result["latency_ms"],
+                "prompt_tokens": pass_result["prompt_tokens"],
+                "completion_tokens": pass_result["completion_tokens"],
+                "cost_usd": pass_result["cost_usd"]
+            })
+            metrics["confidence_evolution"].append(pass_result["confidence"])
+    
+    def _record_step(self, stop_reason: str, passes: int) -> None:
+        """Count a finished multi-pass step and the passes its early exit saved."""
+        with self._metrics_lock:
+            self.reasoning_metrics["multi_pass_steps"] += 1
+            self.reasoning_metrics["passes_saved"] += max(0, self.max_reasoning_passes - passes)
+            self.reasoning_metrics["stop_reasons"][stop_reason] += 1
@@ -0,0 +1,89 @@
+"""
+Run Context Module
+
+Per-run execution state for the agent loop.
+
+AgentLoop, its ReasoningEngine and its tools are built once and shared by
+every run. Everything a single run accumulates (plan, step history, tool
+outputs, reflections, metrics, prompt token stats) lives on a RunContext, so
+one warm loop can serve many concurrent runs.
+
+The active run is tracked in a context variable. Shared components that need
+per-run state (PromptBuilder metrics, EntityTool's database session) look it
+up with current_run() instead of keeping it on themselves.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def new_run_metrics() -> Dict[str, Any]:
+    """Initial execution metrics for one run."""
+    return {
+        "total_steps": 0,
+        "successful_steps": 0,
+        "failed_steps": 0,
+        "total_retries": 0,
+        "replan_count": 0,
+        "total_execution_time": 0.0,
+        "step_times": [],
+        "tools_used": [],
+        "errors_encountered": [],
+        "plan_source": "planner"
+    }
+
+
+@dataclass
+class RunContext:
+    """
+    Mutable state of one AgentLoop.execute() call.
+
+    Attributes:
+        db_session: Database session for memory operations and tools during
+            this run (falls back to the loop's own session when None)
+        max_steps: Step limit for this run (falls back to the loop's)
+        current_step: Index of the next step to execute
+        execution_history: Results of executed steps, in order
+        original_plan: Plan as first generated (or streamed)
+        revised_plan: Latest replanned steps, if any
+        tool_outputs: Every tool call result of the run
+        reflections: Reflections on the current plan's steps
+        metrics: Execution metrics (see new_run_metrics)
+        prompt_metrics: Per-call-type prompt token stats, filled by PromptBuilder
+        last_prompt: Stats of the last prompt PromptBuilder built for this run
+        tool_cache: Run-scoped tool results, filled by ToolResultCache
+        trace: TraceRecorder of this run when it is traced
+    """
+
+    db_session: Optional[Any] = None
+    max_steps: Optional[int] = None
+    current_step: int = 0
+    execution_history: List[Dict[str, Any]] = field(default_factory=list)
+    original_plan: List[Dict[str, Any]] = field(default_factory=list)
+    revised_plan: List[Dict[str, Any]] = field(default_factory=list)
+    tool_outputs: List[Dict[str, Any]] = field(default_factory=list)
+    reflections: List[Dict[str, Any]] = field(default_factory=list)
+    metrics: Dict[str, Any] = field(default_factory=new_run_metrics)
+    prompt_metrics: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    last_prompt: Optional[Dict[str, Any]] = None
+    tool_cache: Dict[str, Any] = field(default_factory=dict)
+    trace: Optional[Any] = None
+
+    @contextmanager
+    def activate(self) -> Iterator["RunContext"]:
+        """Make this the current run for the calling thread/task."""
+        token = _current_run.set(self)
+        try:
+            yield self
+        finally:
+            _current_run.reset(token)
+
+
+_current_run: ContextVar[Optional[RunContext]] = ContextVar("agentic_current_run", default=None)
+
+
+def current_run() -> Optional[RunContext]:
+    """The RunContext active in this thread/task, or None outside a run."""
+    return _current_run.get()
@@ -25,7 +25,13 @@ for the agentic compliance engine.
    - Tracks recovery success rates
    - Generates failure taxonomy statistics
 
-4. **SystemHealthCheck** - Deployment readiness validation
+4. **BenchmarkHarness** - Concurrent, offline performance benchmarking
+   - Runs benchmark cases across a process or asyncio pool
+   - Per-phase latency histograms (plan, tools, reflect, DB, LLM wait) with p50/p95/p99
+   - Reports throughput and peak RSS, saved as JSON/Parquet with the git revision
+   - Compares against a stored baseline to flag regressions
+
+5. **SystemHealthCheck** - Deployment readiness validation
    - Checks missing imports and invalid references
    - Validates environmental paths
    - Detects dependency mismatches
@@ -53,6 +59,12 @@ results = runner.run_benchmark_suite(
     max_cases_per_level=10
 )
 
+# Concurrent offline benchmark with baseline comparison
+from backend.agentic_engine.testing import BenchmarkHarness, HarnessConfig, compare_to_baseline, load_report
+
+report = BenchmarkHarness(HarnessConfig(concurrency=4, repeat=3)).run()
+comparison = compare_to_baseline(report, load_report("baseline.json"))
+
 # Simulate failures
 from backend.agentic_engine.testing import FailureSimulator, FailureType
 
@@ -77,6 +89,14 @@ from .failure_injection import FailureInjectionLayer, FailureType
 from .failure_taxonomy import FailureTaxonomy, FailureCategory, RetryStrategy, FailureRecord
 from .benchmark_cases import BenchmarkCases, BenchmarkCase, BenchmarkLevel
 from .benchmark_runner import BenchmarkRunner
+from .benchmark_harness import (
+    BenchmarkHarness,
+    HarnessConfig,
+    compare_to_baseline,
+    load_report,
+    save_report,
+    summarize_latencies,
+)
 from .health_check import SystemHealthCheck, HealthCheckResult
 
 __all__ = [
@@ -92,6 +112,12 @@ __all__ = [
     "BenchmarkCase",
     "BenchmarkLevel",
     "BenchmarkRunner",
+    "BenchmarkHarness",
+    "HarnessConfig",
+    "compare_to_baseline",
+    "load_report",
+    "save_report",
+    "summarize_latencies",
     "SystemHealthCheck",
     "HealthCheckResult",
 ]
@@ -0,0 +1,561 @@
+"""
+Benchmark Harness Module
+
+Runs benchmark cases concurrently against the real agent loop and reports
+latency distributions instead of averages.
+
+Cases from BenchmarkCases are spread over a process pool (or an asyncio pool
+of threads) and every run is instrumented per phase - plan, tools, reflect,
+DB, LLM wait. The report has p50/p95/p99 and histograms per phase, throughput
+and peak RSS. It is saved as JSON (and optionally Parquet) stamped with the
+git revision, and can be compared against a stored baseline to flag
+regressions. The LLM is always the offline MockLLMProvider, so runs need no
+network and are reproducible.
+
+Usage:
+    python -m backend.agentic_engine.testing.benchmark_harness \\
+        --concurrency 4 --repeat 3 --output bench.json --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .benchmark_cases import BenchmarkCase, BenchmarkCases, BenchmarkLevel
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("plan", "tools", "reflect", "db", "llm_wait")
+# Upper bucket bounds in milliseconds; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+POOL_MODES = ("process", "async")
+
+
+@dataclass
+class HarnessConfig:
+    """
+    Benchmark harness settings.
+
+    Attributes:
+        concurrency: Number of worker processes (or concurrent async tasks)
+        mode: "process" for a process pool, "async" for asyncio + threads
+        repeat: How many times each selected case is run
+        levels: Benchmark levels to include (all if empty)
+        max_cases_per_level: Cap on distinct cases per level (all if None)
+        max_steps: AgentLoop max_steps for every run
+        enable_reflection: Run the reflection phase after each step
+        reflection_mode: "per_step" or "batched" reflection (see AgentLoop)
+        reflection_window: Steps per batched reflection call, 0 for the whole plan
+        speculative_reflection: Reflect in the background while the next
+            step executes
+        with_db: Give each worker an in-memory SQLite database so entity
+            lookups and memory writes are exercised and timed
+        mock_llm: MockLLMConfig overrides for the offline provider
+    """
+
+    concurrency: int = 4
+    mode: str = "process"
+    repeat: int = 1
+    levels: List[str] = field(default_factory=list)
+    max_cases_per_level: Optional[int] = None
+    max_steps: int = 5
+    enable_reflection: bool = True
+    reflection_mode: str = "per_step"
+    reflection_window: int = 0
+    speculative_reflection: bool = False
+    with_db: bool = True
+    mock_llm: Dict[str, Any] = field(default_factory=lambda: {"latency_ms": 20.0, "tokens_per_second": 0.0})
+
+    def __post_init__(self):
+        if self.mode not in POOL_MODES:
+            raise ValueError(f"Unknown pool mode '{self.mode}', expected one of {POOL_MODES}")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PhaseRecorder:
+    """Thread-safe collector of per-phase latency samples (seconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.samples[phase].append(seconds)
+
+    def drain(self) -> Dict[str, List[float]]:
+        """Return collected samples and start over."""
+        with self._lock:
+            samples = self.samples
+            self.samples = {phase: [] for phase in PHASES}
+        return samples
+
+    def timed(self, phase: str, func: Callable) -> Callable:
+        """Wrap a callable so each call is recorded under phase."""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+        return wrapper
+
+    def timed_iter(self, phase: str, func: Callable[..., Iterator]) -> Callable[..., Iterator]:
+        """Wrap a generator function; records the time until it is exhausted."""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                yield from func(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+        return wrapper
+
+    def attach_db(self, engine: Any) -> None:
+        """Time every SQL statement executed on a SQLAlchemy engine."""
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("_bench_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("_bench_query_start")
+            if starts:
+                self.add("db", time.perf_counter() - starts.pop())
+
+
+def _build_worker(config: Dict[str, Any], provider: Any = None) -> Dict[str, Any]:
+    """Create an instrumented orchestrator wired to the offline LLM provider."""
+    from backend.agentic_engine.orchestrator import AgenticAIOrchestrator
+    from backend.utils.llm_client import LLMClient
+    from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider
+
+    recorder = PhaseRecorder()
+    session = None
+    if config["with_db"]:
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+        from backend.db.base import Base
+        from backend.db import models  # noqa: F401 - register tables
+
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+        recorder.attach_db(engine)
+        session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    orchestrator = AgenticAIOrchestrator(
+        config={
+            "max_steps": config["max_steps"],
+            "enable_reflection": config["enable_reflection"],
+            "enable_memory": config["with_db"],
+            "reflection_mode": config.get("reflection_mode"),
+            "reflection_window": config.get("reflection_window"),
+            "speculative_reflection": config.get("speculative_reflection"),
+        },
+        db_session=session,
+    )
+    loop = orchestrator.agent_loop
+    # Offline: never let a benchmark reach out over HTTP
+    loop.tools.pop("http_tool", None)
+
+    engine = loop.reasoning_engine
+    llm_client = LLMClient(provider="mock")
+    llm_client.client = provider or MockLLMProvider(MockLLMConfig(**config["mock_llm"]))
+    llm_client.run_compliance_analysis = recorder.timed("llm_wait", llm_client.run_compliance_analysis)
+    llm_client.stream_compliance_analysis = recorder.timed_iter("llm_wait", llm_client.stream_compliance_analysis)
+    engine.llm_client = llm_client
+    engine.mock_mode = False
+
+    loop.generate_plan = recorder.timed("plan", loop.generate_plan)
+    engine.stream_plan = recorder.timed_iter("plan", engine.stream_plan)
+    loop.execute_tools = recorder.timed("tools", loop.execute_tools)
+    loop.reflect_on_step = recorder.timed("reflect", loop.reflect_on_step)
+    loop.reflect_on_steps = recorder.timed("reflect", loop.reflect_on_steps)
+
+    return {"orchestrator": orchestrator, "recorder": recorder, "session": session}
+
+
+_worker_local = threading.local()
+_worker_config: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Process pool initializer: quiet logging and remember the config."""
+    global _worker_config
+    _worker_config = config
+    logging.disable(logging.WARNING)
+
+
+def _peak_rss_bytes(who: Optional[int] = None) -> int:
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(usage if sys.platform == "darwin" else usage * 1024)
+
+
+def _run_case(case: Dict[str, Any], config: Optional[Dict[str, Any]] = None, provider: Any = None) -> Dict[str, Any]:
+    """Run one case on this thread's orchestrator and return its record."""
+    worker = getattr(_worker_local, "worker", None)
+    if worker is None:
+        worker = _build_worker(config or _worker_config, provider)
+        _worker_local.worker = worker
+    orchestrator, recorder = worker["orchestrator"], worker["recorder"]
+    recorder.drain()
+
+    status, error, steps = "success", None, 0
+    start = time.perf_counter()
+    try:
+        result = orchestrator.run(
+            task=case["task_description"],
+            context={"entity": case["entity_context"], "task": case["task_context"]},
+            max_iterations=max(3, (config or _worker_config)["max_steps"]),
+        )
+        steps = len(result.get("step_outputs", []))
+        if result.get("error"):
+            status, error = "error", result["error"]
+    except Exception as e:
+        status, error = "error", str(e)
+        if worker["session"] is not None:
+            worker["session"].rollback()
+    wall = time.perf_counter() - start
+
+    phases = recorder.drain()
+    return {
+        "case_id": case["case_id"],
+        "level": case["level"],
+        "iteration": case.get("iteration", 0),
+        "status": status,
+        "error": error,
+        "wall_s": wall,
+        "steps": steps,
+        "phases": phases,
+        "phase_totals": {phase: sum(values) for phase, values in phases.items()},
+        "worker_pid": os.getpid(),
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def summarize_latencies(samples: List[float]) -> Dict[str, Any]:
+    """
+    Percentiles and a fixed-bucket histogram for latency samples.
+
+    Args:
+        samples: Latencies in seconds
+
+    Returns:
+        count, mean/p50/p95/p99/max in milliseconds, and a histogram with
+        HISTOGRAM_BOUNDS_MS upper bounds plus one overflow bucket
+    """
+    if not samples:
+        return {
+            "count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0,
+            "histogram": {"bounds_ms": list(HISTOGRAM_BOUNDS_MS), "counts": [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)},
+        }
+    values = np.asarray(samples, dtype=float) * 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    counts = np.bincount(
+        np.searchsorted(HISTOGRAM_BOUNDS_MS, values, side="left"),
+        minlength=len(HISTOGRAM_BOUNDS_MS) + 1,
+    )
+    return {
+        "count": int(values.size),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+        "histogram": {"bounds_ms": list(HISTOGRAM_BOUNDS_MS), "counts": counts.tolist()},
+    }
+
+
+def git_revision() -> str:
+    """Current git commit of the working tree, or "unknown"."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return output.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+class BenchmarkHarness:
+    """
+    Concurrent, instrumented benchmark runner for the agentic engine.
+
+    Usage:
+        harness = BenchmarkHarness(HarnessConfig(concurrency=4, repeat=2))
+        report = harness.run()
+        save_report(report, json_path="bench.json")
+        comparison = compare_to_baseline(report, load_report("baseline.json"))
+    """
+
+    def __init__(self, config: Optional[HarnessConfig] = None):
+        self.config = config or HarnessConfig()
+
+    def select_cases(self) -> List[Dict[str, Any]]:
+        """Benchmark cases to run, repeated config.repeat times."""
+        levels = [BenchmarkLevel(level) for level in self.config.levels] or list(BenchmarkLevel)
+        selected: List[BenchmarkCase] = []
+        for level in levels:
+            cases = BenchmarkCases.get_cases_by_level(level)
+            if self.config.max_cases_per_level is not None:
+                cases = cases[:self.config.max_cases_per_level]
+            selected.extend(cases)
+        return [
+            {**case.to_dict(), "iteration": iteration}
+            for iteration in range(self.config.repeat)
+            for case in selected
+        ]
+
+    def run(self) -> Dict[str, Any]:
+        """Run the selected cases and build the report."""
+        cases = self.select_cases()
+        config = self.config.to_dict()
+        logger.info(f"Benchmarking {len(cases)} case runs with {self.config.concurrency} {self.config.mode} workers")
+
+        if self.config.mode == "process":
+            records, elapsed = self._run_process(cases, config)
+        else:
+            records, elapsed = asyncio.run(self._run_async(cases, config))
+        return self._build_report(records, elapsed)
+
+    def _run_process(self, cases: List[Dict[str, Any]], config: Dict[str, Any]):
+        with ProcessPoolExecutor(
+            max_workers=self.config.concurrency,
+            initializer=_init_worker,
+            initargs=(config,),
+        ) as pool:
+            # Start every worker before the clock so process spawn is not measured
+            list(pool.map(time.sleep, [0.05] * self.config.concurrency))
+            start = time.perf_counter()
+            records = list(pool.map(_run_case, cases))
+            elapsed = time.perf_counter() - start
+        return records, elapsed
+
+    async def _run_async(self, cases: List[Dict[str, Any]], config: Dict[str, Any]):
+        from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider
+
+        provider = MockLLMProvider(MockLLMConfig(**config["mock_llm"]))
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+
+        async def _one(case):
+            async with semaphore:
+                return await asyncio.to_thread(_run_case, case, config, provider)
+
+        start = time.perf_counter()
+        records = await asyncio.gather(*(_one(case) for case in cases))
+        return list(records), time.perf_counter() - start
+
+    def _build_report(self, records: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+        succeeded = [r for r in records if r["status"] == "success"]
+        phase_samples = {phase: [] for phase in PHASES}
+        for record in records:
+            for phase, values in record.pop("phases").items():
+                phase_samples[phase].extend(values)
+
+        return {
+            "meta": {
+                "git_revision": git_revision(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "config": self.config.to_dict(),
+            },
+            "summary": {
+                "cases": len(records),
+                "succeeded": len(succeeded),
+                "failed": len(records) - len(succeeded),
+                "elapsed_s": round(elapsed, 3),
+                "throughput_cases_per_s": round(len(records) / elapsed, 3) if elapsed > 0 else 0.0,
+                "peak_rss_bytes": max([_peak_rss_bytes()] + [r["peak_rss_bytes"] for r in records]),
+                "latency": summarize_latencies([r["wall_s"] for r in records]),
+                "phases": {phase: summarize_latencies(values) for phase, values in phase_samples.items()},
+            },
+            "cases": records,
+        }
+
+
+def save_report(
+    report: Dict[str, Any],
+    json_path: Optional[str] = None,
+    parquet_path: Optional[str] = None
+) -> None:
+    """
+    Persist a report as JSON and/or per-case Parquet rows.
+
+    The Parquet file has one row per case run with phase totals in seconds
+    and the git revision, ready for trend analysis across revisions.
+    """
+    if json_path:
+        Path(json_path).write_text(json.dumps(report, indent=2, default=str))
+    if parquet_path:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        revision = report["meta"]["git_revision"]
+        rows = [
+            {
+                "git_revision": revision,
+                "case_id": r["case_id"],
+                "level": r["level"],
+                "iteration": r["iteration"],
+                "status": r["status"],
+                "wall_s": r["wall_s"],
+                "steps": r["steps"],
+                "worker_pid": r["worker_pid"],
+                "peak_rss_bytes": r["peak_rss_bytes"],
+                **{f"{phase}_s": r["phase_totals"].get(phase, 0.0) for phase in PHASES},
+            }
+            for r in report["cases"]
+        ]
+        pq.write_table(pa.Table.from_pylist(rows), parquet_path)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Load a JSON report written by save_report()."""
+    return json.loads(Path(path).read_text())
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.10,
+    min_delta_ms: float = 1.0
+) -> Dict[str, Any]:
+    """
+    Compare a report's summary against a baseline report.
+
+    Latency percentiles and peak RSS regress when they grow by more than
+    tolerance; throughput regresses when it drops by more than tolerance.
+    Latency changes smaller than min_delta_ms are ignored as noise.
+
+    Returns:
+        Dictionary with regressions, improvements (lists of metric, baseline,
+        current, change_pct) and passed
+    """
+    current, base = report["summary"], baseline["summary"]
+    checks = []  # (metric, baseline, current, higher_is_better, min_delta)
+    for stat in ("p50_ms", "p95_ms", "p99_ms"):
+        checks.append((f"latency.{stat}", base["latency"][stat], current["latency"][stat], False, min_delta_ms))
+    for phase in PHASES:
+        base_phase = base.get("phases", {}).get(phase)
+        if base_phase and base_phase.get("count"):
+            checks.append((f"{phase}.p95_ms", base_phase["p95_ms"], current["phases"][phase]["p95_ms"], False, min_delta_ms))
+    checks.append(("throughput_cases_per_s", base["throughput_cases_per_s"], current["throughput_cases_per_s"], True, 0.0))
+    checks.append(("peak_rss_bytes", base["peak_rss_bytes"], current["peak_rss_bytes"], False, 0.0))
+
+    regressions, improvements = [], []
+    for metric, old, new, higher_is_better, min_delta in checks:
+        if not old or abs(new - old) < min_delta:
+            continue
+        change = (new - old) / old
+        entry = {"metric": metric, "baseline": old, "current": new, "change_pct": round(change * 100, 1)}
+        worse = change < -tolerance if higher_is_better else change > tolerance
+        better = change > tolerance if higher_is_better else change < -tolerance
+        if worse:
+            regressions.append(entry)
+        elif better:
+            improvements.append(entry)
+
+    return {
+        "baseline_revision": baseline.get("meta", {}).get("git_revision"),
+        "current_revision": report.get("meta", {}).get("git_revision"),
+        "tolerance": tolerance,
+        "regressions": regressions,
+        "improvements": improvements,
+        "passed": not regressions,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the agentic benchmark harness offline")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--mode", choices=POOL_MODES, default="process")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--levels", nargs="*", default=[], choices=[level.value for level in BenchmarkLevel])
+    parser.add_argument("--max-cases-per-level", type=int, default=None)
+    parser.add_argument("--max-steps", type=int, default=5)
+    parser.add_argument("--no-reflection", action="store_true")
+    parser.add_argument("--reflection-mode", choices=("per_step", "batched"), default="per_step")
+    parser.add_argument("--reflection-window", type=int, default=0)
+    parser.add_argument("--speculative-reflection", action="store_true")
+    parser.add_argument("--no-db", action="store_true")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--parquet", help="Write per-case rows as Parquet here")
+    parser.add_argument("--baseline", help="Baseline JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    config = HarnessConfig(
+        concurrency=args.concurrency,
+        mode=args.mode,
+        repeat=args.repeat,
+        levels=args.levels,
+        max_cases_per_level=args.max_cases_per_level,
+        max_steps=args.max_steps,
+        enable_reflection=not args.no_reflection,
+        reflection_mode=args.reflection_mode,
+        reflection_window=args.reflection_window,
+        speculative_reflection=args.speculative_reflection,
+        with_db=not args.no_db,
+        mock_llm={
+            "latency_ms": args.llm_latency_ms,
+            "tokens_per_second": args.llm_tokens_per_second,
+            "error_rate": args.llm_error_rate,
+        },
+    )
+    logging.basicConfig(level=logging.WARNING)
+    report = BenchmarkHarness(config).run()
+    save_report(report, json_path=args.output, parquet_path=args.parquet)
+
+    summary = report["summary"]
+    print(
+        f"{summary['cases']} runs ({summary['failed']} failed) in {summary['elapsed_s']}s - "
+        f"{summary['throughput_cases_per_s']} runs/s, peak RSS {summary['peak_rss_bytes'] / 1e6:.1f} MB"
+    )
+    for name, stats in [("total", summary["latency"])] + list(summary["phases"].items()):
+        print(f"  {name:<9} n={stats['count']:<5} p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms")
+
+    if args.baseline:
+        comparison = compare_to_baseline(report, load_report(args.baseline), tolerance=args.tolerance)
+        for entry in comparison["regressions"]:
+            print(f"  REGRESSION {entry['metric']}: {entry['baseline']} -> {entry['current']} ({entry['change_pct']:+}%)")
+        if not comparison["passed"]:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -98,6 +98,11 @@ class FailureSimulator:
                     )
                 tool.get_sync = wrapped_http
         
+        # Results cached by earlier runs would bypass the wrapped tools
+        tool_cache = getattr(self.orchestrator.agent_loop, "tool_cache", None)
+        if tool_cache is not None:
+            tool_cache.clear()
+        
         start_time = time.time()
         recovery_timeline = []
         
@@ -0,0 +1,127 @@
+"""
+Orchestrator Pool Benchmark
+===========================
+Compares building an AgenticAIOrchestrator per request with sharing a pooled
+one (get_orchestrator) across concurrent runs.
+
+Two things are measured:
+
+- setup: wall time to obtain an orchestrator for a request, with the real
+  OpenAI client configured (a dummy key; construction makes no network call)
+- throughput: runs per second for N concurrent threads, each run a full
+  plan-execute-reflect loop against the offline MockLLMProvider
+
+Usage:
+    python -m backend.agentic_engine.testing.orchestrator_benchmark \\
+        [--runs 64] [--concurrency 1 8] [--latency-ms 20]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import settings
+
+CONFIG = {"enable_reflection": True, "enable_memory": False}
+CONTEXT = {
+    "entity": {"entity_name": "Acme Corp", "locations": ["European Union"]},
+    "task": {"task_description": "Update privacy notice for GDPR"},
+}
+MAX_STEPS = 3
+
+
+def _per_request(config: Dict[str, Any]) -> Any:
+    from backend.agentic_engine.orchestrator import AgenticAIOrchestrator
+    return AgenticAIOrchestrator(config=config)
+
+
+def _pooled(config: Dict[str, Any]) -> Any:
+    from backend.agentic_engine.orchestrator import get_orchestrator
+    return get_orchestrator(config)
+
+
+STRATEGIES: Dict[str, Callable[[Dict[str, Any]], Any]] = {"per_request": _per_request, "pooled": _pooled}
+
+
+def _setup_ms(strategy: Callable[[Dict[str, Any]], Any], repeats: int) -> float:
+    """Median milliseconds to obtain an orchestrator (after one warm-up)"""
+    strategy(CONFIG)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        strategy(CONFIG)
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def _throughput(strategy: Callable[[Dict[str, Any]], Any], runs: int, concurrency: int) -> Dict[str, Any]:
+    """Runs per second and failed run count for ``concurrency`` threads"""
+    def _request(_: int) -> bool:
+        result = strategy(CONFIG).run("Update privacy notice for GDPR", CONTEXT, MAX_STEPS, max_steps=MAX_STEPS)
+        return not result.get("error") and len(result["step_outputs"]) == MAX_STEPS
+
+    strategy(CONFIG)
+    with ThreadPoolExecutor(concurrency) as executor:
+        started = time.perf_counter()
+        ok = list(executor.map(_request, range(runs)))
+        elapsed = time.perf_counter() - started
+    return {"runs_per_s": round(runs / elapsed, 1), "failed": ok.count(False)}
+
+
+def benchmark(runs: int = 64, concurrency: Optional[List[int]] = None, latency_ms: float = 20.0, repeats: int = 30) -> Dict[str, Any]:
+    """
+    Setup cost and concurrent throughput, per request vs pooled.
+
+    Args:
+        runs: Runs per throughput measurement
+        concurrency: Thread counts to measure (default 1 and 8)
+        latency_ms: Fixed mock LLM latency per call
+        repeats: Timed orchestrator constructions for the setup measurement
+
+    Returns:
+        {"setup_ms": {...}, "throughput": {"<n>_threads": {...}}}
+    """
+    from backend.agentic_engine.orchestrator import clear_orchestrator_pool
+
+    names = ("OPENAI_API_KEY", "LLM_PROVIDER", "MOCK_LLM_LATENCY_MS", "MOCK_LLM_LATENCY_DISTRIBUTION", "MOCK_LLM_TOKENS_PER_SECOND")
+    saved = {name: getattr(settings, name) for name in names}
+    try:
+        results: Dict[str, Any] = {"setup_ms": {}, "throughput": {}}
+        settings.OPENAI_API_KEY, settings.LLM_PROVIDER = "sk-benchmark-offline", "openai"
+        for name, strategy in STRATEGIES.items():
+            clear_orchestrator_pool()
+            results["setup_ms"][name] = _setup_ms(strategy, repeats)
+
+        settings.LLM_PROVIDER = "mock"
+        settings.MOCK_LLM_LATENCY_MS, settings.MOCK_LLM_LATENCY_DISTRIBUTION = latency_ms, "fixed"
+        settings.MOCK_LLM_TOKENS_PER_SECOND = 0.0
+        for threads in concurrency or [1, 8]:
+            results["throughput"][f"{threads}_threads"] = {}
+            for name, strategy in STRATEGIES.items():
+                clear_orchestrator_pool()
+                results["throughput"][f"{threads}_threads"][name] = _throughput(strategy, runs, threads)
+        return results
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+        clear_orchestrator_pool()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-request vs pooled agentic orchestrators")
+    parser.add_argument("--runs", type=int, default=64, help="Runs per throughput measurement")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8], help="Thread counts")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Fixed mock LLM latency per call")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(benchmark(args.runs, args.concurrency, args.latency_ms), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
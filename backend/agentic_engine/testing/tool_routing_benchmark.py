@@ -0,0 +1,167 @@
+"""
+Tool Routing Benchmark
+======================
+Accuracy and latency of tool selection on recorded plans.
+
+Plans are recorded offline: the planner runs against the deterministic
+MockLLMProvider for every benchmark case and seed, and every resulting step
+(with its run context) is replayed through:
+
+- matcher: the compiled ToolRegistry.score_tools against the original
+  per-keyword substring scan (kept here as the reference). Reports how many
+  steps got identical scores and tool sets, and microseconds per match.
+- router: AgentLoop.execute_tools with and without the ToolRouter, running
+  the real tools. Reports tool calls, tool time, the share of executed tools
+  whose output was usable, and recall of usable tool outputs relative to
+  running every matched tool.
+
+Usage:
+    python -m backend.agentic_engine.testing.tool_routing_benchmark [--seeds 5] [--passes 3]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.agentic_engine.tools.tool_registry import ToolRegistry
+from backend.agentic_engine.tools.tool_router import ToolRouter, tool_contributed
+
+Step = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+def reference_scores(registry: ToolRegistry, step_description: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """Tool scores computed the original way: a substring test per keyword."""
+    step_lower = step_description.lower()
+    tool_scores: Dict[str, float] = {}
+    for tool_name, metadata in registry.get_all_tools().items():
+        score = 0.0
+        for keyword in metadata.keywords:
+            if keyword.lower() in step_lower:
+                score += len(keyword) * 0.1
+        for capability in metadata.capabilities:
+            for keyword in capability.keywords:
+                if keyword.lower() in step_lower:
+                    score += len(keyword) * 0.15
+        if context:
+            if tool_name == "entity_tool" and (
+                context.get("entity") or any(word in step_lower for word in ["entity", "organization", "company"])
+            ):
+                score += 5.0
+            if tool_name == "calendar_tool" and (
+                context.get("task", {}).get("deadline") or any(word in step_lower for word in ["deadline", "due date", "urgency"])
+            ):
+                score += 5.0
+            if tool_name == "task_tool" and (
+                context.get("task") or any(word in step_lower for word in ["task", "risk", "compliance"])
+            ):
+                score += 5.0
+            if tool_name == "http_tool" and ("http://" in step_lower or "https://" in step_lower or "api" in step_lower):
+                score += 5.0
+        if score > 0:
+            tool_scores[tool_name] = score
+    return tool_scores
+
+
+def record_plans(seeds: int = 5) -> List[Step]:
+    """(step, context) pairs of mock-planned runs over every benchmark case."""
+    from backend.agentic_engine.reasoning import ReasoningEngine
+    from backend.agentic_engine.testing.benchmark_cases import BenchmarkCases
+    from backend.utils.llm_client import LLMClient
+    from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider
+
+    steps: List[Step] = []
+    for seed in range(seeds):
+        engine = ReasoningEngine()
+        engine.llm_client = LLMClient(provider="mock")
+        engine.llm_client.client = MockLLMProvider(MockLLMConfig(seed=seed, latency_ms=0, tokens_per_second=0))
+        engine.mock_mode = False
+        for case in BenchmarkCases.get_all_cases():
+            context = {"entity": case.entity_context, "task": case.task_context}
+            entity = case.entity_context.get("entity_name", "Entity")
+            for step in engine.generate_plan(entity, case.task_description, context):
+                steps.append((step, context))
+    return steps
+
+
+def _same(a: Dict[str, float], b: Dict[str, float]) -> bool:
+    return a.keys() == b.keys() and all(abs(a[name] - b[name]) < 1e-9 for name in a)
+
+
+def benchmark_matcher(steps: List[Step], repeats: int = 200) -> Dict[str, Any]:
+    """Agreement with the reference scan and time per match."""
+    registry = ToolRegistry()
+    agree = sum(_same(reference_scores(registry, step["description"], context),
+                      registry.score_tools(step["description"], context)) for step, context in steps)
+
+    def _time(fn) -> float:
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for step, context in steps:
+                fn(registry, step["description"], context)
+        return (time.perf_counter() - started) / (repeats * len(steps)) * 1e6
+
+    return {
+        "steps": len(steps),
+        "identical_scores": agree,
+        "accuracy": round(agree / len(steps), 4) if steps else 1.0,
+        "reference_us": round(_time(reference_scores), 2),
+        "compiled_us": round(_time(ToolRegistry.score_tools), 2),
+    }
+
+
+def _replay(steps: List[Step], router: Optional[ToolRouter], passes: int) -> Dict[str, Any]:
+    from backend.agentic_engine.agent_loop import AgentLoop
+    from backend.agentic_engine.reasoning import ReasoningEngine
+    from backend.agentic_engine.tools import CalendarTool, EntityTool, TaskTool
+
+    tools = {"entity_tool": EntityTool(), "calendar_tool": CalendarTool(), "task_tool": TaskTool()}
+    loop = AgentLoop(
+        enable_memory=False, reasoning_engine=ReasoningEngine(), tools=tools,
+        tool_router=router, enable_tool_router=router is not None, enable_plan_cache=False, enable_tool_cache=False,
+    )
+    calls = usable = 0
+    usable_by_step: List[set] = []
+    started = time.perf_counter()
+    for _ in range(passes):
+        for step, context in steps:
+            outputs = loop.execute_tools(step, context)
+            calls += len(outputs)
+            names = {output["tool_name"] for output in outputs if tool_contributed(output["result"])}
+            usable += len(names)
+            usable_by_step.append(names)
+    return {
+        "tool_calls": calls,
+        "tool_time_ms": round((time.perf_counter() - started) * 1000, 1),
+        "usable_share": round(usable / calls, 3) if calls else 0.0,
+        "usable_by_step": usable_by_step,
+    }
+
+
+def benchmark_router(steps: List[Step], passes: int = 3) -> Dict[str, Any]:
+    """Tool calls, time and usable-output recall with and without routing."""
+    baseline = _replay(steps, None, passes)
+    router = ToolRouter.from_settings()
+    routed = _replay(steps, router, passes)
+    expected = sum(len(names) for names in baseline["usable_by_step"])
+    kept = sum(len(a & b) for a, b in zip(baseline.pop("usable_by_step"), routed.pop("usable_by_step")))
+    routed["usable_recall"] = round(kept / expected, 3) if expected else None
+    routed["router"] = {k: v for k, v in router.get_metrics().items() if k != "tools"}
+    return {"all_matched": baseline, "routed": routed}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tool matching and routing on recorded plans")
+    parser.add_argument("--seeds", type=int, default=5, help="Planner seeds to record plans with")
+    parser.add_argument("--passes", type=int, default=3, help="Replays of the recorded steps through the router")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    steps = record_plans(args.seeds)
+    print(json.dumps({"matcher": benchmark_matcher(steps), "router": benchmark_router(steps, args.passes)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
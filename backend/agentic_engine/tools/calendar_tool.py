@@ -143,7 +143,7 @@ class CalendarTool:
         try:
             # Determine base date
             if base_date:
-                start = datetime.fromisoformat(base_date.replace('Z', '+00:00'))
+                start = self._parse_iso(base_date)
             else:
                 start = datetime.now(timezone.utc)
             
@@ -161,7 +161,7 @@ class CalendarTool:
                 else:
                     # Try to parse as date
                     try:
-                        deadline = datetime.fromisoformat(deadline_text)
+                        deadline = self._parse_iso(deadline_text)
                         method = f"Direct date: {deadline_text}"
                     except Exception:
                         # Default to 30 days if parsing fails
@@ -212,7 +212,7 @@ class CalendarTool:
         try:
             # Parse deadline
             try:
-                deadline_dt = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
+                deadline_dt = self._parse_iso(deadline)
             except Exception:
                 # Try to calculate from text if ISO format parsing fails
                 calc_result = self.calculate_deadline(deadline_text=deadline)
@@ -272,6 +272,11 @@ class CalendarTool:
                 "urgency_level": "MEDIUM"
             }
     
+    def _parse_iso(self, value: str) -> datetime:
+        """Parse an ISO date or datetime, reading dates without an offset (e.g. "2025-12-31") as UTC."""
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    
     def _calculate_urgency_score(self, days_remaining: int) -> float:
         """
         Calculate base urgency score from days remaining.
@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Optional
 import logging
 from sqlalchemy.orm import Session
 
+from backend.agentic_engine.run_context import current_run
+
 
 class EntityTool:
     """
@@ -24,12 +26,25 @@ class EntityTool:
         Initialize entity tool.
         
         Args:
-            db_session: Optional database session for audit log queries
+            db_session: Optional database session for audit log queries; a
+                session given to the current agent run takes precedence
         """
-        self.db_session = db_session
+        self._db_session = db_session
         self._entity_analyzer = None
         self._logger = logging.getLogger(__name__)
     
+    @property
+    def db_session(self) -> Optional[Session]:
+        """Database session of the current agent run, else the one given at init"""
+        run = current_run()
+        if run is not None and run.db_session is not None:
+            return run.db_session
+        return self._db_session
+    
+    @db_session.setter
+    def db_session(self, value: Optional[Session]) -> None:
+        self._db_session = value
+    
     @property
     def name(self) -> str:
         """Get tool name"""
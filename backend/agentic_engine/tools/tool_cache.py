@@ -0,0 +1,188 @@
+"""
+Tool Cache Module
+
+Memoizes tool results per (tool, parameters).
+
+Within a run, and across runs on similar entities and tasks, the agent loop
+calls the same tools with identical parameters again and again (entity
+details and history, deadline calculations, task risk analysis). Whether a
+result may be reused comes from the tool's ToolRegistry metadata:
+
+- tools that are not read-only are never cached
+- cache_scope "process": the result is a pure function of its parameters and
+  is shared by every run of the loop
+- cache_scope "run": the result depends on volatile state (database, remote
+  APIs) and is only reused within the run that produced it
+- cache_ttl_s bounds how long an entry is valid in either scope
+- cache_by_date adds today's UTC date to the key, so results relative to
+  "today" are not reused after midnight
+
+Only successful results are stored, so transient failures are retried.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from backend.agentic_engine.run_context import RunContext
+from backend.agentic_engine.tools.tool_registry import ToolRegistry
+from backend.config import settings
+from backend.telemetry.metrics import CACHE_REQUESTS
+
+CACHE_SCOPES = ("process", "run", "none")
+
+# (expires_at or None, seconds the original call took, result)
+_Entry = Tuple[Optional[float], float, Any]
+
+
+def params_key(tool_name: str, params: Dict[str, Any]) -> str:
+    """Stable hash of a tool call (parameter order does not matter)."""
+    payload = json.dumps([tool_name, params], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def _cacheable(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("success") is not False and not result.get("error")
+
+
+class ToolResultCache:
+    """
+    Thread-safe tool result cache driven by ToolRegistry metadata.
+
+    Usage:
+        cache = ToolResultCache.from_settings(registry)
+        result = cache.get(run, tool_name, params)
+        if result is None:
+            result = tool.run(params)
+            cache.put(run, tool_name, params, result, seconds)
+    """
+
+    def __init__(self, registry: Optional[ToolRegistry] = None, max_entries: int = 1024):
+        """
+        Args:
+            registry: Tool metadata source (cache scope, TTL, read-only flag)
+            max_entries: Process-scoped entries kept; least recently used are
+                evicted first
+        """
+        self.registry = registry or ToolRegistry()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0, "run_hits": 0, "process_hits": 0, "misses": 0,
+            "stored": 0, "expired": 0, "evicted": 0, "seconds_saved": 0.0,
+        }
+
+    @classmethod
+    def from_settings(cls, registry: Optional[ToolRegistry] = None) -> "ToolResultCache":
+        return cls(registry=registry, max_entries=settings.AGENTIC_TOOL_CACHE_MAX_ENTRIES)
+
+    def policy(self, tool_name: str) -> Tuple[str, Optional[float]]:
+        """(scope, ttl in seconds) of a tool; unknown and writing tools get "none"."""
+        metadata = self.registry.get_tool_metadata(tool_name)
+        if metadata is None or not metadata.read_only or metadata.cache_scope not in CACHE_SCOPES:
+            return "none", None
+        return metadata.cache_scope, metadata.cache_ttl_s
+
+    def _key(self, tool_name: str, params: Dict[str, Any]) -> str:
+        """Cache key of a tool call, dated for tools whose results depend on today's date."""
+        key = params_key(tool_name, params)
+        metadata = self.registry.get_tool_metadata(tool_name)
+        return f"{key}@{_today()}" if metadata is not None and metadata.cache_by_date else key
+
+    def _store(self, run: RunContext, scope: str) -> Dict[str, _Entry]:
+        return self._entries if scope == "process" else run.tool_cache
+
+    def get(self, run: RunContext, tool_name: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Cached result of a tool call.
+
+        Returns:
+            A copy of the cached result, or None on a miss (or when the tool
+            is not cacheable)
+        """
+        scope, _ = self.policy(tool_name)
+        if scope == "none":
+            return None
+        key = self._key(tool_name, params)
+        now = time.time()
+        with self._lock:
+            store = self._store(run, scope)
+            entry = store.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                del store[key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                CACHE_REQUESTS.labels("tool", "miss").inc()
+                return None
+            if scope == "process":
+                self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats[f"{scope}_hits"] += 1
+            CACHE_REQUESTS.labels("tool", "hit").inc()
+            self._stats["seconds_saved"] += entry[1]
+            return copy.deepcopy(entry[2])
+
+    def put(self, run: RunContext, tool_name: str, params: Dict[str, Any], result: Any, seconds: float) -> bool:
+        """
+        Store a tool result if the tool and the result are cacheable.
+
+        Args:
+            run: Run the call belongs to (holds run-scoped entries)
+            seconds: How long the call took (credited on later hits)
+
+        Returns:
+            True if the result was stored
+        """
+        scope, ttl = self.policy(tool_name)
+        if scope == "none" or not _cacheable(result):
+            return False
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            store = self._store(run, scope)
+            store[self._key(tool_name, params)] = (expires_at, seconds, copy.deepcopy(result))
+            self._stats["stored"] += 1
+            if scope == "process":
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evicted"] += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop every process-scoped entry (run-scoped ones end with their run)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit/miss counts, hit rate and tool time saved."""
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "entries": entries,
+            "hits": stats["hits"],
+            "run_hits": stats["run_hits"],
+            "process_hits": stats["process_hits"],
+            "misses": stats["misses"],
+            "stored": stats["stored"],
+            "expired": stats["expired"],
+            "evicted": stats["evicted"],
+            "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+            "time_saved_ms": round(stats["seconds_saved"] * 1000, 1),
+        }
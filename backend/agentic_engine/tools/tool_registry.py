@@ -5,7 +5,8 @@ Centralized registry of all available tools with their capabilities,
 keywords, and input schemas for intelligent tool selection.
 """
 
-from typing import Dict, List, Any, Optional, Set
+import re
+from typing import Dict, Iterable, List, Any, Optional, Set
 from dataclasses import dataclass, field
 
 
@@ -38,6 +39,74 @@ class ToolMetadata:
     read_only: bool = True  # Default to read-only for safety
     requires_db: bool = False
     requires_http: bool = False
+    # Result caching for read-only tools: "process" (pure; shared across runs),
+    # "run" (volatile; reused within one run only) or "none"
+    cache_scope: str = "run"
+    cache_ttl_s: Optional[float] = None  # None = no expiry within the scope
+    cache_by_date: bool = False  # Results depend on today's (UTC) date, which is part of the cache key
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords occur in a text, in one regex pass.
+    
+    The keywords are compiled once into a single trie-shaped regex tried at
+    every position of the text (a zero-width lookahead, so overlapping
+    keywords are all seen). At each position the regex reports the longest
+    keyword starting there; every shorter keyword that is a prefix of it
+    also occurs there and is added from a precomputed table. The result is
+    exactly the set a substring test per keyword would find.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+        self._pattern = re.compile("(?=(" + self._trie_pattern(self.keywords) + "))") if self.keywords else None
+        # Keywords found implicitly wherever a longer keyword they prefix is found
+        self._prefixes = {
+            keyword: frozenset(other for other in self.keywords if keyword.startswith(other))
+            for keyword in self.keywords
+        }
+    
+    @staticmethod
+    def _trie_pattern(keywords: List[str]) -> str:
+        """Regex alternation nested by common prefix, preferring longer matches."""
+        trie: Dict[str, Any] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        
+        def _render(node: Dict[str, Any]) -> str:
+            branches = [re.escape(char) + _render(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            if "" in node:
+                # A keyword ends here: the longer continuation is optional
+                return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+            return body
+        
+        return _render(trie)
+    
+    def find(self, text: str) -> Set[str]:
+        """Keywords occurring anywhere in ``text`` (case-insensitive)."""
+        found: Set[str] = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text.lower()):
+            if match.group(1):
+                found |= self._prefixes[match.group(1)]
+        return found
+
+
+# Context bonus terms per tool: the tool gets +5.0 when any of them is in the step
+_CONTEXT_TERMS = {
+    "entity_tool": ("entity", "organization", "company"),
+    "calendar_tool": ("deadline", "due date", "urgency"),
+    "task_tool": ("task", "risk", "compliance"),
+    "http_tool": ("http://", "https://", "api"),
+}
 
 
 class ToolRegistry:
@@ -51,6 +120,21 @@ class ToolRegistry:
         """Initialize the tool registry with all available tools."""
         self._tools: Dict[str, ToolMetadata] = {}
         self._initialize_registry()
+        self._compile_matcher()
+    
+    def _compile_matcher(self):
+        """Precompute per-keyword tool weights and the single-pass keyword matcher."""
+        # keyword -> tool -> summed weight (listed keywords 0.1, capability keywords 0.15 per char)
+        self._keyword_weights: Dict[str, Dict[str, float]] = {}
+        for tool_name, metadata in self._tools.items():
+            weighted = [(keyword, 0.1) for keyword in metadata.keywords] + [
+                (keyword, 0.15) for capability in metadata.capabilities for keyword in capability.keywords
+            ]
+            for keyword, factor in weighted:
+                weights = self._keyword_weights.setdefault(keyword.lower(), {})
+                weights[tool_name] = weights.get(tool_name, 0.0) + len(keyword) * factor
+        context_terms = [term for terms in _CONTEXT_TERMS.values() for term in terms]
+        self._matcher = KeywordMatcher(list(self._keyword_weights) + context_terms)
     
     def _initialize_registry(self):
         """Initialize registry with all tool metadata."""
@@ -128,7 +212,8 @@ class ToolRegistry:
             ],
             read_only=True,
             requires_db=True,
-            requires_http=False
+            requires_http=False,
+            cache_scope="run"  # Reads the database, which other runs may change
         )
         
         # Calendar Tool
@@ -186,7 +271,10 @@ class ToolRegistry:
             ],
             read_only=True,
             requires_db=False,
-            requires_http=False
+            requires_http=False,
+            cache_scope="process",
+            cache_ttl_s=3600.0,  # days_remaining also moves with the time of day of a deadline
+            cache_by_date=True  # Results are relative to today's date
         )
         
         # HTTP Tool
@@ -238,7 +326,9 @@ class ToolRegistry:
             ],
             read_only=True,  # HTTP tool is read-only (no writes)
             requires_db=False,
-            requires_http=True
+            requires_http=True,
+            cache_scope="run",
+            cache_ttl_s=60.0
         )
         
         # Task Tool
@@ -306,7 +396,8 @@ class ToolRegistry:
             ],
             read_only=True,
             requires_db=False,
-            requires_http=False
+            requires_http=False,
+            cache_scope="process"  # Pure function of the task parameters
         )
     
     def get_tool_metadata(self, tool_name: str) -> Optional[ToolMetadata]:
@@ -333,8 +424,8 @@ class ToolRegistry:
         """
         Match tools to a step based on description and context.
         
-        Uses keyword matching and capability analysis to identify relevant tools.
-        Supports multi-tool selection.
+        Uses keyword matching and capability analysis to identify relevant tools
+        (see score_tools). Supports multi-tool selection.
         
         Args:
             step_description: Description of the step
@@ -343,66 +434,47 @@ class ToolRegistry:
         Returns:
             List of tool names that match the step
         """
-        step_lower = step_description.lower()
-        matched_tools: Set[str] = set()
+        tool_scores = self.score_tools(step_description, context)
         
-        # Score each tool based on keyword matches
+        # Select tools with score >= 2.0 (threshold for relevance)
+        threshold = 2.0
+        matched_tools = [tool_name for tool_name, score in tool_scores.items() if score >= threshold]
+        return sorted(matched_tools, key=lambda t: tool_scores.get(t, 0), reverse=True)
+    
+    def score_tools(
+        self,
+        step_description: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, float]:
+        """
+        Relevance score of every tool for a step (tools scoring 0 are omitted).
+        
+        Keywords are weighted by length (longer keywords are more specific),
+        capability keywords higher than tool keywords, plus 5.0 for a tool
+        the context or the step clearly calls for.
+        """
+        found = self._matcher.find(step_description)
         tool_scores: Dict[str, float] = {}
         
-        for tool_name, metadata in self._tools.items():
-            score = 0.0
-            
-            # Check keyword matches
-            for keyword in metadata.keywords:
-                if keyword.lower() in step_lower:
-                    # Weight by keyword length (longer keywords are more specific)
-                    score += len(keyword) * 0.1
-            
-            # Check capability keyword matches
-            for capability in metadata.capabilities:
-                for keyword in capability.keywords:
-                    if keyword.lower() in step_lower:
-                        score += len(keyword) * 0.15  # Capability keywords weighted higher
-            
-            # Context-based matching
-            if context:
-                # Check if context mentions entities
-                if tool_name == "entity_tool":
-                    if context.get("entity") or any(
-                        word in step_lower for word in ["entity", "organization", "company"]
-                    ):
-                        score += 5.0
-                
-                # Check if context mentions deadlines
-                if tool_name == "calendar_tool":
-                    if context.get("task", {}).get("deadline") or any(
-                        word in step_lower for word in ["deadline", "due date", "urgency"]
-                    ):
-                        score += 5.0
-                
-                # Check if context mentions tasks
-                if tool_name == "task_tool":
-                    if context.get("task") or any(
-                        word in step_lower for word in ["task", "risk", "compliance"]
-                    ):
-                        score += 5.0
-                
-                # Check if context mentions URLs or external APIs
-                if tool_name == "http_tool":
-                    if "http://" in step_lower or "https://" in step_lower or "api" in step_lower:
-                        score += 5.0
-            
-            if score > 0:
-                tool_scores[tool_name] = score
+        for keyword in found:
+            for tool_name, weight in self._keyword_weights.get(keyword, {}).items():
+                tool_scores[tool_name] = tool_scores.get(tool_name, 0.0) + weight
         
-        # Select tools with score >= 2.0 (threshold for relevance)
-        threshold = 2.0
-        for tool_name, score in tool_scores.items():
-            if score >= threshold:
-                matched_tools.add(tool_name)
+        # Context-based matching
+        if context:
+            task = context.get("task", {})
+            context_hints = {
+                "entity_tool": bool(context.get("entity")),
+                "calendar_tool": bool(task.get("deadline")),
+                "task_tool": bool(task),
+                "http_tool": False,
+            }
+            for tool_name, terms in _CONTEXT_TERMS.items():
+                if tool_name in self._tools and (context_hints[tool_name] or any(term in found for term in terms)):
+                    tool_scores[tool_name] = tool_scores.get(tool_name, 0.0) + 5.0
         
-        # Always return at least one tool if any match, otherwise return empty
-        return sorted(list(matched_tools), key=lambda t: tool_scores.get(t, 0), reverse=True)
+        # Registry order, so ties rank as they always have
+        return {tool_name: tool_scores[tool_name] for tool_name in self._tools if tool_scores.get(tool_name, 0) > 0}
     
     def get_tool_capabilities(self, tool_name: str) -> List[str]:
         """
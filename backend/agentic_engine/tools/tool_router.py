@@ -0,0 +1,200 @@
+"""
+Tool Router Module
+
+Learns which matched tools are worth running for a step.
+
+ToolRegistry.match_tools_to_step picks tools by keyword relevance only, so a
+step often runs tools whose output it never gets anything from. The router
+sits after the matcher: for every (step type, tool) pair it keeps how often
+the tool produced a usable result and, per tool, a moving average of its
+latency. A tool is skipped for a step type once enough runs show it rarely
+contributes, and within a per-step latency budget expensive tools are only
+run when they are likely to contribute. Skipped tools are still run every
+``explore_every``-th time so their statistics can recover.
+
+The step type is the step description's leading verb ("identify", "assess",
+"review", ...); planners phrase steps of the same kind the same way.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.config import settings
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def step_type(step: Dict[str, Any]) -> str:
+    """Leading verb of a step description ("other" when there is none)."""
+    match = _WORD.search(str(step.get("description", "")).lower())
+    return match.group(0) if match else "other"
+
+
+def tool_contributed(result: Any) -> bool:
+    """Whether a tool result carries usable output (succeeded and is not empty)."""
+    if not isinstance(result, dict):
+        return bool(result)
+    if result.get("success") is False or result.get("error"):
+        return False
+    return any(value not in (None, "", [], {}) for key, value in result.items() if key != "success")
+
+
+@dataclass
+class _ToolStats:
+    runs: int = 0
+    contributed: int = 0
+    skipped: int = 0
+
+
+class ToolRouter:
+    """
+    Cost- and latency-aware selection among matched tools.
+
+    Usage:
+        router = ToolRouter.from_settings()
+        tools = router.route(step, candidate_tools)
+        ...
+        router.record(step, tool_name, seconds, tool_result)
+    """
+
+    def __init__(
+        self,
+        latency_budget_ms: float = 2000.0,
+        min_samples: int = 10,
+        min_value: float = 0.2,
+        budget_value: float = 0.5,
+        explore_every: int = 10,
+        latency_smoothing: float = 0.2
+    ):
+        """
+        Args:
+            latency_budget_ms: Expected tool time allowed per step (0 = no budget)
+            min_samples: Runs of a (step type, tool) pair before it can be skipped
+                as low value
+            min_value: Contribution rate below which a tool is skipped
+            budget_value: Contribution rate a tool needs to run when its expected
+                latency exceeds what is left of the budget
+            explore_every: Run a skipped tool anyway every N-th time (0 = never)
+            latency_smoothing: Weight of a new sample in the latency average
+        """
+        self.latency_budget_ms = latency_budget_ms
+        self.min_samples = min_samples
+        self.min_value = min_value
+        self.budget_value = budget_value
+        self.explore_every = explore_every
+        self.latency_smoothing = latency_smoothing
+        self._stats: Dict[Tuple[str, str], _ToolStats] = {}
+        self._latency_ms: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "decisions": 0, "selected": 0, "skipped_low_value": 0, "skipped_budget": 0,
+            "explored": 0, "latency_saved_ms": 0.0,
+        }
+
+    @classmethod
+    def from_settings(cls) -> "ToolRouter":
+        return cls(
+            latency_budget_ms=settings.AGENTIC_TOOL_LATENCY_BUDGET_MS,
+            min_samples=settings.AGENTIC_TOOL_ROUTER_MIN_SAMPLES,
+            min_value=settings.AGENTIC_TOOL_ROUTER_MIN_VALUE,
+        )
+
+    def value(self, kind: str, tool_name: str) -> float:
+        """Smoothed contribution rate of a tool for a step type (0.5 with no data)."""
+        with self._lock:
+            stats = self._stats.get((kind, tool_name))
+            return self._value(stats)
+
+    def expected_latency_ms(self, tool_name: str) -> float:
+        """Moving-average latency of a tool (0 until it has run)."""
+        with self._lock:
+            return self._latency_ms.get(tool_name, 0.0)
+
+    @staticmethod
+    def _value(stats: Optional[_ToolStats]) -> float:
+        if stats is None:
+            return 0.5
+        return (stats.contributed + 1) / (stats.runs + 2)
+
+    def route(self, step: Dict[str, Any], candidates: Iterable[str]) -> List[str]:
+        """
+        Tools to run for a step, in candidate order.
+
+        Args:
+            step: Plan step (its description gives the step type)
+            candidates: Matched tool names, most relevant first
+
+        Returns:
+            The candidates worth running
+        """
+        kind = step_type(step)
+        candidates = list(dict.fromkeys(candidates))
+        with self._lock:
+            self._counters["decisions"] += 1
+            keep = []
+            for tool_name in candidates:
+                stats = self._stats.setdefault((kind, tool_name), _ToolStats())
+                if stats.runs >= self.min_samples and self._value(stats) < self.min_value:
+                    if not self._explore(stats, tool_name, "skipped_low_value"):
+                        continue
+                keep.append(tool_name)
+
+            # Spend the latency budget on the most valuable tools first
+            selected = set()
+            remaining = self.latency_budget_ms
+            for tool_name in sorted(keep, key=lambda name: self._value(self._stats[(kind, name)]), reverse=True):
+                latency = self._latency_ms.get(tool_name, 0.0)
+                stats = self._stats[(kind, tool_name)]
+                if (
+                    self.latency_budget_ms > 0
+                    and latency > remaining
+                    and self._value(stats) < self.budget_value
+                    and not self._explore(stats, tool_name, "skipped_budget")
+                ):
+                    continue
+                selected.add(tool_name)
+                remaining -= latency
+            self._counters["selected"] += len(selected)
+            return [tool_name for tool_name in candidates if tool_name in selected]
+
+    def _explore(self, stats: _ToolStats, tool_name: str, reason: str) -> bool:
+        """Count a skip; True on the turns a skipped tool is run anyway (lock held)."""
+        stats.skipped += 1
+        if self.explore_every and stats.skipped % self.explore_every == 0:
+            self._counters["explored"] += 1
+            return True
+        self._counters[reason] += 1
+        self._counters["latency_saved_ms"] += self._latency_ms.get(tool_name, 0.0)
+        return False
+
+    def record(self, step: Dict[str, Any], tool_name: str, seconds: float, result: Any) -> None:
+        """Record one tool run: its latency and whether its output was usable."""
+        latency_ms = seconds * 1000.0
+        with self._lock:
+            stats = self._stats.setdefault((step_type(step), tool_name), _ToolStats())
+            stats.runs += 1
+            stats.contributed += int(tool_contributed(result))
+            previous = self._latency_ms.get(tool_name)
+            self._latency_ms[tool_name] = (
+                latency_ms if previous is None else previous + self.latency_smoothing * (latency_ms - previous)
+            )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Routing counters and per step type/tool contribution and latency."""
+        with self._lock:
+            metrics: Dict[str, Any] = dict(self._counters)
+            metrics["latency_saved_ms"] = round(metrics["latency_saved_ms"], 1)
+            metrics["tools"] = {
+                f"{kind}/{tool_name}": {
+                    "runs": stats.runs,
+                    "contributed": stats.contributed,
+                    "value": round(self._value(stats), 3),
+                    "skipped": stats.skipped,
+                    "latency_ms": round(self._latency_ms.get(tool_name, 0.0), 3),
+                }
+                for (kind, tool_name), stats in sorted(self._stats.items())
+                if stats.runs or stats.skipped
+            }
+        return metrics
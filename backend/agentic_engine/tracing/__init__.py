@@ -0,0 +1,18 @@
+"""
+Tracing Module
+
+Execution traces of agent loop runs (LLM, tool, DB and reflection spans),
+stored compactly and replayable offline with recorded responses.
+"""
+
+from .recorder import ExecutionTrace, Span, TraceRecorder, current_trace, trace_span
+from .replay import ReplayEngine
+
+__all__ = [
+    "ExecutionTrace",
+    "Span",
+    "TraceRecorder",
+    "current_trace",
+    "trace_span",
+    "ReplayEngine",
+]
@@ -0,0 +1,270 @@
+"""
+Trace Recorder Module
+
+Structured execution traces of AgentLoop runs.
+
+A trace is a flat list of spans, each with a kind, a parent and timings
+relative to the start of the run:
+
+- run: the whole AgentLoop.execute() call
+- plan: plan generation, or reuse of a cached plan (cache_hit)
+- step: one executed plan step
+- tool: one tool call (params hash, cache_hit); its payload holds the
+  parameters and the result
+- llm: one LLM call (prompt hash, call type, prompt/completion tokens,
+  streamed); its payload holds the response
+- reflection: one reflect call over one or more steps
+- db: one SQL statement issued while the run was active
+
+The recorder hangs off the RunContext, so shared components find it with
+current_trace() and record nothing (one context-variable lookup) when the
+run is not traced. Payloads of llm and tool spans are what ReplayEngine
+serves back when the run is replayed.
+
+Traces are stored as zstd-compressed MessagePack.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import ormsgpack
+import zstandard
+
+from backend.agentic_engine.run_context import current_run
+
+TRACE_FORMAT = b"AGTR1"
+SPAN_KINDS = ("run", "plan", "step", "tool", "llm", "reflection", "db")
+
+_current_span: ContextVar[Optional[int]] = ContextVar("agentic_current_span", default=None)
+
+# Parts of a prompt that differ between otherwise identical runs (step and tool
+# output timestamps, measured step and pass times)
+_VOLATILE = re.compile(
+    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?"
+    r'|"(?:execution_time|latency_ms)":\s*[-+.\deE]+'
+)
+
+
+def prompt_hash(prompt: str) -> str:
+    """Short hash identifying a prompt, ignoring its timestamps and timings."""
+    return hashlib.sha1(_VOLATILE.sub("~", prompt).encode("utf-8")).hexdigest()[:16]
+
+
+def _plain(value: Any) -> Any:
+    """JSON-compatible copy of a value (non-serializable leaves become strings)."""
+    return json.loads(json.dumps(value, default=str))
+
+
+@dataclass
+class Span:
+    """One timed operation of a run."""
+
+    span_id: int
+    parent_id: Optional[int]
+    kind: str
+    name: str
+    start_ms: float
+    duration_ms: float = 0.0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    payload: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ExecutionTrace:
+    """A recorded run: its inputs, loop configuration, spans and outcome."""
+
+    trace_id: str
+    started_at: str
+    entity: str = ""
+    task: str = ""
+    context: Dict[str, Any] = field(default_factory=dict)
+    config: Dict[str, Any] = field(default_factory=dict)
+    spans: List[Span] = field(default_factory=list)
+    outcome: Dict[str, Any] = field(default_factory=dict)
+
+    def spans_of(self, kind: str) -> List[Span]:
+        """Spans of one kind, in start order."""
+        return sorted((span for span in self.spans if span.kind == kind), key=lambda span: span.start_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-kind span count and total/max duration, plus LLM token totals."""
+        kinds: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            stats = kinds.setdefault(span.kind, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+            stats["count"] += 1
+            stats["total_ms"] += span.duration_ms
+            stats["max_ms"] = max(stats["max_ms"], span.duration_ms)
+            stats["errors"] += int(span.error is not None)
+        for stats in kinds.values():
+            stats["total_ms"] = round(stats["total_ms"], 3)
+            stats["max_ms"] = round(stats["max_ms"], 3)
+        llm = self.spans_of("llm")
+        return {
+            "trace_id": self.trace_id,
+            "duration_ms": round(max((span.start_ms + span.duration_ms for span in self.spans), default=0.0), 3),
+            "spans": kinds,
+            "prompt_tokens": sum(span.attrs.get("prompt_tokens", 0) for span in llm),
+            "completion_tokens": sum(span.attrs.get("completion_tokens", 0) for span in llm),
+            "cache_hits": sum(1 for span in self.spans if span.attrs.get("cache_hit")),
+        }
+
+    def to_bytes(self, level: int = 3) -> bytes:
+        """Serialize as a format tag followed by zstd-compressed MessagePack."""
+        packed = ormsgpack.packb(asdict(self), default=str, option=ormsgpack.OPT_NON_STR_KEYS)
+        return TRACE_FORMAT + zstandard.ZstdCompressor(level=level).compress(packed)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ExecutionTrace":
+        if not data.startswith(TRACE_FORMAT):
+            raise ValueError("Not an agent execution trace")
+        raw = ormsgpack.unpackb(zstandard.ZstdDecompressor().decompress(data[len(TRACE_FORMAT):]))
+        raw["spans"] = [Span(**span) for span in raw.get("spans", [])]
+        return cls(**raw)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ExecutionTrace":
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+class TraceRecorder:
+    """
+    Collects the spans of one run (thread-safe; spans may come from the
+    plan prefetch and speculative reflection threads).
+
+    Usage:
+        run.trace = TraceRecorder(config=...)
+        with trace_span("step", step_id) as span:
+            ...
+        trace = run.trace.finish(outcome)
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, trace_id: Optional[str] = None):
+        self.trace = ExecutionTrace(
+            trace_id=trace_id or uuid.uuid4().hex,
+            started_at=datetime.now(timezone.utc).isoformat(),
+            config=dict(config or {}),
+        )
+        self._origin = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def set_input(self, entity: str, task: str, context: Optional[Dict[str, Any]]) -> None:
+        """Record what the run was asked to do (context as the planner sees it)."""
+        self.trace.entity = entity
+        self.trace.task = task
+        self.trace.context = _plain(context or {})
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000.0
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attrs: Any) -> Iterator[Span]:
+        """Time a block as a child of the current span; exceptions are noted and re-raised."""
+        span = Span(span_id=next(self._ids), parent_id=_current_span.get(), kind=kind, name=name,
+                    start_ms=self._now_ms(), attrs=attrs)
+        token = _current_span.set(span.span_id)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration_ms = self._now_ms() - span.start_ms
+            self._append(span)
+
+    def add_span(
+        self,
+        kind: str,
+        name: str,
+        started: float,
+        ended: float,
+        attrs: Optional[Dict[str, Any]] = None,
+        payload: Any = None,
+        error: Optional[str] = None
+    ) -> Span:
+        """Record an operation timed elsewhere (perf_counter start/end)."""
+        span = Span(
+            span_id=next(self._ids), parent_id=_current_span.get(), kind=kind, name=name,
+            start_ms=(started - self._origin) * 1000.0, duration_ms=(ended - started) * 1000.0,
+            attrs=attrs or {}, payload=payload, error=error,
+        )
+        self._append(span)
+        return span
+
+    def _append(self, span: Span) -> None:
+        if span.payload is not None:
+            span.payload = _plain(span.payload)
+        with self._lock:
+            self.trace.spans.append(span)
+
+    def finish(self, outcome: Optional[Dict[str, Any]] = None) -> ExecutionTrace:
+        """Attach the run's outcome and return the trace with spans in start order."""
+        with self._lock:
+            self.trace.outcome = _plain(outcome or {})
+            self.trace.spans.sort(key=lambda span: (span.start_ms, span.span_id))
+        return self.trace
+
+
+def current_trace() -> Optional[TraceRecorder]:
+    """Recorder of the active run, or None when the run is not traced."""
+    run = current_run()
+    return run.trace if run is not None else None
+
+
+def trace_span(kind: str, name: str, **attrs: Any):
+    """Span context manager on the active run's trace; yields None when not tracing."""
+    recorder = current_trace()
+    if recorder is None:
+        return nullcontext()
+    return recorder.span(kind, name, **attrs)
+
+
+_db_hooks_installed = False
+_db_hooks_lock = threading.Lock()
+
+
+def install_db_hooks() -> None:
+    """Record SQL statements issued during traced runs as db spans (idempotent)."""
+    global _db_hooks_installed
+    with _db_hooks_lock:
+        if _db_hooks_installed:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        @event.listens_for(Engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            if current_trace() is not None:
+                conn.info.setdefault("agentic_trace_started", []).append(time.perf_counter())
+
+        @event.listens_for(Engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            recorder = current_trace()
+            started = conn.info.get("agentic_trace_started")
+            if recorder is None or not started:
+                return
+            verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+            recorder.add_span("db", verb, started.pop(), time.perf_counter(), {
+                "statement": statement[:500], "rowcount": getattr(cursor, "rowcount", -1),
+            })
+
+        _db_hooks_installed = True
@@ -0,0 +1,289 @@
+"""
+Replay Engine Module
+
+Re-executes a recorded AgentLoop run with LLM and tool responses served from
+its trace.
+
+The replayed run is built from the trace's loop configuration with stand-ins
+for every external dependency:
+
+- ReplayLLMClient answers each LLM call with the recorded response for the
+  same prompt hash (falling back to the next unused response in recorded
+  order when the prompt changed)
+- ReplayTool returns the recorded result of the same tool call
+- ReplayToolCache serves the calls the recorded run answered from its tool
+  cache as cache hits again
+- ReplayRouter selects, for each step, the tools the recorded run executed
+- a cached plan the recorded run reused (or was seeded with) is preloaded
+- memory is off; the recorded context already includes what memory added
+
+Everything else (prompt building, parsing, multi-pass control, reflection
+scheduling, hallucination checks, risk and recommendation) runs for real, so
+a replay reproduces the run's outcome without network or database access and
+its own trace measures the engine's overhead. With ``latency="recorded"``
+each served response waits as long as the recorded call took.
+
+Usage:
+    trace = ExecutionTrace.load("traces/<trace_id>.trace")
+    report = ReplayEngine(trace).run()
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from backend.agentic_engine.tools.tool_cache import ToolResultCache, params_key
+from backend.agentic_engine.tools.tool_router import ToolRouter
+from backend.agentic_engine.tracing.recorder import ExecutionTrace, Span, TraceRecorder, prompt_hash
+from backend.utils.llm_client import LLMResponse
+
+REPLAY_LATENCIES = ("none", "recorded")
+
+
+class _SpanQueue:
+    """Recorded spans served by key, then in recorded order once keys stop matching."""
+
+    def __init__(self, spans: List[Span], key_attr: str, latency: str):
+        self.latency = latency
+        self._by_key: Dict[Any, Deque[Span]] = defaultdict(deque)
+        self._order: List[Span] = spans
+        self._used: set = set()
+        self._lock = threading.Lock()
+        self.served = 0
+        self.divergences = 0
+        for span in spans:
+            self._by_key[span.attrs.get(key_attr)].append(span)
+
+    def take(self, key: Any) -> Optional[Span]:
+        with self._lock:
+            queue = self._by_key.get(key)
+            while queue and queue[0].span_id in self._used:
+                queue.popleft()
+            if queue:
+                span = queue.popleft()
+            else:
+                span = next((span for span in self._order if span.span_id not in self._used), None)
+                self.divergences += 1
+            if span is not None:
+                self._used.add(span.span_id)
+                self.served += 1
+        if span is not None and self.latency == "recorded":
+            time.sleep(span.duration_ms / 1000.0)
+        return span
+
+    def take_if(self, key: Any, predicate: Callable[[Span], bool]) -> Optional[Span]:
+        """Next span recorded for ``key`` if it satisfies ``predicate`` (no fallback)."""
+        with self._lock:
+            queue = self._by_key.get(key)
+            while queue and queue[0].span_id in self._used:
+                queue.popleft()
+            if not queue or not predicate(queue[0]):
+                return None
+            span = queue.popleft()
+            self._used.add(span.span_id)
+            self.served += 1
+        if self.latency == "recorded":
+            time.sleep(span.duration_ms / 1000.0)
+        return span
+
+    @property
+    def unused(self) -> int:
+        with self._lock:
+            return len(self._order) - len(self._used)
+
+
+class ReplayLLMClient:
+    """LLMClient stand-in serving recorded responses."""
+
+    available = True
+
+    def __init__(self, trace: ExecutionTrace, latency: str = "none"):
+        self.model = trace.config.get("model", "")
+        self.calls = _SpanQueue(trace.spans_of("llm"), "prompt_hash", latency)
+
+    def _response(self, prompt: str) -> Dict[str, Any]:
+        span = self.calls.take(prompt_hash(prompt))
+        if span is None:
+            return {"status": "error", "error": "LLM call not in trace"}
+        return span.payload or {}
+
+    def run_compliance_analysis(
+        self,
+        prompt: str,
+        use_json_schema: bool = True,
+        timeout: Optional[float] = None
+    ) -> LLMResponse:
+        payload = self._response(prompt)
+        return LLMResponse(
+            parsed_json=payload.get("parsed_json"),
+            raw_text=payload.get("raw_text"),
+            confidence=payload.get("confidence"),
+            status=payload.get("status") or "completed",
+            error=payload.get("error"),
+        )
+
+    def stream_compliance_analysis(self, prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        payload = self._response(prompt)
+        if payload.get("raw_text"):
+            yield payload["raw_text"]
+        if payload.get("error"):
+            raise RuntimeError(payload["error"])
+
+
+class ReplayTool:
+    """Tool stand-in returning the recorded result of the same call."""
+
+    def __init__(self, name: str, calls: _SpanQueue):
+        self.name = name
+        self._calls = calls
+
+    def run(self, input: Dict[str, Any]) -> Any:
+        span = self._calls.take((self.name, params_key(self.name, input)))
+        if span is None:
+            return {"success": False, "error": f"{self.name} call not in trace"}
+        payload = span.payload or {}
+        if span.error is not None and "result" not in payload:
+            raise RuntimeError(span.error)
+        return payload.get("result")
+
+
+class ReplayToolCache(ToolResultCache):
+    """Tool cache answering exactly the calls the recorded run served from its cache."""
+
+    def __init__(self, calls: _SpanQueue):
+        super().__init__()
+        self._calls = calls
+
+    def get(self, run: Any, tool_name: str, params: Dict[str, Any]) -> Optional[Any]:
+        span = self._calls.take_if((tool_name, params_key(tool_name, params)), lambda span: span.attrs.get("cache_hit"))
+        return None if span is None else (span.payload or {}).get("result")
+
+    def put(self, run: Any, tool_name: str, params: Dict[str, Any], result: Any, seconds: float) -> bool:
+        return False
+
+
+class ReplayRouter(ToolRouter):
+    """Selects, per step, the tools the recorded run executed for it."""
+
+    def __init__(self, trace: ExecutionTrace):
+        super().__init__(latency_budget_ms=0, explore_every=0)
+        self._selected: Dict[str, Deque[List[str]]] = defaultdict(deque)
+        tools_by_step: Dict[int, List[str]] = defaultdict(list)
+        for span in trace.spans_of("tool"):
+            tools_by_step[span.parent_id].append(span.name)
+        for span in trace.spans_of("step"):
+            self._selected[span.name].append(tools_by_step.get(span.span_id, []))
+
+    def route(self, step: Dict[str, Any], candidates: Any) -> List[str]:
+        queue = self._selected.get(str(step.get("step_id")))
+        recorded = queue.popleft() if queue else []
+        return [name for name in dict.fromkeys(candidates) if name in recorded]
+
+    def record(self, step: Dict[str, Any], tool_name: str, seconds: float, result: Any) -> None:
+        pass
+
+
+class ReplayEngine:
+    """
+    Deterministic re-execution of a recorded run.
+
+    Usage:
+        report = ReplayEngine(ExecutionTrace.load(path)).run()
+        report["matches"], report["replayed"].summary()
+    """
+
+    def __init__(self, trace: ExecutionTrace, latency: str = "none"):
+        """
+        Args:
+            trace: Recorded run to replay
+            latency: "none" serves responses immediately (engine overhead
+                only); "recorded" waits as long as each recorded call took
+        """
+        if latency not in REPLAY_LATENCIES:
+            raise ValueError(f"Unknown replay latency '{latency}', expected one of {REPLAY_LATENCIES}")
+        self.trace = trace
+        self.latency = latency
+
+    def _plan_library(self) -> Tuple[Optional[Any], bool]:
+        """Library preloaded with the plan the recorded run reused or was seeded with."""
+        from backend.agentic_engine.reasoning.plan_library import PlanLibrary
+
+        for span in self.trace.spans_of("plan"):
+            cached = (span.payload or {}).get("cached_plan")
+            if cached:
+                reuse = span.attrs.get("source") == "cache"
+                library = PlanLibrary(min_quality=0.0, reuse_quality=0.0 if reuse else 2.0, evict_below=0.0)
+                library.record(self.trace.context, cached, 1.0)
+                return library, True
+        return None, False
+
+    def build_loop(self) -> Tuple[Any, ReplayLLMClient, _SpanQueue]:
+        """AgentLoop configured as recorded, with every external call served from the trace."""
+        from backend.agentic_engine.agent_loop import AgentLoop
+        from backend.agentic_engine.reasoning.reasoning_engine import ReasoningEngine
+
+        config = self.trace.config
+        engine = ReasoningEngine(
+            model=config.get("model") or None,
+            enable_multi_pass=config.get("enable_multi_pass", True),
+            max_reasoning_passes=config.get("max_reasoning_passes", 3),
+        )
+        llm = ReplayLLMClient(self.trace, self.latency)
+        engine.llm_client = llm
+        engine.mock_mode = bool(config.get("mock_mode", False))
+
+        tool_spans = self.trace.spans_of("tool")
+        for span in tool_spans:
+            span.attrs["replay_key"] = (span.name, span.attrs.get("params_hash"))
+        tool_calls = _SpanQueue(tool_spans, "replay_key", self.latency)
+        names = set(config.get("tools", [])) | {span.name for span in tool_spans}
+        plan_library, enable_plan_cache = self._plan_library()
+
+        loop = AgentLoop(
+            max_steps=config.get("max_steps", 5),
+            enable_reflection=config.get("enable_reflection", True),
+            enable_memory=False,
+            reasoning_engine=engine,
+            tools={name: ReplayTool(name, tool_calls) for name in sorted(names)},
+            pipeline_planning=config.get("pipeline_planning", True),
+            reflection_mode=config.get("reflection_mode"),
+            reflection_window=config.get("reflection_window"),
+            speculative_reflection=config.get("speculative_reflection"),
+            plan_library=plan_library,
+            enable_plan_cache=enable_plan_cache,
+            tool_router=ReplayRouter(self.trace),
+            enable_tool_router=True,
+            tool_cache=ReplayToolCache(tool_calls),
+            enable_tool_cache=True,
+            record_traces=False,
+        )
+        return loop, llm, tool_calls
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Replay the run.
+
+        Returns:
+            Dictionary containing:
+                - result: The replayed run's result
+                - replayed: Trace of the replay
+                - matches: Whether success, plan, risk level and
+                  recommendation equal the recorded outcome
+                - llm_calls/tool_calls: Responses served, divergences (calls
+                  not matched by key) and recorded responses left unused
+        """
+        loop, llm, tool_calls = self.build_loop()
+        recorder = TraceRecorder(config=self.trace.config)
+        result = loop.execute(
+            self.trace.entity, self.trace.task, dict(self.trace.context),
+            max_steps=self.trace.config.get("max_steps"), trace=recorder,
+        )
+        replayed = recorder.trace
+        return {
+            "result": result,
+            "replayed": replayed,
+            "matches": replayed.outcome == self.trace.outcome,
+            "llm_calls": {"served": llm.calls.served, "divergences": llm.calls.divergences, "unused": llm.calls.unused},
+            "tool_calls": {"served": tool_calls.served, "divergences": tool_calls.divergences, "unused": tool_calls.unused},
+        }
@@ -0,0 +1,27 @@
+"""Columnar analytics over the audit and feedback tables"""
+
+from .snapshots import SNAPSHOT_COLUMNS, SnapshotStore, get_snapshot_store
+from .queries import (
+    audit_summary,
+    confusion_matrix,
+    feedback_summary,
+    filter_rows,
+    group_by,
+    override_summary,
+    percentiles,
+    time_series,
+)
+
+__all__ = [
+    "SNAPSHOT_COLUMNS",
+    "SnapshotStore",
+    "get_snapshot_store",
+    "audit_summary",
+    "confusion_matrix",
+    "feedback_summary",
+    "filter_rows",
+    "group_by",
+    "override_summary",
+    "percentiles",
+    "time_series",
+]
@@ -0,0 +1,180 @@
+"""
+Analytics Benchmark
+===================
+Times the row-at-a-time reporting endpoints against the columnar snapshots.
+
+A temporary SQLite database is filled with synthetic audit and feedback
+rows. The benchmark then times:
+
+- /audit/statistics, /feedback/stats and /feedback/overrides, called
+  through their route functions
+- their /analytics counterparts, plus the snapshot build and a no-op refresh
+
+Usage:
+    python -m backend.analytics.benchmark [--rows 1000000] [--repeats 3]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.analytics import queries
+from backend.analytics.snapshots import SnapshotStore
+from backend.config import settings
+from backend.db.base import Base
+from backend.db.models import AuditTrail, FeedbackLog
+
+DECISIONS = np.array(queries.DECISION_LABELS)
+RISK_LEVELS = np.array(["LOW", "MEDIUM", "HIGH"])
+AGENT_TYPES = np.array(["decision_engine", "agentic_engine", "entity_analysis"])
+CATEGORIES = np.array(["DATA_PRIVACY", "FINANCIAL_REPORTING", "SECURITY", "EMPLOYMENT", "CONTRACTS"])
+
+
+def populate(db, rows: int, seed: int = 7, chunk: int = 50_000) -> None:
+    """Insert ``rows`` audit rows and ``rows`` feedback rows"""
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    for offset in range(0, rows, chunk):
+        n = min(chunk, rows - offset)
+        ages = rng.uniform(0, 730 * 86400, n)
+        outcome = DECISIONS[rng.integers(0, 3, n)].tolist()
+        risk = rng.random(n)
+        risk_score = [None if missing else value for missing, value in zip(rng.random(n) < 0.05, risk.tolist())]
+        db.execute(AuditTrail.__table__.insert(), [
+            {
+                "timestamp": now - timedelta(seconds=age),
+                "agent_type": agent,
+                "task_description": "Synthetic benchmark decision",
+                "task_category": category,
+                "entity_name": f"Entity {entity}",
+                "entity_type": "PRIVATE_COMPANY",
+                "decision_outcome": decision,
+                "confidence_score": confidence,
+                "risk_level": level,
+                "risk_score": score,
+                "reasoning_chain": [],
+            }
+            for age, agent, category, entity, decision, confidence, level, score in zip(
+                ages.tolist(), AGENT_TYPES[rng.integers(0, 3, n)].tolist(), CATEGORIES[rng.integers(0, 5, n)].tolist(),
+                rng.integers(0, 1000, n).tolist(), outcome, rng.uniform(0.4, 1.0, n).tolist(),
+                RISK_LEVELS[np.minimum((risk * 3).astype(int), 2)].tolist(), risk_score,
+            )
+        ])
+
+        ai = rng.integers(0, 3, n)
+        human = np.where(rng.random(n) < 0.7, ai, rng.integers(0, 3, n))
+        db.execute(FeedbackLog.__table__.insert(), [
+            {
+                "timestamp": now - timedelta(seconds=age),
+                "entity_name": f"Entity {entity}",
+                "task_description": "Synthetic benchmark feedback",
+                "ai_decision": DECISIONS[a],
+                "human_decision": DECISIONS[h],
+                "is_agreement": int(a == h),
+                "audit_trail_id": offset + k + 1,
+            }
+            for k, (age, entity, a, h) in enumerate(zip(
+                rng.uniform(0, 365 * 86400, n).tolist(), rng.integers(0, 1000, n).tolist(), ai.tolist(), human.tolist()
+            ))
+        ])
+        db.commit()
+
+
+def _time(function: Callable[[], Any], repeats: int) -> float:
+    """Median wall time in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def benchmark(rows: int = 1_000_000, repeats: int = 3, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Endpoint timings (median milliseconds) on ``rows`` audit and feedback rows.
+
+    Args:
+        rows: Rows per table
+        repeats: Timed runs per query
+        workdir: Directory for the database and snapshots (temporary if None)
+
+    Returns:
+        {"rows", "populate_s", "current": {...}, "analytics": {...}, "speedup": {...}}
+    """
+    from backend.agent.audit_service import AuditService
+    from backend.api.feedback_routes import get_feedback_stats, get_override_statistics
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(workdir or tmp)
+        saved = settings.AUDIT_ARCHIVE_DIR
+        settings.AUDIT_ARCHIVE_DIR = str(root / "archive")
+        engine = create_engine(f"sqlite:///{root / 'analytics_benchmark.db'}")
+        try:
+            Base.metadata.create_all(engine)
+            db = sessionmaker(bind=engine)()
+            started = time.perf_counter()
+            populate(db, rows)
+            results: Dict[str, Any] = {"rows": rows, "populate_s": round(time.perf_counter() - started, 1)}
+
+            results["current"] = {
+                "audit_statistics": _time(lambda: AuditService.get_audit_statistics(db), repeats),
+                "feedback_stats": _time(lambda: get_feedback_stats(db), repeats),
+                "feedback_overrides": _time(lambda: get_override_statistics(None, 30, db), repeats),
+            }
+            db.expunge_all()
+
+            store = SnapshotStore(root / "snapshots")
+            analytics = {
+                "snapshot_build": _time(lambda: [store.rebuild(db, table) for table in ("audit_trail", "feedback_log")], 1),
+                "snapshot_refresh": _time(lambda: [store.get(db, table, max_age=0) for table in ("audit_trail", "feedback_log")], repeats),
+            }
+            restarted = SnapshotStore(root / "snapshots")
+            analytics["snapshot_load"] = _time(lambda: restarted._load("audit_trail") and restarted._load("feedback_log"), 1)
+
+            audit = store.get(db, "audit_trail")
+            feedback = store.get(db, "feedback_log")
+            analytics.update({
+                "audit_summary": _time(lambda: queries.audit_summary(audit), repeats),
+                "feedback_summary": _time(lambda: queries.feedback_summary(feedback), repeats),
+                "feedback_overrides": _time(lambda: queries.override_summary(feedback), repeats),
+                "group_by_outcome_risk": _time(lambda: queries.group_by(audit, ["decision_outcome", "risk_level"]), repeats),
+                "timeseries_daily_by_outcome": _time(lambda: queries.time_series(audit, "day", "decision_outcome"), repeats),
+                "percentiles_by_category": _time(lambda: queries.percentiles(audit, "risk_score", by="task_category"), repeats),
+                "confusion_matrix": _time(lambda: queries.confusion_matrix(feedback), repeats),
+            })
+            results["analytics"] = analytics
+            results["speedup"] = {
+                "audit_statistics": round(results["current"]["audit_statistics"] / max(analytics["audit_summary"], 0.01), 1),
+                "feedback_stats": round(results["current"]["feedback_stats"] / max(analytics["feedback_summary"], 0.01), 1),
+                "feedback_overrides": round(results["current"]["feedback_overrides"] / max(analytics["feedback_overrides"], 0.01), 1),
+            }
+            db.close()
+            return results
+        finally:
+            engine.dispose()
+            settings.AUDIT_ARCHIVE_DIR = saved
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the reporting endpoints against the analytics snapshots")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per table")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per query")
+    parser.add_argument("--workdir", default=None, help="Keep the database and snapshots here")
+    args = parser.parse_args(argv)
+    print(json.dumps(benchmark(args.rows, args.repeats, args.workdir), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Analytics Queries
+=================
+Vectorized reporting queries over the columnar snapshots.
+
+Every function takes an Arrow table from ``SnapshotStore.get`` and works on
+whole columns with pyarrow.compute and numpy. Python code only runs once
+per output group, never once per row.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from backend.agent.feedback_processor import DECISIONS, FeedbackProcessor
+from backend.db.audit_archive import _naive_utc
+
+DECISION_LABELS = DECISIONS
+METRICS = ("confidence_score", "risk_score")
+INTERVALS = ("hour", "day", "week", "month", "quarter", "year")
+FEEDBACK_STATS_FIELDS = (
+    "total_feedback_count", "agreement_count", "override_count", "accuracy_percent",
+    "most_overridden_decision", "override_breakdown",
+)
+
+
+def filter_rows(
+    rows: pa.Table,
+    filters: Optional[Dict[str, Any]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> pa.Table:
+    """
+    Rows matching column equality filters and a timestamp window.
+
+    Args:
+        rows: Snapshot table
+        filters: Column equality filters (None values are ignored)
+        start: Include rows at or after this time
+        end: Include rows at or before this time
+
+    Returns:
+        Filtered table
+    """
+    mask = None
+    terms = [pc.equal(rows[column], value) for column, value in (filters or {}).items() if value is not None]
+    if start is not None:
+        terms.append(pc.greater_equal(rows["timestamp"], pa.scalar(_naive_utc(start), pa.timestamp("us"))))
+    if end is not None:
+        terms.append(pc.less_equal(rows["timestamp"], pa.scalar(_naive_utc(end), pa.timestamp("us"))))
+    for term in terms:
+        mask = term if mask is None else pc.and_kleene(mask, term)
+    return rows if mask is None else rows.filter(mask)
+
+
+def _value_counts(column: pa.ChunkedArray) -> Dict[str, int]:
+    """Counts per value, skipping nulls and empty strings"""
+    counts = pc.value_counts(column.drop_null())
+    return {value: count for value, count in zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist())
+            if value}
+
+
+def _mean(column: pa.ChunkedArray) -> float:
+    return pc.mean(column).as_py() or 0
+
+
+def _records(result: pa.Table) -> List[Dict[str, Any]]:
+    records = result.to_pylist()
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, datetime):
+                record[key] = value.isoformat()
+    return records
+
+
+def audit_summary(rows: pa.Table) -> Dict[str, Any]:
+    """
+    Decision counts and averages, as returned by AuditService.get_audit_statistics.
+
+    Args:
+        rows: Audit snapshot (already filtered)
+
+    Returns:
+        Dictionary containing statistics
+    """
+    if rows.num_rows == 0:
+        return {
+            "total_decisions": 0,
+            "by_outcome": {},
+            "by_risk_level": {},
+            "by_agent_type": {},
+            "by_task_category": {},
+            "average_confidence": 0,
+            "average_risk_score": 0
+        }
+
+    by_outcome = _value_counts(rows["decision_outcome"])
+    by_risk_level = _value_counts(rows["risk_level"])
+    return {
+        "total_decisions": rows.num_rows,
+        "high_risk_count": by_risk_level.get("HIGH", 0),
+        "medium_risk_count": by_risk_level.get("MEDIUM", 0),
+        "low_risk_count": by_risk_level.get("LOW", 0),
+        "autonomous_count": by_outcome.get("AUTONOMOUS", 0),
+        "review_required_count": by_outcome.get("REVIEW_REQUIRED", 0),
+        "escalate_count": by_outcome.get("ESCALATE", 0),
+        "by_outcome": by_outcome,
+        "by_risk_level": by_risk_level,
+        "by_agent_type": _value_counts(rows["agent_type"]),
+        "by_task_category": _value_counts(rows["task_category"]),
+        "average_confidence": (pc.sum(rows["confidence_score"]).as_py() or 0) / rows.num_rows,
+        "average_risk_score": _mean(rows["risk_score"]),
+        "last_updated": datetime.utcnow().isoformat()
+    }
+
+
+def group_by(rows: pa.Table, keys: Sequence[str], metrics: Sequence[str] = METRICS) -> List[Dict[str, Any]]:
+    """
+    Row count and metric averages per combination of key values.
+
+    Args:
+        rows: Snapshot table
+        keys: Columns to group by
+        metrics: Numeric columns to average
+
+    Returns:
+        One record per group ({key: value, ..., "count": n, "avg_<metric>": x}), largest first
+    """
+    result = rows.group_by(list(keys)).aggregate([([], "count_all")] + [(metric, "mean") for metric in metrics])
+    result = result.select(list(keys) + ["count_all"] + [f"{metric}_mean" for metric in metrics])
+    result = result.rename_columns(list(keys) + ["count"] + [f"avg_{metric}" for metric in metrics])
+    return _records(result.sort_by([("count", "descending")] + [(key, "ascending") for key in keys]))
+
+
+def time_series(
+    rows: pa.Table,
+    interval: str = "day",
+    by: Optional[str] = None,
+    metrics: Sequence[str] = METRICS,
+) -> List[Dict[str, Any]]:
+    """
+    Row count and metric averages per time bucket.
+
+    Args:
+        rows: Snapshot table
+        interval: Bucket width, one of INTERVALS (weeks start on Monday)
+        by: Optional column to split each bucket by
+        metrics: Numeric columns to average
+
+    Returns:
+        One record per bucket (and ``by`` value), oldest first
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval {interval!r}; expected one of {', '.join(INTERVALS)}")
+    bucket = pc.floor_temporal(rows["timestamp"], unit=interval, week_starts_monday=True)
+    keys = ["bucket"] + ([by] if by else [])
+    records = group_by(rows.append_column("bucket", bucket), keys, metrics)
+    return sorted(records, key=lambda record: tuple("" if record[key] is None else record[key] for key in keys))
+
+
+def _quantiles(values: np.ndarray, starts: np.ndarray, sizes: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Linearly interpolated quantiles of consecutive sorted runs (numpy's default method)"""
+    result = np.empty((len(starts), len(quantiles)))
+    for n, q in enumerate(quantiles):
+        position = (sizes - 1) * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, sizes - 1)
+        fraction = position - lower
+        low, high = values[starts + lower], values[starts + upper]
+        result[:, n] = low + (high - low) * fraction
+    return result
+
+
+def percentiles(
+    rows: pa.Table,
+    metric: str,
+    quantiles: Sequence[float] = (0.5, 0.9, 0.99),
+    by: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Exact quantiles of a numeric column, overall or per group.
+
+    The values are sorted once by (group, value); each group is then a
+    contiguous run, and its quantiles are read off by position.
+
+    Args:
+        rows: Snapshot table
+        metric: Numeric column
+        quantiles: Quantiles in [0, 1]
+        by: Optional column to group by
+
+    Returns:
+        One record per group ({by: value, "count": n, "p50": x, ...}), nulls skipped
+    """
+    if any(not 0 <= q <= 1 for q in quantiles):
+        raise ValueError("Quantiles must be between 0 and 1")
+    rows = rows.filter(pc.is_valid(rows[metric]))
+    labels = [f"p{round(q * 100, 3):g}" for q in quantiles]
+    if rows.num_rows == 0:
+        return []
+
+    if by is None:
+        values = np.sort(rows[metric].to_numpy())
+        starts, sizes, groups = np.array([0]), np.array([len(values)]), [None]
+    else:
+        # Integer group codes in label order (nulls last), then one lexsort
+        encoded = rows[by].combine_chunks().dictionary_encode()
+        dictionary = encoded.dictionary
+        rank = np.empty(len(dictionary) + 1, dtype=np.int64)
+        rank[pc.sort_indices(dictionary).to_numpy()] = np.arange(len(dictionary))
+        rank[len(dictionary)] = len(dictionary)
+        codes = rank[encoded.indices.fill_null(len(dictionary)).to_numpy()]
+        values = rows[metric].to_numpy()
+        values = values[np.lexsort((values, codes))]
+        counts = np.bincount(codes, minlength=len(dictionary) + 1)
+        present = np.flatnonzero(counts)
+        sizes = counts[present]
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        ordered = dictionary.take(pc.sort_indices(dictionary)).to_pylist() + [None]
+        groups = [ordered[code] for code in present]
+
+    table = _quantiles(values, starts, sizes, quantiles)
+    records = []
+    for group, size, row in zip(groups, sizes, table):
+        record = {by: group} if by is not None else {}
+        record["count"] = int(size)
+        record.update(zip(labels, row.tolist()))
+        records.append(record)
+    return records
+
+
+def confusion_matrix(rows: pa.Table, labels: Sequence[str] = DECISION_LABELS) -> Dict[str, Any]:
+    """
+    AI decision vs. human decision cross-tab over feedback rows.
+
+    Args:
+        rows: Feedback snapshot (already filtered)
+        labels: Decision labels, in matrix order; other observed values are appended
+
+    Returns:
+        {"labels", "matrix" (rows = AI, columns = human), "total", "agreement_rate",
+        "per_label": {label: {"precision", "recall", "support"}}}
+    """
+    counts = {(pair["ai_decision"], pair["human_decision"]): pair["count"]
+              for pair in group_by(rows, ["ai_decision", "human_decision"], metrics=())}
+    observed = {value for pair in counts for value in pair}
+    labels = list(labels) + sorted(value for value in observed - set(labels) if value is not None)
+    matrix = [[counts.get((ai, human), 0) for human in labels] for ai in labels]
+
+    per_label = {}
+    for n, label in enumerate(labels):
+        predicted = sum(matrix[n])
+        actual = sum(row[n] for row in matrix)
+        per_label[label] = {
+            "precision": round(matrix[n][n] / predicted, 4) if predicted else None,
+            "recall": round(matrix[n][n] / actual, 4) if actual else None,
+            "support": actual,
+        }
+    agreed = sum(matrix[n][n] for n in range(len(labels)))
+    return {
+        "labels": labels,
+        "matrix": matrix,
+        "total": rows.num_rows,
+        "agreement_rate": round(agreed / rows.num_rows, 4) if rows.num_rows else 0.0,
+        "per_label": per_label,
+    }
+
+
+def _decision_counts(rows: pa.Table) -> Dict[tuple, int]:
+    """{(ai_decision, human_decision, is_agreement): count} over feedback rows"""
+    keys = ["ai_decision", "human_decision", "is_agreement"]
+    return {tuple(group[key] for key in keys): group["count"] for group in group_by(rows, keys, metrics=())}
+
+
+def feedback_summary(rows: pa.Table) -> Dict[str, Any]:
+    """
+    Accuracy and overrides per AI decision, as returned by /feedback/stats.
+
+    Args:
+        rows: Feedback snapshot
+
+    Returns:
+        Dictionary with the FeedbackStats fields
+    """
+    summary = FeedbackProcessor.summarize_decision_counts(_decision_counts(rows))
+    return {field: summary[field] for field in FEEDBACK_STATS_FIELDS}
+
+
+def override_summary(
+    rows: pa.Table,
+    entity_name: Optional[str] = None,
+    days: int = 30,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Overrides by type, as returned by FeedbackProcessor.get_override_statistics.
+
+    Args:
+        rows: Feedback snapshot
+        entity_name: Optional entity name filter
+        days: Number of days to look back
+        now: End of the window (current time if None)
+
+    Returns:
+        Dictionary with override statistics, plus overrides per entity
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    overrides = filter_rows(rows, {"is_agreement": 0, "entity_name": entity_name}, start=cutoff)
+    summary = FeedbackProcessor.summarize_decision_counts(_decision_counts(overrides))
+    return {
+        "total_overrides": overrides.num_rows,
+        "override_breakdown": summary["override_types"],
+        "timeframe_days": days,
+        "entity_name": entity_name,
+        "by_entity": _value_counts(overrides["entity_name"]),
+    }
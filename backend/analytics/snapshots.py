@@ -0,0 +1,251 @@
+"""
+Analytics Snapshots
+===================
+Columnar snapshots of the audit and feedback tables for reporting.
+
+Each snapshot is an in-memory Arrow table holding only the scalar columns
+that reports group, filter and aggregate on. It spans both tiers: the
+archived Parquet partitions (backend/db/audit_archive.py) and the hot rows.
+A copy is kept under ANALYTICS_SNAPSHOT_DIR so a restarted process starts
+from the last build instead of rescanning the database.
+
+Refreshes are incremental. New rows are found by primary key above the
+snapshot's high-water mark and appended. If the row total (hot plus
+archived) no longer matches, rows were deleted or moved out of order, and
+the snapshot is rebuilt. A full rebuild also runs every
+ANALYTICS_REBUILD_SECONDS to pick up in-place updates.
+
+Usage:
+    python -m backend.analytics.snapshots build
+    python -m backend.analytics.snapshots status
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.db.audit_archive import ARCHIVED_TABLES, _naive_utc, arrow_schema, get_archive
+from backend.db.models import ArchivePartition
+
+logger = logging.getLogger(__name__)
+
+# Scalar columns kept per table; the JSON and free-text columns are never loaded
+SNAPSHOT_COLUMNS = {
+    "audit_trail": (
+        "id", "timestamp", "agent_type", "task_category", "entity_name", "entity_type",
+        "decision_outcome", "confidence_score", "risk_level", "risk_score",
+    ),
+    "feedback_log": (
+        "feedback_id", "timestamp", "entity_name", "ai_decision", "human_decision",
+        "is_agreement", "audit_trail_id",
+    ),
+}
+
+
+def snapshot_schema(table: str) -> pa.Schema:
+    """Arrow schema of a snapshot (timestamps are naive UTC)"""
+    schema = arrow_schema(ARCHIVED_TABLES[table])
+    return pa.schema([schema.field(column) for column in SNAPSHOT_COLUMNS[table]])
+
+
+class SnapshotStore:
+    """
+    Columnar snapshots of the audit and feedback tables.
+
+    Args:
+        root: Directory holding the persisted snapshots
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root if root is not None else settings.ANALYTICS_SNAPSHOT_DIR)
+        self._tables: Dict[str, pa.Table] = {}
+        self._high_water: Dict[str, int] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._built_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def path(self, table: str) -> Path:
+        return self.root / f"{table}.parquet"
+
+    def _fetch_hot(self, db: Session, table: str, after: Optional[int] = None) -> pa.Table:
+        """Hot rows (above ``after`` if given) as an Arrow table"""
+        spec = ARCHIVED_TABLES[table]
+        schema = snapshot_schema(table)
+        pk = getattr(spec.model, spec.pk)
+        query = select(*(spec.model.__table__.c[column] for column in schema.names))
+        if after is not None:
+            query = query.where(pk > after)
+        rows = db.execute(query).all()
+        if not rows:
+            return schema.empty_table()
+
+        columns = [list(values) for values in zip(*rows)]
+        timestamps = columns[schema.get_field_index("timestamp")]
+        first = next((value for value in timestamps if value is not None), None)
+        if first is not None and first.tzinfo is not None:
+            columns[schema.get_field_index("timestamp")] = [_naive_utc(value) for value in timestamps]
+        return pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+        )
+
+    def _fetch_cold(self, db: Session, table: str) -> pa.Table:
+        """All archived rows as an Arrow table"""
+        schema = snapshot_schema(table)
+        rows = get_archive().read(db, table, columns=schema.names)
+        return rows.select(schema.names).cast(schema)
+
+    @staticmethod
+    def _row_total(db: Session, table: str) -> int:
+        """Hot plus archived rows in the database"""
+        spec = ARCHIVED_TABLES[table]
+        hot = db.query(func.count(getattr(spec.model, spec.pk))).scalar() or 0
+        archived = db.query(func.sum(ArchivePartition.row_count)).filter(
+            ArchivePartition.table_name == table
+        ).scalar() or 0
+        return hot + int(archived)
+
+    def _install(self, table: str, rows: pa.Table) -> None:
+        pk = ARCHIVED_TABLES[table].pk
+        self._tables[table] = rows
+        self._high_water[table] = (pc.max(rows[pk]).as_py() or 0) if rows.num_rows else 0
+
+    def _load(self, table: str) -> bool:
+        """Install the persisted snapshot, if any"""
+        path = self.path(table)
+        if not path.is_file():
+            return False
+        try:
+            rows = pq.read_table(path, partitioning=None)
+            metadata = json.loads(rows.schema.metadata[b"snapshot"])
+            rows = rows.replace_schema_metadata(None).cast(snapshot_schema(table))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable analytics snapshot {path}: {e}")
+            return False
+        self._install(table, rows.combine_chunks())
+        self._built_at[table] = metadata["built_at"]
+        return True
+
+    def _save(self, table: str) -> None:
+        rows = self._tables[table]
+        metadata = {"built_at": self._built_at[table], "rows": rows.num_rows}
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(table)
+        tmp = path.with_suffix(".parquet.tmp")
+        pq.write_table(rows.replace_schema_metadata({"snapshot": json.dumps(metadata)}), tmp, compression="zstd")
+        tmp.replace(path)
+
+    def rebuild(self, db: Session, table: str) -> pa.Table:
+        """Build a snapshot from scratch and persist it"""
+        with self._lock:
+            return self._rebuild(db, table)
+
+    def _rebuild(self, db: Session, table: str) -> pa.Table:
+        started = time.perf_counter()
+        rows = pa.concat_tables([self._fetch_cold(db, table), self._fetch_hot(db, table)]).combine_chunks()
+        self._install(table, rows)
+        self._built_at[table] = self._checked_at[table] = time.time()
+        self._save(table)
+        logger.info(f"Built {table} analytics snapshot: {rows.num_rows} rows in {time.perf_counter() - started:.2f}s")
+        return rows
+
+    def get(self, db: Session, table: str, max_age: Optional[float] = None) -> pa.Table:
+        """
+        Current snapshot of a table, refreshed if it was last checked more
+        than ``max_age`` seconds ago.
+
+        Args:
+            db: Database session
+            table: "audit_trail" or "feedback_log"
+            max_age: Seconds between refresh checks (ANALYTICS_REFRESH_SECONDS if None)
+
+        Returns:
+            Arrow table with the SNAPSHOT_COLUMNS of the table
+        """
+        max_age = settings.ANALYTICS_REFRESH_SECONDS if max_age is None else max_age
+        checked = self._checked_at.get(table)
+        if checked is not None and time.time() - checked < max_age:
+            return self._tables[table]
+
+        with self._lock:
+            if table not in self._tables and not self._load(table):
+                return self._rebuild(db, table)
+            if time.time() - self._built_at[table] >= settings.ANALYTICS_REBUILD_SECONDS:
+                return self._rebuild(db, table)
+
+            rows = self._tables[table]
+            new = self._fetch_hot(db, table, after=self._high_water[table])
+            if new.num_rows:
+                rows = pa.concat_tables([rows, new]).combine_chunks()
+            if rows.num_rows != self._row_total(db, table):
+                return self._rebuild(db, table)
+            if new.num_rows:
+                self._install(table, rows)
+            self._checked_at[table] = time.time()
+            return rows
+
+    def status(self) -> Dict[str, Any]:
+        """Rows, high-water mark and age per snapshot"""
+        status: Dict[str, Any] = {"root": str(self.root)}
+        for table in SNAPSHOT_COLUMNS:
+            rows = self._tables.get(table)
+            built_at = self._built_at.get(table)
+            status[table] = {
+                "rows": rows.num_rows if rows is not None else None,
+                "high_water": self._high_water.get(table),
+                "built_at": datetime.utcfromtimestamp(built_at).isoformat() if built_at else None,
+                "persisted": self.path(table).is_file(),
+            }
+        return status
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Snapshot store at the configured ANALYTICS_SNAPSHOT_DIR"""
+    global _store
+    if _store is None or _store.root != Path(settings.ANALYTICS_SNAPSHOT_DIR):
+        _store = SnapshotStore()
+    return _store
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from backend.db.base import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Build the columnar analytics snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="Rebuild all snapshots from the database and archive")
+    commands.add_parser("status", help="Show persisted snapshots")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    store = get_snapshot_store()
+    if args.command == "build":
+        db = SessionLocal()
+        try:
+            for table in SNAPSHOT_COLUMNS:
+                store.rebuild(db, table)
+        finally:
+            db.close()
+    else:
+        for table in SNAPSHOT_COLUMNS:
+            store._load(table)
+    print(json.dumps(store.status(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
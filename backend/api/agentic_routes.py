@@ -1,15 +1,17 @@
 """API routes for the experimental agentic AI engine"""
 
+import json
 import logging
 from backend.config import settings
 import asyncio
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 
-from backend.agentic_engine.orchestrator import AgenticAIOrchestrator
+from backend.agentic_engine.orchestrator import get_orchestrator
 from backend.agentic_engine.testing.test_suite_engine import TestSuiteEngine
 from backend.agentic_engine.testing.test_scenario import TestScenario, ComplexityLevel
 from backend.agentic_engine.testing.failure_simulator import FailureSimulator
@@ -23,11 +25,16 @@ from backend.db.base import get_db
 from backend.auth.security import get_current_user
 from backend.utils.llm_client import LLMClient
 from backend.utils.text_sanitizer import sanitize_user_text
+from backend.api.responses import json_response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/agentic", tags=["Agentic AI Engine", "Protected"], dependencies=[Depends(get_current_user)])
 
+# Seconds of silence after which the event stream sends an SSE comment so
+# proxies and the frontend client do not drop an idle connection.
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 # Request/Response Models
 class EntityData(BaseModel):
@@ -189,7 +196,7 @@ def transform_orchestrator_result(
     
     Args:
         result: Output from orchestrator.run()
-        agent_loop_metrics: Optional metrics from agent_loop.get_metrics()
+        agent_loop_metrics: Optional AgentLoop metrics of the run (result["metrics"])
         
     Returns:
         AgenticAnalyzeResponse with properly mapped fields
@@ -350,6 +357,7 @@ def transform_orchestrator_result(
 @router.post("/analyze", response_model=AgenticAnalyzeResponse)
 async def analyze_with_agentic_engine(
     request: AgenticAnalyzeRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -363,6 +371,7 @@ async def analyze_with_agentic_engine(
     
     Args:
         request: Entity data, task data, and configuration
+        http_request: Incoming HTTP request (for response compression)
         db: Database session
         
     Returns:
@@ -373,16 +382,12 @@ async def analyze_with_agentic_engine(
         HTTPException: If analysis fails or validation errors occur
     """
     try:
-        # Initialize orchestrator with database session for tools
+        # Shared warm orchestrator; the database session is passed per run
         max_iters = min(request.max_iterations, 2)  # Force demo mode
-        orchestrator = AgenticAIOrchestrator(
-            config={
-                "max_iterations": max_iters,
-                "enable_reflection": False,
-                "enable_memory": True
-            },
-            db_session=db
-        )
+        orchestrator = get_orchestrator({
+            "enable_reflection": False,
+            "enable_memory": True
+        })
         
         # Prepare context from entity and task data
         context = {
@@ -404,7 +409,9 @@ async def analyze_with_agentic_engine(
                     orchestrator.run,
                     task_description,
                     context,
-                    max_iters
+                    max_iters,
+                    db_session=db,
+                    max_steps=max_iters
                 ),
                 timeout=settings.AGENTIC_OPERATION_TIMEOUT
             )
@@ -449,12 +456,8 @@ async def analyze_with_agentic_engine(
                 detail=f"Agentic analysis execution failed: {str(orchestrator_error)}"
             )
         
-        # Get agent loop metrics with error handling
-        try:
-            agent_loop_metrics = orchestrator.agent_loop.get_metrics()
-        except Exception as metrics_error:
-            logger.warning(f"Failed to get agent loop metrics: {metrics_error}")
-            agent_loop_metrics = None
+        # Metrics of this run (the orchestrator is shared, so not agent_loop.get_metrics())
+        agent_loop_metrics = result.get("metrics")
         
         # Log agentic loop output to audit trail
         try:
@@ -489,7 +492,7 @@ async def analyze_with_agentic_engine(
                 detail=f"Failed to format analysis response: {str(transform_error)}"
             )
         
-        return response
+        return json_response(response, http_request)
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -515,6 +518,175 @@ async def analyze_with_agentic_engine(
         )
 
 
+def _format_sse(event: str, data: Any) -> str:
+    """Encode one server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/analyze/stream")
+async def analyze_with_agentic_engine_stream(
+    request: AgenticAnalyzeRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Streaming variant of /agentic/analyze using server-sent events.
+    
+    Runs the same plan-execute-reflect workflow but pushes progress to the
+    client while it happens instead of returning once at the end.
+    
+    Event types (``event:`` field, JSON ``data:`` payload):
+    - ``status``: emitted immediately once the run starts
+    - ``plan_token``: raw planner output as the LLM streams it
+    - ``plan_reset``: discard the ``plan_token`` text so far (the stream
+      failed part-way; the plan is regenerated without streaming)
+    - ``plan``: the parsed plan (``revised`` is true after a replan)
+    - ``step``: each step output as soon as the step finishes
+    - ``reflection``: each reflection (when reflection is enabled)
+    - ``recommendation``: final recommendation and risk assessment
+    - ``result``: the complete AgenticAnalyzeResponse payload (last event)
+    - ``timeout`` / ``error``: terminal failure events
+    
+    Args:
+        request: Entity data, task data, and configuration
+        db: Database session
+        
+    Returns:
+        StreamingResponse with media type text/event-stream
+    """
+    max_iters = request.max_iterations or 10
+    orchestrator = get_orchestrator({
+        "enable_reflection": False,
+        "enable_memory": True
+    })
+    context = {
+        "entity": request.entity.model_dump(),
+        "task": request.task.model_dump()
+    }
+    sanitized_task = sanitize_user_text(request.task.task_description)
+    task_description = (
+        f"Analyze compliance task for {sanitize_user_text(request.entity.entity_name)}: "
+        f"{sanitized_task}"
+    )
+    
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def on_event(event: str, payload: Dict[str, Any]) -> None:
+        # Called from the worker thread running the orchestrator
+        loop.call_soon_threadsafe(queue.put_nowait, (event, payload))
+    
+    async def run_orchestrator() -> None:
+        try:
+            result = await asyncio.to_thread(
+                orchestrator.run,
+                task_description,
+                context,
+                max_iters,
+                on_event,
+                db_session=db,
+                max_steps=max_iters
+            )
+            await queue.put(("_done", result))
+        except Exception as e:
+            await queue.put(("_failed", e))
+    
+    async def event_stream():
+        # On timeout/disconnect the worker task is cancelled; its thread cannot be
+        # interrupted and finishes in the background like the blocking endpoint's
+        worker = asyncio.create_task(run_orchestrator())
+        deadline = loop.time() + settings.AGENTIC_OPERATION_TIMEOUT
+        try:
+            yield _format_sse("status", {"status": "started", "entity_name": request.entity.entity_name})
+            
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                try:
+                    event, payload = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=min(remaining, SSE_KEEPALIVE_SECONDS)
+                    )
+                except asyncio.TimeoutError:
+                    if loop.time() >= deadline:
+                        raise
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                if event == "_failed":
+                    logger.error(f"Streaming orchestrator execution failed: {payload}", exc_info=payload)
+                    db.rollback()
+                    yield _format_sse("error", {
+                        "status": "error",
+                        "error": f"Agentic analysis execution failed: {str(payload)}"
+                    })
+                    return
+                
+                if event == "_done":
+                    result = payload
+                    agent_loop_metrics = result.get("metrics")
+                    
+                    try:
+                        AuditService.log_agentic_loop_output(
+                            db=db,
+                            entity_name=request.entity.entity_name,
+                            task_description=request.task.task_description,
+                            agent_loop_result=result,
+                            agent_type="agentic_engine",
+                            metadata={
+                                "api_endpoint": "/agentic/analyze/stream",
+                                "max_iterations": request.max_iterations,
+                                "task_category": request.task.task_category,
+                                "original_task_description": request.task.task_description
+                            }
+                        )
+                    except Exception as audit_error:
+                        logger.warning(f"Failed to log agentic loop output: {audit_error}")
+                    
+                    try:
+                        response = transform_orchestrator_result(result, agent_loop_metrics)
+                    except Exception as transform_error:
+                        logger.error(f"Failed to transform orchestrator result: {transform_error}", exc_info=True)
+                        db.rollback()
+                        yield _format_sse("error", {
+                            "status": "error",
+                            "error": f"Failed to format analysis response: {str(transform_error)}"
+                        })
+                        return
+                    
+                    yield _format_sse("result", response.model_dump())
+                    return
+                
+                yield _format_sse(event, payload)
+        
+        except asyncio.TimeoutError:
+            logger.error(
+                f"TIMEOUT: Streaming agentic analysis for {request.entity.entity_name}",
+                extra={
+                    "entity_name": request.entity.entity_name,
+                    "timeout_seconds": settings.AGENTIC_OPERATION_TIMEOUT
+                }
+            )
+            db.rollback()
+            yield _format_sse("timeout", {
+                "status": "timeout",
+                "error": f"Analysis timed out after {settings.AGENTIC_OPERATION_TIMEOUT} seconds"
+            })
+        finally:
+            if not worker.done():
+                worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/status")
 async def get_agentic_engine_status():
     """
@@ -857,6 +1029,7 @@ async def full_health_check(db: Session = Depends(get_db)):
 @router.post("/testSuite")
 async def run_test_suite_endpoint(
     request: TestSuiteRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -867,6 +1040,7 @@ async def run_test_suite_endpoint(
     
     Args:
         request: TestSuiteRequest with test configuration
+        http_request: Incoming HTTP request (for response compression)
         db: Database session
         
     Returns:
@@ -937,12 +1111,12 @@ async def run_test_suite_endpoint(
                 # Continue without AI analysis - results are still valid
             
             # STEP 6: Return standardized response format
-            return {
+            return json_response({
                 "status": "completed",
                 "results": results,
                 "error": None,
                 "timestamp": timestamp
-            }
+            }, http_request)
             
         except asyncio.TimeoutError:
             error_msg = f"Test suite execution timed out after {settings.AGENTIC_OPERATION_TIMEOUT} seconds"
@@ -972,6 +1146,7 @@ async def run_test_suite_endpoint(
 @router.post("/benchmarks")
 async def run_benchmarks_endpoint(
     request: BenchmarkRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -983,6 +1158,7 @@ async def run_benchmarks_endpoint(
     
     Args:
         request: BenchmarkRequest with benchmark configuration
+        http_request: Incoming HTTP request (for response compression)
         db: Database session
         
     Returns:
@@ -1070,12 +1246,12 @@ async def run_benchmarks_endpoint(
                 # Continue without AI analysis - results are still valid
             
             # STEP 5: Return standardized response format
-            return {
+            return json_response({
                 "status": "completed",
                 "results": results,
                 "error": None,
                 "timestamp": timestamp
-            }
+            }, http_request)
             
         except asyncio.TimeoutError:
             error_msg = f"Benchmark execution timed out after {settings.AGENTIC_OPERATION_TIMEOUT} seconds"
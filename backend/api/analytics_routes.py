@@ -0,0 +1,239 @@
+"""API routes for columnar audit and feedback analytics"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from backend.analytics import queries
+from backend.analytics.snapshots import SNAPSHOT_COLUMNS, get_snapshot_store
+from backend.api.responses import json_response
+from backend.auth.security import get_current_user
+from backend.db.base import get_db
+
+router = APIRouter(prefix="/analytics", tags=["Analytics", "Protected"], dependencies=[Depends(get_current_user)])
+
+AUDIT_DIMENSIONS = ("agent_type", "task_category", "entity_name", "entity_type", "decision_outcome", "risk_level")
+
+
+class AuditFilters:
+    """Filter parameters shared by the audit analytics endpoints"""
+
+    def __init__(
+        self,
+        agent_type: Optional[str] = Query(default=None, description="Filter by agent type"),
+        entity_name: Optional[str] = Query(default=None, description="Filter by entity name"),
+        decision_outcome: Optional[str] = Query(default=None, description="Filter by decision outcome"),
+        risk_level: Optional[str] = Query(default=None, description="Filter by risk level"),
+        task_category: Optional[str] = Query(default=None, description="Filter by task category"),
+        start_date: Optional[datetime] = Query(default=None, description="Filter entries after this date"),
+        end_date: Optional[datetime] = Query(default=None, description="Filter entries before this date"),
+    ):
+        self.values = dict(
+            agent_type=agent_type, entity_name=entity_name, decision_outcome=decision_outcome,
+            risk_level=risk_level, task_category=task_category, start_date=start_date, end_date=end_date,
+        )
+
+    def rows(self, db: Session):
+        """Matching rows of the audit snapshot"""
+        values = dict(self.values)
+        start, end = values.pop("start_date"), values.pop("end_date")
+        return queries.filter_rows(get_snapshot_store().get(db, "audit_trail"), values, start, end)
+
+
+def _dimensions(values: List[str], allowed) -> List[str]:
+    keys = [key for value in values for key in value.split(",") if key]
+    unknown = [key for key in keys if key not in allowed]
+    if not keys or unknown:
+        raise HTTPException(status_code=400, detail=f"Group by one or more of: {', '.join(allowed)}")
+    return keys
+
+
+@router.get("/audit/summary")
+def audit_summary(request: Request, filters: AuditFilters = Depends(), db: Session = Depends(get_db)):
+    """
+    Decision counts and averages (same fields as /audit/statistics)
+
+    Args:
+        filters: Audit filters
+        db: Database session
+
+    Returns:
+        Statistics about audit trail entries
+    """
+    return json_response(queries.audit_summary(filters.rows(db)), request)
+
+
+@router.get("/audit/group-by")
+def audit_group_by(
+    request: Request,
+    by: List[str] = Query(default=["decision_outcome"], description="Columns to group by (repeat or comma-separate)"),
+    filters: AuditFilters = Depends(),
+    db: Session = Depends(get_db)
+):
+    """
+    Decision count, average confidence and average risk score per group
+
+    Args:
+        by: Columns to group by
+        filters: Audit filters
+        db: Database session
+
+    Returns:
+        One record per group, largest first
+    """
+    keys = _dimensions(by, AUDIT_DIMENSIONS)
+    return json_response({"by": keys, "groups": queries.group_by(filters.rows(db), keys)}, request)
+
+
+@router.get("/audit/timeseries")
+def audit_timeseries(
+    request: Request,
+    interval: str = Query(default="day", description=f"Bucket width: {', '.join(queries.INTERVALS)}"),
+    by: Optional[str] = Query(default=None, description="Optional column to split each bucket by"),
+    filters: AuditFilters = Depends(),
+    db: Session = Depends(get_db)
+):
+    """
+    Decision count and averages per time bucket
+
+    Args:
+        interval: Bucket width
+        by: Optional column to split each bucket by
+        filters: Audit filters
+        db: Database session
+
+    Returns:
+        One record per bucket, oldest first
+    """
+    if interval not in queries.INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of: {', '.join(queries.INTERVALS)}")
+    if by is not None:
+        _dimensions([by], AUDIT_DIMENSIONS)
+    series = queries.time_series(filters.rows(db), interval, by)
+    return json_response({"interval": interval, "by": by, "series": series}, request)
+
+
+@router.get("/audit/percentiles")
+def audit_percentiles(
+    request: Request,
+    metric: str = Query(default="risk_score", pattern="^(risk_score|confidence_score)$", description="Numeric column"),
+    q: List[float] = Query(default=[0.5, 0.9, 0.99], description="Quantiles in [0, 1]"),
+    by: Optional[str] = Query(default=None, description="Optional column to group by"),
+    filters: AuditFilters = Depends(),
+    db: Session = Depends(get_db)
+):
+    """
+    Exact percentiles of risk or confidence scores, overall or per group
+
+    Args:
+        metric: Numeric column
+        q: Quantiles
+        by: Optional column to group by
+        filters: Audit filters
+        db: Database session
+
+    Returns:
+        One record per group
+    """
+    if by is not None:
+        _dimensions([by], AUDIT_DIMENSIONS)
+    try:
+        groups = queries.percentiles(filters.rows(db), metric, q, by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response({"metric": metric, "by": by, "groups": groups}, request)
+
+
+@router.get("/feedback/summary")
+def feedback_summary(request: Request, db: Session = Depends(get_db)):
+    """
+    AI accuracy and overrides per decision type (same fields as /feedback/stats)
+
+    Args:
+        db: Database session
+
+    Returns:
+        Feedback statistics including accuracy and override counts
+    """
+    return json_response(queries.feedback_summary(get_snapshot_store().get(db, "feedback_log")), request)
+
+
+@router.get("/feedback/confusion")
+def feedback_confusion(
+    request: Request,
+    entity_name: Optional[str] = Query(default=None, description="Filter by entity name"),
+    start_date: Optional[datetime] = Query(default=None, description="Filter feedback after this date"),
+    end_date: Optional[datetime] = Query(default=None, description="Filter feedback before this date"),
+    db: Session = Depends(get_db)
+):
+    """
+    Confusion matrix of AI decisions (rows) against human decisions (columns)
+
+    Args:
+        entity_name: Optional entity name filter
+        start_date: Filter feedback after this date
+        end_date: Filter feedback before this date
+        db: Database session
+
+    Returns:
+        Labels, matrix, agreement rate and per-label precision/recall
+    """
+    rows = queries.filter_rows(
+        get_snapshot_store().get(db, "feedback_log"), {"entity_name": entity_name}, start_date, end_date
+    )
+    return json_response(queries.confusion_matrix(rows), request)
+
+
+@router.get("/feedback/overrides")
+def feedback_overrides(
+    request: Request,
+    entity_name: Optional[str] = Query(default=None, description="Filter by entity name"),
+    days: int = Query(default=30, ge=1, description="Number of days to look back"),
+    db: Session = Depends(get_db)
+):
+    """
+    Override counts by type and entity (aggregates of /feedback/overrides)
+
+    Args:
+        entity_name: Optional entity name filter
+        days: Number of days to look back
+        db: Database session
+
+    Returns:
+        Dictionary with override statistics
+    """
+    rows = get_snapshot_store().get(db, "feedback_log")
+    return json_response(queries.override_summary(rows, entity_name, days), request)
+
+
+@router.get("/status")
+def analytics_status(request: Request):
+    """Rows, high-water mark and build time of each snapshot"""
+    return json_response(get_snapshot_store().status(), request)
+
+
+@router.post("/refresh")
+def refresh_snapshots(
+    request: Request,
+    full: bool = Query(default=False, description="Rebuild from scratch instead of appending new rows"),
+    db: Session = Depends(get_db)
+):
+    """
+    Bring the snapshots up to date now instead of on the next read
+
+    Args:
+        full: Rebuild from scratch
+        db: Database session
+
+    Returns:
+        Snapshot status
+    """
+    store = get_snapshot_store()
+    for table in SNAPSHOT_COLUMNS:
+        if full:
+            store.rebuild(db, table)
+        else:
+            store.get(db, table, max_age=0)
+    return json_response(store.status(), request)
@@ -1,7 +1,6 @@
 """API routes for audit trail management"""
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime
@@ -11,10 +10,21 @@ from backend.db.base import get_db
 from backend.auth.security import get_current_user
 from pydantic import BaseModel, Field
 from backend.api.rate_limit import limiter, AUTH_RATE
-from backend.utils.audit_converter import convert_audit_trail_to_audit_entry
+from backend.utils.audit_converter import (
+    convert_audit_trail_to_audit_entry,
+    convert_audit_trail_to_audit_summary,
+)
+from backend.utils.serializers import audit_trail_summary_row
+from backend.api.responses import json_response
 
 router = APIRouter(prefix="/audit", tags=["Audit Trail", "Protected"], dependencies=[Depends(get_current_user)])
 
+FIELDS_PATTERN = "^(full|summary)$"
+FIELDS_DESCRIPTION = (
+    "Projection: full (all columns) or summary (scalar columns only; fetch the "
+    "full entry from /audit/entries/{audit_id})"
+)
+
 
 class AuditQueryParams(BaseModel):
     """Parameters for querying audit trail"""
@@ -31,6 +41,7 @@ class AuditQueryParams(BaseModel):
 
 @router.get("/entries")
 async def get_audit_entries(
+    request: Request,
     limit: int = Query(default=100, ge=1, le=1000, description="Maximum number of entries"),
     offset: int = Query(default=0, ge=0, description="Number of entries to skip"),
     agent_type: Optional[str] = Query(default=None, description="Filter by agent type"),
@@ -40,6 +51,7 @@ async def get_audit_entries(
     task_category: Optional[str] = Query(default=None, description="Filter by task category"),
     start_date: Optional[datetime] = Query(default=None, description="Filter entries after this date"),
     end_date: Optional[datetime] = Query(default=None, description="Filter entries before this date"),
+    fields: str = Query(default="full", pattern=FIELDS_PATTERN, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
@@ -55,36 +67,24 @@ async def get_audit_entries(
         task_category: Filter by task category
         start_date: Filter entries after this date (ISO 8601 format)
         end_date: Filter entries before this date (ISO 8601 format)
+        fields: "full" or "summary" (scalar columns only, JSON columns not loaded)
         db: Database session
         
     Returns:
         List of audit trail entries as JSON
     """
     try:
-        from backend.db.models import AuditTrail
-        from sqlalchemy import func
-        
-        # Build base query for counting total matching records
-        count_query = db.query(func.count(AuditTrail.id))
-        
-        # Apply same filters as get_audit_trail
-        if agent_type:
-            count_query = count_query.filter(AuditTrail.agent_type == agent_type)
-        if entity_name:
-            count_query = count_query.filter(AuditTrail.entity_name == entity_name)
-        if decision_outcome:
-            count_query = count_query.filter(AuditTrail.decision_outcome == decision_outcome)
-        if risk_level:
-            count_query = count_query.filter(AuditTrail.risk_level == risk_level)
-        if task_category:
-            count_query = count_query.filter(AuditTrail.task_category == task_category)
-        if start_date:
-            count_query = count_query.filter(AuditTrail.timestamp >= start_date)
-        if end_date:
-            count_query = count_query.filter(AuditTrail.timestamp <= end_date)
-        
-        # Get total count of matching records
-        total_count = count_query.scalar() or 0
+        # Total matching records across the hot table and the archive
+        total_count = AuditService.count_audit_trail(
+            db=db,
+            agent_type=agent_type,
+            entity_name=entity_name,
+            decision_outcome=decision_outcome,
+            risk_level=risk_level,
+            task_category=task_category,
+            start_date=start_date,
+            end_date=end_date
+        )
         
         # Get paginated entries
         entries = AuditService.get_audit_trail(
@@ -97,19 +97,21 @@ async def get_audit_entries(
             risk_level=risk_level,
             task_category=task_category,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            fields=fields
         )
         
         # Convert to unified schema format
+        convert = convert_audit_trail_to_audit_summary if fields == "summary" else convert_audit_trail_to_audit_entry
         result = {
             "total_count": total_count,
             "total_returned": len(entries),
             "limit": limit,
             "offset": offset,
-            "entries": [convert_audit_trail_to_audit_entry(entry) for entry in entries]
+            "entries": [convert(entry) for entry in entries]
         }
         
-        return result
+        return json_response(result, request)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve audit entries: {str(e)}")
@@ -202,6 +204,7 @@ async def get_audit_statistics(
 
 @router.get("/export/json")
 async def export_audit_trail(
+    request: Request,
     limit: int = Query(default=1000, ge=1, le=10000, description="Maximum number of entries to export"),
     agent_type: Optional[str] = Query(default=None, description="Filter by agent type"),
     entity_name: Optional[str] = Query(default=None, description="Filter by entity name"),
@@ -261,7 +264,7 @@ async def export_audit_trail(
             "entries": entries
         }
         
-        return JSONResponse(content=result)
+        return json_response(result, request)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export audit trail: {str(e)}")
@@ -307,6 +310,7 @@ async def get_available_filters(db: Session = Depends(get_db)):
 async def get_recent_decisions(
     request: Request,
     limit: int = Query(default=10, ge=1, le=100, description="Number of recent decisions to return"),
+    fields: str = Query(default="full", pattern=FIELDS_PATTERN, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
@@ -316,6 +320,7 @@ async def get_recent_decisions(
     
     Args:
         limit: Number of recent decisions to return (1-100)
+        fields: "full" or "summary" (scalar columns only)
         db: Database session
         
     Returns:
@@ -325,13 +330,17 @@ async def get_recent_decisions(
         entries = AuditService.get_audit_trail(
             db=db,
             limit=limit,
-            offset=0
+            offset=0,
+            fields=fields
         )
+        if fields == "summary":
+            entries = [audit_trail_summary_row(entry) for entry in entries]
         
-        return {
+        # Rows are encoded by the AuditTrail serializer (same layout as to_dict)
+        return json_response({
             "count": len(entries),
-            "entries": [entry.to_dict() for entry in entries]
-        }
+            "entries": entries
+        }, request)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve recent decisions: {str(e)}")
@@ -339,9 +348,11 @@ async def get_recent_decisions(
 
 @router.get("/entity/{entity_name}")
 async def get_audit_by_entity(
+    request: Request,
     entity_name: str,
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    fields: str = Query(default="full", pattern=FIELDS_PATTERN, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
@@ -351,6 +362,7 @@ async def get_audit_by_entity(
         entity_name: Name of the entity
         limit: Maximum number of entries to return
         offset: Number of entries to skip
+        fields: "full" or "summary" (scalar columns only)
         db: Database session
         
     Returns:
@@ -361,8 +373,11 @@ async def get_audit_by_entity(
             db=db,
             limit=limit,
             offset=offset,
-            entity_name=entity_name
+            entity_name=entity_name,
+            fields=fields
         )
+        if fields == "summary":
+            entries = [audit_trail_summary_row(entry) for entry in entries]
         
         if not entries and offset == 0:
             return {
@@ -371,13 +386,13 @@ async def get_audit_by_entity(
                 "entries": []
             }
         
-        return {
+        return json_response({
             "entity_name": entity_name,
             "total_returned": len(entries),
             "limit": limit,
             "offset": offset,
-            "entries": [entry.to_dict() for entry in entries]
-        }
+            "entries": entries
+        }, request)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve entity audit trail: {str(e)}")
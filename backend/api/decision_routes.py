@@ -1,6 +1,6 @@
 """API routes for compliance decision engine"""
 
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request, Query
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -20,22 +20,63 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from backend.db.base import get_db
 from backend.auth.security import get_current_user
-from backend.db.models import ComplianceQuery, EntityHistory
+from backend.db.models import AuditTrail, ComplianceQuery, EntityHistory
 from backend.api.rate_limit import limiter, AUTH_RATE
 
 router = APIRouter(prefix="/decision", tags=["Decision Engine", "Protected"], dependencies=[Depends(get_current_user)])
 
+EXPLAIN_PATTERN = "^(none|summary|full)$"
+EXPLAIN_DESCRIPTION = (
+    "Explanation level: none (scores and decision only), summary (short reasoning, "
+    "recommendations, escalation reason) or full (complete reasoning chain)"
+)
+
 # Initialize decision engine and what-if engine
 decision_engine = DecisionEngine()
 what_if_engine = WhatIfEngine(decision_engine)
 
 
+def _analyze(entity: EntityContext, task: TaskContext, explain: str) -> DecisionAnalysis:
+    """
+    Analysis at the level its audit row is first written with: full when the
+    response needs the full chain, otherwise summary (recommendations and
+    escalation reason included; see _complete_audit_reasoning)
+    """
+    return decision_engine.analyze_and_decide(entity, task, explain="full" if explain == "full" else "summary")
+
+
+def _explained(analysis: DecisionAnalysis, explain: str) -> DecisionAnalysis:
+    """Response copy of an analysis from _analyze at the requested explain level"""
+    return decision_engine.explain(analysis, "none") if explain == "none" else analysis
+
+
+def _complete_audit_reasoning(bind: Any, audited: List[tuple]) -> None:
+    """
+    Replace the summary reasoning of audit rows with the full reasoning chain
+    
+    Runs as a background task after the response is sent, so the audit trail
+    keeps the full chain without the request paying for it.
+    
+    Args:
+        bind: Engine (or connection) of the request's session
+        audited: (audit id, analysis written to that row) pairs
+    """
+    with Session(bind=bind) as session:
+        for audit_id, analysis in audited:
+            entry = session.get(AuditTrail, audit_id)
+            if entry is not None:
+                entry.reasoning_chain = decision_engine.explain(analysis, "full").reasoning
+        session.commit()
+
+
 @router.post("/analyze")
 @limiter.limit(AUTH_RATE)
 async def analyze_compliance_decision(
     request: Request,
     entity: EntityContext,
     task: TaskContext,
+    background_tasks: BackgroundTasks,
+    explain: str = Query(default="full", pattern=EXPLAIN_PATTERN, description=EXPLAIN_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
@@ -51,6 +92,10 @@ async def analyze_compliance_decision(
     Args:
         entity: Entity context (company info, jurisdiction, industry)
         task: Task context (description, category, data sensitivity)
+        background_tasks: Fills in the audit row's full reasoning chain after
+            the response when explain is not full
+        explain: Explanation level of the response (none, summary, full); the
+            audit row always records the full reasoning
         db: Database session
         
     Returns:
@@ -97,7 +142,7 @@ async def analyze_compliance_decision(
             pattern_analysis = ". ".join(pattern_parts) + "."
         
         # STEP 2: Run decision engine analysis
-        analysis = decision_engine.analyze_and_decide(entity, task)
+        analysis = _analyze(entity, task, explain)
         
         # Diagnostic logging
         import logging
@@ -178,9 +223,11 @@ async def analyze_compliance_decision(
         )
         db.add(db_query)
         db.commit()
+        if explain != "full":
+            background_tasks.add_task(_complete_audit_reasoning, db.get_bind(), [(audit_entry.id, analysis)])
         
-        # Convert to unified schema format
-        return convert_decision_analysis_to_analysis_result(analysis, detailed=True)
+        # Convert to unified schema format at the requested explain level
+        return convert_decision_analysis_to_analysis_result(_explained(analysis, explain), detailed=True)
         
     except Exception as e:
         db.rollback()
@@ -197,16 +244,22 @@ async def analyze_compliance_decision(
 async def quick_risk_check(
     entity: EntityContext,
     task: TaskContext,
+    background_tasks: BackgroundTasks,
+    explain: str = Query(default="summary", pattern=EXPLAIN_PATTERN, description=EXPLAIN_DESCRIPTION),
     db: Session = Depends(get_db)
 ) -> dict:
     """
     Quick risk check without full analysis (faster endpoint)
     
+    The audit trail always records the full reasoning chain; below explain=full
+    it is rendered after the response is sent, and explain only controls what
+    the response includes.
+    
     Returns:
         Simplified risk assessment with key metrics
     """
     try:
-        analysis = decision_engine.analyze_and_decide(entity, task)
+        analysis = _analyze(entity, task, explain)
         
         # STEP: Log to audit trail (required for all decisions)
         audit_entry = AuditService.log_decision_analysis(
@@ -220,9 +273,11 @@ async def quick_risk_check(
             }
         )
         db.commit()
+        if explain != "full":
+            background_tasks.add_task(_complete_audit_reasoning, db.get_bind(), [(audit_entry.id, analysis)])
         
         # Convert to unified schema format (simple view)
-        return convert_decision_analysis_to_analysis_result(analysis, detailed=False)
+        return convert_decision_analysis_to_analysis_result(_explained(analysis, explain), detailed=False)
         
     except Exception as e:
         db.rollback()
@@ -281,6 +336,8 @@ async def get_risk_level_info():
 async def batch_analyze(
     entity: EntityContext,
     tasks: List[TaskContext],
+    background_tasks: BackgroundTasks,
+    explain: str = Query(default="summary", pattern=EXPLAIN_PATTERN, description=EXPLAIN_DESCRIPTION),
     db: Session = Depends(get_db)
 ) -> List[dict]:
     """
@@ -289,6 +346,10 @@ async def batch_analyze(
     Args:
         entity: Entity context
         tasks: List of task contexts to analyze
+        background_tasks: Fills in the audit rows' full reasoning chains after
+            the response when explain is not full
+        explain: Explanation level of the response; the default summary still returns
+            escalation reasons (audit rows always record the full reasoning)
         db: Database session
         
     Returns:
@@ -297,9 +358,10 @@ async def batch_analyze(
     try:
         results = []
         audit_ids = []
+        audited = []
         
         for task in tasks:
-            analysis = decision_engine.analyze_and_decide(entity, task)
+            analysis = _analyze(entity, task, explain)
             
             # Log each decision to audit trail
             audit_entry = AuditService.log_decision_analysis(
@@ -313,6 +375,8 @@ async def batch_analyze(
                 }
             )
             audit_ids.append(audit_entry.id)
+            audited.append((audit_entry.id, analysis))
+            analysis = _explained(analysis, explain)
             
             results.append({
                 "task_description": task.description,
@@ -339,6 +403,8 @@ async def batch_analyze(
         )
         db.add(db_query)
         db.commit()
+        if explain != "full":
+            background_tasks.add_task(_complete_audit_reasoning, db.get_bind(), audited)
         
         return results
         
@@ -489,6 +555,101 @@ async def compare_scenarios(
         )
 
 
+class SweepRequest(BaseModel):
+    """Request model for vectorized scenario sweeps"""
+    baseline: DecisionAnalysis
+    factors: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Risk factor -> list of values, or {min, max, steps}. "
+        "Unlisted factors keep their baseline value"
+    )
+    entity_attributes: Dict[str, List[Any]] = Field(
+        default_factory=dict, description="EntityContext field -> candidate values"
+    )
+    task_attributes: Dict[str, List[Any]] = Field(
+        default_factory=dict, description="TaskContext field -> candidate values"
+    )
+    mode: str = Field(default="grid", description="grid (cartesian product) or random (uniform samples)")
+    samples: int = Field(default=10_000, ge=1, description="Random samples per attribute combination")
+    seed: Optional[int] = Field(default=None, description="Seed for reproducible random sweeps")
+    include_surface: bool = Field(default=True, description="Return the score surface for 1-2 grid axes")
+
+
+@router.post("/what-if/sweep")
+@limiter.limit(AUTH_RATE)
+async def sweep_scenarios(
+    request: Request,
+    req: SweepRequest,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Sweep grids or random samples of scenarios around a baseline.
+    
+    Evaluates tens of thousands of scenarios in a single vectorized pass and
+    returns score surfaces, per-factor sensitivities and the exact factor
+    values at which the decision flips.
+    
+    Args:
+        request: FastAPI Request object (for rate limiting)
+        req: SweepRequest with baseline and sweep specification
+        db: Database session
+    
+    Returns:
+        Dictionary with sweep summary, sensitivities and thresholds
+    """
+    try:
+        result = what_if_engine.sweep(
+            baseline=req.baseline,
+            factors=req.factors,
+            entity_attributes=req.entity_attributes,
+            task_attributes=req.task_attributes,
+            mode=req.mode,
+            samples=req.samples,
+            seed=req.seed,
+            include_surface=req.include_surface
+        )
+    except ValueError as e:
+        from backend.api.error_utils import raise_standardized_error
+        raise_standardized_error(
+            status_code=400,
+            error_type="InvalidSweepRequest",
+            message=str(e)
+        )
+    
+    try:
+        AuditService.log_custom_decision(
+            db=db,
+            task_description=req.baseline.task_context.description,
+            decision_outcome="SCENARIO_SWEEP",
+            confidence_score=0.8,
+            reasoning_chain=[f"Swept {result['scenario_count']} scenarios"],
+            agent_type="what_if_engine",
+            task_category=req.baseline.task_context.category.value,
+            entity_name=req.baseline.entity_context.name,
+            risk_level=req.baseline.risk_level.value,
+            risk_score=req.baseline.risk_factors.overall_score,
+            metadata={
+                "api_endpoint": "/decision/what-if/sweep",
+                "mode": req.mode,
+                "scenario_count": result["scenario_count"],
+                "swept_factors": result["swept_factors"],
+                "elapsed_ms": result["elapsed_ms"]
+            }
+        )
+        db.commit()
+        return result
+        
+    except Exception as e:
+        db.rollback()
+        from backend.api.error_utils import raise_standardized_error
+        raise_standardized_error(
+            status_code=500,
+            error_type="ScenarioSweepError",
+            message=f"Scenario sweep failed: {str(e)}",
+            details={"error_type": type(e).__name__}
+        )
+
+
 class TriggerCheckRequest(BaseModel):
     """Request model for checking proactive suggestion triggers"""
     entity_name: str = Field(description="Organization name")
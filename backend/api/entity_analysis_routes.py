@@ -512,30 +512,12 @@ async def get_audit_log(
         Complete audit log with reasoning chain
     """
     try:
-        # Query audit trail by task_id in metadata
+        # task_id is mirrored from meta_data into an indexed column
         from backend.db.models import AuditTrail
-        from sqlalchemy import func
-        from backend.db.base import get_database_type
         
-        # Use portable JSON query based on database type
-        db_type = get_database_type()
-        
-        if db_type == "sqlite":
-            # SQLite-specific JSON extraction using json_extract function
-            audit_entry = db.query(AuditTrail).filter(
-                func.json_extract(AuditTrail.meta_data, '$.task_id') == task_id
-            ).order_by(AuditTrail.timestamp.desc()).first()
-        elif db_type == "postgresql":
-            # PostgreSQL uses JSON operators: meta_data->>'task_id'
-            audit_entry = db.query(AuditTrail).filter(
-                AuditTrail.meta_data['task_id'].astext == task_id
-            ).order_by(AuditTrail.timestamp.desc()).first()
-        else:
-            # MySQL and other databases: use JSON_EXTRACT function
-            # Fallback to SQLite method for compatibility
-            audit_entry = db.query(AuditTrail).filter(
-                func.json_extract(AuditTrail.meta_data, '$.task_id') == task_id
-            ).order_by(AuditTrail.timestamp.desc()).first()
+        audit_entry = db.query(AuditTrail).filter(
+            AuditTrail.task_id == task_id
+        ).order_by(AuditTrail.timestamp.desc()).first()
         
         if not audit_entry:
             raise HTTPException(
@@ -1,16 +1,18 @@
 """API routes for human feedback on AI decisions"""
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timezone, timedelta
 
 from backend.db.base import get_db
 from backend.db.models import FeedbackLog
+from backend.db.audit_archive import get_archive
 from backend.auth.security import get_current_user
 from backend.agent.feedback_processor import FeedbackProcessor
+from backend.api.responses import json_response
+from backend.utils.serializers import feedback_row
 
 router = APIRouter(tags=["Feedback", "Protected"], dependencies=[Depends(get_current_user)])
 
@@ -145,6 +147,7 @@ def submit_feedback(
 
 @router.get("/feedback", response_model=List[FeedbackResponse])
 def get_feedback(
+    request: Request,
     skip: int = 0,
     limit: int = 50,
     entity_name: Optional[str] = None,
@@ -167,22 +170,17 @@ def get_feedback(
     if entity_name:
         query = query.filter(FeedbackLog.entity_name == entity_name)
     
-    feedback_entries = query.order_by(FeedbackLog.timestamp.desc()).offset(skip).limit(limit).all()
+    # Newest first, across the hot table and the archive
+    feedback_entries = get_archive().read_through(
+        db, "feedback_log", query.order_by(FeedbackLog.timestamp.desc()),
+        limit=limit, offset=skip, filters={"entity_name": entity_name}
+    )
     
-    return [
-        FeedbackResponse(
-            feedback_id=f.feedback_id,
-            timestamp=f.timestamp.isoformat(),
-            entity_name=f.entity_name,
-            task_description=f.task_description,
-            ai_decision=f.ai_decision,
-            human_decision=f.human_decision,
-            notes=f.notes,
-            is_agreement=bool(f.is_agreement),
-            audit_trail_id=f.audit_trail_id
-        )
-        for f in feedback_entries
-    ]
+    # FeedbackResponse layout, serialized directly from the rows
+    return json_response(
+        [feedback_row(f, include_metadata=False) for f in feedback_entries],
+        request
+    )
 
 
 @router.get("/feedback/stats", response_model=FeedbackStats)
@@ -197,52 +195,9 @@ def get_feedback_stats(db: Session = Depends(get_db)):
         Feedback statistics including accuracy and override counts
     """
     try:
-        # Total feedback count
-        total_count = db.query(func.count(FeedbackLog.feedback_id)).scalar() or 0
-        
-        if total_count == 0:
-            return FeedbackStats(
-                total_feedback_count=0,
-                agreement_count=0,
-                override_count=0,
-                accuracy_percent=0.0,
-                most_overridden_decision=None,
-                override_breakdown={}
-            )
-        
-        # Agreement count (AI was correct)
-        agreement_count = db.query(func.count(FeedbackLog.feedback_id)).filter(
-            FeedbackLog.is_agreement == 1
-        ).scalar() or 0
-        
-        # Override count (AI was corrected)
-        override_count = total_count - agreement_count
-        
-        # Accuracy percentage
-        accuracy_percent = (agreement_count / total_count * 100) if total_count > 0 else 0.0
-        
-        # Override breakdown by AI decision type
-        override_breakdown = {}
-        for decision_type in ["AUTONOMOUS", "REVIEW_REQUIRED", "ESCALATE"]:
-            override_count_for_type = db.query(func.count(FeedbackLog.feedback_id)).filter(
-                FeedbackLog.ai_decision == decision_type,
-                FeedbackLog.is_agreement == 0
-            ).scalar() or 0
-            override_breakdown[decision_type] = override_count_for_type
-        
-        # Most overridden decision type
-        most_overridden = max(override_breakdown, key=override_breakdown.get) if override_breakdown else None
-        if most_overridden and override_breakdown[most_overridden] == 0:
-            most_overridden = None
-        
-        return FeedbackStats(
-            total_feedback_count=total_count,
-            agreement_count=agreement_count,
-            override_count=override_count,
-            accuracy_percent=round(accuracy_percent, 2),
-            most_overridden_decision=most_overridden,
-            override_breakdown=override_breakdown
-        )
+        # One grouped aggregate (hot and archived rows) instead of a COUNT per decision type
+        summary = FeedbackProcessor(db).get_feedback_statistics()["overall"]
+        return FeedbackStats(**{field: summary[field] for field in FeedbackStats.model_fields})
         
     except Exception as e:
         raise HTTPException(
@@ -251,34 +206,36 @@ def get_feedback_stats(db: Session = Depends(get_db)):
         )
 
 
-@router.get("/feedback/{feedback_id}", response_model=FeedbackResponse)
-def get_feedback_by_id(feedback_id: int, db: Session = Depends(get_db)):
+@router.get("/feedback/accuracy", response_model=Dict[str, Any])
+def get_feedback_accuracy(
+    group_by: Optional[str] = Query(default=None, pattern="^(entity_name|task_category)$", description="Optional dimension"),
+    entity_name: Optional[str] = Query(default=None, description="Filter by entity name"),
+    start_date: Optional[datetime] = Query(default=None, description="Filter feedback after this date"),
+    end_date: Optional[datetime] = Query(default=None, description="Filter feedback before this date"),
+    db: Session = Depends(get_db)
+):
     """
-    Get a specific feedback entry by ID
+    Get AI accuracy, the AI vs. human confusion matrix and override types,
+    overall and per entity or task category
     
     Args:
-        feedback_id: ID of the feedback entry
+        group_by: Optional dimension (entity_name or task_category)
+        entity_name: Optional entity name filter
+        start_date: Filter feedback after this date
+        end_date: Filter feedback before this date
         db: Database session
-        
+    
     Returns:
-        Feedback entry
+        Overall summary and one summary per group, largest first
     """
-    feedback = db.query(FeedbackLog).filter(FeedbackLog.feedback_id == feedback_id).first()
-    
-    if not feedback:
-        raise HTTPException(status_code=404, detail="Feedback entry not found")
+    try:
+        return FeedbackProcessor(db).get_feedback_statistics(entity_name, start_date, end_date, group_by)
     
-    return FeedbackResponse(
-        feedback_id=feedback.feedback_id,
-        timestamp=feedback.timestamp.isoformat(),
-        entity_name=feedback.entity_name,
-        task_description=feedback.task_description,
-        ai_decision=feedback.ai_decision,
-        human_decision=feedback.human_decision,
-        notes=feedback.notes,
-        is_agreement=bool(feedback.is_agreement),
-        audit_trail_id=feedback.audit_trail_id
-    )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve feedback accuracy: {str(e)}"
+        )
 
 
 @router.get("/feedback/overrides", response_model=Dict[str, Any])
@@ -312,7 +269,8 @@ def get_override_statistics(
         if entity_name:
             query = query.filter(FeedbackLog.entity_name == entity_name)
         
-        overrides = query.order_by(FeedbackLog.timestamp.desc()).all()
+        # Only the 50 most recent rows are listed; the totals come from the aggregate
+        overrides = query.order_by(FeedbackLog.timestamp.desc()).limit(50).all()
         
         # Detailed override list
         override_details = []
@@ -332,8 +290,8 @@ def get_override_statistics(
         
         return {
             **stats,
-            "override_details": override_details[:50],  # Limit to 50 most recent
-            "total_tracked": len(override_details)
+            "override_details": override_details,
+            "total_tracked": stats["total_overrides"]
         }
         
     except Exception as e:
@@ -342,3 +300,34 @@ def get_override_statistics(
             detail=f"Failed to retrieve override statistics: {str(e)}"
         )
 
+
+@router.get("/feedback/{feedback_id}", response_model=FeedbackResponse)
+def get_feedback_by_id(feedback_id: int, db: Session = Depends(get_db)):
+    """
+    Get a specific feedback entry by ID
+    
+    Args:
+        feedback_id: ID of the feedback entry
+        db: Database session
+        
+    Returns:
+        Feedback entry
+    """
+    feedback = db.query(FeedbackLog).filter(FeedbackLog.feedback_id == feedback_id).first()
+    if feedback is None:
+        feedback = get_archive().get(db, "feedback_log", feedback_id)
+    
+    if not feedback:
+        raise HTTPException(status_code=404, detail="Feedback entry not found")
+    
+    return FeedbackResponse(
+        feedback_id=feedback.feedback_id,
+        timestamp=feedback.timestamp.isoformat(),
+        entity_name=feedback.entity_name,
+        task_description=feedback.task_description,
+        ai_decision=feedback.ai_decision,
+        human_decision=feedback.human_decision,
+        notes=feedback.notes,
+        is_agreement=bool(feedback.is_agreement),
+        audit_trail_id=feedback.audit_trail_id
+    )
@@ -0,0 +1,244 @@
+"""Admin-only API routes for on-demand CPU and memory profiling of this API process"""
+
+import json
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+from backend.auth.security import require_admin
+from backend.profiling import memory_profiler, profiler
+from backend.profiling.memory import KEY_TYPES
+
+router = APIRouter(prefix="/profiling", tags=["Profiling", "Protected"], dependencies=[Depends(require_admin)])
+
+ProfileFormat = Literal["summary", "collapsed", "speedscope"]
+SnapshotFormat = Literal["top", "collapsed", "speedscope"]
+
+
+class CPUProfileStart(BaseModel):
+    """Process-wide sampling profile"""
+    max_seconds: Optional[float] = Field(default=None, gt=0, description="Stop automatically after this long")
+    include_idle: bool = Field(default=False, description="Also record threads that are waiting")
+
+
+class RequestProfilingArm(BaseModel):
+    """Header-triggered request profiling"""
+    sample_rate: float = Field(default=0.1, gt=0, le=1, description="Share of X-Profile requests to profile")
+    duration_s: float = Field(default=300, gt=0, description="How long profiling stays armed")
+    path_prefix: str = Field(default="", description="Only profile paths starting with this (e.g. /api/v1/agentic/analyze)")
+
+
+class MemoryTracingStart(BaseModel):
+    """tracemalloc tracing"""
+    frames: int = Field(default=25, ge=1, le=100, description="Frames kept per allocation traceback")
+
+
+def _download(content: Any, filename: str) -> Response:
+    if isinstance(content, str):
+        body, media_type = content, "text/plain; charset=utf-8"
+    else:
+        body, media_type = json.dumps(content), "application/json"
+    return Response(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+def _key_type(key_type: str) -> str:
+    if key_type not in KEY_TYPES:
+        raise HTTPException(status_code=400, detail=f"key_type must be one of: {', '.join(KEY_TYPES)}")
+    return key_type
+
+
+@router.get("/status")
+def profiling_status():
+    """
+    Sampler, request profiling and tracemalloc state of the process serving this request
+
+    Returns:
+        Sampler status (with the process id) and memory tracing status
+    """
+    return {"cpu": profiler.status(), "memory": memory_profiler.status()}
+
+
+@router.post("/cpu/start")
+def start_cpu_profile(body: CPUProfileStart = CPUProfileStart()):
+    """
+    Start sampling every thread of this process
+
+    Args:
+        body: Time limit and whether to record idle threads
+
+    Returns:
+        Id of the profile being recorded
+    """
+    try:
+        session = profiler.start(max_seconds=body.max_seconds, include_idle=body.include_idle)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"id": session.id, "status": profiler.status()}
+
+
+@router.post("/cpu/stop")
+def stop_cpu_profile():
+    """
+    Stop the process-wide profile and keep it
+
+    Returns:
+        Profile summary (download it from /profiling/profiles/{id})
+    """
+    try:
+        return profiler.stop().summary()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/requests/arm")
+def arm_request_profiling(body: RequestProfilingArm):
+    """
+    Profile a share of the requests sent with an X-Profile header
+
+    Profiled responses carry an X-Profile-Id header naming their profile.
+
+    Args:
+        body: Sample rate, how long to stay armed and an optional path prefix
+
+    Returns:
+        Request profiling status
+    """
+    profiler.arm(body.sample_rate, body.duration_s, body.path_prefix)
+    return profiler.status()["request_profiling"]
+
+
+@router.post("/requests/disarm")
+def disarm_request_profiling():
+    """Stop profiling X-Profile requests"""
+    profiler.disarm()
+    return {"request_profiling": None}
+
+
+@router.get("/profiles")
+def list_profiles():
+    """
+    Kept profiles of this process, newest first
+
+    Returns:
+        Profile summaries with their top functions
+    """
+    return [profile.summary(top=3) for profile in reversed(list(profiler.profiles.values()))]
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    format: ProfileFormat = Query(default="summary", description="summary, collapsed (flame graph input) or speedscope"),
+):
+    """
+    One profile, as a summary or a flame graph file
+
+    Args:
+        profile_id: Profile id
+        format: summary, collapsed or speedscope
+
+    Returns:
+        Summary JSON, or the profile as a collapsed-stack / speedscope download
+    """
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    if format == "collapsed":
+        return _download(profile.collapsed(), f"{profile.kind}-{profile.id}.collapsed.txt")
+    if format == "speedscope":
+        return _download(profile.speedscope(), f"{profile.kind}-{profile.id}.speedscope.json")
+    return profile.summary(top=25)
+
+
+@router.post("/memory/start")
+def start_memory_tracing(body: MemoryTracingStart = MemoryTracingStart()):
+    """
+    Start tracing allocations with tracemalloc (slows the process until stopped)
+
+    Args:
+        body: Frames kept per traceback
+
+    Returns:
+        Memory tracing status
+    """
+    try:
+        memory_profiler.start(body.frames)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return memory_profiler.status()
+
+
+@router.post("/memory/stop")
+def stop_memory_tracing():
+    """Stop tracing allocations (snapshots are kept)"""
+    try:
+        memory_profiler.stop()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return memory_profiler.status()
+
+
+@router.post("/memory/snapshots")
+def take_memory_snapshot(limit: int = Query(default=10, ge=1, le=200, description="Top allocation sites to return")):
+    """
+    Take a tracemalloc snapshot
+
+    Returns:
+        Snapshot id and its largest allocation sites
+    """
+    try:
+        return memory_profiler.snapshot(limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/snapshots/{snapshot_id}")
+def get_memory_snapshot(
+    snapshot_id: str,
+    format: SnapshotFormat = Query(default="top", description="top, collapsed (flame graph input) or speedscope"),
+    key_type: str = Query(default="lineno", description="Group the top list by lineno or filename"),
+    limit: int = Query(default=20, ge=1, le=500, description="Allocation sites to return"),
+):
+    """
+    One snapshot: largest allocation sites, or allocation tracebacks as a flame graph file
+
+    Args:
+        snapshot_id: Snapshot id
+        format: top, collapsed or speedscope (weights in bytes)
+        key_type: lineno or filename (top only)
+        limit: Allocation sites to return (top only)
+    """
+    if snapshot_id not in memory_profiler.snapshots:
+        raise HTTPException(status_code=404, detail=f"Snapshot {snapshot_id} not found")
+    if format == "collapsed":
+        return _download(memory_profiler.collapsed(snapshot_id), f"memory-{snapshot_id}.collapsed.txt")
+    if format == "speedscope":
+        return _download(memory_profiler.speedscope(snapshot_id), f"memory-{snapshot_id}.speedscope.json")
+    return {"id": snapshot_id, "top": memory_profiler.top(snapshot_id, limit, _key_type(key_type))}
+
+
+@router.get("/memory/diff")
+def diff_memory_snapshots(
+    base: str = Query(..., description="Earlier snapshot id"),
+    target: str = Query(..., description="Later snapshot id"),
+    key_type: str = Query(default="lineno", description="Group by lineno or filename"),
+    limit: int = Query(default=20, ge=1, le=500, description="Allocation sites to return"),
+):
+    """
+    Allocation sites that grew or shrank most between two snapshots
+
+    Args:
+        base: Earlier snapshot id
+        target: Later snapshot id
+        key_type: lineno or filename
+        limit: Allocation sites to return
+
+    Returns:
+        Sites with their size and count now and the change since ``base``
+    """
+    missing = [snapshot_id for snapshot_id in (base, target) if snapshot_id not in memory_profiler.snapshots]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Snapshot {missing[0]} not found")
+    return {"base": base, "target": target, "diff": memory_profiler.diff(base, target, limit, _key_type(key_type))}
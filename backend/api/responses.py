@@ -0,0 +1,88 @@
+"""
+Fast JSON responses for API routes.
+
+FastJSONResponse is the application's default response class, so every route
+renders through orjson. Routes with large payloads return json_response(...)
+directly: FastAPI then skips jsonable_encoder entirely, and the body is
+compressed with zstd or gzip when the client accepts it.
+"""
+
+from typing import Any, Mapping, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.background import BackgroundTask
+
+from backend.config import settings
+from backend.utils.serializers import encode_body
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson, optionally content-encoded.
+
+    Args:
+        content: Response content (dicts, lists, Pydantic models, ORM rows, ...)
+        status_code: HTTP status code
+        headers: Extra response headers
+        media_type: Overrides application/json
+        background: Background task to run after sending
+        accept_encoding: Client Accept-Encoding header; None disables compression
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        accept_encoding: Optional[str] = None,
+    ) -> None:
+        self.accept_encoding = accept_encoding
+        self.content_encoding: Optional[str] = None
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        body, self.content_encoding = encode_body(
+            content,
+            accept_encoding=self.accept_encoding,
+            min_bytes=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+            zstd_level=settings.RESPONSE_ZSTD_LEVEL,
+            gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        )
+        return body
+
+    def init_headers(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        super().init_headers(headers)
+        if self.accept_encoding is not None:
+            self.raw_headers.append((b"vary", b"Accept-Encoding"))
+        if self.content_encoding:
+            self.raw_headers.append((b"content-encoding", self.content_encoding.encode("latin-1")))
+
+
+def json_response(
+    content: Any,
+    request: Optional[Request] = None,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> FastJSONResponse:
+    """
+    Build a FastJSONResponse, compressed according to the request's Accept-Encoding.
+
+    Returning this from a route bypasses FastAPI's jsonable_encoder and
+    response_model serialization.
+
+    Args:
+        content: Response content
+        request: Incoming request (for Accept-Encoding); None disables compression
+        status_code: HTTP status code
+        headers: Extra response headers
+
+    Returns:
+        FastJSONResponse
+    """
+    accept_encoding = request.headers.get("accept-encoding", "") if request is not None else None
+    return FastJSONResponse(content, status_code=status_code, headers=headers, accept_encoding=accept_encoding)
@@ -0,0 +1,54 @@
+"""API routes exposing telemetry: recent spans as OTLP JSON (metrics are served by /metrics)"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from backend.api.responses import json_response
+from backend.auth.security import get_current_user
+from backend.telemetry import InMemorySpanExporter, encode_spans, telemetry
+
+router = APIRouter(prefix="/telemetry", tags=["Telemetry", "Protected"], dependencies=[Depends(get_current_user)])
+
+
+def _span_buffer() -> Optional[InMemorySpanExporter]:
+    return next((e for e in telemetry.exporters if isinstance(e, InMemorySpanExporter)), None)
+
+
+@router.get("/status")
+def telemetry_status():
+    """
+    Whether telemetry is recording, and where spans are exported
+
+    Returns:
+        Enabled flag, service name and exporter types
+    """
+    return {
+        "enabled": telemetry.enabled,
+        "service_name": telemetry.service_name,
+        "exporters": [type(exporter).__name__ for exporter in telemetry.exporters],
+    }
+
+
+@router.get("/traces")
+def telemetry_traces(
+    request: Request,
+    limit: int = Query(default=500, ge=1, le=10000, description="Most recent spans to return"),
+    trace_id: Optional[str] = Query(default=None, description="Only spans of this trace"),
+):
+    """
+    Most recent finished spans as an OTLP/JSON ExportTraceServiceRequest
+
+    Args:
+        limit: Most recent spans to return
+        trace_id: Only spans of this trace
+
+    Returns:
+        OTLP/JSON resourceSpans (empty while telemetry is disabled)
+    """
+    buffer = _span_buffer()
+    spans = buffer.get_finished_spans() if buffer is not None else []
+    if trace_id:
+        spans = [span for span in spans if span.trace_id == trace_id]
+    return json_response(encode_spans(spans[-limit:], telemetry.service_name), request)
+
@@ -5,13 +5,14 @@ Provides authentication, authorization, and user management functionality.
 """
 
 from .auth_router import router as auth_router
-from .security import get_current_user, create_access_token, create_refresh_token
+from .security import get_current_user, require_admin, create_access_token, create_refresh_token
 from .user_manager import ensure_admin_user, authenticate_user
 from .auth_models import User
 
 __all__ = [
     "auth_router",
     "get_current_user",
+    "require_admin",
     "create_access_token",
     "create_refresh_token",
     "ensure_admin_user",
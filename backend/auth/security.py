@@ -135,3 +135,11 @@ def get_current_user(
         "user_id": user.id
     })
     return user
+
+
+def require_admin(user: User = Depends(get_current_user)) -> User:
+    """Authenticated user listed in ADMIN_USERNAMES (users have no roles)."""
+    if user.username not in settings.ADMIN_USERNAMES:
+        logger.warning(f"Admin access denied: {user.username}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return user
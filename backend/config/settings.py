@@ -56,6 +56,60 @@ class Settings(BaseSettings):
     AGENTIC_OPERATION_TIMEOUT: int = 60  # Overall timeout for agentic operations
     AGENTIC_SECONDARY_TASK_TIMEOUT: int = 20  # Timeout for secondary tasks like reflection
     AGENTIC_LLM_CALL_TIMEOUT: int = 15  # Timeout for individual LLM calls in orchestrator (plan, execute, recommend)
+
+    # Agentic prompt token budgets (whole prompt, per call type); context is compacted to fit
+    AGENTIC_PROMPT_BUDGET_PLAN: int = 3000
+    AGENTIC_PROMPT_BUDGET_EXECUTE: int = 3000
+    AGENTIC_PROMPT_BUDGET_REFLECT: int = 2500
+    AGENTIC_PROMPT_BUDGET_REFLECT_BATCH: int = 8000
+
+    # Reflection scheduling: "per_step" reflects after every step; "batched" scores
+    # AGENTIC_REFLECTION_WINDOW completed steps per LLM call (0 = all steps of the plan).
+    # Speculative reflection runs each reflection call while the next step executes
+    AGENTIC_REFLECTION_MODE: str = "per_step"  # per_step | batched
+    AGENTIC_REFLECTION_WINDOW: int = 0
+    AGENTIC_SPECULATIVE_REFLECTION: bool = False
+
+    # Plan cache: plans of successful runs keyed on (task category, jurisdictions, entity type).
+    # A cached plan whose quality (decayed with a half-life since last use) reaches
+    # AGENTIC_PLAN_CACHE_REUSE_QUALITY is reused without calling the planner; a lower-scoring
+    # one is passed to the planner as a reference plan. Runs below MIN_QUALITY are not stored
+    AGENTIC_PLAN_CACHE_ENABLED: bool = True
+    AGENTIC_PLAN_CACHE_MAX_ENTRIES: int = 256
+    AGENTIC_PLAN_CACHE_MIN_QUALITY: float = 0.8
+    AGENTIC_PLAN_CACHE_REUSE_QUALITY: float = 0.85
+    AGENTIC_PLAN_CACHE_HALF_LIFE_HOURS: float = 72.0
+
+    # Tool router: after AGENTIC_TOOL_ROUTER_MIN_SAMPLES runs, a tool whose output is usable
+    # for less than AGENTIC_TOOL_ROUTER_MIN_VALUE of a step type's runs is skipped for it;
+    # tools expected to overrun the per-step latency budget (ms, 0 = none) need a 0.5 rate
+    AGENTIC_TOOL_ROUTER_ENABLED: bool = True
+    AGENTIC_TOOL_ROUTER_MIN_SAMPLES: int = 10
+    AGENTIC_TOOL_ROUTER_MIN_VALUE: float = 0.2
+    AGENTIC_TOOL_LATENCY_BUDGET_MS: float = 2000.0
+
+    # Tool result cache: read-only tools' results are reused per parameter hash, within a
+    # run or across runs depending on the tool's cache_scope/cache_ttl_s in ToolRegistry
+    AGENTIC_TOOL_CACHE_ENABLED: bool = True
+    AGENTIC_TOOL_CACHE_MAX_ENTRIES: int = 1024
+
+    # Execution traces: every AgentLoop run records its LLM, tool, DB and reflection calls as
+    # spans and saves them (zstd-compressed MessagePack) to AGENTIC_TRACE_DIR for replay
+    AGENTIC_TRACE_ENABLED: bool = False
+    AGENTIC_TRACE_DIR: str = "traces"
+
+    # Multi-pass step reasoning: steps the complexity classifier scores at least
+    # AGENTIC_COMPLEXITY_THRESHOLD get extra passes (weights from AGENTIC_COMPLEXITY_MODEL_PATH
+    # when set). Passes stop once pass 1 reaches AGENTIC_PASS_CONFIDENT_EXIT, or when
+    # confidence moves by at most the epsilon and findings overlap by at least the ratio
+    AGENTIC_COMPLEXITY_THRESHOLD: float = 0.5
+    AGENTIC_COMPLEXITY_MODEL_PATH: str = ""
+    AGENTIC_PASS_CONFIDENT_EXIT: float = 0.85
+    AGENTIC_PASS_CONFIDENCE_EPSILON: float = 0.05
+    AGENTIC_PASS_FINDINGS_OVERLAP: float = 0.5
+    # USD per 1K tokens, used to cost each reasoning pass (defaults: gpt-4o-mini list prices)
+    LLM_PROMPT_COST_PER_1K: float = 0.00015
+    LLM_COMPLETION_COST_PER_1K: float = 0.0006
     
     # API Client Timeouts
     API_DEFAULT_TIMEOUT: int = 30  # Default timeout for API calls
@@ -65,11 +119,75 @@ class Settings(BaseSettings):
     LLM_COMPLIANCE_TIMEOUT: int = 45  # For compliance analysis calls
     LLM_STANDARD_TIMEOUT: int = 30  # For standard LLM calls
 
-    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    # API response encoding (orjson). Bodies of at least this many bytes are
+    # zstd/gzip-compressed when the client's Accept-Encoding allows it; 0 disables
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 4096
+    RESPONSE_ZSTD_LEVEL: int = 3
+    RESPONSE_GZIP_LEVEL: int = 6
+
+    # Compressed audit JSON columns (backend/db/compressed_json.py): zstd level and the
+    # trained dictionary in backend/db/zstd_dicts/ used for new writes ("" = no dictionary)
+    AUDIT_JSON_ZSTD_LEVEL: int = 3
+    AUDIT_JSON_ZSTD_DICT: str = "audit_json_v1"
+
+    # Audit archive (backend/db/audit_archive.py): audit/feedback rows older than the
+    # hot retention window are moved to monthly Parquet partitions under AUDIT_ARCHIVE_DIR
+    AUDIT_ARCHIVE_DIR: str = "./audit_archive"
+    AUDIT_HOT_RETENTION_DAYS: int = 90
+
+    # Analytics snapshots (backend/analytics/snapshots.py): columnar copies of the audit and
+    # feedback tables; new rows are appended at most every ANALYTICS_REFRESH_SECONDS, and the
+    # snapshots are rebuilt from scratch every ANALYTICS_REBUILD_SECONDS
+    ANALYTICS_SNAPSHOT_DIR: str = "./analytics_snapshots"
+    ANALYTICS_REFRESH_SECONDS: float = 30.0
+    ANALYTICS_REBUILD_SECONDS: float = 3600.0
+
+    # Telemetry (backend/telemetry): OpenTelemetry-shaped spans for API requests, decision engine
+    # phases, agent runs, LLM calls and SQL queries, served under /api/v1/telemetry (OTLP JSON
+    # traces from the last TELEMETRY_BUFFER_SPANS spans) and pushed to TELEMETRY_OTLP_ENDPOINT
+    # when set (e.g. http://localhost:4318/v1/traces); span durations and errors go to /metrics.
+    # Nothing is instrumented while disabled
+    TELEMETRY_ENABLED: bool = False
+    TELEMETRY_SERVICE_NAME: str = "agentic-compliance-api"
+    TELEMETRY_BUFFER_SPANS: int = 2048
+    TELEMETRY_OTLP_ENDPOINT: str = ""
+
+    # Prometheus metrics served at /metrics (backend/telemetry/metrics.py), always recorded.
+    # With several uvicorn workers set METRICS_MULTIPROC_DIR (or PROMETHEUS_MULTIPROC_DIR) to a
+    # directory shared by the workers and emptied before the server starts; every scrape then
+    # aggregates all workers
+    METRICS_MULTIPROC_DIR: str = ""
+
+    # Usernames allowed on admin-only endpoints (users have no roles); "demo" is the default admin
+    ADMIN_USERNAMES: List[str] = ["demo"]
+
+    # Profiling (backend/profiling), admin-only under /api/v1/profiling and per process: sampling
+    # profiler start/stop, per-request profiles of a fraction of X-Profile requests while armed,
+    # tracemalloc snapshots and diffs. Idle until started; profiles are kept in memory and also
+    # written to PROFILING_OUTPUT_DIR (collapsed stacks, speedscope JSON) when set
+    PROFILING_ENABLED: bool = True
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_SECONDS: float = 600.0  # Longest process profile / request profiling window
+    PROFILING_MAX_CONCURRENT_REQUESTS: int = 2
+    PROFILING_KEEP_PROFILES: int = 50
+    PROFILING_KEEP_SNAPSHOTS: int = 5
+    PROFILING_OUTPUT_DIR: str = ""
+
+    # LLM provider: "openai", or "mock" for the deterministic offline provider (load tests, CI)
+    LLM_PROVIDER: str = "openai"
+    MOCK_LLM_SEED: int = 42
+    MOCK_LLM_LATENCY_DISTRIBUTION: str = "lognormal"  # fixed | uniform | lognormal | exponential
+    MOCK_LLM_LATENCY_MS: float = 300.0  # Median time to first token
+    MOCK_LLM_LATENCY_JITTER: float = 0.3  # Lognormal sigma / uniform +/- fraction
+    MOCK_LLM_TOKENS_PER_SECOND: float = 80.0  # Output token rate, 0 = instant
+    MOCK_LLM_ERROR_RATE: float = 0.0  # Probability of an injected 500
+    MOCK_LLM_RATE_LIMIT_RATE: float = 0.0  # Probability of an injected 429
+
+    @field_validator("BACKEND_CORS_ORIGINS", "ADMIN_USERNAMES", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
         """
-        Allow CORS origins to be provided as:
+        Allow CORS origins (and admin usernames) to be provided as:
         - JSON array string
         - Comma-separated string
         - List[str]
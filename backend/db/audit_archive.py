@@ -0,0 +1,612 @@
+"""
+Audit Archive
+=============
+Hot/cold tiering for AuditTrail and FeedbackLog.
+
+Rows older than AUDIT_HOT_RETENTION_DAYS are moved by the rollover job into
+immutable, zstd-compressed Parquet files partitioned by month::
+
+    {AUDIT_ARCHIVE_DIR}/audit_trail/year=2024/month=03/part-0000012001-0000013000.parquet
+
+Two small tables in the main database describe the cold tier:
+ArchivePartition (one row per file, with timestamp and id bounds) and
+ArchiveIndex (one row per archived row, for id and entity lookups). The
+files, manifest rows and hot-row deletes of a batch are committed together,
+so a row is always in exactly one tier.
+
+Reads go through ``AuditArchive.read_through``: the hot query runs as
+before, and the archive is only read when its newest matching row could
+rank within the requested page.
+
+Usage:
+    python -m backend.db.audit_archive rollover [--days 90] [--batch-size 5000] [--dry-run]
+    python -m backend.db.audit_archive status
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Type
+
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import JSON, DateTime, Float, Integer, func, insert
+from sqlalchemy.orm import Query, Session
+
+from backend.config import settings
+from backend.db.base import Base
+from backend.db.compressed_json import CompressedJSON
+from backend.db.models import ArchiveIndex, ArchivePartition, AuditTrail, FeedbackLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ArchivedTable:
+    """How one hot table is archived"""
+
+    model: Type[Base]
+    name: str
+    pk: str
+
+    @cached_property
+    def columns(self) -> List[str]:
+        return [column.name for column in self.model.__table__.columns]
+
+    @cached_property
+    def json_columns(self) -> FrozenSet[str]:
+        return frozenset(column.name for column in self.model.__table__.columns
+                         if isinstance(column.type, (JSON, CompressedJSON)))
+
+    @cached_property
+    def attributes(self) -> Dict[str, str]:
+        """Mapped attribute name per column name"""
+        mapper = self.model.__mapper__
+        return {column.name: mapper.get_property_by_column(column).key for column in self.model.__table__.columns}
+
+
+ARCHIVED_TABLES = {
+    "audit_trail": ArchivedTable(AuditTrail, "audit_trail", "id"),
+    "feedback_log": ArchivedTable(FeedbackLog, "feedback_log", "feedback_id"),
+}
+
+# Ids per index lookup (keeps IN lists under SQLite's bound-parameter limit)
+_ID_BATCH = 500
+
+
+def _arrow_type(column) -> pa.DataType:
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    # Text, strings and JSON (stored as JSON text)
+    return pa.string()
+
+
+def arrow_schema(spec: ArchivedTable) -> pa.Schema:
+    """Parquet schema for an archived table (timestamps are naive UTC)"""
+    return pa.schema([pa.field(column.name, _arrow_type(column), nullable=column.nullable or column.primary_key)
+                      for column in spec.model.__table__.columns])
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC datetime (naive input is assumed to be UTC already)"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class AuditArchive:
+    """
+    Cold tier of the audit database.
+
+    Args:
+        root: Directory holding the Parquet partitions
+    """
+
+    def __init__(self, root: Optional[os.PathLike] = None):
+        self.root = Path(root if root is not None else settings.AUDIT_ARCHIVE_DIR)
+
+    def has_data(self, table: str) -> bool:
+        """Cheap filesystem check used to skip the archive entirely"""
+        return (self.root / table).is_dir()
+
+    # ------------------------------------------------------------------
+    # Rollover
+    # ------------------------------------------------------------------
+
+    def rollover(
+        self,
+        db: Session,
+        older_than: Optional[datetime] = None,
+        batch_size: int = 5000,
+        tables: Sequence[str] = tuple(ARCHIVED_TABLES),
+        dry_run: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Move rows older than the cutoff from the hot tables into the archive.
+
+        Each batch writes its Parquet files, then records them in the manifest
+        and index and deletes the hot rows in one transaction. Files are named
+        by id range, so re-running after an interruption overwrites any file
+        the failed batch left behind.
+
+        Args:
+            db: Database session
+            older_than: Cutoff timestamp (defaults to now - AUDIT_HOT_RETENTION_DAYS)
+            batch_size: Rows per transaction
+            tables: Tables to roll over
+            dry_run: Count the rows per month without moving anything
+
+        Returns:
+            Per-table counts of archived rows and written files
+        """
+        cutoff = older_than or datetime.now(timezone.utc) - timedelta(days=settings.AUDIT_HOT_RETENTION_DAYS)
+        result: Dict[str, Any] = {"cutoff": _naive_utc(cutoff).isoformat()}
+        for name in tables:
+            spec = ARCHIVED_TABLES[name]
+            model, pk = spec.model, getattr(spec.model, spec.pk)
+            aged = db.query(model).filter(model.timestamp < cutoff)
+            if dry_run:
+                months: Dict[str, int] = {}
+                for (timestamp,) in aged.with_entities(model.timestamp):
+                    key = _naive_utc(timestamp).strftime("%Y-%m")
+                    months[key] = months.get(key, 0) + 1
+                result[name] = {"rows": sum(months.values()), "by_month": dict(sorted(months.items()))}
+                continue
+
+            stats = {"rows": 0, "files": 0}
+            while True:
+                rows = aged.order_by(pk).limit(batch_size).all()
+                if not rows:
+                    break
+                try:
+                    for (year, month), group in self._by_month(rows).items():
+                        self._write_partition(db, spec, year, month, group)
+                        stats["files"] += 1
+                    ids = [getattr(row, spec.pk) for row in rows]
+                    for first in range(0, len(ids), _ID_BATCH):
+                        db.query(model).filter(pk.in_(ids[first:first + _ID_BATCH])).delete(
+                            synchronize_session=False
+                        )
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                db.expunge_all()
+                stats["rows"] += len(rows)
+                logger.info(f"Archived {stats['rows']} {name} rows ({stats['files']} files)")
+            result[name] = stats
+        return result
+
+    @staticmethod
+    def _by_month(rows: Iterable[Any]) -> Dict[Tuple[int, int], List[Any]]:
+        groups: Dict[Tuple[int, int], List[Any]] = {}
+        for row in rows:
+            timestamp = _naive_utc(row.timestamp)
+            groups.setdefault((timestamp.year, timestamp.month), []).append(row)
+        return groups
+
+    def _write_partition(self, db: Session, spec: ArchivedTable, year: int, month: int, rows: List[Any]) -> None:
+        records = []
+        for row in rows:
+            record = {}
+            for column in spec.columns:
+                value = getattr(row, spec.attributes[column])
+                if column in spec.json_columns:
+                    value = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode() if value is not None else None
+                elif isinstance(value, datetime):
+                    value = _naive_utc(value)
+                record[column] = value
+            records.append(record)
+
+        ids = [record[spec.pk] for record in records]
+        relative = Path(spec.name) / f"year={year:04d}" / f"month={month:02d}" / f"part-{min(ids):010d}-{max(ids):010d}.parquet"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".parquet.tmp")
+        pq.write_table(pa.Table.from_pylist(records, schema=arrow_schema(spec)), tmp, compression="zstd")
+        os.replace(tmp, path)
+
+        timestamps = [record["timestamp"] for record in records]
+        partition = ArchivePartition(
+            table_name=spec.name, path=relative.as_posix(), year=year, month=month,
+            min_timestamp=min(timestamps), max_timestamp=max(timestamps),
+            min_id=min(ids), max_id=max(ids), row_count=len(records),
+        )
+        db.add(partition)
+        db.flush()
+        db.execute(insert(ArchiveIndex), [
+            {"table_name": spec.name, "row_id": record[spec.pk], "timestamp": record["timestamp"],
+             "entity_name": record.get("entity_name"), "partition_id": partition.id}
+            for record in records
+        ])
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _partitions(
+        self,
+        db: Session,
+        table: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        entity_name: Optional[str] = None,
+    ) -> List[ArchivePartition]:
+        """Partitions that may hold matching rows, newest first"""
+        query = db.query(ArchivePartition).filter(ArchivePartition.table_name == table)
+        if start is not None:
+            query = query.filter(ArchivePartition.max_timestamp >= _naive_utc(start))
+        if end is not None:
+            query = query.filter(ArchivePartition.min_timestamp <= _naive_utc(end))
+        if entity_name is not None:
+            query = query.filter(ArchivePartition.id.in_(
+                db.query(ArchiveIndex.partition_id).filter(
+                    ArchiveIndex.table_name == table, ArchiveIndex.entity_name == entity_name
+                ).distinct()
+            ))
+        return query.order_by(ArchivePartition.max_timestamp.desc()).all()
+
+    def watermark(
+        self,
+        db: Session,
+        table: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        entity_name: Optional[str] = None,
+    ) -> Optional[datetime]:
+        """Newest archived timestamp (naive UTC) that could match, or None if nothing can"""
+        if not self.has_data(table):
+            return None
+        if entity_name is not None:
+            query = db.query(func.max(ArchiveIndex.timestamp)).filter(
+                ArchiveIndex.table_name == table, ArchiveIndex.entity_name == entity_name
+            )
+            if start is not None:
+                query = query.filter(ArchiveIndex.timestamp >= _naive_utc(start))
+            if end is not None:
+                query = query.filter(ArchiveIndex.timestamp <= _naive_utc(end))
+        else:
+            query = db.query(func.max(ArchivePartition.max_timestamp)).filter(ArchivePartition.table_name == table)
+            if start is not None:
+                query = query.filter(ArchivePartition.max_timestamp >= _naive_utc(start))
+            if end is not None:
+                query = query.filter(ArchivePartition.min_timestamp <= _naive_utc(end))
+        return query.scalar()
+
+    @staticmethod
+    def _expression(filters: Dict[str, Any], start: Optional[datetime], end: Optional[datetime]):
+        expression = None
+        terms = [pc.field(column) == value for column, value in filters.items() if value is not None]
+        if start is not None:
+            terms.append(pc.field("timestamp") >= pa.scalar(_naive_utc(start), pa.timestamp("us")))
+        if end is not None:
+            terms.append(pc.field("timestamp") <= pa.scalar(_naive_utc(end), pa.timestamp("us")))
+        for term in terms:
+            expression = term if expression is None else expression & term
+        return expression
+
+    def read(
+        self,
+        db: Session,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pa.Table:
+        """
+        Matching archived rows, newest first.
+
+        Partitions are scanned newest first, and the scan stops once ``limit``
+        rows are collected and no remaining partition can hold a newer row.
+
+        Args:
+            db: Database session (for the manifest and index)
+            table: Archived table name
+            filters: Column equality filters (None values are ignored)
+            start: Include rows at or after this time
+            end: Include rows at or before this time
+            limit: Maximum number of rows
+            columns: Columns to read (all if None)
+
+        Returns:
+            Arrow table sorted by timestamp descending
+        """
+        spec = ARCHIVED_TABLES[table]
+        filters = {column: value for column, value in (filters or {}).items() if value is not None}
+        schema = arrow_schema(spec)
+        if columns is not None:
+            columns = list(dict.fromkeys([spec.pk, "timestamp", *columns]))
+            schema = pa.schema([schema.field(column) for column in columns])
+        if not self.has_data(table):
+            return schema.empty_table()
+
+        expression = self._expression(filters, start, end)
+        collected = schema.empty_table()
+        for partition in self._partitions(db, table, start, end, filters.get("entity_name")):
+            if limit is not None and collected.num_rows >= limit and partition.max_timestamp < collected["timestamp"][-1].as_py():
+                break
+            chunk = pq.read_table(self.root / partition.path, columns=columns, filters=expression, partitioning=None)
+            if chunk.num_rows:
+                collected = pa.concat_tables([collected, chunk.select(schema.names)])
+                collected = collected.sort_by([("timestamp", "descending")])
+                if limit is not None:
+                    collected = collected.slice(0, limit)
+        return collected
+
+    def materialize(self, db: Session, table: str, rows: pa.Table) -> List[Any]:
+        """Transient ORM objects for archived rows (not attached to the session)"""
+        spec = ARCHIVED_TABLES[table]
+        aware = db.get_bind().dialect.name != "sqlite"
+        json_columns, attributes = spec.json_columns, spec.attributes
+        objects = []
+        for record in rows.to_pylist():
+            values = {}
+            for column, value in record.items():
+                if value is not None and column in json_columns:
+                    value = orjson.loads(value)
+                elif aware and isinstance(value, datetime):
+                    value = value.replace(tzinfo=timezone.utc)
+                values[attributes[column]] = value
+            objects.append(spec.model(**values))
+        return objects
+
+    def get(self, db: Session, table: str, row_id: int) -> Optional[Any]:
+        """Archived row by primary key, located through the index"""
+        if not self.has_data(table):
+            return None
+        spec = ARCHIVED_TABLES[table]
+        partition = db.query(ArchivePartition).join(
+            ArchiveIndex, ArchiveIndex.partition_id == ArchivePartition.id
+        ).filter(ArchiveIndex.table_name == table, ArchiveIndex.row_id == row_id).first()
+        if partition is None:
+            return None
+        rows = pq.read_table(self.root / partition.path, filters=pc.field(spec.pk) == row_id, partitioning=None)
+        return self.materialize(db, table, rows)[0] if rows.num_rows else None
+
+    def read_ids(
+        self,
+        db: Session,
+        table: str,
+        row_ids: Iterable[int],
+        columns: Optional[Sequence[str]] = None,
+    ) -> pa.Table:
+        """
+        Archived rows by primary key.
+
+        The index names the partitions holding the ids; only those are read,
+        with the ids pushed down as a Parquet filter.
+
+        Args:
+            db: Database session (for the index)
+            table: Archived table name
+            row_ids: Primary keys to read (ids that are not archived are skipped)
+            columns: Columns to read besides the key and timestamp (all if None)
+
+        Returns:
+            Arrow table of the archived rows, in no particular order
+        """
+        spec = ARCHIVED_TABLES[table]
+        schema = arrow_schema(spec)
+        if columns is not None:
+            columns = list(dict.fromkeys([spec.pk, "timestamp", *columns]))
+            schema = pa.schema([schema.field(column) for column in columns])
+        row_ids = sorted(set(row_ids))
+        if not row_ids or not self.has_data(table):
+            return schema.empty_table()
+
+        by_partition: Dict[str, List[int]] = {}
+        for first in range(0, len(row_ids), _ID_BATCH):
+            located = db.query(ArchivePartition.path, ArchiveIndex.row_id).join(
+                ArchiveIndex, ArchiveIndex.partition_id == ArchivePartition.id
+            ).filter(ArchiveIndex.table_name == table, ArchiveIndex.row_id.in_(row_ids[first:first + _ID_BATCH]))
+            for path, row_id in located:
+                by_partition.setdefault(path, []).append(row_id)
+        chunks = [
+            pq.read_table(self.root / path, columns=columns, filters=pc.field(spec.pk).isin(ids),
+                          partitioning=None).select(schema.names)
+            for path, ids in by_partition.items()
+        ]
+        return pa.concat_tables([schema.empty_table(), *chunks])
+
+    def count(
+        self,
+        db: Session,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> int:
+        """Number of matching archived rows (index only, unless other filters need the files)"""
+        if not self.has_data(table):
+            return 0
+        filters = {column: value for column, value in (filters or {}).items() if value is not None}
+        if set(filters) <= {"entity_name"}:
+            query = db.query(func.count(ArchiveIndex.row_id)).filter(ArchiveIndex.table_name == table)
+            if "entity_name" in filters:
+                query = query.filter(ArchiveIndex.entity_name == filters["entity_name"])
+            if start is not None:
+                query = query.filter(ArchiveIndex.timestamp >= _naive_utc(start))
+            if end is not None:
+                query = query.filter(ArchiveIndex.timestamp <= _naive_utc(end))
+            return query.scalar() or 0
+        return self.read(db, table, filters, start, end, columns=list(filters)).num_rows
+
+    def aggregate(
+        self,
+        db: Session,
+        table: str,
+        group_by: Sequence[str] = (),
+        sums: Sequence[str] = (),
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Row count, per-value counts and sums over archived rows.
+
+        Only the named columns are read from the Parquet files.
+
+        Args:
+            db: Database session
+            table: Archived table name
+            group_by: Columns to count values of (nulls are skipped)
+            sums: Numeric columns to sum (with their non-null counts)
+            start: Include rows at or after this time
+            end: Include rows at or before this time
+
+        Returns:
+            {"count": n, "groups": {column: {value: count}}, "sums": {column: (sum, count)}}
+        """
+        rows = self.read(db, table, start=start, end=end, columns=[*group_by, *sums])
+        result: Dict[str, Any] = {"count": rows.num_rows, "groups": {}, "sums": {}}
+        for column in group_by:
+            counts = pc.value_counts(rows[column].drop_null()) if rows.num_rows else []
+            result["groups"][column] = {item["values"].as_py(): item["counts"].as_py() for item in counts}
+        for column in sums:
+            values = rows[column]
+            result["sums"][column] = (pc.sum(values).as_py() or 0, len(values) - values.null_count)
+        return result
+
+    def group_count(
+        self,
+        db: Session,
+        table: str,
+        keys: Sequence[str],
+        filters: Optional[Dict[str, Any]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[Tuple[Any, ...], int]:
+        """
+        Archived row counts per combination of key values (a GROUP BY over the files).
+
+        Args:
+            db: Database session
+            table: Archived table name
+            keys: Columns to group by
+            filters: Column equality filters (None values are ignored)
+            start: Include rows at or after this time
+            end: Include rows at or before this time
+
+        Returns:
+            {(value, ...): count}
+        """
+        rows = self.read(db, table, filters, start, end, columns=list(keys))
+        if rows.num_rows == 0:
+            return {}
+        groups = rows.group_by(list(keys)).aggregate([([], "count_all")])
+        columns = [groups[key].to_pylist() for key in keys]
+        return dict(zip(zip(*columns), groups["count_all"].to_pylist()))
+
+    def read_through(
+        self,
+        db: Session,
+        table: str,
+        hot_query: Query,
+        limit: int,
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        One page of rows, newest first, across the hot table and the archive.
+
+        Args:
+            db: Database session
+            table: Archived table name
+            hot_query: Hot-table query with the same filters, ordered by timestamp descending
+            limit: Page size
+            offset: Rows to skip
+            filters: Column equality filters applied by hot_query
+            start: Lower timestamp bound applied by hot_query
+            end: Upper timestamp bound applied by hot_query
+            columns: Columns to read from the archive (all if None)
+
+        Returns:
+            List of ORM objects (archived ones are transient)
+        """
+        filters = filters or {}
+        watermark = self.watermark(db, table, start, end, filters.get("entity_name"))
+        if watermark is None:
+            return hot_query.limit(limit).offset(offset).all()
+
+        wanted = limit + offset
+        hot = hot_query.limit(wanted).all()
+        if len(hot) == wanted and _naive_utc(hot[-1].timestamp) > watermark:
+            return hot[offset:]
+
+        cold = self.materialize(db, table, self.read(db, table, filters, start, end, limit=wanted, columns=columns))
+        merged = sorted(hot + cold, key=lambda row: _naive_utc(row.timestamp), reverse=True)
+        return merged[offset:wanted]
+
+    def status(self, db: Session) -> Dict[str, Any]:
+        """Rows, files and time range per archived table"""
+        status = {"root": str(self.root)}
+        for table in ARCHIVED_TABLES:
+            rows, files, oldest, newest = db.query(
+                func.sum(ArchivePartition.row_count), func.count(ArchivePartition.id),
+                func.min(ArchivePartition.min_timestamp), func.max(ArchivePartition.max_timestamp),
+            ).filter(ArchivePartition.table_name == table).one()
+            status[table] = {
+                "rows": rows or 0,
+                "files": files,
+                "oldest": oldest.isoformat() if oldest else None,
+                "newest": newest.isoformat() if newest else None,
+            }
+        return status
+
+
+_archive: Optional[AuditArchive] = None
+
+
+def get_archive() -> AuditArchive:
+    """Archive at the configured AUDIT_ARCHIVE_DIR"""
+    global _archive
+    if _archive is None or _archive.root != Path(settings.AUDIT_ARCHIVE_DIR):
+        _archive = AuditArchive()
+    return _archive
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from backend.db.base import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Move aged audit rows into the Parquet archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rollover = commands.add_parser("rollover", help="Archive rows older than the hot retention window")
+    rollover.add_argument("--days", type=int, default=settings.AUDIT_HOT_RETENTION_DAYS, help="Hot retention in days")
+    rollover.add_argument("--batch-size", type=int, default=5000, help="Rows per transaction")
+    rollover.add_argument("--dry-run", action="store_true", help="Count rows per month without moving them")
+    commands.add_parser("status", help="Show archived rows and files per table")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    db = SessionLocal()
+    try:
+        archive = get_archive()
+        if args.command == "rollover":
+            cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+            result = archive.rollover(db, older_than=cutoff, batch_size=args.batch_size, dry_run=args.dry_run)
+        else:
+            result = archive.status(db)
+        print(json.dumps(result, indent=2))
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
 """Database configuration and base models"""
 
-from sqlalchemy import create_engine
+from typing import List
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from backend.config import settings
@@ -59,6 +62,33 @@ def get_database_type() -> str:
         return "sqlite"
 
 
+def create_missing_indexes(bind: Engine) -> List[str]:
+    """
+    Create model indexes that are missing from existing tables.
+
+    ``Base.metadata.create_all`` only creates indexes together with their
+    table, so indexes added to a model later are created here.
+
+    Args:
+        bind: Engine to inspect and update
+
+    Returns:
+        Names of the indexes that were created
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind, checkfirst=True)
+                created.append(index.name)
+    return created
+
+
 def get_db():
     """
     Dependency function to get database session
@@ -0,0 +1,412 @@
+"""
+Compressed JSON Columns
+=======================
+Transparent zstd-compressed JSON storage for large audit columns.
+
+CompressedJSON is a drop-in replacement for ``Column(JSON)``: values are
+serialized with orjson and compressed with zstd, using a dictionary trained
+on audit payloads so that even short rows compress well. Every frame records
+the id of the dictionary it was written with, and all dictionaries shipped in
+``backend/db/zstd_dicts/`` stay loaded for reads, so a new dictionary can be
+rolled out without rewriting old rows.
+
+Rows written before the column was compressed (plain JSON text) are still
+read transparently; ``python -m backend.db.migrate_compressed_json`` rewrites
+them in place.
+
+Usage:
+    python -m backend.db.compressed_json train --output backend/db/zstd_dicts/audit_json_v2.zdict
+    python -m backend.db.compressed_json benchmark --rows 2000
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+import zstandard
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+DICTIONARY_DIR = Path(__file__).parent / "zstd_dicts"
+DICTIONARY_SUFFIX = ".zdict"
+
+# Audit columns stored as CompressedJSON
+COMPRESSED_AUDIT_COLUMNS = ("reasoning_chain", "entity_context", "task_context", "meta_data")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a JSON value (orjson, falling back to the stdlib for edge cases)"""
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # Integers beyond 64 bits and other values orjson rejects
+        return json.dumps(value).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON text (str, bytes or memoryview)"""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity written by the stdlib encoder
+        return json.loads(data)
+
+
+class JSONCodec:
+    """
+    Encodes JSON values as zstd frames and decodes frames or legacy JSON text.
+
+    Compressor and decompressor contexts are not thread-safe, so each thread
+    keeps its own.
+
+    Args:
+        dictionary: Dictionary used for new writes (None for plain zstd)
+        level: zstd compression level
+        read_dictionaries: Additional dictionaries accepted when reading
+    """
+
+    def __init__(
+        self,
+        dictionary: Optional[zstandard.ZstdCompressionDict] = None,
+        level: int = 3,
+        read_dictionaries: Iterable[zstandard.ZstdCompressionDict] = (),
+    ):
+        self.dictionary = dictionary
+        self.level = level
+        self.dictionaries: Dict[int, zstandard.ZstdCompressionDict] = {
+            d.dict_id(): d for d in read_dictionaries
+        }
+        if dictionary is not None:
+            dictionary.precompute_compress(level=level)
+            self.dictionaries[dictionary.dict_id()] = dictionary
+        self._local = threading.local()
+
+    @property
+    def dict_id(self) -> int:
+        """Id of the dictionary used for writes (0 without one)"""
+        return self.dictionary.dict_id() if self.dictionary is not None else 0
+
+    def _compressor(self) -> zstandard.ZstdCompressor:
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self.dictionary)
+            self._local.compressor = compressor
+        return compressor
+
+    def _decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor:
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        decompressor = decompressors.get(dict_id)
+        if decompressor is None:
+            if dict_id and dict_id not in self.dictionaries:
+                raise ValueError(f"Compressed JSON was written with unknown zstd dictionary {dict_id}")
+            decompressor = zstandard.ZstdDecompressor(dict_data=self.dictionaries.get(dict_id))
+            decompressors[dict_id] = decompressor
+        return decompressor
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize and compress a JSON value"""
+        return self._compressor().compress(dumps(value))
+
+    def decode(self, data: Any) -> Any:
+        """Decompress and parse a stored value; plain JSON text is parsed as-is"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if isinstance(data, (bytes, bytearray)) and data[:4] == ZSTD_MAGIC:
+            dict_id = zstandard.get_frame_parameters(data).dict_id
+            return loads(self._decompressor(dict_id).decompress(data))
+        return loads(data)
+
+    @staticmethod
+    def is_compressed(data: Any) -> bool:
+        """True if a stored value is already a zstd frame"""
+        return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:4]) == ZSTD_MAGIC
+
+
+def load_dictionary(path: Path) -> zstandard.ZstdCompressionDict:
+    """Load a trained dictionary file"""
+    return zstandard.ZstdCompressionDict(Path(path).read_bytes())
+
+
+def shipped_dictionaries() -> Dict[str, zstandard.ZstdCompressionDict]:
+    """All dictionaries in backend/db/zstd_dicts, keyed by file stem"""
+    return {path.stem: load_dictionary(path) for path in sorted(DICTIONARY_DIR.glob(f"*{DICTIONARY_SUFFIX}"))}
+
+
+_codec: Optional[JSONCodec] = None
+_codec_lock = threading.Lock()
+
+
+def get_codec() -> JSONCodec:
+    """Process-wide codec configured from settings (built on first use)"""
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                dictionaries = shipped_dictionaries()
+                name = settings.AUDIT_JSON_ZSTD_DICT
+                if name and name not in dictionaries:
+                    raise ValueError(f"zstd dictionary '{name}' not found in {DICTIONARY_DIR}")
+                _codec = JSONCodec(
+                    dictionary=dictionaries.get(name) if name else None,
+                    level=settings.AUDIT_JSON_ZSTD_LEVEL,
+                    read_dictionaries=dictionaries.values(),
+                )
+    return _codec
+
+
+class _RawBinary(LargeBinary):
+    """LargeBinary that hands driver values through untouched, so legacy JSON text survives"""
+
+    def result_processor(self, dialect, coltype):
+        return None
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON column stored as a zstd frame (BLOB / BYTEA / LONGBLOB).
+
+    Python None is stored as SQL NULL. Unlike JSON, the stored value cannot be
+    queried with database JSON functions.
+    """
+
+    impl = _RawBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name in ("mysql", "mariadb"):
+            return dialect.type_descriptor(mysql.LONGBLOB())
+        return dialect.type_descriptor(_RawBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return get_codec().encode(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return get_codec().decode(value)
+
+
+def train_dictionary(samples: Iterable[Any], dict_size: int = 32 * 1024) -> zstandard.ZstdCompressionDict:
+    """
+    Train a zstd dictionary on JSON values.
+
+    Args:
+        samples: JSON values (one per stored column value)
+        dict_size: Target dictionary size in bytes
+
+    Returns:
+        Trained dictionary (save with ``dictionary.as_bytes()``)
+    """
+    encoded = [dumps(sample) for sample in samples if sample is not None]
+    if not encoded:
+        raise ValueError("Cannot train a zstd dictionary without samples")
+    return zstandard.train_dictionary(dict_size, encoded)
+
+
+def sample_audit_payloads(decisions: int = 500, agentic_runs: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Audit column values produced by the real logging paths, fully offline.
+
+    Decision-engine rows come from AuditService.log_decision_analysis over a
+    grid of entities and tasks; agentic rows come from AgentLoop runs on the
+    benchmark cases with the mock LLM provider, logged through
+    AuditService.log_agentic_loop_output. Each row is a dict of
+    COMPRESSED_AUDIT_COLUMNS values.
+
+    Args:
+        decisions: Number of decision-engine rows
+        agentic_runs: Number of agentic-loop rows
+        offset: Start index into the case grids (use a different offset for held-out rows)
+
+    Returns:
+        List of column-value dicts
+    """
+    from backend.agent.audit_service import AuditService
+    from backend.agent.decision_engine import DecisionEngine
+    from backend.agent.risk_models import (
+        EntityContext,
+        EntityType,
+        IndustryCategory,
+        Jurisdiction,
+        TaskCategory,
+        TaskContext,
+    )
+    from backend.agentic_engine.testing.benchmark_cases import BenchmarkCases
+    from backend.agentic_engine.testing.benchmark_harness import HarnessConfig, _build_worker
+
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        worker = _build_worker(HarnessConfig(mock_llm={"latency_ms": 0.0, "tokens_per_second": 0.0}).to_dict())
+        session, loop = worker["session"], worker["orchestrator"].agent_loop
+        engine = DecisionEngine()
+        jurisdiction_sets = ([Jurisdiction.US_FEDERAL], [Jurisdiction.EU, Jurisdiction.UK], list(Jurisdiction)[:4])
+        grid = list(itertools.product(
+            list(EntityType), list(IndustryCategory), jurisdiction_sets, list(TaskCategory), (False, True)
+        ))
+        rows = []
+        for index in range(offset, offset + decisions):
+            entity_type, industry, jurisdictions, category, personal = grid[(index * 7919) % len(grid)]
+            entity = EntityContext(
+                name=f"Entity {index}",
+                entity_type=entity_type,
+                industry=industry,
+                jurisdictions=jurisdictions,
+                employee_count=50 + index % 5000,
+                previous_violations=index % 4,
+            )
+            task = TaskContext(
+                description=f"{category.value.replace('_', ' ').title()} review #{index}",
+                category=category,
+                affects_personal_data=personal,
+                involves_cross_border=len(jurisdictions) > 1,
+                potential_impact=("Moderate", "Severe penalties", None)[index % 3],
+            )
+            entry = AuditService.log_decision_analysis(
+                session, engine.analyze_and_decide(entity, task),
+                metadata={"api_endpoint": "/entity/analyze", "task_id": f"TASK-{index:04d}-001",
+                          "frequency": ("Monthly", "Quarterly", "Annual")[index % 3]},
+            )
+            rows.append({column: getattr(entry, column) for column in COMPRESSED_AUDIT_COLUMNS})
+
+        cases = [case.to_dict() for case in BenchmarkCases.get_all_cases()]
+        for index in range(offset, offset + agentic_runs):
+            case = cases[index % len(cases)]
+            entity_name = f"{case['entity_context'].get('entity_name', 'Entity')} {index}"
+            context = {"entity": {**case["entity_context"], "entity_name": entity_name}, "task": case["task_context"]}
+            result = loop.execute(entity_name, case["task_description"], context)
+            entry = AuditService.log_agentic_loop_output(
+                session, entity_name, case["task_description"], result,
+                metadata={"api_endpoint": "/agentic/analyze", "max_iterations": 5,
+                          "original_task_description": case["task_description"]},
+            )
+            rows.append({column: getattr(entry, column) for column in COMPRESSED_AUDIT_COLUMNS})
+        session.close()
+        return rows
+    finally:
+        logging.disable(previous_disable)
+
+
+def benchmark(rows: int = 2000, agentic_share: float = 0.3, repeats: int = 3,
+              codec: Optional[JSONCodec] = None) -> Dict[str, Any]:
+    """
+    Storage size and read/write throughput of the audit JSON columns.
+
+    Compares plain JSON text (the previous storage), zstd without a
+    dictionary and zstd with the trained dictionary, on rows held out from
+    the dictionary's training range. Write throughput covers serialize +
+    compress; read covers decompress + parse (best of ``repeats``).
+
+    Args:
+        rows: Number of audit rows
+        agentic_share: Fraction of rows that are agentic-loop entries
+        repeats: Timed repetitions per path
+        codec: Dictionary codec to measure (defaults to the configured one)
+
+    Returns:
+        Dictionary with per-path sizes, MB/s and rows/s
+    """
+    agentic = int(rows * agentic_share)
+    payloads = sample_audit_payloads(decisions=rows - agentic, agentic_runs=agentic, offset=100_000)
+    values = [row[column] for row in payloads for column in COMPRESSED_AUDIT_COLUMNS]
+    codec = codec or get_codec()
+    paths = {
+        "json": (lambda value: json.dumps(value).encode("utf-8"), json.loads),
+        "zstd": (JSONCodec(level=codec.level).encode, JSONCodec(level=codec.level).decode),
+        "zstd+dict": (codec.encode, codec.decode),
+    }
+
+    raw_bytes = sum(len(json.dumps(value).encode("utf-8")) for value in values)
+    results: Dict[str, Any] = {"rows": len(payloads), "values": len(values), "dict_id": codec.dict_id}
+    for name, (encode, decode) in paths.items():
+        write_s, read_s = float("inf"), float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            stored = [encode(value) for value in values]
+            write_s = min(write_s, time.perf_counter() - start)
+            start = time.perf_counter()
+            decoded = [decode(data) for data in stored]
+            read_s = min(read_s, time.perf_counter() - start)
+        assert decoded == values
+        size = sum(len(data) for data in stored)
+        results[name] = {
+            "bytes": size,
+            "ratio": round(raw_bytes / size, 2),
+            "bytes_per_row": round(size / len(payloads), 1),
+            "write_mb_s": round(raw_bytes / write_s / 1e6, 1),
+            "read_mb_s": round(raw_bytes / read_s / 1e6, 1),
+            "write_rows_s": round(len(payloads) / write_s),
+            "read_rows_s": round(len(payloads) / read_s),
+        }
+    for kind in ("decision_engine", "agentic_engine"):
+        subset = [row for row in payloads if (row["meta_data"] or {}).get("agent_type", "decision_engine") == kind]
+        if subset:
+            plain = sum(len(json.dumps(row[c]).encode("utf-8")) for row in subset for c in COMPRESSED_AUDIT_COLUMNS)
+            packed = sum(len(codec.encode(row[c])) for row in subset for c in COMPRESSED_AUDIT_COLUMNS if row[c] is not None)
+            results[f"{kind}_bytes_per_row"] = {"json": round(plain / len(subset)), "zstd+dict": round(packed / len(subset))}
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train zstd dictionaries and benchmark compressed audit JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="Train a dictionary on audit column values")
+    train.add_argument("--output", required=True, help="Dictionary file to write (*.zdict)")
+    train.add_argument("--size", type=int, default=32 * 1024, help="Dictionary size in bytes")
+    train.add_argument("--from-db", action="store_true", help="Train on the configured database instead of the offline corpus")
+    train.add_argument("--limit", type=int, default=20_000, help="Rows to sample")
+
+    bench = commands.add_parser("benchmark", help="Measure storage size and read/write throughput")
+    bench.add_argument("--rows", type=int, default=2000)
+    bench.add_argument("--repeats", type=int, default=3)
+    bench.add_argument("--dictionary", help="Dictionary file to measure instead of the configured one")
+
+    args = parser.parse_args(argv)
+    if args.command == "train":
+        if args.from_db:
+            from backend.db.base import SessionLocal
+            from backend.db.models import AuditTrail
+
+            db = SessionLocal()
+            try:
+                query = db.query(*(getattr(AuditTrail, column) for column in COMPRESSED_AUDIT_COLUMNS))
+                payloads = [dict(zip(COMPRESSED_AUDIT_COLUMNS, row))
+                            for row in query.order_by(AuditTrail.id.desc()).limit(args.limit)]
+            finally:
+                db.close()
+        else:
+            payloads = sample_audit_payloads(decisions=int(args.limit * 0.7), agentic_runs=int(args.limit * 0.3))
+        dictionary = train_dictionary(
+            (row[column] for row in payloads for column in COMPRESSED_AUDIT_COLUMNS), dict_size=args.size
+        )
+        Path(args.output).write_bytes(dictionary.as_bytes())
+        print(f"Wrote {args.output}: dict_id={dictionary.dict_id()}, {len(dictionary)} bytes, {len(payloads)} rows")
+    else:
+        codec = None
+        if args.dictionary:
+            codec = JSONCodec(load_dictionary(Path(args.dictionary)), level=settings.AUDIT_JSON_ZSTD_LEVEL)
+        print(json.dumps(benchmark(rows=args.rows, repeats=args.repeats, codec=codec), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,7 +18,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.db.base import Base, engine
+from backend.db.base import Base, engine, create_missing_indexes
 from backend.config import settings
 
 # Import all models to ensure they're registered with Base.metadata
@@ -54,6 +54,8 @@ def init_database(drop_existing: bool = False):
         # Create all tables
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        for index_name in create_missing_indexes(engine):
+            logger.info(f"Created missing index {index_name}")
         
         # List created tables
         tables = list(Base.metadata.tables.keys())
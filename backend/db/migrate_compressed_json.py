@@ -0,0 +1,272 @@
+"""
+Compressed Audit JSON Migration
+===============================
+Rewrite existing audit_trail rows for the CompressedJSON columns.
+
+Steps (all idempotent, safe to re-run or resume after an interruption):
+    1. Add the indexed audit_trail.task_id column if it is missing and fill it
+       in from meta_data for the existing rows.
+    2. PostgreSQL / MySQL: change the compressed columns to BYTEA / LONGBLOB
+       (existing JSON is kept as UTF-8 text). SQLite stores blobs in the
+       existing columns as-is.
+    3. Walk the table in id order, compress every value still stored as
+       plain JSON text and backfill task_id from meta_data. With --recompress,
+       frames written with another dictionary are rewritten too.
+
+Usage:
+    python -m backend.db.migrate_compressed_json [--batch-size 500] [--recompress] [--dry-run] [--vacuum]
+"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, Optional
+
+import zstandard
+from sqlalchemy import bindparam, column, inspect, select, table, text
+from sqlalchemy.engine import Engine
+
+from backend.db.compressed_json import COMPRESSED_AUDIT_COLUMNS, JSONCodec, _RawBinary, get_codec
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "audit_trail"
+
+_NOT_NULL_COLUMNS = {"reasoning_chain"}
+
+_raw_table = table(
+    TABLE_NAME,
+    column("id"),
+    column("task_id"),
+    *(column(name, _RawBinary()) for name in COMPRESSED_AUDIT_COLUMNS),
+)
+
+
+def upgrade_schema(engine: Engine, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Add audit_trail.task_id and switch the compressed columns to binary types.
+
+    When task_id is added, it is backfilled from meta_data straight away so
+    task id lookups find the existing rows too.
+
+    Args:
+        engine: SQLAlchemy engine
+        dry_run: Report the DDL without running it
+
+    Returns:
+        Dictionary with the statements that were (or would be) executed and
+        the number of task ids backfilled
+    """
+    inspector = inspect(engine)
+    columns = {info["name"]: info for info in inspector.get_columns(TABLE_NAME)}
+    dialect = engine.dialect.name
+    statements = []
+
+    if "task_id" not in columns:
+        statements.append(f"ALTER TABLE {TABLE_NAME} ADD COLUMN task_id VARCHAR(100)")
+        statements.append(f"CREATE INDEX ix_{TABLE_NAME}_task_id ON {TABLE_NAME} (task_id)")
+
+    for name in COMPRESSED_AUDIT_COLUMNS:
+        current = str(columns[name]["type"]).upper()
+        if dialect == "postgresql" and current != "BYTEA":
+            statements.append(
+                f"ALTER TABLE {TABLE_NAME} ALTER COLUMN {name} TYPE BYTEA USING convert_to({name}::text, 'UTF8')"
+            )
+        elif dialect in ("mysql", "mariadb") and current != "LONGBLOB":
+            nullability = "NOT NULL" if name in _NOT_NULL_COLUMNS else "NULL"
+            statements.append(f"ALTER TABLE {TABLE_NAME} MODIFY {name} LONGBLOB {nullability}")
+
+    backfilled = 0
+    if not dry_run:
+        with engine.begin() as conn:
+            for statement in statements:
+                logger.info(statement)
+                conn.execute(text(statement))
+        if "task_id" not in columns:
+            backfilled = backfill_task_ids(engine)
+    return {"statements": statements, "task_ids_backfilled": backfilled}
+
+
+def backfill_task_ids(engine: Engine, codec: Optional[JSONCodec] = None, batch_size: int = 500) -> int:
+    """
+    Copy meta_data["task_id"] into task_id for rows that do not have one yet.
+
+    Reads plain-JSON and compressed meta_data alike and walks the table in id
+    order, one transaction per batch.
+
+    Args:
+        engine: SQLAlchemy engine
+        codec: Codec to read meta_data with (defaults to the configured one)
+        batch_size: Rows per transaction
+
+    Returns:
+        Number of rows whose task_id was set
+    """
+    codec = codec or get_codec()
+    update = _raw_table.update().where(_raw_table.c.id == bindparam("_id")).values(task_id=bindparam("task_id"))
+    backfilled, last_id = 0, 0
+
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(_raw_table.c.id, _raw_table.c.meta_data)
+                .where(_raw_table.c.id > last_id, _raw_table.c.task_id.is_(None), _raw_table.c.meta_data.is_not(None))
+                .order_by(_raw_table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            updates = []
+            for row_id, stored in rows:
+                meta = codec.decode(stored)
+                if isinstance(meta, dict) and meta.get("task_id") is not None:
+                    updates.append({"_id": row_id, "task_id": str(meta["task_id"])})
+            if updates:
+                conn.execute(update, updates)
+            backfilled += len(updates)
+            last_id = rows[-1][0]
+
+    if backfilled:
+        logger.info(f"Backfilled task_id for {backfilled} rows")
+    return backfilled
+
+
+def compress_rows(
+    engine: Engine,
+    codec: Optional[JSONCodec] = None,
+    batch_size: int = 500,
+    recompress: bool = False,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    Compress plain-JSON values in place and backfill task_id.
+
+    Each batch is read and written in its own transaction, keyed on id, so
+    the migration can run against a live database and be resumed.
+
+    Args:
+        engine: SQLAlchemy engine
+        codec: Codec to write with (defaults to the configured one)
+        batch_size: Rows per transaction
+        recompress: Also rewrite frames written with a different dictionary
+        dry_run: Compute the result without writing
+
+    Returns:
+        Counts of rows scanned/updated and stored bytes before/after
+    """
+    codec = codec or get_codec()
+    stats = {"rows": 0, "rows_updated": 0, "values_compressed": 0, "bytes_before": 0, "bytes_after": 0}
+    update = (
+        _raw_table.update()
+        .where(_raw_table.c.id == bindparam("_id"))
+        .values({name: bindparam(name) for name in ("task_id",) + COMPRESSED_AUDIT_COLUMNS})
+    )
+    last_id = 0
+
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(_raw_table).where(_raw_table.c.id > last_id).order_by(_raw_table.c.id).limit(batch_size)
+            ).mappings().all()
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                stats["rows"] += 1
+                values, changed = {"_id": row["id"], "task_id": row["task_id"]}, False
+                for name in COMPRESSED_AUDIT_COLUMNS:
+                    stored = row[name]
+                    values[name] = stored
+                    if stored is None:
+                        continue
+                    if isinstance(stored, memoryview):
+                        stored = values[name] = stored.tobytes()
+                    size = len(stored.encode("utf-8")) if isinstance(stored, str) else len(stored)
+                    stats["bytes_before"] += size
+                    if codec.is_compressed(stored) and not (
+                        recompress and zstandard.get_frame_parameters(stored).dict_id != codec.dict_id
+                    ):
+                        stats["bytes_after"] += size
+                        continue
+                    decoded = codec.decode(stored)
+                    values[name] = codec.encode(decoded)
+                    stats["bytes_after"] += len(values[name])
+                    stats["values_compressed"] += 1
+                    changed = True
+                    if name == "meta_data" and row["task_id"] is None and isinstance(decoded, dict):
+                        if decoded.get("task_id") is not None:
+                            values["task_id"] = str(decoded["task_id"])
+                if changed:
+                    updates.append(values)
+
+            if updates and not dry_run:
+                conn.execute(update, updates)
+            stats["rows_updated"] += len(updates)
+            last_id = rows[-1]["id"]
+        logger.info(f"Processed {stats['rows']} rows ({stats['rows_updated']} updated)")
+
+    return stats
+
+
+def vacuum(engine: Engine) -> None:
+    """Return freed pages to the filesystem (SQLite / PostgreSQL)"""
+    if engine.dialect.name not in ("sqlite", "postgresql"):
+        logger.info(f"VACUUM not supported for {engine.dialect.name}; skipping")
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM" if engine.dialect.name == "sqlite" else f"VACUUM {TABLE_NAME}"))
+
+
+def migrate(
+    engine: Engine,
+    batch_size: int = 500,
+    recompress: bool = False,
+    dry_run: bool = False,
+    run_vacuum: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run the full migration: schema upgrade, row compression, optional VACUUM.
+
+    Returns:
+        Dictionary with DDL statements and row statistics
+    """
+    schema = upgrade_schema(engine, dry_run=dry_run)
+    if dry_run and schema["statements"]:
+        # Rows cannot be scanned through a schema that has not been upgraded yet
+        return {**schema, "rows": None}
+    stats = compress_rows(engine, batch_size=batch_size, recompress=recompress, dry_run=dry_run)
+    if run_vacuum and not dry_run:
+        vacuum(engine)
+    return {**schema, **stats}
+
+
+def main(argv: Optional[list] = None) -> int:
+    from backend.config import settings
+    from backend.db.base import engine
+
+    parser = argparse.ArgumentParser(description="Compress existing audit_trail JSON columns")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+    parser.add_argument("--recompress", action="store_true", help="Rewrite frames made with an older dictionary")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to reclaim disk space")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.info(f"Migrating compressed audit JSON columns: {settings.DATABASE_URL}")
+    result = migrate(engine, batch_size=args.batch_size, recompress=args.recompress,
+                     dry_run=args.dry_run, run_vacuum=args.vacuum)
+    for statement in result["statements"]:
+        logger.info(f"DDL: {statement}")
+    if result.get("rows") is not None:
+        saved = result["bytes_before"] - result["bytes_after"]
+        logger.info(
+            f"{result['rows_updated']}/{result['rows']} rows updated, {result['values_compressed']} values compressed, "
+            f"{result['bytes_before']:,} -> {result['bytes_after']:,} bytes ({saved:,} saved)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,11 @@
 """Database models"""
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, Index
 from datetime import datetime, timezone
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from .base import Base
+from .compressed_json import CompressedJSON
 
 
 def utcnow():
@@ -71,7 +73,11 @@ class AuditTrail(Base):
     confidence_score = Column(Float, nullable=False)
     risk_level = Column(String(50), nullable=True, index=True)  # LOW, MEDIUM, HIGH
     risk_score = Column(Float, nullable=True)
-    
+
+    # Compliance calendar task id, copied from meta_data["task_id"] so it stays
+    # queryable now that meta_data is stored compressed
+    task_id = Column(String(100), nullable=True, index=True)
+
     # Backwards compatibility — some routes still expect audit_id
     # Note: API routes use 'audit_id' parameter name for consistency,
     # but internally we query by 'id' (the primary key).
@@ -86,21 +92,28 @@ class AuditTrail(Base):
         """Set audit_id (maps to id) for API compatibility"""
         self.id = value
     
-    # Reasoning chain (stored as JSON array)
-    reasoning_chain = Column(JSON, nullable=False)
+    # Reasoning chain (JSON array, zstd-compressed)
+    reasoning_chain = Column(CompressedJSON, nullable=False)
     
     # Additional context
     risk_factors = Column(JSON, nullable=True)  # Detailed risk breakdown
     recommendations = Column(JSON, nullable=True)  # Action recommendations
     escalation_reason = Column(Text, nullable=True)
     
-    # Full context (for detailed analysis)
-    entity_context = Column(JSON, nullable=True)
-    task_context = Column(JSON, nullable=True)
-    
-    # Metadata
-    meta_data = Column(JSON, nullable=True)
-    
+    # Full context (for detailed analysis), zstd-compressed
+    entity_context = Column(CompressedJSON, nullable=True)
+    task_context = Column(CompressedJSON, nullable=True)
+
+    # Metadata (agentic entries carry whole plans, step outputs and reflections)
+    meta_data = Column(CompressedJSON, nullable=True)
+
+    @validates("meta_data")
+    def _copy_task_id(self, key, value):
+        """Keep task_id in sync with meta_data["task_id"]"""
+        task_id = value.get("task_id") if isinstance(value, dict) else None
+        self.task_id = str(task_id) if task_id is not None else None
+        return value
+
     def __repr__(self):
         return f"<AuditTrail(id={self.id}, timestamp={self.timestamp}, decision={self.decision_outcome})>"
     
@@ -138,6 +151,11 @@ class FeedbackLog(Base):
     """Model for storing human feedback on AI decisions"""
     
     __tablename__ = "feedback_log"
+    __table_args__ = (
+        # Covers the accuracy/override aggregates: the decision columns come before timestamp
+        # so GROUP BY ai_decision, human_decision streams off the index without a sort
+        Index("ix_feedback_log_agreement_decision_time", "is_agreement", "ai_decision", "human_decision", "timestamp"),
+    )
     
     feedback_id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -274,3 +292,45 @@ class MemoryRecord(Base):
             "metadata": self.meta_data
         }
 
+
+
+class ArchivePartition(Base):
+    """Manifest of Parquet files in the cold audit archive (one row per file)"""
+    
+    __tablename__ = "archive_partitions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String(50), nullable=False, index=True)  # 'audit_trail' or 'feedback_log'
+    path = Column(String(255), nullable=False, unique=True)  # Relative to AUDIT_ARCHIVE_DIR
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    
+    # Bounds of the rows in the file (timestamps are UTC)
+    min_timestamp = Column(DateTime, nullable=False, index=True)
+    max_timestamp = Column(DateTime, nullable=False, index=True)
+    min_id = Column(Integer, nullable=False)
+    max_id = Column(Integer, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<ArchivePartition(id={self.id}, path={self.path}, rows={self.row_count})>"
+
+
+class ArchiveIndex(Base):
+    """Row-level index of archived rows for id and entity lookups"""
+    
+    __tablename__ = "archive_index"
+    __table_args__ = (
+        Index("ix_archive_index_entity", "table_name", "entity_name", "timestamp"),
+    )
+    
+    table_name = Column(String(50), primary_key=True)
+    row_id = Column(Integer, primary_key=True)  # AuditTrail.id / FeedbackLog.feedback_id
+    timestamp = Column(DateTime, nullable=False)  # UTC
+    entity_name = Column(String(255), nullable=True)
+    partition_id = Column(Integer, nullable=False, index=True)  # ArchivePartition.id
+    
+    def __repr__(self):
+        return f"<ArchiveIndex(table={self.table_name}, row_id={self.row_id}, partition={self.partition_id})>"
@@ -0,0 +1,52 @@
+"""
+Synthetic Audit Rows
+====================
+Transient AuditTrail rows shaped like real decision-engine entries, shared by
+the serialization benchmark and the test suite. Rows are deterministic: the
+same count always yields the same ids, timestamps and payloads.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+from backend.db.models import AuditTrail
+
+
+def synthetic_audit_rows(count: int) -> List[AuditTrail]:
+    """
+    Build ``count`` unsaved audit rows with ids 1..count.
+
+    Args:
+        count: Number of rows
+
+    Returns:
+        List of transient AuditTrail rows, 37 seconds apart from 2025-01-01
+    """
+    base = datetime(2025, 1, 1, 9, 30, 15, 123456)
+    rows = []
+    for i in range(count):
+        rows.append(AuditTrail(
+            id=i + 1,
+            timestamp=base + timedelta(seconds=37 * i),
+            agent_type="decision_engine",
+            task_description=f"Review data processing agreement #{i} for GDPR compliance",
+            task_category="DATA_PRIVACY",
+            entity_name=f"Entity {i % 250}",
+            entity_type="PRIVATE_COMPANY",
+            decision_outcome=("AUTONOMOUS", "REVIEW_REQUIRED", "ESCALATE")[i % 3],
+            confidence_score=0.6 + (i % 40) / 100,
+            risk_level=("LOW", "MEDIUM", "HIGH")[i % 3],
+            risk_score=(i % 100) / 100,
+            reasoning_chain=[f"Step {n}: factor assessment for case {i}" for n in range(6)],
+            risk_factors={
+                "jurisdiction_risk": 0.5, "entity_risk": 0.4, "task_risk": 0.7,
+                "data_sensitivity_risk": 0.8, "regulatory_risk": 0.6, "impact_risk": 0.3,
+                "overall_score": (i % 100) / 100
+            },
+            recommendations=["Document processing basis", "Schedule legal review"],
+            escalation_reason=None if i % 3 == 0 else "Personal data processed across jurisdictions",
+            entity_context={"name": f"Entity {i % 250}", "jurisdictions": ["EU", "US_FEDERAL"], "employee_count": 420},
+            task_context={"description": "Review DPA", "category": "DATA_PRIVACY", "affects_personal_data": True},
+            meta_data={"api_endpoint": "/decision/analyze", "version": "v1"}
+        ))
+    return rows
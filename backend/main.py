@@ -10,13 +10,20 @@ import uuid
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from backend.config import settings
 from backend.core.version import get_version
-from backend.db.base import Base, engine
+from backend.db.base import Base, engine, create_missing_indexes
+from backend.db.migrate_compressed_json import upgrade_schema
 from backend.api.error_handlers import register_exception_handlers
 from backend.api.rate_limit import limiter, rate_limit_handler
+from backend.api.responses import FastJSONResponse
+from backend.telemetry import TelemetryMiddleware, enable_from_settings, telemetry
+from backend.telemetry.metrics import configure_from_settings, instrument_engine, render_metrics
+from backend.telemetry.prometheus import PROMETHEUS_CONTENT_TYPE
+from backend.profiling import ProfilingMiddleware
 from slowapi.errors import RateLimitExceeded
 
 # Import models to ensure they're registered with Base.metadata
@@ -32,6 +39,9 @@ from backend.api.entity_analysis_routes import router as entity_router
 from backend.api.audit_routes import router as audit_router
 from backend.api.feedback_routes import router as feedback_router
 from backend.api.agentic_routes import router as agentic_router
+from backend.api.analytics_routes import router as analytics_router
+from backend.api.telemetry_routes import router as telemetry_router
+from backend.api.profiling_routes import router as profiling_router
 
 # Configure logging
 logging.basicConfig(
@@ -101,21 +111,38 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("✓ Environment validation passed")
     
+    # Per-worker metric files when several workers share a metrics directory
+    configure_from_settings()
+    
     # Initialize database
     try:
         # Create all database tables
         Base.metadata.create_all(bind=engine)
+        # Columns create_all cannot add to existing tables (audit_trail.task_id
+        # and the binary compressed JSON columns); every audit query needs them
+        if upgrade_schema(engine)["statements"]:
+            logger.warning(
+                "Upgraded the audit_trail schema; run `python -m backend.db.migrate_compressed_json` "
+                "to compress existing rows"
+            )
+        for index_name in create_missing_indexes(engine):
+            logger.info(f"Created missing index {index_name}")
         logger.info("Database tables initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}", exc_info=True)
         raise
     
+    if enable_from_settings():
+        logger.info("Telemetry enabled")
+    
     logger.info(f"Application started successfully (version: {get_version()})")
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    if telemetry.enabled:
+        telemetry.disable()
 
 
 # Create FastAPI application
@@ -124,6 +151,7 @@ app = FastAPI(
     description="AI-powered compliance decision engine with agentic capabilities",
     version=get_version(),
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Register global exception handlers
@@ -133,6 +161,11 @@ register_exception_handlers(app)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
 
+# Per-request profiling of X-Profile requests while armed (innermost, so the
+# request runs in the context carrying its profile; one check while disarmed)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -153,6 +186,13 @@ async def add_request_id_middleware(request, call_next):
 
 app.add_middleware(BaseHTTPMiddleware, dispatch=add_request_id_middleware)
 
+# DB pool checkout wait and checked-out connections (served at /metrics)
+instrument_engine(engine)
+
+# Per-route latency and requests in flight for /metrics, and request spans while
+# telemetry is on (outermost; a flag check while it is off)
+app.add_middleware(TelemetryMiddleware)
+
 
 import os
 
@@ -255,6 +295,12 @@ def root():
     return {"status": "running", "version": get_version()}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (unauthenticated, like /health)"""
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 # Auth router (unversioned, used by frontend auth_client)
 app.include_router(auth_router)
 
@@ -265,6 +311,10 @@ app.include_router(entity_router, prefix="/api/v1")  # /api/v1/entity/*, /api/v1
 app.include_router(audit_router, prefix="/api/v1")  # /api/v1/audit/*
 app.include_router(feedback_router, prefix="/api/v1")  # /api/v1/feedback/*
 app.include_router(agentic_router, prefix="/api/v1")  # /api/v1/agentic/*
+app.include_router(analytics_router, prefix="/api/v1")  # /api/v1/analytics/*
+app.include_router(telemetry_router, prefix="/api/v1")  # /api/v1/telemetry/*
+if settings.PROFILING_ENABLED:
+    app.include_router(profiling_router, prefix="/api/v1")  # /api/v1/profiling/* (admin only)
 
 # Note: Route aliasing is handled directly in the router files using multiple decorators
 # This provides better type safety and cleaner code organization
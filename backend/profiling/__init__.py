@@ -0,0 +1,24 @@
+"""
+Profiling
+
+On-demand CPU and memory profiling of a running API process: a sampling
+profiler (process-wide, or per request for a fraction of requests carrying
+the X-Profile header), tracemalloc snapshots and diffs, and collapsed-stack
+/ speedscope output for flame graphs. Idle until an admin starts it through
+/api/v1/profiling.
+"""
+
+from .formats import to_collapsed, to_speedscope
+from .memory import MemoryProfiler, memory_profiler
+from .sampler import Profile, ProfilingMiddleware, SamplingProfiler, profiler
+
+__all__ = [
+    "to_collapsed",
+    "to_speedscope",
+    "MemoryProfiler",
+    "memory_profiler",
+    "Profile",
+    "ProfilingMiddleware",
+    "SamplingProfiler",
+    "profiler",
+]
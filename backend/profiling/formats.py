@@ -0,0 +1,92 @@
+"""
+Profile Formats
+
+A profile is a set of sampled stacks with their weights. Stacks are tuples
+of frames, root first; the root frame names the thread. Two outputs:
+
+- collapsed stacks ("thread;outer;inner 12" per line), the input of
+  flamegraph.pl, inferno and most flame graph viewers
+- speedscope JSON (https://www.speedscope.app), one sampled profile per
+  thread
+"""
+
+import os
+from typing import Any, Dict, List, Tuple
+
+# (function, file, first line); the thread root has no file
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def short_path(path: str) -> str:
+    """Path relative to the project, or from site-packages / the stdlib for library code."""
+    if path.startswith(_ROOT + os.sep):
+        return os.path.relpath(path, _ROOT)
+    marker = path.rfind("-packages" + os.sep)
+    if marker != -1:
+        return path[marker + len("-packages" + os.sep):]
+    return os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+
+
+def frame_label(frame: Frame) -> str:
+    """One frame of a collapsed stack ("func (file:line)"; no semicolons)."""
+    name, file, line = frame
+    label = f"{name} ({file}:{line})" if file else name
+    return label.replace(";", ":")
+
+
+def to_collapsed(stacks: Dict[Stack, float]) -> str:
+    """Collapsed-stack text, heaviest stacks first."""
+    lines = [
+        f"{';'.join(frame_label(frame) for frame in stack)} {_weight(weight)}"
+        for stack, weight in sorted(stacks.items(), key=lambda item: -item[1])
+    ]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def to_speedscope(stacks: Dict[Stack, float], name: str, unit: str = "seconds", exporter: str = "") -> Dict[str, Any]:
+    """
+    Speedscope file with one sampled profile per thread (root frame).
+
+    Args:
+        stacks: Stack -> weight (in ``unit``)
+        name: Profile name shown by speedscope
+        unit: "seconds" for CPU samples, "bytes" for memory
+    """
+    frames: List[Dict[str, Any]] = []
+    index: Dict[Frame, int] = {}
+    profiles: Dict[str, Dict[str, Any]] = {}
+    for stack, weight in sorted(stacks.items(), key=lambda item: -item[1]):
+        thread, frames_of_stack = (stack[0][0], stack[1:]) if stack and not stack[0][1] else ("main", stack)
+        profile = profiles.setdefault(thread, {
+            "type": "sampled", "name": f"{name} [{thread}]" if name else thread, "unit": unit,
+            "startValue": 0, "endValue": 0, "samples": [], "weights": [],
+        })
+        sample = []
+        for frame in frames_of_stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                entry: Dict[str, Any] = {"name": frame[0]}
+                if frame[1]:
+                    entry["file"], entry["line"] = frame[1], frame[2]
+                frames.append(entry)
+            sample.append(index[frame])
+        profile["samples"].append(sample)
+        profile["weights"].append(weight)
+        profile["endValue"] += weight
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "shared": {"frames": frames},
+        "profiles": list(profiles.values()),
+        "name": name,
+        "activeProfileIndex": 0,
+        "exporter": exporter,
+    }
+
+
+def _weight(weight: float) -> str:
+    return str(int(weight)) if float(weight).is_integer() else f"{weight:.6f}"
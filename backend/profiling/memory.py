@@ -0,0 +1,180 @@
+"""
+Memory Profiler
+
+tracemalloc snapshots of the process and the differences between them.
+
+Tracing costs memory and time on every allocation, so it only runs between
+start() and stop(). Snapshots (the last PROFILING_KEEP_SNAPSHOTS) can be
+listed by line or file, diffed against each other, or exported by
+allocation traceback as collapsed stacks / speedscope JSON (weights in
+bytes) for a memory flame graph.
+"""
+
+import linecache
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from backend.config import settings
+from backend.profiling.formats import Stack, short_path, to_collapsed, to_speedscope
+
+KEY_TYPES = ("lineno", "filename")
+
+_DEF = re.compile(r"^(\s*)(?:async\s+)?(?:def|class)\s+(\w+)")
+
+_IGNORED = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@lru_cache(maxsize=4096)
+def _function_at(filename: str, lineno: int) -> str:
+    """Name of the def/class enclosing a source line ("<module>" if none)."""
+    line = linecache.getline(filename, lineno)
+    indent = len(line) - len(line.lstrip())
+    for number in range(lineno, 0, -1):
+        match = _DEF.match(linecache.getline(filename, number))
+        if match and (len(match.group(1)) < indent or number == lineno):
+            return match.group(2)
+    return "<module>"
+
+
+class MemoryProfiler:
+    """
+    Start/stop tracemalloc and keep snapshots.
+
+    Usage:
+        memory.start()
+        before = memory.snapshot()
+        ...
+        after = memory.snapshot()
+        memory.diff(before["id"], after["id"])
+    """
+
+    def __init__(self, keep: int = 5):
+        self.keep = keep
+        self.snapshots: "OrderedDict[str, Tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "MemoryProfiler":
+        return cls(keep=settings.PROFILING_KEEP_SNAPSHOTS)
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {
+            "tracing": self.tracing,
+            "frames": tracemalloc.get_traceback_limit() if self.tracing else None,
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "snapshots": [self._describe(snapshot_id) for snapshot_id in self.snapshots],
+        }
+
+    def start(self, frames: int = 25) -> None:
+        """
+        Start tracing allocations, keeping ``frames`` frames per traceback.
+
+        Raises:
+            RuntimeError: If tracemalloc is already tracing
+        """
+        if self.tracing:
+            raise RuntimeError("tracemalloc is already tracing")
+        tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """Stop tracing (snapshots already taken are kept)."""
+        if not self.tracing:
+            raise RuntimeError("tracemalloc is not tracing")
+        tracemalloc.stop()
+
+    def snapshot(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        Take a snapshot and keep it.
+
+        Returns:
+            Snapshot id, time, traced memory and the top ``limit`` lines
+
+        Raises:
+            RuntimeError: If tracemalloc is not tracing
+        """
+        if not self.tracing:
+            raise RuntimeError("Start tracemalloc before taking snapshots")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        snapshot_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self.snapshots[snapshot_id] = (time.time(), snapshot)
+            while len(self.snapshots) > self.keep:
+                self.snapshots.popitem(last=False)
+        return {**self._describe(snapshot_id), "top": self.top(snapshot_id, limit)}
+
+    def _get(self, snapshot_id: str) -> tracemalloc.Snapshot:
+        entry = self.snapshots.get(snapshot_id)
+        if entry is None:
+            raise KeyError(snapshot_id)
+        return entry[1]
+
+    def _describe(self, snapshot_id: str) -> Dict[str, Any]:
+        taken_at, snapshot = self.snapshots[snapshot_id]
+        return {
+            "id": snapshot_id,
+            "taken_at": datetime.fromtimestamp(taken_at, timezone.utc).isoformat(),
+            "traced_kb": round(sum(trace.size for trace in snapshot.traces) / 1024, 1),
+        }
+
+    def top(self, snapshot_id: str, limit: int = 20, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        """Largest allocation sites of a snapshot, by line or by file."""
+        return [_stat(stat) for stat in self._get(snapshot_id).statistics(key_type)[:limit]]
+
+    def diff(self, base_id: str, target_id: str, limit: int = 20, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        """Allocation sites whose size changed most from ``base_id`` to ``target_id``."""
+        stats = self._get(target_id).compare_to(self._get(base_id), key_type)
+        return [_stat(stat) for stat in stats[:limit]]
+
+    def stacks(self, snapshot_id: str) -> Dict[Stack, float]:
+        """Allocated bytes per allocation traceback (root first)."""
+        stacks: Dict[Stack, float] = {}
+        for stat in self._get(snapshot_id).statistics("traceback"):
+            stack = (("allocations", "", 0),) + tuple(
+                (_function_at(frame.filename, frame.lineno), short_path(frame.filename), frame.lineno)
+                for frame in stat.traceback
+            )
+            stacks[stack] = stacks.get(stack, 0) + stat.size
+        return stacks
+
+    def collapsed(self, snapshot_id: str) -> str:
+        return to_collapsed(self.stacks(snapshot_id))
+
+    def speedscope(self, snapshot_id: str) -> Dict[str, Any]:
+        return to_speedscope(self.stacks(snapshot_id), name=f"memory {snapshot_id}", unit="bytes",
+                             exporter=settings.TELEMETRY_SERVICE_NAME)
+
+
+def _stat(stat: Any) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    entry: Dict[str, Any] = {"location": short_path(frame.filename)}
+    if frame.lineno:
+        entry["location"] += f":{frame.lineno}"
+        entry["function"] = _function_at(frame.filename, frame.lineno)
+    entry["size_kb"] = round(stat.size / 1024, 1)
+    entry["count"] = stat.count
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+        entry["count_diff"] = stat.count_diff
+    return entry
+
+
+# Process-wide memory profiler used by the API
+memory_profiler = MemoryProfiler.from_settings()
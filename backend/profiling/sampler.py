@@ -0,0 +1,449 @@
+"""
+Sampling Profiler
+
+A background thread samples the Python stacks of every thread of the
+process (sys._current_frames) at a fixed interval, only while a profiling
+session is open:
+
+- process sessions: started and stopped by an admin; every busy thread is
+  recorded (threads idle in a wait, a queue or the event loop's select are
+  skipped)
+- request sessions: one profiled request. The request runs with the
+  session in a context variable, and a thread's samples count for the
+  request when the context it is running in holds that session. The
+  context is read from the frame that entered it: the asyncio handle
+  stepping the request's task, or the executor / anyio work item of code
+  the request moved to a thread (asyncio.to_thread, sync endpoints and
+  dependencies), so concurrent requests do not leak into each other's
+  profiles.
+
+Request sessions are opened by ProfilingMiddleware for a fraction of the
+requests carrying the X-Profile header, and only while request profiling
+is armed by an admin. With nothing open the sampler thread is not running
+and the middleware costs one attribute check per request.
+
+Profiles are kept in memory (the last PROFILING_KEEP_PROFILES) and written
+to PROFILING_OUTPUT_DIR when set, as collapsed stacks and speedscope JSON.
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from contextvars import Context, ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import settings
+from backend.profiling.formats import Frame, Stack, short_path, to_collapsed, to_speedscope
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+# Leaf frames of threads that are waiting rather than working
+_IDLE_LEAVES = frozenset({
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+})
+
+# Frames that run a callable inside a contextvars.Context
+_CONTEXT_RUNNERS = frozenset({"_run", "run"})
+
+_profiled_request: ContextVar[Optional["ProfileSession"]] = ContextVar("profiled_request", default=None)
+
+
+def _frame_context(frame: FrameType) -> Optional[Context]:
+    """Context a context-running frame runs its callable in, if it is one."""
+    f_locals = frame.f_locals
+    context = f_locals.get("context")  # anyio worker threads
+    if isinstance(context, Context):
+        return context
+    owner = f_locals.get("self")
+    context = getattr(owner, "_context", None)  # asyncio handles (task steps)
+    if isinstance(context, Context):
+        return context
+    fn = getattr(owner, "fn", None)  # executor work items: partial(context.run, func)
+    context = getattr(getattr(fn, "func", None), "__self__", None)
+    return context if isinstance(context, Context) else None
+
+
+@dataclass
+class Profile:
+    """Finished profile: sample counts per stack (root first, thread at the root)."""
+
+    id: str
+    kind: str
+    name: str
+    started_at: float
+    duration_s: float
+    ticks: int
+    stacks: Dict[Stack, int]
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    @property
+    def seconds_per_sample(self) -> float:
+        return self.duration_s / self.ticks if self.ticks else 0.0
+
+    def collapsed(self) -> str:
+        return to_collapsed(self.stacks)
+
+    def speedscope(self) -> Dict[str, Any]:
+        weight = self.seconds_per_sample
+        return to_speedscope({stack: count * weight for stack, count in self.stacks.items()},
+                             name=f"{self.kind} {self.name}".strip(), exporter=settings.TELEMETRY_SERVICE_NAME)
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Metadata and the functions with the most samples (self and total)."""
+        own: Dict[Frame, int] = defaultdict(int)
+        total: Dict[Frame, int] = defaultdict(int)
+        for stack, count in self.stacks.items():
+            frames = stack[1:]
+            if frames:
+                own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "name": self.name,
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "duration_s": round(self.duration_s, 6),
+            "samples": self.samples,
+            "top": [
+                {"function": f"{name} ({file}:{line})", "self_samples": count, "total_samples": total[(name, file, line)]}
+                for (name, file, line), count in sorted(own.items(), key=lambda item: -item[1])[:top]
+            ],
+        }
+
+
+class ProfileSession:
+    """Profile being recorded (written by the sampler thread only)."""
+
+    def __init__(self, kind: str, name: str = "", max_seconds: Optional[float] = None, include_idle: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.name = name
+        self.include_idle = include_idle
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.deadline = self.started + max_seconds if max_seconds else None
+        self.ticks = 0
+        self.stacks: Dict[Stack, int] = defaultdict(int)
+
+    def finish(self) -> Profile:
+        return Profile(self.id, self.kind, self.name, self.started_at, time.perf_counter() - self.started,
+                       self.ticks, dict(self.stacks))
+
+
+@dataclass
+class RequestSampling:
+    """Arming of header-triggered request profiling."""
+
+    sample_rate: float
+    expires_at: float
+    path_prefix: str = ""
+    profiled: int = 0
+
+
+class SamplingProfiler:
+    """
+    Per-process sampling profiler.
+
+    Usage:
+        profiler.start()                   # process-wide
+        ...
+        profile = profiler.stop()
+        profile.collapsed()                # flamegraph.pl / speedscope input
+
+        profiler.arm(sample_rate=0.1, duration_s=600)  # X-Profile requests
+    """
+
+    def __init__(
+        self,
+        interval_s: float = 0.005,
+        keep: int = 50,
+        max_seconds: float = 600.0,
+        max_concurrent_requests: int = 2,
+        output_dir: str = ""
+    ):
+        self.interval_s = interval_s
+        self.keep = keep
+        self.max_seconds = max_seconds
+        self.max_concurrent_requests = max_concurrent_requests
+        self.output_dir = output_dir
+        self.profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self.request_sampling: Optional[RequestSampling] = None
+        self._process: Optional[ProfileSession] = None
+        self._requests: List[ProfileSession] = []
+        self._thread: Optional[threading.Thread] = None
+        self._frames: Dict[CodeType, Frame] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "SamplingProfiler":
+        return cls(
+            interval_s=settings.PROFILING_INTERVAL_MS / 1000.0,
+            keep=settings.PROFILING_KEEP_PROFILES,
+            max_seconds=settings.PROFILING_MAX_SECONDS,
+            max_concurrent_requests=settings.PROFILING_MAX_CONCURRENT_REQUESTS,
+            output_dir=settings.PROFILING_OUTPUT_DIR,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None
+
+    def status(self) -> Dict[str, Any]:
+        sampling = self.request_sampling
+        if sampling is not None and time.time() >= sampling.expires_at:
+            sampling = self.request_sampling = None
+        with self._lock:
+            process = self._process
+            samples = sum(process.stacks.values()) if process is not None else 0
+        return {
+            "pid": os.getpid(),
+            "interval_ms": self.interval_s * 1000.0,
+            "sampler_running": self._thread is not None,
+            "process_profile": {
+                "id": process.id,
+                "elapsed_s": round(time.perf_counter() - process.started, 3),
+                "samples": samples,
+            } if process is not None else None,
+            "request_profiling": {
+                "sample_rate": sampling.sample_rate,
+                "path_prefix": sampling.path_prefix,
+                "expires_in_s": round(sampling.expires_at - time.time(), 1),
+                "profiled": sampling.profiled,
+                "in_progress": len(self._requests),
+            } if sampling is not None else None,
+            "profiles": len(self.profiles),
+        }
+
+    # Process-wide profiling
+
+    def start(self, max_seconds: Optional[float] = None, include_idle: bool = False) -> ProfileSession:
+        """
+        Start profiling every thread of this process.
+
+        Args:
+            max_seconds: Stop (and keep the profile) after this long; capped
+                at the configured maximum
+            include_idle: Also record threads that are waiting
+
+        Raises:
+            RuntimeError: If a process profile is already being recorded
+        """
+        limit = min(max_seconds or self.max_seconds, self.max_seconds)
+        with self._lock:
+            if self._process is not None:
+                raise RuntimeError("The sampling profiler is already running")
+            self._process = ProfileSession("process", "", max_seconds=limit, include_idle=include_idle)
+            self._ensure_thread()
+            return self._process
+
+    def stop(self) -> Profile:
+        """
+        Stop the process-wide profile and keep it.
+
+        Raises:
+            RuntimeError: If the profiler is not running
+        """
+        with self._lock:
+            session, self._process = self._process, None
+            if session is None:
+                raise RuntimeError("The sampling profiler is not running")
+            profile = session.finish()
+        self._keep(profile)
+        return profile
+
+    # Header-triggered request profiling
+
+    def arm(self, sample_rate: float, duration_s: float, path_prefix: str = "") -> RequestSampling:
+        """Profile ``sample_rate`` of the requests carrying X-Profile for ``duration_s``."""
+        self.request_sampling = RequestSampling(
+            sample_rate=max(0.0, min(1.0, sample_rate)),
+            expires_at=time.time() + min(duration_s, self.max_seconds),
+            path_prefix=path_prefix,
+        )
+        return self.request_sampling
+
+    def disarm(self) -> None:
+        self.request_sampling = None
+
+    def begin_request(self, scope: Dict[str, Any]) -> Optional[ProfileSession]:
+        """Open a session for this request if it is selected for profiling."""
+        sampling = self.request_sampling
+        if sampling is None:
+            return None
+        if time.time() >= sampling.expires_at:
+            self.request_sampling = None
+            return None
+        if not scope.get("path", "").startswith(sampling.path_prefix):
+            return None
+        if not any(name == PROFILE_HEADER.encode() for name, _ in scope.get("headers", ())):
+            return None
+        if random.random() >= sampling.sample_rate:
+            return None
+        with self._lock:
+            if len(self._requests) >= self.max_concurrent_requests:
+                return None
+            session = ProfileSession("request", f"{scope.get('method', '')} {scope.get('path', '')}")
+            self._requests.append(session)
+            sampling.profiled += 1
+            self._ensure_thread()
+        return session
+
+    def end_request(self, session: ProfileSession, name: Optional[str] = None) -> Profile:
+        with self._lock:
+            self._requests.remove(session)
+            if name:
+                session.name = name
+            profile = session.finish()
+        self._keep(profile)
+        return profile
+
+    # Profiles
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self.profiles.get(profile_id)
+
+    def _keep(self, profile: Profile) -> None:
+        with self._lock:
+            self.profiles[profile.id] = profile
+            while len(self.profiles) > self.keep:
+                self.profiles.popitem(last=False)
+        if self.output_dir:
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                base = os.path.join(self.output_dir, f"{profile.kind}-{profile.id}")
+                with open(f"{base}.collapsed.txt", "w", encoding="utf-8") as f:
+                    f.write(profile.collapsed())
+                with open(f"{base}.speedscope.json", "w", encoding="utf-8") as f:
+                    json.dump(profile.speedscope(), f)
+            except OSError as e:
+                logger.warning(f"Could not write profile {profile.id} to {self.output_dir}: {e}")
+
+    # Sampling
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            expired = None
+            with self._lock:
+                process = self._process
+                if process is not None and process.deadline is not None and time.perf_counter() >= process.deadline:
+                    expired, self._process = process.finish(), None
+                if self._process is None and not self._requests:
+                    self._thread = None
+                    break
+                self._sample(own)
+            if expired is not None:
+                self._keep(expired)
+            time.sleep(self.interval_s)
+        if expired is not None:
+            self._keep(expired)
+
+    def _frame(self, code: CodeType) -> Frame:
+        frame = self._frames.get(code)
+        if frame is None:
+            frame = self._frames[code] = (
+                getattr(code, "co_qualname", code.co_name), short_path(code.co_filename), code.co_firstlineno
+            )
+        return frame
+
+    def _sample(self, own: int) -> None:
+        """Record one stack per busy thread into the open sessions (lock held)."""
+        process = self._process
+        requests = self._requests
+        if process is not None:
+            process.ticks += 1
+        for session in requests:
+            session.ticks += 1
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            codes: List[CodeType] = []
+            context: Optional[Context] = None
+            current: Optional[FrameType] = frame
+            while current is not None:
+                code = current.f_code
+                codes.append(code)
+                if requests and context is None and code.co_name in _CONTEXT_RUNNERS:
+                    context = _frame_context(current)
+                current = current.f_back
+            session = context.get(_profiled_request) if context is not None else None
+            if session is not None and session not in requests:
+                session = None
+            record_process = process is not None and (
+                process.include_idle or (os.path.basename(codes[0].co_filename), codes[0].co_name) not in _IDLE_LEAVES
+            )
+            if not record_process and session is None:
+                continue
+            stack = ((names.get(ident, str(ident)), "", 0),) + tuple(self._frame(code) for code in reversed(codes))
+            if record_process:
+                process.stacks[stack] += 1
+            if session is not None:
+                session.stacks[stack] += 1
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests selected by the armed SamplingProfiler.
+
+    Add it innermost (before other middleware) so the request runs in the
+    context that carries its session. Selected responses get an
+    X-Profile-Id header naming the stored profile.
+    """
+
+    def __init__(self, app: Any, profiler: Optional[SamplingProfiler] = None):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        sampler = self.profiler or profiler
+        if sampler.request_sampling is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        session = sampler.begin_request(scope)
+        if session is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_profile_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER.encode(), session.id.encode())]}
+            await send(message)
+
+        token = _profiled_request.set(session)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _profiled_request.reset(token)
+            route = getattr(scope.get("route"), "path", None) or scope.get("path", "")
+            sampler.end_request(session, f"{scope.get('method', '')} {route}")
+
+
+# Process-wide profiler used by the API
+profiler = SamplingProfiler.from_settings()
@@ -51,7 +51,8 @@ class DecisionService:
     def analyze_decision(
         self,
         entity: EntityContext,
-        task: TaskContext
+        task: TaskContext,
+        explain: str = "full"
     ) -> DecisionAnalysis:
         """
         Perform complete decision analysis with historical context.
@@ -59,6 +60,7 @@ class DecisionService:
         Args:
             entity: Entity context
             task: Task context
+            explain: Explanation level (none, summary, full)
             
         Returns:
             DecisionAnalysis with full reasoning and historical context
@@ -73,7 +75,7 @@ class DecisionService:
         pattern_analysis = pattern_result["pattern_analysis"]
         
         # STEP 2: Run decision engine analysis
-        analysis = self.decision_engine.analyze_and_decide(entity, task)
+        analysis = self.decision_engine.analyze_and_decide(entity, task, explain=explain)
         
         # STEP 3: Add historical context to analysis
         analysis.similar_cases = similar_cases
@@ -145,7 +147,8 @@ class DecisionService:
     def quick_risk_check(
         self,
         entity: EntityContext,
-        task: TaskContext
+        task: TaskContext,
+        explain: str = "summary"
     ) -> Dict[str, Any]:
         """
         Quick risk check without full analysis.
@@ -153,11 +156,12 @@ class DecisionService:
         Args:
             entity: Entity context
             task: Task context
+            explain: Explanation level; "summary" is enough for action_required
             
         Returns:
             Simplified risk assessment
         """
-        analysis = self.decision_engine.analyze_and_decide(entity, task)
+        analysis = self.decision_engine.analyze_and_decide(entity, task, explain=explain)
         
         return {
             "risk_level": analysis.risk_level.value,
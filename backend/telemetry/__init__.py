@@ -0,0 +1,24 @@
+"""
+Telemetry
+
+OpenTelemetry-compatible tracing for the API, decision engine, agentic
+engine, LLM client and database, exported as OTLP/JSON, and the Prometheus
+metrics served by /metrics (metrics.py). Tracing is off unless
+TELEMETRY_ENABLED is set (or telemetry.enable() is called), and free while off;
+span durations and errors are recorded in the /metrics store while it is on.
+"""
+
+from .core import Span, Telemetry, telemetry
+from .exporters import InMemorySpanExporter, OTLPHttpExporter, encode_spans
+from .instrumentation import TelemetryMiddleware, enable_from_settings
+
+__all__ = [
+    "Span",
+    "Telemetry",
+    "telemetry",
+    "InMemorySpanExporter",
+    "OTLPHttpExporter",
+    "encode_spans",
+    "TelemetryMiddleware",
+    "enable_from_settings",
+]
@@ -0,0 +1,212 @@
+"""
+Telemetry Core
+
+OpenTelemetry-shaped spans, without the OTel SDK.
+
+Spans carry W3C-sized trace and span ids, a kind (INTERNAL, SERVER,
+CLIENT), attributes named after the OTel semantic conventions and a status,
+so exporters can emit them as OTLP. Every finished span is also recorded in
+the ``operation_duration_seconds`` histogram and, when it failed, the
+``operation_errors`` counter of the /metrics store (metrics.py), labelled
+with the span name.
+
+Telemetry is off by default. While it is off, span() and start_span() return
+a shared no-op span and none of the instrumented components are wrapped
+(see instrumentation.py), so the disabled cost is nil on the hot paths.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.telemetry.metrics import OPERATION_DURATION, OPERATION_ERRORS
+
+logger = logging.getLogger(__name__)
+
+SPAN_KINDS = ("INTERNAL", "SERVER", "CLIENT")
+STATUS_CODES = ("UNSET", "OK", "ERROR")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("telemetry_current_span", default=None)
+
+Attributes = Dict[str, Any]
+
+
+@dataclass
+class Span:
+    """One timed operation; use as a context manager to make it the current span."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: str = "INTERNAL"
+    start_time_unix_nano: int = 0
+    end_time_unix_nano: int = 0
+    attributes: Attributes = field(default_factory=dict)
+    status_code: str = "UNSET"
+    status_message: str = ""
+    _telemetry: Optional["Telemetry"] = field(default=None, repr=False, compare=False)
+    _start: float = field(default=0.0, repr=False, compare=False)
+    _token: Any = field(default=None, repr=False, compare=False)
+
+    is_recording = True
+
+    @property
+    def duration_s(self) -> float:
+        return max(self.end_time_unix_nano - self.start_time_unix_nano, 0) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Attributes) -> None:
+        self.attributes.update(attributes)
+
+    def set_status(self, code: str, message: str = "") -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Mark the span failed with the exception's type and message."""
+        self.attributes["error.type"] = type(exc).__name__
+        self.set_status("ERROR", str(exc)[:500])
+
+    def end(self) -> None:
+        """Finish the span (idempotent) and hand it to metrics and exporters."""
+        if self.end_time_unix_nano:
+            return
+        self.end_time_unix_nano = self.start_time_unix_nano + int((time.perf_counter() - self._start) * 1e9)
+        if self._telemetry is not None:
+            self._telemetry._on_end(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None and isinstance(exc, Exception):
+            self.record_exception(exc)
+        _current_span.reset(self._token)
+        self.end()
+
+
+class _NoopSpan:
+    """Span returned while telemetry is disabled."""
+
+    __slots__ = ()
+    is_recording = False
+    name = ""
+    attributes: Attributes = {}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Attributes) -> None:
+        pass
+
+    def set_status(self, code: str, message: str = "") -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Telemetry:
+    """
+    Tracer of the process.
+
+    Usage:
+        telemetry.enable(exporters=[InMemorySpanExporter()])
+        with telemetry.span("decision.analyze", {"explain": "full"}) as span:
+            ...
+        telemetry.disable()
+    """
+
+    def __init__(self, service_name: str = "agentic-compliance-api"):
+        self.enabled = False
+        self.service_name = service_name
+        self.exporters: List[Any] = []
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+    def enable(self, exporters: Iterable[Any] = (), service_name: Optional[str] = None) -> None:
+        """Start recording: install the instrumentation and export finished spans to ``exporters``."""
+        from backend.telemetry.instrumentation import INSTRUMENTORS
+
+        with self._lock:
+            self.exporters = list(exporters)
+            if service_name:
+                self.service_name = service_name
+            for instrumentor in INSTRUMENTORS:
+                instrumentor.instrument()
+            self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording, remove the instrumentation and shut the exporters down."""
+        from backend.telemetry.instrumentation import INSTRUMENTORS
+
+        with self._lock:
+            self.enabled = False
+            for instrumentor in INSTRUMENTORS:
+                instrumentor.uninstrument()
+            exporters, self.exporters = self.exporters, []
+        for exporter in exporters:
+            try:
+                exporter.shutdown()
+            except Exception as e:
+                logger.warning(f"Telemetry exporter shutdown failed: {e}")
+
+    def start_span(self, name: str, attributes: Optional[Attributes] = None, kind: str = "INTERNAL"):
+        """Start a span under the current one without making it current; call end() on it."""
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        bits = self._random.getrandbits
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else f"{bits(128):032x}",
+            span_id=f"{bits(64):016x}",
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            start_time_unix_nano=time.time_ns(),
+            attributes=dict(attributes) if attributes else {},
+            _telemetry=self,
+            _start=time.perf_counter(),
+        )
+
+    def span(self, name: str, attributes: Optional[Attributes] = None, kind: str = "INTERNAL"):
+        """Span context manager that is the current span inside its block."""
+        return self.start_span(name, attributes, kind)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def _on_end(self, span: Span) -> None:
+        OPERATION_DURATION.labels(span.name).observe(span.duration_s)
+        if span.status_code == "ERROR":
+            OPERATION_ERRORS.labels(span.name, span.attributes.get("error.type", "error")).inc()
+        for exporter in self.exporters:
+            try:
+                exporter.export((span,))
+            except Exception as e:
+                logger.warning(f"Telemetry exporter {type(exporter).__name__} failed: {e}")
+
+
+# Process-wide instance used by the instrumentation and the API
+telemetry = Telemetry()
@@ -0,0 +1,163 @@
+"""
+Telemetry Exporters
+
+Where finished spans go:
+
+- InMemorySpanExporter keeps the most recent spans (tests, and the
+  /telemetry/traces endpoint)
+- OTLPHttpExporter pushes spans in batches to an OTLP/HTTP collector
+  (JSON encoding, e.g. http://localhost:4318/v1/traces)
+- encode_spans() renders spans as an OTLP/JSON ExportTraceServiceRequest
+
+Metrics are served in the Prometheus text format by /metrics (see
+metrics.py).
+"""
+
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence
+
+from backend.telemetry.core import Span
+
+logger = logging.getLogger(__name__)
+
+# OTLP enum values
+_OTLP_SPAN_KIND = {"INTERNAL": 1, "SERVER": 2, "CLIENT": 3}
+_OTLP_STATUS_CODE = {"UNSET": 0, "OK": 1, "ERROR": 2}
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in memory, dropping the oldest beyond ``max_spans``."""
+
+    def __init__(self, max_spans: Optional[int] = None):
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def shutdown(self) -> None:
+        pass
+
+
+class OTLPHttpExporter:
+    """
+    Posts spans as OTLP/JSON to a collector from a background thread.
+
+    Spans are queued by export() and sent in batches of up to ``batch_size``,
+    at least every ``interval_s`` seconds; when the queue is full new spans
+    are dropped (and counted) rather than slowing down the caller.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "agentic-compliance-api",
+        batch_size: int = 512,
+        interval_s: float = 5.0,
+        max_queue: int = 8192,
+        timeout_s: float = 5.0
+    ):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.dropped = 0
+        self.sent = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._worker, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+
+    def _worker(self) -> None:
+        import httpx
+
+        with httpx.Client(timeout=self.timeout_s) as client:
+            stopping = False
+            while not stopping:
+                batch: List[Span] = []
+                try:
+                    item = self._queue.get(timeout=self.interval_s)
+                    while item is not None:
+                        batch.append(item)
+                        if len(batch) >= self.batch_size:
+                            break
+                        item = self._queue.get_nowait()
+                    stopping = item is None
+                except queue.Empty:
+                    pass
+                if batch:
+                    self._post(client, batch)
+
+    def _post(self, client: Any, batch: List[Span]) -> None:
+        try:
+            response = client.post(self.endpoint, json=encode_spans(batch, self.service_name))
+            response.raise_for_status()
+            self.sent += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning(f"OTLP export of {len(batch)} spans to {self.endpoint} failed: {e}")
+
+    def shutdown(self) -> None:
+        """Send what is queued and stop the worker."""
+        self._queue.put(None)
+        self._thread.join(timeout=self.timeout_s + self.interval_s)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def encode_spans(spans: Iterable[Span], service_name: str = "agentic-compliance-api") -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest for ``spans``."""
+    encoded = []
+    for span in spans:
+        item = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _OTLP_SPAN_KIND.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_time_unix_nano),
+            "endTimeUnixNano": str(span.end_time_unix_nano),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": _OTLP_STATUS_CODE.get(span.status_code, 0)},
+        }
+        if span.parent_span_id:
+            item["parentSpanId"] = span.parent_span_id
+        if span.status_message:
+            item["status"]["message"] = span.status_message
+        encoded.append(item)
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+        "scopeSpans": [{"scope": {"name": "backend.telemetry"}, "spans": encoded}],
+    }]}
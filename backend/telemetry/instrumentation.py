@@ -0,0 +1,330 @@
+"""
+Telemetry Instrumentation
+
+Spans around the API, the decision engine, the agent loop, the LLM client and
+the database. Method and event instrumentation is installed by
+telemetry.enable() and removed by telemetry.disable(), so none of these
+components is wrapped while telemetry is off:
+
+- DecisionEngine: analyze, assess, factor scoring, full analysis, decision
+  and recommendations
+- AgentLoop: run, plan (blocking and streamed), step, tools and reflection
+- LLMClient: blocking, async and streamed requests (gen_ai.* attributes;
+  error responses mark the span failed)
+- SQLAlchemy: one span per statement, from Engine events (db.* attributes)
+
+HTTP request spans come from TelemetryMiddleware, which also records every
+request's latency for /metrics and only checks telemetry.enabled per request
+while telemetry is off.
+"""
+
+import functools
+import importlib
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from backend.config import settings
+from backend.telemetry.core import NOOP_SPAN, Attributes, _current_span, telemetry
+from backend.telemetry.exporters import InMemorySpanExporter, OTLPHttpExporter
+from backend.telemetry.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+
+@dataclass(frozen=True)
+class TracedMethod:
+    """A method to wrap in a span, with optional attribute and result hooks."""
+
+    name: str
+    span_name: str
+    kind: str = "INTERNAL"
+    attributes: Optional[Callable[[Any, tuple, dict], Attributes]] = None
+    on_result: Optional[Callable[[Any, Any], None]] = None
+
+
+def _traced(fn: Callable, method: TracedMethod) -> Callable:
+    """Wrap a plain, coroutine or generator function in a span."""
+
+    def start(instance: Any, args: tuple, kwargs: dict):
+        attributes = method.attributes(instance, args, kwargs) if method.attributes else None
+        return telemetry.start_span(method.span_name, attributes, method.kind)
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def generator_wrapper(self, *args, **kwargs):
+            # The span is current only while the generator body runs, so it never
+            # leaks into the consumer's context between items
+            span = start(self, args, kwargs)
+            items = fn(self, *args, **kwargs)
+            try:
+                while True:
+                    token = _current_span.set(span) if span.is_recording else None
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    finally:
+                        if token is not None:
+                            _current_span.reset(token)
+                    yield item
+            except Exception as e:
+                span.record_exception(e)
+                raise
+            finally:
+                items.close()
+                span.end()
+        return generator_wrapper
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(self, *args, **kwargs):
+            with start(self, args, kwargs) as span:
+                result = await fn(self, *args, **kwargs)
+                if method.on_result is not None:
+                    method.on_result(span, result)
+                return result
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with start(self, args, kwargs) as span:
+            result = fn(self, *args, **kwargs)
+            if method.on_result is not None:
+                method.on_result(span, result)
+            return result
+    return wrapper
+
+
+class MethodInstrumentor:
+    """Wraps methods of one class in spans; uninstrument() restores the originals."""
+
+    def __init__(self, module: str, class_name: str, methods: Sequence[TracedMethod]):
+        self.module = module
+        self.class_name = class_name
+        self.methods = tuple(methods)
+        self._originals: Dict[str, Callable] = {}
+
+    @property
+    def instrumented(self) -> bool:
+        return bool(self._originals)
+
+    def instrument(self) -> None:
+        if self._originals:
+            return
+        cls = getattr(importlib.import_module(self.module), self.class_name)
+        for method in self.methods:
+            original = cls.__dict__[method.name]
+            self._originals[method.name] = original
+            setattr(cls, method.name, _traced(original, method))
+
+    def uninstrument(self) -> None:
+        if not self._originals:
+            return
+        cls = getattr(importlib.import_module(self.module), self.class_name)
+        for name, original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals = {}
+
+
+class SQLAlchemyInstrumentor:
+    """One CLIENT span per SQL statement, from events on every Engine."""
+
+    EVENTS = ("before_cursor_execute", "after_cursor_execute", "handle_error")
+
+    def __init__(self):
+        self._listeners = {
+            "before_cursor_execute": self._before,
+            "after_cursor_execute": self._after,
+            "handle_error": self._error,
+        }
+        self.instrumented = False
+
+    def instrument(self) -> None:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        if self.instrumented:
+            return
+        for name in self.EVENTS:
+            event.listen(Engine, name, self._listeners[name])
+        self.instrumented = True
+
+    def uninstrument(self) -> None:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        if not self.instrumented:
+            return
+        for name in self.EVENTS:
+            event.remove(Engine, name, self._listeners[name])
+        self.instrumented = False
+
+    @staticmethod
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        span = telemetry.start_span(f"db.{operation.lower()}", {
+            "db.system": conn.dialect.name,
+            "db.operation.name": operation,
+            "db.query.text": statement[:500],
+        }, "CLIENT")
+        conn.info.setdefault("telemetry_spans", []).append(span)
+
+    @staticmethod
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("telemetry_spans")
+        if spans:
+            span = spans.pop()
+            span.set_attribute("db.response.rowcount", getattr(cursor, "rowcount", -1))
+            span.end()
+
+    @staticmethod
+    def _error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("telemetry_spans") if conn is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(exception_context.original_exception)
+            span.end()
+
+
+def _arg(args: tuple, kwargs: dict, index: int, name: str, default: Any = None) -> Any:
+    return args[index] if len(args) > index else kwargs.get(name, default)
+
+
+def _category(task: Any) -> Any:
+    category = getattr(task, "category", None)
+    return getattr(category, "value", category)
+
+
+def _decision_attributes(engine: Any, args: tuple, kwargs: dict) -> Attributes:
+    return {"decision.task_category": _category(_arg(args, kwargs, 1, "task"))}
+
+
+def _analyze_attributes(engine: Any, args: tuple, kwargs: dict) -> Attributes:
+    return {**_decision_attributes(engine, args, kwargs), "decision.explain": _arg(args, kwargs, 2, "explain", "full")}
+
+
+def _llm_attributes(client: Any, args: tuple, kwargs: dict) -> Attributes:
+    return {"gen_ai.system": client.provider, "gen_ai.request.model": client.model, "gen_ai.operation.name": "chat"}
+
+
+def _llm_result(span: Any, response: Any) -> None:
+    status = getattr(response, "status", None)
+    span.set_attribute("llm.status", status)
+    if status == "error":
+        span.set_attribute("error.type", "llm_error")
+        span.set_status("ERROR", (response.error or "")[:500])
+
+
+def _step_attributes(loop: Any, args: tuple, kwargs: dict) -> Attributes:
+    step = _arg(args, kwargs, 0, "step") or {}
+    return {"agent.step_id": str(step.get("step_id"))}
+
+
+def _reflect_batch_attributes(loop: Any, args: tuple, kwargs: dict) -> Attributes:
+    return {"agent.reflection.steps": len(_arg(args, kwargs, 0, "items") or ())}
+
+
+INSTRUMENTORS = (
+    MethodInstrumentor("backend.agent.decision_engine", "DecisionEngine", (
+        TracedMethod("analyze_and_decide", "decision.analyze", attributes=_analyze_attributes),
+        TracedMethod("assess", "decision.assess", attributes=_decision_attributes),
+        TracedMethod("score_factors", "decision.score_factors"),
+        TracedMethod("_analyze_full", "decision.analyze_full"),
+        TracedMethod("_decide_core", "decision.decide"),
+        TracedMethod("_decide", "decision.decide"),
+        TracedMethod("_recommend", "decision.recommend"),
+    )),
+    MethodInstrumentor("backend.agentic_engine.agent_loop", "AgentLoop", (
+        TracedMethod("execute", "agent.run"),
+        TracedMethod("generate_plan", "agent.plan"),
+        TracedMethod("_timed_plan_stream", "agent.plan", attributes=lambda loop, args, kwargs: {"agent.plan.streamed": True}),
+        TracedMethod("execute_step", "agent.step", attributes=_step_attributes),
+        TracedMethod("execute_tools", "agent.tools", attributes=_step_attributes),
+        TracedMethod("reflect_on_step", "agent.reflect", attributes=_step_attributes),
+        TracedMethod("reflect_on_steps", "agent.reflect", attributes=_reflect_batch_attributes),
+    )),
+    MethodInstrumentor("backend.utils.llm_client", "LLMClient", (
+        TracedMethod("_make_request_with_retries", "llm.request", "CLIENT", _llm_attributes, _llm_result),
+        TracedMethod("_make_request_with_retries_async", "llm.request", "CLIENT", _llm_attributes, _llm_result),
+        TracedMethod("stream_compliance_analysis", "llm.stream", "CLIENT", _llm_attributes),
+    )),
+    SQLAlchemyInstrumentor(),
+)
+
+
+def enable_from_settings() -> bool:
+    """
+    Enable telemetry as configured by the TELEMETRY_* settings.
+
+    Finished spans are kept in an in-memory buffer of TELEMETRY_BUFFER_SPANS
+    (served by /telemetry/traces) and, when TELEMETRY_OTLP_ENDPOINT is set,
+    pushed to that OTLP/HTTP collector.
+
+    Returns:
+        Whether telemetry was enabled
+    """
+    if not settings.TELEMETRY_ENABLED:
+        return False
+    exporters = [InMemorySpanExporter(max_spans=settings.TELEMETRY_BUFFER_SPANS)]
+    if settings.TELEMETRY_OTLP_ENDPOINT:
+        exporters.append(OTLPHttpExporter(settings.TELEMETRY_OTLP_ENDPOINT, settings.TELEMETRY_SERVICE_NAME))
+    telemetry.enable(exporters, service_name=settings.TELEMETRY_SERVICE_NAME)
+    return True
+
+
+class TelemetryMiddleware:
+    """
+    ASGI middleware recording per-route latency and requests in flight, and
+    opening a SERVER span per HTTP request while telemetry is on.
+
+    Requests are labelled with the matched route template (not the raw
+    path) so label cardinality stays bounded; unmatched paths are labelled
+    "unmatched", and the /metrics scrape itself is not recorded. The span is
+    named "{method} {route}"; 5xx responses and unhandled exceptions mark it
+    failed.
+    """
+
+    def __init__(self, app: Any, exclude: tuple = ("/metrics",)):
+        self.app = app
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope.get("path") in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "GET")
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        span = NOOP_SPAN
+        if telemetry.enabled:
+            span = telemetry.start_span(method, {"http.request.method": method, "url.path": scope.get("path", "")}, "SERVER")
+        token = _current_span.set(span) if span.is_recording else None
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            route = getattr(scope.get("route"), "path", None)
+            HTTP_REQUEST_DURATION.labels(method, route or "unmatched", status).observe(time.perf_counter() - started)
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            if token is not None:
+                _current_span.reset(token)
+                if route:
+                    span.name = f"{method} {route}"
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status)
+                if status >= 500 and span.status_code != "ERROR":
+                    span.set_attribute("error.type", str(status))
+                    span.set_status("ERROR")
+                span.end()
@@ -0,0 +1,121 @@
+"""
+Application Metrics
+
+The metrics served by /metrics, and the hooks that record them:
+
+- HTTP: per-route request latency and requests in flight
+  (TelemetryMiddleware)
+- Database: connection checkout wait and connections checked out
+  (instrument_engine)
+- LLM: call latency, tokens and retries (recorded by LLMClient)
+- Caches: plan and tool result cache lookups by result, plus the derived
+  cache_hit_ratio gauge
+- Agentic runs: time spent per phase (run, plan, step, tool, reflect)
+- Telemetry spans: duration per operation and failures by error type
+  (only while telemetry is on; see core.py)
+
+All but the span metrics are always recorded; each update is a lock-free add
+to the calling thread's shard (see prometheus.py), a few microseconds per
+request in total.
+"""
+
+import os
+import time
+from typing import Any, Dict
+
+from backend.config import settings
+from backend.telemetry.prometheus import REGISTRY, Counter, Gauge, Histogram, _number
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served")
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to check a connection out of the pool (waiting or connecting)",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge("db_pool_connections_checked_out", "Pool connections currently checked out")
+
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds", "LLM call latency, retries included, by provider, model, call kind and status",
+    ["provider", "model", "kind", "status"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 45.0, 90.0),
+)
+LLM_TOKENS = Counter("llm_tokens", "LLM tokens used by provider, model and type (prompt/completion)",
+                     ["provider", "model", "type"])
+LLM_RETRIES = Counter("llm_retries", "LLM call attempts retried after an error", ["provider", "model"])
+
+CACHE_REQUESTS = Counter("cache_requests", "Cache lookups by cache and result (hit, miss; seed for plan references)",
+                         ["cache", "result"])
+
+AGENT_PHASE_DURATION = Histogram(
+    "agent_phase_duration_seconds", "Time spent per agentic run phase (run, plan, step, tool, reflect)", ["phase"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+OPERATION_DURATION = Histogram(
+    "operation_duration_seconds", "Duration of operations traced by telemetry, by span name", ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75,
+             1.0, 2.5, 5.0, 7.5, 10.0, 30.0),
+)
+OPERATION_ERRORS = Counter("operation_errors", "Operations traced by telemetry that failed, by span name and error type",
+                           ["operation", "error_type"])
+
+
+def configure_from_settings() -> None:
+    """Use the shared multiprocess directory when METRICS_MULTIPROC_DIR (or PROMETHEUS_MULTIPROC_DIR) is set."""
+    REGISTRY.configure(settings.METRICS_MULTIPROC_DIR or os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None)
+
+
+def record_llm_call(provider: str, model: str, kind: str, status: str, started: float, usage: Any = None) -> None:
+    """Record one LLM call that started at ``started`` (perf_counter), with its token usage if known."""
+    LLM_REQUEST_DURATION.labels(provider, model, kind, status).observe(time.perf_counter() - started)
+    if usage is not None:
+        LLM_TOKENS.labels(provider, model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+        LLM_TOKENS.labels(provider, model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def render_metrics() -> str:
+    """Prometheus text of every metric, plus cache_hit_ratio per cache."""
+    lookups: Dict[str, Dict[str, float]] = {}
+    for (labelvalues, _), value in REGISTRY.samples("cache_requests").items():
+        cache, result = labelvalues
+        lookups.setdefault(cache, {})[result] = value
+    lines = [
+        "# HELP cache_hit_ratio Share of cache lookups that were hits, since the server started",
+        "# TYPE cache_hit_ratio gauge",
+    ]
+    for cache, results in sorted(lookups.items()):
+        total = sum(results.values())
+        lines.append(f'cache_hit_ratio{{cache="{cache}"}} {_number(results.get("hit", 0.0) / total if total else 0.0)}')
+    return REGISTRY.render() + "\n".join(lines) + "\n"
+
+
+def instrument_engine(engine: Any) -> None:
+    """
+    Record checkout wait and checked-out connections of an engine's pool.
+
+    The wait is timed around Engine.raw_connection (every Connection checks
+    out through it, so it survives pool recreation on dispose()); the
+    checked-out gauge follows the pool's checkout/checkin events.
+    """
+    from sqlalchemy import event
+
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return raw_connection(*args, **kwargs)
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    engine.raw_connection = timed_raw_connection
+    event.listen(engine, "checkout", lambda dbapi_connection, record, proxy: DB_POOL_CHECKED_OUT.inc())
+    event.listen(engine, "checkin", lambda dbapi_connection, record: DB_POOL_CHECKED_OUT.dec())
+    engine._metrics_instrumented = True
+
@@ -0,0 +1,433 @@
+"""
+Prometheus Metrics
+
+Counters, gauges and histograms for the /metrics endpoint. Values live in
+per-thread shards:
+
+- every thread of every process writes only to its own shard, so an update
+  takes no lock (a dict lookup and a float add)
+- with a multiprocess directory configured (one directory shared by all
+  uvicorn workers, emptied before the server starts), each shard is an
+  mmap-ed file there and a scrape served by any worker aggregates the
+  files of every worker
+- shards are only ever summed: counters and histograms over every shard
+  ever written (so they stay monotonic across worker restarts), gauges over
+  the shards of live processes
+
+Gauges therefore support inc()/dec() but not set().
+
+The shard file layout follows prometheus_client's multiprocess files: a
+header holding the bytes used, then entries of a 4-byte key length, the
+key (padded to 8 bytes) and an 8-byte double.
+"""
+
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+__all__ = ["Counter", "Gauge", "Histogram", "MetricsRegistry", "REGISTRY", "PROMETHEUS_CONTENT_TYPE"]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+_HEADER = struct.Struct("<II")  # bytes used, reserved
+_LENGTH = struct.Struct("<I")
+_DOUBLE = struct.Struct("<d")
+_INITIAL_FILE_SIZE = 64 * 1024
+
+# Sample key: [metric name, label values, sample] where sample is "" for
+# counters and gauges, the bucket's upper bound or "sum" for histograms
+SampleKey = str
+
+
+def _sample_key(name: str, labelvalues: Sequence[str], sample: str = "") -> SampleKey:
+    return json.dumps([name, list(labelvalues), sample], separators=(",", ":"))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _read_entries(data: bytes) -> Iterator[Tuple[str, float, int]]:
+    """(key, value, value offset) of every entry of a shard file's contents."""
+    if len(data) < _HEADER.size:
+        return
+    used = _HEADER.unpack_from(data, 0)[0]
+    pos = _HEADER.size
+    while pos + _LENGTH.size <= used:
+        length = _LENGTH.unpack_from(data, pos)[0]
+        key_end = pos + _LENGTH.size + length
+        value_offset = key_end + (-key_end % 8)
+        if value_offset + _DOUBLE.size > used:
+            return
+        yield data[pos + _LENGTH.size:key_end].decode("utf-8"), _DOUBLE.unpack_from(data, value_offset)[0], value_offset
+        pos = value_offset + _DOUBLE.size
+
+
+class _Shard:
+    """Values written by one thread (the shard's only writer)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.slots: Dict[SampleKey, int] = {}
+        self.values: List[float] = []
+        self._offsets: List[int] = []
+        self._mm: Optional[mmap.mmap] = None
+        self._used = _HEADER.size
+        if path is not None:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size < _INITIAL_FILE_SIZE:
+            os.ftruncate(self._fd, _INITIAL_FILE_SIZE)
+            size = _INITIAL_FILE_SIZE
+        self._mm = mmap.mmap(self._fd, size)
+        # A file left by an earlier thread or process with the same id: carry on from its values
+        for key, value, offset in _read_entries(self._mm):
+            self.slots[key] = len(self.values)
+            self.values.append(value)
+            self._offsets.append(offset)
+            self._used = offset + _DOUBLE.size
+        _HEADER.pack_into(self._mm, 0, self._used, 0)
+
+    def add(self, key: SampleKey, amount: float) -> None:
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+        value = self.values[slot] + amount
+        self.values[slot] = value
+        if self._mm is not None:
+            _DOUBLE.pack_into(self._mm, self._offsets[slot], value)
+
+    def _allocate(self, key: SampleKey) -> int:
+        if self._mm is not None:
+            encoded = key.encode("utf-8")
+            key_end = self._used + _LENGTH.size + len(encoded)
+            value_offset = key_end + (-key_end % 8)
+            end = value_offset + _DOUBLE.size
+            if end > len(self._mm):
+                size = max(len(self._mm) * 2, end)
+                self._mm.close()
+                os.ftruncate(self._fd, size)
+                self._mm = mmap.mmap(self._fd, size)
+            _LENGTH.pack_into(self._mm, self._used, len(encoded))
+            self._mm[self._used + _LENGTH.size:key_end] = encoded
+            _DOUBLE.pack_into(self._mm, value_offset, 0.0)
+            # Publish the entry only once it is complete
+            _HEADER.pack_into(self._mm, 0, end, 0)
+            self._used = end
+            self._offsets.append(value_offset)
+        # Value before slot: a concurrent collect() only sees complete slots
+        self.values.append(0.0)
+        self.slots[key] = len(self.values) - 1
+        return self.slots[key]
+
+    def items(self) -> List[Tuple[SampleKey, float]]:
+        return [(key, self.values[slot]) for key, slot in list(self.slots.items())]
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            os.close(self._fd)
+            self._mm = None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _ChildBase:
+    __slots__ = ("_registry", "_key")
+
+    def __init__(self, registry: "MetricsRegistry", key: SampleKey):
+        self._registry = registry
+        self._key = key
+
+
+class _CounterChild(_ChildBase):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        self._registry._add(self._key, amount)
+
+
+class _GaugeChild(_ChildBase):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1) -> None:
+        self._registry._add(self._key, amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._registry._add(self._key, -amount)
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        self._registry._add(self._key, 1)
+        try:
+            yield
+        finally:
+            self._registry._add(self._key, -1)
+
+
+class _HistogramChild:
+    __slots__ = ("_registry", "_bounds", "_bucket_keys", "_sum_key")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labelvalues: Sequence[str], bounds: Tuple[float, ...]):
+        self._registry = registry
+        self._bounds = bounds
+        self._bucket_keys = [_sample_key(name, labelvalues, _number(float(bound))) for bound in bounds + (float("inf"),)]
+        self._sum_key = _sample_key(name, labelvalues, "sum")
+
+    def observe(self, value: float) -> None:
+        add = self._registry._add
+        add(self._bucket_keys[bisect_left(self._bounds, value)], 1)
+        add(self._sum_key, value)
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["MetricsRegistry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._registry = registry if registry is not None else REGISTRY
+        self._registry.register(self)
+
+    def labels(self, *labelvalues: Any) -> Any:
+        """Child for one combination of label values (cached)."""
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+            child = self._children.setdefault(labelvalues, self._child(tuple(str(value) for value in labelvalues)))
+        return child
+
+    def _child(self, labelvalues: Tuple[str, ...]) -> Any:
+        raise NotImplementedError
+
+    def __getattr__(self, attr: str) -> Any:
+        # Metrics without labels forward inc()/observe()/... to their only child
+        if attr.startswith("_") or self.labelnames:
+            raise AttributeError(attr)
+        return getattr(self.labels(), attr)
+
+
+class Counter(_Metric):
+    """Monotonic counter, exposed as ``<name>_total``."""
+
+    kind = "counter"
+
+    def _child(self, labelvalues: Tuple[str, ...]) -> _CounterChild:
+        return _CounterChild(self._registry, _sample_key(self.name, labelvalues))
+
+
+class Gauge(_Metric):
+    """Up/down gauge summed over live processes (inc/dec only)."""
+
+    kind = "gauge"
+
+    def _child(self, labelvalues: Tuple[str, ...]) -> _GaugeChild:
+        return _GaugeChild(self._registry, _sample_key(self.name, labelvalues))
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with ``_bucket``, ``_sum`` and ``_count`` samples."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None
+    ):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != float("inf")))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _child(self, labelvalues: Tuple[str, ...]) -> _HistogramChild:
+        return _HistogramChild(self._registry, self.name, labelvalues, self.buckets)
+
+
+class MetricsRegistry:
+    """
+    Registered metrics and the shards holding their values.
+
+    Usage:
+        registry.configure(multiprocess_dir="/tmp/metrics")  # once per process
+        requests = Counter("requests", "Requests served", ["route"], registry=registry)
+        requests.labels("/health").inc()
+        text = registry.render()
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self.multiprocess_dir: Optional[str] = None
+        self._shards: Dict[int, _Shard] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_shards)
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self.metrics[metric.name] = metric
+
+    def configure(self, multiprocess_dir: Optional[str] = None) -> None:
+        """
+        Switch between in-process shards and shared mmap files (drops this
+        process' values; call before serving traffic).
+
+        Args:
+            multiprocess_dir: Directory shared by all workers, or None for a
+                single process
+        """
+        if multiprocess_dir:
+            os.makedirs(multiprocess_dir, exist_ok=True)
+        with self._lock:
+            self.multiprocess_dir = multiprocess_dir or None
+            self._reset_shards()
+
+    def _reset_shards(self) -> None:
+        for shard in self._shards.values():
+            shard.close()
+        self._shards = {}
+        self._local = threading.local()
+
+    def _shard(self) -> _Shard:
+        ident = threading.get_ident()
+        with self._lock:
+            shard = self._shards.get(ident)
+            if shard is None:
+                path = None
+                if self.multiprocess_dir:
+                    path = os.path.join(self.multiprocess_dir, f"{os.getpid()}_{ident}.db")
+                # Reused when a new thread gets a finished thread's id
+                shard = self._shards[ident] = _Shard(path)
+        self._local.shard = shard
+        return shard
+
+    def _add(self, key: SampleKey, amount: float) -> None:
+        shard = getattr(self._local, "shard", None) or self._shard()
+        shard.add(key, amount)
+
+    def collect(self) -> Tuple[Dict[SampleKey, float], Dict[SampleKey, float]]:
+        """
+        Aggregated values: (over every shard, over shards of live processes).
+        """
+        total: Dict[SampleKey, float] = defaultdict(float)
+        live: Dict[SampleKey, float] = defaultdict(float)
+        if self.multiprocess_dir:
+            for path in glob.glob(os.path.join(self.multiprocess_dir, "*.db")):
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    alive = _pid_alive(int(os.path.basename(path).split("_", 1)[0]))
+                except (OSError, ValueError):
+                    continue
+                for key, value, _ in _read_entries(data):
+                    total[key] += value
+                    if alive:
+                        live[key] += value
+        else:
+            with self._lock:
+                shards = list(self._shards.values())
+            for shard in shards:
+                for key, value in shard.items():
+                    total[key] += value
+                    live[key] += value
+        return total, live
+
+    def samples(self, name: str) -> Dict[Tuple[Tuple[str, ...], str], float]:
+        """Aggregated values of one metric, keyed by (label values, sample)."""
+        metric = self.metrics[name]
+        total, live = self.collect()
+        values = live if metric.kind == "gauge" else total
+        result: Dict[Tuple[Tuple[str, ...], str], float] = {}
+        for key, value in values.items():
+            key_name, labelvalues, sample = json.loads(key)
+            if key_name == name:
+                result[(tuple(labelvalues), sample)] = value
+        return result
+
+    def render(self) -> str:
+        """Every registered metric in the Prometheus text exposition format."""
+        total, live = self.collect()
+        by_metric: Dict[str, Dict[Tuple[str, ...], Dict[str, float]]] = defaultdict(lambda: defaultdict(dict))
+        for key, value in total.items():
+            name, labelvalues, sample = json.loads(key)
+            metric = self.metrics.get(name)
+            if metric is None:
+                continue
+            if metric.kind == "gauge":
+                value = live.get(key, 0.0)
+            by_metric[name][tuple(labelvalues)][sample] = value
+
+        lines: List[str] = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            exposed = f"{name}_total" if metric.kind == "counter" else name
+            lines.append(f"# HELP {exposed} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {exposed} {metric.kind}")
+            for labelvalues, samples in sorted(by_metric.get(name, {}).items()):
+                labels = list(zip(metric.labelnames, labelvalues))
+                if metric.kind != "histogram":
+                    lines.append(f"{exposed}{_labels(labels)} {_number(samples.get('', 0.0))}")
+                    continue
+                cumulative = 0.0
+                for bound in metric.buckets + (float("inf"),):
+                    le = _number(float(bound))
+                    cumulative += samples.get(le, 0.0)
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(samples.get('sum', 0.0))}")
+                lines.append(f"{name}_count{_labels(labels)} {_number(cumulative)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+# Process-wide registry served by /metrics
+REGISTRY = MetricsRegistry()
@@ -10,6 +10,10 @@ from shared.schemas.audit_entry import AuditEntry, DecisionOutcome, RiskLevel
 from datetime import datetime
 
 
+# Keys kept in the output even when their value is None
+NULLABLE_KEYS = ("risk_level", "risk_score", "task_category", "entity_name", "entity_type")
+
+
 def convert_audit_trail_to_audit_entry(audit_trail: AuditTrail) -> Dict[str, Any]:
     """
     Convert AuditTrail database model to unified AuditEntry schema format.
@@ -20,20 +24,7 @@ def convert_audit_trail_to_audit_entry(audit_trail: AuditTrail) -> Dict[str, Any
     Returns:
         Dictionary matching AuditEntry schema exactly
     """
-    # Convert decision outcome
-    try:
-        decision_outcome = DecisionOutcome(audit_trail.decision_outcome)
-    except ValueError:
-        # Fallback for legacy values
-        decision_outcome = DecisionOutcome.REVIEW_REQUIRED
-    
-    # Convert risk level
-    risk_level = None
-    if audit_trail.risk_level:
-        try:
-            risk_level = RiskLevel(audit_trail.risk_level)
-        except ValueError:
-            risk_level = None
+    decision_outcome, risk_level = _normalize_outcome_and_level(audit_trail)
     
     # Build audit entry dict
     audit_entry_dict = {
@@ -44,9 +35,9 @@ def convert_audit_trail_to_audit_entry(audit_trail: AuditTrail) -> Dict[str, Any
         "task_category": audit_trail.task_category,
         "entity_name": audit_trail.entity_name,
         "entity_type": audit_trail.entity_type,
-        "decision_outcome": decision_outcome.value,
+        "decision_outcome": decision_outcome,
         "confidence_score": audit_trail.confidence_score,
-        "risk_level": risk_level.value if risk_level else None,
+        "risk_level": risk_level,
         "risk_score": audit_trail.risk_score,
         "reasoning_chain": audit_trail.reasoning_chain if isinstance(audit_trail.reasoning_chain, list) else [],
         "risk_factors": audit_trail.risk_factors,
@@ -57,11 +48,61 @@ def convert_audit_trail_to_audit_entry(audit_trail: AuditTrail) -> Dict[str, Any
         "metadata": audit_trail.meta_data or {}
     }
     
-    # Remove None values for optional fields (except those that should be None)
-    cleaned = {}
-    for key, value in audit_entry_dict.items():
-        if value is not None or key in ["risk_level", "risk_score", "task_category", "entity_name", "entity_type"]:
-            cleaned[key] = value
+    return _drop_empty_optionals(audit_entry_dict)
+
+
+def convert_audit_trail_to_audit_summary(audit_trail: AuditTrail) -> Dict[str, Any]:
+    """
+    Convert an AuditTrail row to the summary list view (fields=summary).
+    
+    Reads only the scalar columns selected by AuditService.SUMMARY_COLUMNS, so
+    none of the deferred JSON columns are loaded. The full entry is available
+    from GET /audit/entries/{audit_id}.
+    
+    Args:
+        audit_trail: AuditTrail database model (may be a load_only projection)
+        
+    Returns:
+        Dictionary with the AuditEntry scalar fields
+    """
+    decision_outcome, risk_level = _normalize_outcome_and_level(audit_trail)
+    return _drop_empty_optionals({
+        "audit_id": audit_trail.id,
+        "timestamp": audit_trail.timestamp,
+        "agent_type": audit_trail.agent_type,
+        "task_description": audit_trail.task_description,
+        "task_category": audit_trail.task_category,
+        "entity_name": audit_trail.entity_name,
+        "entity_type": audit_trail.entity_type,
+        "decision_outcome": decision_outcome,
+        "confidence_score": audit_trail.confidence_score,
+        "risk_level": risk_level,
+        "risk_score": audit_trail.risk_score,
+        "escalation_reason": audit_trail.escalation_reason
+    })
+
+
+def _normalize_outcome_and_level(audit_trail: AuditTrail):
+    """Decision outcome and risk level as schema values (legacy values mapped)"""
+    try:
+        decision_outcome = DecisionOutcome(audit_trail.decision_outcome).value
+    except ValueError:
+        # Fallback for legacy values
+        decision_outcome = DecisionOutcome.REVIEW_REQUIRED.value
     
-    return cleaned
+    risk_level = None
+    if audit_trail.risk_level:
+        try:
+            risk_level = RiskLevel(audit_trail.risk_level).value
+        except ValueError:
+            risk_level = None
+    return decision_outcome, risk_level
+
+
+def _drop_empty_optionals(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove None values for optional fields (except those that should be None)"""
+    return {
+        key: value for key, value in entry.items()
+        if value is not None or key in NULLABLE_KEYS
+    }
 
@@ -11,9 +11,11 @@ import os
 import json
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Iterator
 from datetime import datetime
 from backend.config import settings
+from backend.telemetry.metrics import LLM_RETRIES, record_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -136,7 +138,8 @@ class LLMClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        provider: Optional[str] = None
     ):
         """
         Initialize the LLM client.
@@ -144,12 +147,21 @@ class LLMClient:
         Args:
             api_key: OpenAI API key (defaults to settings.OPENAI_API_KEY)
             model: Model to use (defaults to COMPLIANCE_MODEL)
+            provider: "openai" or "mock" (defaults to settings.LLM_PROVIDER).
+                The mock provider serves deterministic offline responses and
+                ignores the API key.
         """
         self.api_key = api_key or settings.OPENAI_API_KEY
         self.model = model or COMPLIANCE_MODEL
+        self.provider = (provider or settings.LLM_PROVIDER or "openai").lower()
         
+        if self.provider == "mock":
+            # Offline provider with the same chat.completions interface
+            from backend.utils.mock_llm_provider import get_mock_provider
+            self.client = get_mock_provider()
+            self.available = True
         # Initialize OpenAI client if we have an API key
-        if HAS_OPENAI and self.api_key and self.api_key != "mock" and not (isinstance(self.api_key, str) and self.api_key.startswith("sk-mock")):
+        elif HAS_OPENAI and self.api_key and self.api_key != "mock" and not (isinstance(self.api_key, str) and self.api_key.startswith("sk-mock")):
             # Set timeout at client level
             self.client = OpenAI(
                 api_key=self.api_key,
@@ -199,6 +211,7 @@ class LLMClient:
             )
         
         last_error = None
+        call_started = time.perf_counter()
         
         for attempt in range(MAX_RETRIES + 1):
             try:
@@ -260,6 +273,7 @@ class LLMClient:
                         # Ensure confidence is in 0-1 range
                         confidence = max(0.0, min(1.0, float(confidence)))
                 
+                record_llm_call(self.provider, self.model, "blocking", "completed", call_started, getattr(response, "usage", None))
                 return LLMResponse(
                     parsed_json=parsed_json,
                     raw_text=raw_text,
@@ -274,6 +288,7 @@ class LLMClient:
                 
                 # If this was the last attempt, return error
                 if attempt == MAX_RETRIES:
+                    record_llm_call(self.provider, self.model, "blocking", "error", call_started)
                     return LLMResponse(
                         parsed_json=None,
                         raw_text=None,
@@ -283,8 +298,8 @@ class LLMClient:
                     )
                 
                 # Wait before retry (exponential backoff)
+                LLM_RETRIES.labels(self.provider, self.model).inc()
                 wait_time = 2 ** attempt
-                import time
                 time.sleep(wait_time)
         
         # Should not reach here, but handle it
@@ -323,6 +338,7 @@ class LLMClient:
             )
         
         last_error = None
+        call_started = time.perf_counter()
         
         for attempt in range(MAX_RETRIES + 1):
             try:
@@ -401,6 +417,7 @@ class LLMClient:
                         # Ensure confidence is in 0-1 range
                         confidence = max(0.0, min(1.0, float(confidence)))
                 
+                record_llm_call(self.provider, self.model, "async", "completed", call_started, getattr(response, "usage", None))
                 return LLMResponse(
                     parsed_json=parsed_json,
                     raw_text=raw_text,
@@ -418,6 +435,7 @@ class LLMClient:
             
             # If this was the last attempt, return error
             if attempt == MAX_RETRIES:
+                record_llm_call(self.provider, self.model, "async", "error", call_started)
                 return LLMResponse(
                     parsed_json=None,
                     raw_text=None,
@@ -427,6 +445,7 @@ class LLMClient:
                 )
             
             # Wait before retry (exponential backoff)
+            LLM_RETRIES.labels(self.provider, self.model).inc()
             wait_time = 2 ** attempt
             await asyncio.sleep(wait_time)
         
@@ -488,6 +507,66 @@ class LLMClient:
             timeout=timeout or COMPLIANCE_TIMEOUT
         )
     
+    def stream_compliance_analysis(
+        self,
+        prompt: str,
+        timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Stream a plain-text completion token by token.
+        
+        Connection failures are retried with the same backoff as the blocking
+        calls, but only until the first token arrives; once output has been
+        yielded an error propagates to the caller, who already holds a partial
+        completion.
+        
+        Args:
+            prompt: The analysis prompt
+            timeout: Request timeout in seconds
+            
+        Yields:
+            Text deltas in the order the model produces them. Nothing is
+            yielded when the client is not available (mock mode).
+        """
+        if not self.available:
+            return
+        
+        request_params = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a compliance analysis assistant. Provide structured, accurate responses."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": STANDARD_TEMPERATURE,
+            "max_tokens": MAX_OUTPUT_TOKENS,
+            "stream": True,
+            "timeout": timeout or COMPLIANCE_TIMEOUT
+        }
+        
+        call_started = time.perf_counter()
+        for attempt in range(MAX_RETRIES + 1):
+            started = False
+            try:
+                stream = self.client.chat.completions.create(**request_params)
+                for chunk in stream:
+                    choices = getattr(chunk, "choices", None)
+                    if not choices:
+                        continue
+                    delta = getattr(choices[0], "delta", None)
+                    content = getattr(delta, "content", None) if delta is not None else None
+                    if content:
+                        started = True
+                        yield content
+                record_llm_call(self.provider, self.model, "stream", "completed", call_started)
+                return
+            except Exception as e:
+                if started or attempt == MAX_RETRIES:
+                    record_llm_call(self.provider, self.model, "stream", "error", call_started)
+                    raise
+                logger.warning(f"LLM stream attempt {attempt + 1}/{MAX_RETRIES + 1} failed: {e}")
+                LLM_RETRIES.labels(self.provider, self.model).inc()
+                time.sleep(2 ** attempt)
+    
     # Legacy methods for backward compatibility
     def call_sync(
         self,
@@ -0,0 +1,414 @@
+"""
+Mock LLM Provider
+=================
+Deterministic, offline stand-in for the OpenAI chat completions API.
+
+Plugs in behind LLMClient (LLM_PROVIDER=mock) so the full agentic pipeline -
+planning, step execution, reflection, compliance analysis and streaming - can
+be exercised on a disconnected machine. Responses are schema-valid for each
+prompt type the engine sends, and latency, token rate and error/429 injection
+are configurable. Every random draw is seeded from (seed, prompt, attempt), so
+the same workload always produces the same responses, latencies and failures
+regardless of thread scheduling.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_CHARS_PER_TOKEN = 4
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "exponential")
+
+
+class MockLLMError(Exception):
+    """Injected provider failure (HTTP 5xx equivalent)."""
+
+    status_code = 500
+
+
+class MockRateLimitError(MockLLMError):
+    """Injected rate limit (HTTP 429) with a suggested retry delay."""
+
+    status_code = 429
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class MockLLMConfig:
+    """
+    Behaviour of the mock provider.
+
+    Attributes:
+        seed: Base seed; change it to get a different but repeatable run
+        latency_distribution: fixed, uniform, lognormal or exponential
+        latency_ms: Median time to first token in milliseconds
+        latency_jitter: Spread of the distribution (lognormal sigma, or
+            +/- fraction of latency_ms for uniform)
+        tokens_per_second: Output token rate; 0 emits the completion instantly
+        error_rate: Probability a call fails with MockLLMError
+        rate_limit_rate: Probability a call fails with MockRateLimitError
+        stream_chunk_tokens: Tokens per streamed delta
+    """
+
+    seed: int = 42
+    latency_distribution: str = "lognormal"
+    latency_ms: float = 300.0
+    latency_jitter: float = 0.3
+    tokens_per_second: float = 80.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    stream_chunk_tokens: int = 4
+
+    def __post_init__(self):
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{self.latency_distribution}', "
+                f"expected one of {LATENCY_DISTRIBUTIONS}"
+            )
+
+    @classmethod
+    def from_settings(cls) -> "MockLLMConfig":
+        """Build a config from the MOCK_LLM_* settings."""
+        return cls(
+            seed=settings.MOCK_LLM_SEED,
+            latency_distribution=settings.MOCK_LLM_LATENCY_DISTRIBUTION,
+            latency_ms=settings.MOCK_LLM_LATENCY_MS,
+            latency_jitter=settings.MOCK_LLM_LATENCY_JITTER,
+            tokens_per_second=settings.MOCK_LLM_TOKENS_PER_SECOND,
+            error_rate=settings.MOCK_LLM_ERROR_RATE,
+            rate_limit_rate=settings.MOCK_LLM_RATE_LIMIT_RATE,
+        )
+
+
+_PLAN_STEPS = [
+    ("Identify applicable jurisdictions and regulations", "Scope determines which obligations apply", ["jurisdiction_analyzer"]),
+    ("Review entity history for prior compliance decisions", "Past outcomes inform current risk", ["entity_tool"]),
+    ("Assess data sensitivity and processing risks", "Sensitive data raises the compliance bar", ["task_tool"]),
+    ("Check deadlines and regulatory timelines", "Urgency affects escalation", ["calendar_tool"]),
+    ("Evaluate required controls and documentation", "Controls must match the identified obligations", ["task_tool"]),
+    ("Consolidate findings into a risk assessment", "A single view supports the decision", []),
+    ("Generate compliance recommendations", "Actionable guidance is the final deliverable", []),
+]
+_FINDINGS = [
+    "Entity operates in multiple regulated jurisdictions",
+    "Personal data is processed as part of the task",
+    "Existing controls partially cover the requirement",
+    "Documentation needs to be updated before the deadline",
+    "No prior violations recorded for this entity",
+]
+_RISKS = [
+    "Cross-border data transfer requires safeguards",
+    "Deadline leaves limited time for review",
+    "Incomplete records for historical processing",
+]
+
+
+class MockLLMProvider:
+    """
+    OpenAI-compatible chat completions provider that never leaves the process.
+
+    Exposes ``chat.completions.create(...)`` with the same request parameters
+    and response shape (``choices[0].message.content``, streamed
+    ``choices[0].delta.content``, ``usage``) that LLMClient already consumes.
+
+    Usage:
+        provider = MockLLMProvider(MockLLMConfig(latency_ms=0, tokens_per_second=0))
+        client = LLMClient(provider="mock")  # uses the shared instance
+        provider.get_stats()
+    """
+
+    def __init__(
+        self,
+        config: Optional[MockLLMConfig] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            config: Provider behaviour (defaults to MockLLMConfig())
+            sleep: Function used to simulate latency; tests can pass a
+                recorder instead of sleeping
+        """
+        self.config = config or MockLLMConfig()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._attempts: Dict[str, int] = {}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Clear call counters and per-prompt attempt history."""
+        with self._lock:
+            self._attempts = {}
+            self.stats = {
+                "calls": 0,
+                "streamed_calls": 0,
+                "errors_injected": 0,
+                "rate_limits_injected": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "simulated_latency_seconds": 0.0,
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of provider counters."""
+        with self._lock:
+            return dict(self.stats)
+
+    def create(
+        self,
+        model: str = "mock",
+        messages: Optional[List[Dict[str, str]]] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Serve a chat completion.
+
+        Args:
+            model: Echoed back on the response
+            messages: Chat messages; the last user message is the prompt
+            response_format: OpenAI response_format; a json_schema request
+                gets a schema-valid compliance analysis
+            stream: Return an iterator of delta chunks instead of a response
+            **kwargs: Other OpenAI parameters (temperature, max_tokens,
+                timeout) are accepted and ignored
+
+        Returns:
+            A response object, or an iterator of chunks when streaming
+
+        Raises:
+            MockRateLimitError: Injected 429
+            MockLLMError: Injected provider failure
+        """
+        prompt = ""
+        for message in messages or []:
+            if message.get("role") == "user":
+                prompt = message.get("content") or ""
+
+        rng = self._rng_for(prompt)
+        self._maybe_fail(rng)
+
+        content = self._generate_content(prompt, response_format, rng)
+        prompt_tokens = _estimate_tokens(prompt)
+        completion_tokens = _estimate_tokens(content)
+        first_token_latency = self._sample_latency(rng)
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+            self.stats["streamed_calls"] += int(stream)
+            self.stats["simulated_latency_seconds"] += first_token_latency + self._generation_time(completion_tokens)
+
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+        if stream:
+            return self._stream(content, first_token_latency, model)
+
+        self._pause(first_token_latency + self._generation_time(completion_tokens))
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(
+            id=f"mock-{hashlib.sha1(prompt.encode()).hexdigest()[:12]}",
+            model=model,
+            choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=usage,
+        )
+
+    def _rng_for(self, prompt: str) -> random.Random:
+        """Seeded RNG for the n-th attempt of this prompt."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+        return random.Random(f"{self.config.seed}:{digest}:{attempt}")
+
+    def _maybe_fail(self, rng: random.Random) -> None:
+        roll = rng.random()
+        if roll < self.config.rate_limit_rate:
+            with self._lock:
+                self.stats["rate_limits_injected"] += 1
+            self._pause(self._sample_latency(rng) * 0.1)
+            raise MockRateLimitError("Mock provider rate limit exceeded (429)", retry_after=1.0)
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            with self._lock:
+                self.stats["errors_injected"] += 1
+            self._pause(self._sample_latency(rng))
+            raise MockLLMError("Mock provider internal error (500)")
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        """Time to first token in seconds."""
+        base = max(0.0, self.config.latency_ms) / 1000.0
+        jitter = max(0.0, self.config.latency_jitter)
+        distribution = self.config.latency_distribution
+        if base == 0.0 or distribution == "fixed":
+            return base
+        if distribution == "uniform":
+            return max(0.0, rng.uniform(base * (1 - jitter), base * (1 + jitter)))
+        if distribution == "exponential":
+            return rng.expovariate(1.0 / base)
+        return rng.lognormvariate(0.0, jitter) * base
+
+    def _generation_time(self, tokens: int) -> float:
+        rate = self.config.tokens_per_second
+        return tokens / rate if rate > 0 else 0.0
+
+    def _pause(self, seconds: float) -> None:
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def _stream(self, content: str, first_token_latency: float, model: str) -> Iterator[Any]:
+        """Yield content in delta chunks at the configured token rate."""
+        chunk_chars = max(1, self.config.stream_chunk_tokens) * _CHARS_PER_TOKEN
+        self._pause(first_token_latency)
+        for start in range(0, len(content), chunk_chars):
+            piece = content[start:start + chunk_chars]
+            self._pause(self._generation_time(_estimate_tokens(piece)))
+            delta = SimpleNamespace(role="assistant", content=piece)
+            yield SimpleNamespace(model=model, choices=[SimpleNamespace(index=0, delta=delta, finish_reason=None)])
+        yield SimpleNamespace(model=model, choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=None), finish_reason="stop")])
+
+    def _generate_content(
+        self,
+        prompt: str,
+        response_format: Optional[Dict[str, Any]],
+        rng: random.Random
+    ) -> str:
+        """Pick a schema-valid response for the kind of prompt received."""
+        if response_format and response_format.get("type") == "json_schema":
+            return json.dumps(_compliance_analysis(prompt, rng))
+        if "strategic plan" in prompt:
+            return json.dumps(_plan(rng), indent=2)
+        if "Step Outputs to Evaluate" in prompt:
+            return json.dumps(_batch_reflection(prompt, rng))
+        if "Execution Output:" in prompt:
+            return json.dumps(_reflection(rng))
+        if "Step to Execute" in prompt:
+            return json.dumps(_step_result(prompt, rng))
+        return json.dumps({"response": "Mock provider response", "confidence": round(rng.uniform(0.6, 0.9), 2)})
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN if text else 0
+
+
+def _plan(rng: random.Random) -> List[Dict[str, Any]]:
+    count = rng.randint(3, 5)
+    chosen = sorted(rng.sample(range(len(_PLAN_STEPS) - 1), count - 1)) + [len(_PLAN_STEPS) - 1]
+    plan = []
+    for index, step_index in enumerate(chosen, start=1):
+        description, rationale, tools = _PLAN_STEPS[step_index]
+        plan.append({
+            "step_id": f"step_{index}",
+            "description": description,
+            "rationale": rationale,
+            "expected_outcome": f"{description} completed",
+            "tools": tools,
+        })
+    return plan
+
+
+def _step_result(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    match = re.search(r"Description: (.*)", prompt)
+    description = match.group(1).strip() if match else "the requested step"
+    return {
+        "output": f"Completed: {description}",
+        "findings": rng.sample(_FINDINGS, rng.randint(1, 3)),
+        "risks": rng.sample(_RISKS, rng.randint(0, 2)),
+        "confidence": round(rng.uniform(0.7, 0.95), 2),
+    }
+
+
+def _reflection(rng: random.Random) -> Dict[str, Any]:
+    correctness = round(rng.uniform(0.78, 0.95), 2)
+    completeness = round(rng.uniform(0.75, 0.95), 2)
+    return {
+        "correctness_score": correctness,
+        "completeness_score": completeness,
+        "overall_quality": round((correctness + completeness) / 2, 2),
+        "confidence_score": round(rng.uniform(0.75, 0.9), 2),
+        "issues": [],
+        "suggestions": ["Cite the specific regulation articles relied on"],
+        "requires_retry": False,
+        "missing_data": [],
+    }
+
+
+def _batch_reflection(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    step_ids = list(dict.fromkeys(re.findall(r'\{"step_id":"([^"]+)","step":', prompt)))
+    return {"reflections": [{"step_id": step_id, **_reflection(rng)} for step_id in step_ids]}
+
+
+def _compliance_analysis(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    score = rng.uniform(0.1, 0.9)
+    if score < 0.4:
+        decision, risk_level = "AUTONOMOUS", "LOW"
+    elif score < 0.7:
+        decision, risk_level = "REVIEW_REQUIRED", "MEDIUM"
+    else:
+        decision, risk_level = "ESCALATE", "HIGH"
+    factors = ["jurisdiction_complexity", "data_sensitivity", "deadline_pressure"]
+    result = {
+        "decision": decision,
+        "confidence": round(rng.uniform(0.65, 0.95), 2),
+        "risk_level": risk_level,
+        "risk_analysis": [
+            {
+                "factor": factor,
+                "score": round(min(1.0, max(0.0, rng.gauss(score, 0.1))), 2),
+                "weight": round(1 / len(factors), 2),
+                "explanation": f"Mock assessment of {factor.replace('_', ' ')}",
+            }
+            for factor in factors
+        ],
+        "why": {"reasoning_steps": [
+            "Identified applicable regulations",
+            "Weighted risk factors",
+            f"Overall risk classified as {risk_level}",
+        ]},
+        "recommendations": ["Document the decision rationale"],
+    }
+    if decision == "ESCALATE":
+        result["escalation_reason"] = "High combined risk score"
+    return result
+
+
+_shared_provider: Optional[MockLLMProvider] = None
+_shared_lock = threading.Lock()
+
+
+def get_mock_provider() -> MockLLMProvider:
+    """
+    Shared provider configured from settings.
+
+    All LLMClient instances in mock mode use this instance so load tests see
+    one set of counters across the whole process.
+    """
+    global _shared_provider
+    with _shared_lock:
+        if _shared_provider is None:
+            _shared_provider = MockLLMProvider(MockLLMConfig.from_settings())
+        return _shared_provider
+
+
+def set_mock_provider(provider: Optional[MockLLMProvider]) -> None:
+    """Replace (or clear, with None) the shared mock provider."""
+    global _shared_provider
+    with _shared_lock:
+        _shared_provider = provider
@@ -6,12 +6,16 @@ Converts backend models to unified schema formats.
 
 from typing import Dict, Any, List
 from backend.agent.risk_models import DecisionAnalysis, RiskFactors
-from shared.schemas.analysis_result import (
-    AnalysisResult,
-    RiskAnalysisItem,
-    WhyReasoning,
-    DecisionOutcome,
-    RiskLevel
+
+
+# (factor, weight, explanation label) in AnalysisResult.risk_analysis order
+RISK_ANALYSIS_FACTORS = (
+    ("jurisdiction_risk", 0.15, "Jurisdiction complexity risk"),
+    ("entity_risk", 0.15, "Entity risk profile"),
+    ("task_risk", 0.20, "Task complexity risk"),
+    ("data_sensitivity_risk", 0.20, "Data sensitivity risk"),
+    ("regulatory_risk", 0.20, "Regulatory oversight risk"),
+    ("impact_risk", 0.10, "Impact severity risk"),
 )
 
 
@@ -22,6 +26,12 @@ def convert_decision_analysis_to_analysis_result(
     """
     Convert DecisionAnalysis to unified AnalysisResult schema format.
     
+    The analysis has already been validated, so the response dict is built
+    directly instead of going through AnalysisResult, RiskAnalysisItem and
+    WhyReasoning models that would only be validated and dumped again. The
+    output is identical to AnalysisResult.to_detailed_dict() /
+    to_simple_dict().
+    
     Args:
         analysis: DecisionAnalysis object from decision engine
         detailed: If True, include all optional fields. If False, simple view.
@@ -29,81 +39,61 @@ def convert_decision_analysis_to_analysis_result(
     Returns:
         Dictionary matching AnalysisResult schema exactly
     """
-    # Convert risk factors to risk_analysis items
     risk_factors = analysis.risk_factors
-    risk_analysis_items = [
-        RiskAnalysisItem(
-            factor="jurisdiction_risk",
-            score=risk_factors.jurisdiction_risk,
-            weight=0.15,
-            explanation=f"Jurisdiction complexity risk: {risk_factors.jurisdiction_risk:.2f}"
-        ),
-        RiskAnalysisItem(
-            factor="entity_risk",
-            score=risk_factors.entity_risk,
-            weight=0.15,
-            explanation=f"Entity risk profile: {risk_factors.entity_risk:.2f}"
-        ),
-        RiskAnalysisItem(
-            factor="task_risk",
-            score=risk_factors.task_risk,
-            weight=0.20,
-            explanation=f"Task complexity risk: {risk_factors.task_risk:.2f}"
-        ),
-        RiskAnalysisItem(
-            factor="data_sensitivity_risk",
-            score=risk_factors.data_sensitivity_risk,
-            weight=0.20,
-            explanation=f"Data sensitivity risk: {risk_factors.data_sensitivity_risk:.2f}"
-        ),
-        RiskAnalysisItem(
-            factor="regulatory_risk",
-            score=risk_factors.regulatory_risk,
-            weight=0.20,
-            explanation=f"Regulatory oversight risk: {risk_factors.regulatory_risk:.2f}"
-        ),
-        RiskAnalysisItem(
-            factor="impact_risk",
-            score=risk_factors.impact_risk,
-            weight=0.10,
-            explanation=f"Impact severity risk: {risk_factors.impact_risk:.2f}"
-        ),
-    ]
-    
-    # Convert decision outcome
-    decision_outcome = DecisionOutcome(analysis.decision.value)
-    
-    # Convert risk level
-    risk_level = RiskLevel(analysis.risk_level.value)
-    
-    # Create why reasoning
-    why_reasoning = WhyReasoning(
-        reasoning_steps=analysis.reasoning,
-        confidence_factors=None,  # Can be added if available
-        uncertainty_notes=None    # Can be added if available
-    )
-    
-    # Create AnalysisResult
-    analysis_result = AnalysisResult(
-        decision=decision_outcome,
-        confidence=analysis.confidence,
-        risk_level=risk_level,
-        risk_score=risk_factors.overall_score,
-        risk_analysis=risk_analysis_items,
-        why=why_reasoning,
-        recommendations=analysis.recommendations,
-        escalation_reason=analysis.escalation_reason,
-        similar_cases=analysis.similar_cases,
-        pattern_analysis=analysis.pattern_analysis,
-        proactive_suggestions=analysis.proactive_suggestions,
-        timestamp=analysis.timestamp
-    )
-    
-    # Convert to dict using appropriate method
-    if detailed:
-        return analysis_result.to_detailed_dict()
-    else:
-        return analysis_result.to_simple_dict()
+    result = {
+        "decision": analysis.decision.value,
+        "confidence": analysis.confidence,
+        "risk_level": analysis.risk_level.value,
+        "risk_score": risk_factors.overall_score,
+        "risk_analysis": risk_analysis_items(risk_factors),
+    }
+    
+    if not detailed:
+        result["why"] = {"reasoning_steps": analysis.reasoning[:3]}  # First 3 steps only
+        return result
+    
+    result["why"] = {
+        "reasoning_steps": list(analysis.reasoning),
+        "confidence_factors": None,  # Can be added if available
+        "uncertainty_notes": None    # Can be added if available
+    }
+    result["timestamp"] = analysis.timestamp.isoformat()
+    
+    # Add optional fields if present
+    if analysis.recommendations:
+        result["recommendations"] = list(analysis.recommendations)
+    if analysis.escalation_reason:
+        result["escalation_reason"] = analysis.escalation_reason
+    if analysis.similar_cases:
+        result["similar_cases"] = list(analysis.similar_cases)
+    if analysis.pattern_analysis:
+        result["pattern_analysis"] = analysis.pattern_analysis
+    if analysis.proactive_suggestions:
+        result["proactive_suggestions"] = list(analysis.proactive_suggestions)
+    
+    return result
+
+
+def risk_analysis_items(risk_factors: RiskFactors) -> List[Dict[str, Any]]:
+    """
+    Per-factor risk_analysis entries (factor, score, weight, explanation).
+    
+    Args:
+        risk_factors: RiskFactors (or the engine's FactorScores)
+        
+    Returns:
+        List of dicts in RiskAnalysisItem shape
+    """
+    items = []
+    for factor, weight, label in RISK_ANALYSIS_FACTORS:
+        score = getattr(risk_factors, factor)
+        items.append({
+            "factor": factor,
+            "score": score,
+            "weight": weight,
+            "explanation": f"{label}: {score:.2f}"
+        })
+    return items
 
 
 def ensure_required_fields(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -9,7 +9,8 @@ Unified API client for Streamlit dashboard with:
 - Structured APIResponse
 """
 
-from typing import Dict, Any, Optional, Tuple, Union, List
+from typing import Dict, Any, Optional, Tuple, Union, List, Iterator
+import json
 import time
 import logging
 import requests
@@ -371,6 +372,51 @@ class APIClient:
         """Run advanced agentic analysis (plan-execute-reflect)"""
         return self.post("/api/v1/agentic/analyze", payload, timeout=timeout)
     
+    def agentic_analyze_stream(self, payload: Dict[str, Any], timeout: Optional[int] = 150) -> Iterator[Tuple[str, Any]]:
+        """
+        Run agentic analysis over server-sent events.
+        
+        Yields (event, data) tuples as the backend emits plan, step, reflection,
+        recommendation and finally result (or timeout/error). HTTP failures are
+        yielded as a single ("error", {...}) event; connection errors and
+        timeouts propagate as requests exceptions.
+        """
+        url = self._build_url("/api/v1/agentic/analyze/stream")
+        headers = {"Accept": "text/event-stream"}
+        resp = self._session.post(url, json=payload, headers={**headers, **get_auth_headers()}, timeout=timeout, stream=True)
+        if resp.status_code == 401 and refresh_tokens_if_needed():
+            resp.close()
+            resp = self._session.post(url, json=payload, headers={**headers, **get_auth_headers()}, timeout=timeout, stream=True)
+        
+        with resp:
+            if not 200 <= resp.status_code < 300:
+                yield "error", {
+                    "status": "error",
+                    "error": self._get_error_message(resp.status_code, resp.text),
+                    "status_code": resp.status_code
+                }
+                return
+            
+            event, data_lines = "message", []
+            for line in resp.iter_lines(decode_unicode=True):
+                if line is None:
+                    continue
+                if line == "":
+                    # Blank line terminates one event
+                    if data_lines:
+                        try:
+                            data = json.loads("\n".join(data_lines))
+                        except ValueError:
+                            data = "\n".join(data_lines)
+                        yield event, data
+                    event, data_lines = "message", []
+                elif line.startswith(":"):
+                    continue  # keep-alive comment
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data_lines.append(line[len("data:"):].lstrip())
+    
     def agentic_status(self) -> APIResponse:
         """Get agentic engine status and configuration"""
         return self.get("/api/v1/agentic/status")
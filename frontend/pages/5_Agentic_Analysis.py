@@ -17,7 +17,7 @@ sys.path.insert(0, str(frontend_dir))
 
 from components.auth_utils import require_auth, show_logout_button
 from components.session_manager import SessionManager
-from components.api_client import APIClient, display_api_error, parseAgenticResponse
+from components.api_client import APIClient, APIResponse, display_api_error, parseAgenticResponse
 from components.constants import (
     INDUSTRY_OPTIONS, LOCATION_OPTIONS
 )
@@ -282,9 +282,43 @@ if st.session_state.get("agentic_analysis_in_progress") and st.session_state.get
     # #endregion
     
     try:
-        with st.spinner("🤖 Agentic engine processing... This may take up to 2 minutes."):
-            # Increase timeout to align with backend long-running agentic flow
-            response = api_client.post("/api/v1/agentic/analyze", request_payload, timeout=150)
+        # Stream progress from the backend so the plan and each step show up as soon as they exist
+        response = None
+        with st.status("🤖 Agentic engine processing...", expanded=True) as stream_status:
+            planned_steps = 0
+            completed_steps = 0
+            for event, data in api_client.agentic_analyze_stream(request_payload, timeout=150):
+                if event == "plan":
+                    planned_steps = len(data.get("plan", []))
+                    label = "🔁 Revised plan" if data.get("revised") else "📋 Plan ready"
+                    stream_status.write(f"{label}: {planned_steps} steps")
+                    progress_bar.progress(10, text="Plan generated, executing steps...")
+                elif event == "plan_step":
+                    # Live planner streams steps one at a time and runs them immediately
+                    planned_steps = max(planned_steps, completed_steps + 1)
+                    stream_status.write(f"📋 {data.get('step_id', 'step')}: {data.get('description', '')[:160]}")
+                elif event == "step":
+                    completed_steps += 1
+                    stream_status.write(f"✅ {data.get('step_id', 'step')}: {str(data.get('output') or '')[:160]}")
+                    if planned_steps:
+                        pct = 10 + int(80 * min(completed_steps, planned_steps) / planned_steps)
+                        progress_bar.progress(pct, text=f"Executed {completed_steps}/{planned_steps} steps...")
+                elif event == "reflection":
+                    stream_status.write(f"🔍 Reflection on {data.get('step_id', 'step')}: quality {data.get('overall_quality', 0):.2f}")
+                elif event == "recommendation":
+                    progress_bar.progress(95, text="Finalizing recommendation...")
+                elif event == "result":
+                    response = APIResponse(success=True, data=data, status_code=200)
+                elif event in ("timeout", "error"):
+                    status_code = 504 if event == "timeout" else data.get("status_code", 500)
+                    response = APIResponse(success=False, error=data.get("error"), status_code=status_code)
+            if response is None:
+                response = APIResponse(success=False, error="Analysis stream ended without a result", status_code=None)
+            stream_status.update(
+                label="✅ Agentic analysis complete" if response.success else "❌ Agentic analysis failed",
+                state="complete" if response.success else "error",
+                expanded=False
+            )
         
         # Clear progress bar
         progress_bar.empty()
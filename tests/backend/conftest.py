@@ -2,11 +2,16 @@
 
 import pytest
 import os
+from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from backend.db.base import Base
+from sqlalchemy.pool import QueuePool
+from backend.auth.security import DemoUser, get_current_user
+from backend.db.base import Base, get_db
 # Import models to ensure they are registered with Base
 from backend.db import models  # noqa: F401
+from backend.db import sample_data
+from backend.main import app
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -27,10 +32,13 @@ def db_session():
     """Create a test database session with in-memory SQLite
     
     Using a shared memory database with URI to allow multiple connections
+    (QueuePool: the default per-thread pool closes other threads' connections
+    once background tasks have used more threads than its size)
     """
     engine = create_engine(
         "sqlite:///file:testdb?mode=memory&cache=shared&uri=true",
         echo=False,
+        poolclass=QueuePool,
         connect_args={"check_same_thread": False, "uri": True}
     )
     Base.metadata.create_all(engine)
@@ -43,3 +51,19 @@ def db_session():
     Base.metadata.drop_all(engine)
     engine.dispose()
 
+
+
+@pytest.fixture
+def client(db_session):
+    """Test client with auth bypassed and the in-memory database session"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: DemoUser()
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def synthetic_audit_rows():
+    """Factory for transient AuditTrail rows shaped like real decision-engine entries"""
+    return sample_data.synthetic_audit_rows
@@ -0,0 +1,55 @@
+"""Tests for the streaming agentic analysis endpoint"""
+
+import json
+
+def _read_events(response):
+    """Parse an SSE body into a list of (event, data) tuples"""
+    events = []
+    for frame in response.text.split("\n\n"):
+        event, data = None, None
+        for line in frame.splitlines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:"):].strip())
+        if event:
+            events.append((event, data))
+    return events
+
+
+def _payload(max_iterations):
+    return {
+        "entity": {"entity_name": "Acme Corp", "locations": ["US", "EU"], "employee_count": 120},
+        "task": {"task_description": "Update privacy notice for GDPR"},
+        "max_iterations": max_iterations,
+    }
+
+
+def test_stream_emits_progress_before_result(client):
+    """Plan and step events arrive in order and the final result closes the stream"""
+    response = client.post("/api/v1/agentic/analyze/stream", json=_payload(5))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _read_events(response)
+    names = [name for name, _ in events]
+    assert names[0] == "status"
+    assert names[-1] == "result"
+    assert names.index("plan") < names.index("step") < names.index("recommendation")
+
+    plan = next(data for name, data in events if name == "plan")["plan"]
+    steps = [data for name, data in events if name == "step"]
+    assert len(steps) == len(plan)
+
+    result = events[-1][1]
+    assert result["status"] == "completed"
+    assert [s["step_id"] for s in result["step_outputs"]] == [s["step_id"] for s in steps]
+
+
+def test_stream_demo_mode_replays_events(client):
+    """Demo responses emit the same event sequence as a real run"""
+    response = client.post("/api/v1/agentic/analyze/stream", json=_payload(2))
+    names = [name for name, _ in _read_events(response)]
+    assert names.count("step") == 4
+    assert names.count("reflection") == 4
+    assert names[-1] == "result"
@@ -0,0 +1,248 @@
+"""Tests for the columnar analytics snapshots, queries and routes"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.agent.audit_service import AuditService
+from backend.agent.feedback_processor import FeedbackProcessor
+from backend.analytics import queries
+from backend.analytics.benchmark import benchmark
+from backend.analytics.snapshots import SnapshotStore, get_snapshot_store
+from backend.config import settings
+from backend.db.audit_archive import get_archive
+from backend.db.models import AuditTrail, FeedbackLog
+
+NOW = datetime.utcnow().replace(microsecond=0)
+AUDIT_ROWS = 900
+FEEDBACK_ROWS = 400
+DECISIONS = ("AUTONOMOUS", "REVIEW_REQUIRED", "ESCALATE")
+
+
+def _audit_rows(rows, first_id=1):
+    for n, row in enumerate(rows):
+        i = first_id - 1 + n
+        row.id = i + 1
+        row.timestamp = NOW - timedelta(hours=19 * (AUDIT_ROWS - i), minutes=i % 60)
+        row.agent_type = ("decision_engine", "agentic_engine")[i % 7 == 0]
+        row.task_category = ("DATA_PRIVACY", "SECURITY", "FINANCIAL_REPORTING", None)[i % 4]
+        row.entity_name = f"Entity {i % 25}"
+        row.risk_score = None if i % 11 == 0 else ((i * 37) % 100) / 100
+        row.confidence_score = 0.5 + ((i * 13) % 50) / 100
+    return rows
+
+
+def _feedback_rows(count, first_id=1):
+    rows = []
+    for n in range(count):
+        i = first_id - 1 + n
+        ai, human = DECISIONS[i % 3], DECISIONS[(i * 7 // 3) % 3]
+        rows.append(FeedbackLog(
+            feedback_id=i + 1,
+            timestamp=NOW - timedelta(hours=17 * (FEEDBACK_ROWS - i)),
+            entity_name=f"Entity {i % 25}",
+            task_description=f"Feedback on decision {i}",
+            ai_decision=ai,
+            human_decision=human,
+            is_agreement=int(ai == human),
+            audit_trail_id=i + 1,
+        ))
+    return rows
+
+
+@pytest.fixture
+def analytics_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(settings, "ANALYTICS_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(settings, "ANALYTICS_REFRESH_SECONDS", 0)
+    return tmp_path
+
+
+@pytest.fixture
+def populated(db_session, synthetic_audit_rows, analytics_dirs):
+    db_session.add_all(_audit_rows(synthetic_audit_rows(AUDIT_ROWS)) + _feedback_rows(FEEDBACK_ROWS))
+    db_session.commit()
+    db_session.expunge_all()
+    return db_session
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    calls = []
+    original = SnapshotStore._rebuild
+
+    def _rebuild(self, db, table):
+        calls.append(table)
+        return original(self, db, table)
+
+    monkeypatch.setattr(SnapshotStore, "_rebuild", _rebuild)
+    return calls
+
+
+def _rollover(db):
+    return get_archive().rollover(db, older_than=NOW - timedelta(days=180), batch_size=200)
+
+
+def _without_timestamp(stats):
+    stats.pop("last_updated", None)
+    return stats
+
+
+@pytest.mark.parametrize("archived", [False, True])
+@pytest.mark.parametrize("window", [{}, {"start_date": NOW - timedelta(days=400), "end_date": NOW - timedelta(days=100)}])
+def test_audit_summary_matches_statistics(populated, archived, window):
+    if archived:
+        _rollover(populated)
+    expected = _without_timestamp(AuditService.get_audit_statistics(populated, **window))
+    rows = queries.filter_rows(get_snapshot_store().get(populated, "audit_trail"), {},
+                               window.get("start_date"), window.get("end_date"))
+    summary = _without_timestamp(queries.audit_summary(rows))
+
+    assert summary.pop("average_confidence") == pytest.approx(expected.pop("average_confidence"))
+    assert summary.pop("average_risk_score") == pytest.approx(expected.pop("average_risk_score"))
+    assert summary == expected
+
+
+def test_feedback_summary_and_overrides_match(populated):
+    feedback = get_snapshot_store().get(populated, "feedback_log")
+    overall = FeedbackProcessor(populated).get_feedback_statistics()["overall"]
+    assert queries.feedback_summary(feedback) == {field: overall[field] for field in queries.FEEDBACK_STATS_FIELDS}
+
+    processor = FeedbackProcessor(populated)
+    for entity_name, days in ((None, 30), ("Entity 3", 30), (None, 365)):
+        summary = queries.override_summary(feedback, entity_name, days)
+        by_entity = summary.pop("by_entity")
+        assert summary == processor.get_override_statistics(entity_name, days)
+        assert sum(by_entity.values()) == summary["total_overrides"]
+
+
+def test_group_by_and_time_series(populated):
+    rows = populated.query(AuditTrail).all()
+    audit = get_snapshot_store().get(populated, "audit_trail")
+
+    groups = queries.group_by(audit, ["decision_outcome", "task_category"])
+    assert {(g["decision_outcome"], g["task_category"]): g["count"] for g in groups} == Counter(
+        (row.decision_outcome, row.task_category) for row in rows)
+    assert [g["count"] for g in groups] == sorted((g["count"] for g in groups), reverse=True)
+    escalated = [row.confidence_score for row in rows if row.decision_outcome == "ESCALATE" and row.task_category == "SECURITY"]
+    group = next(g for g in groups if g["decision_outcome"] == "ESCALATE" and g["task_category"] == "SECURITY")
+    assert group["avg_confidence_score"] == pytest.approx(np.mean(escalated))
+
+    series = queries.time_series(audit, "month", by="decision_outcome")
+    expected = Counter((row.timestamp.strftime("%Y-%m-01T00:00:00"), row.decision_outcome) for row in rows)
+    assert {(point["bucket"], point["decision_outcome"]): point["count"] for point in series} == expected
+    assert [point["bucket"] for point in series] == sorted(point["bucket"] for point in series)
+
+    weekly = queries.time_series(audit, "week")
+    assert all(datetime.fromisoformat(point["bucket"]).weekday() == 0 for point in weekly)
+    assert sum(point["count"] for point in weekly) == AUDIT_ROWS
+    with pytest.raises(ValueError):
+        queries.time_series(audit, "fortnight")
+
+
+def test_percentiles_are_exact(populated):
+    rows = populated.query(AuditTrail).all()
+    audit = get_snapshot_store().get(populated, "audit_trail")
+    quantiles = (0, 0.25, 0.5, 0.9, 0.99, 1)
+
+    overall = queries.percentiles(audit, "risk_score", quantiles)
+    scores = [row.risk_score for row in rows if row.risk_score is not None]
+    assert overall[0]["count"] == len(scores)
+    assert [overall[0][label] for label in ("p0", "p25", "p50", "p90", "p99", "p100")] == pytest.approx(
+        np.quantile(scores, quantiles))
+
+    by_level = queries.percentiles(audit, "confidence_score", (0.5, 0.95), by="risk_level")
+    assert [group["risk_level"] for group in by_level] == ["HIGH", "LOW", "MEDIUM"]
+    for group in by_level:
+        values = [row.confidence_score for row in rows if row.risk_level == group["risk_level"]]
+        assert (group["p50"], group["p95"]) == pytest.approx(tuple(np.quantile(values, (0.5, 0.95))))
+    with pytest.raises(ValueError):
+        queries.percentiles(audit, "risk_score", (1.5,))
+
+
+def test_confusion_matrix(populated):
+    feedback = populated.query(FeedbackLog).all()
+    matrix = queries.confusion_matrix(get_snapshot_store().get(populated, "feedback_log"))
+    pairs = Counter((row.ai_decision, row.human_decision) for row in feedback)
+
+    assert matrix["labels"] == list(DECISIONS)
+    assert matrix["matrix"] == [[pairs[(ai, human)] for human in DECISIONS] for ai in DECISIONS]
+    assert matrix["agreement_rate"] == round(sum(row.is_agreement for row in feedback) / FEEDBACK_ROWS, 4)
+    escalate = matrix["per_label"]["ESCALATE"]
+    assert escalate["support"] == sum(row.human_decision == "ESCALATE" for row in feedback)
+    assert escalate["precision"] == round(pairs[("ESCALATE", "ESCALATE")] / sum(
+        row.ai_decision == "ESCALATE" for row in feedback), 4)
+
+
+def test_incremental_refresh(populated, rebuilds, synthetic_audit_rows):
+    store = get_snapshot_store()
+    assert store.get(populated, "audit_trail").num_rows == AUDIT_ROWS
+    assert rebuilds == ["audit_trail"]
+
+    populated.add_all(_audit_rows(synthetic_audit_rows(50), first_id=AUDIT_ROWS + 1))
+    populated.commit()
+    assert store.get(populated, "audit_trail").num_rows == AUDIT_ROWS + 50
+    _rollover(populated)
+    assert store.get(populated, "audit_trail").num_rows == AUDIT_ROWS + 50
+    assert rebuilds == ["audit_trail"]
+
+    # Within the refresh interval the snapshot is served as is
+    populated.add(_audit_rows(synthetic_audit_rows(1), first_id=AUDIT_ROWS + 51)[0])
+    populated.commit()
+    assert store.get(populated, "audit_trail", max_age=3600).num_rows == AUDIT_ROWS + 50
+    assert store.get(populated, "audit_trail").num_rows == AUDIT_ROWS + 51
+
+    populated.query(AuditTrail).filter(AuditTrail.id > AUDIT_ROWS + 45).delete()
+    populated.commit()
+    assert store.get(populated, "audit_trail").num_rows == AUDIT_ROWS + 45
+    assert rebuilds == ["audit_trail", "audit_trail"]
+
+
+def test_persisted_snapshot_is_reused(populated, analytics_dirs, rebuilds):
+    get_snapshot_store().get(populated, "feedback_log")
+    assert (analytics_dirs / "snapshots" / "feedback_log.parquet").is_file()
+
+    populated.add_all(_feedback_rows(10, first_id=FEEDBACK_ROWS + 1))
+    populated.commit()
+    restarted = SnapshotStore()
+    assert restarted.get(populated, "feedback_log").num_rows == FEEDBACK_ROWS + 10
+    assert rebuilds == ["feedback_log"]
+    assert restarted.status()["feedback_log"]["high_water"] == FEEDBACK_ROWS + 10
+
+
+def test_analytics_routes(populated, client):
+    summary = client.get("/api/v1/analytics/audit/summary?risk_level=HIGH").json()
+    assert summary["total_decisions"] == AuditService.count_audit_trail(populated, risk_level="HIGH")
+    statistics = client.get("/api/v1/audit/statistics").json()
+    assert client.get("/api/v1/analytics/audit/summary").json()["by_outcome"] == statistics["by_outcome"]
+
+    groups = client.get("/api/v1/analytics/audit/group-by?by=decision_outcome,risk_level").json()
+    assert groups["by"] == ["decision_outcome", "risk_level"]
+    assert sum(group["count"] for group in groups["groups"]) == AUDIT_ROWS
+    series = client.get("/api/v1/analytics/audit/timeseries?interval=month&entity_name=Entity 4").json()
+    assert sum(point["count"] for point in series["series"]) == AUDIT_ROWS // 25
+    percentiles = client.get("/api/v1/analytics/audit/percentiles?metric=risk_score&q=0.5&q=0.9&by=agent_type").json()
+    assert {group["agent_type"] for group in percentiles["groups"]} == {"decision_engine", "agentic_engine"}
+
+    assert client.get("/api/v1/analytics/feedback/summary").json() == client.get("/api/v1/feedback/stats").json()
+    confusion = client.get("/api/v1/analytics/feedback/confusion?entity_name=Entity 2").json()
+    assert confusion["total"] == FEEDBACK_ROWS // 25
+    overrides = client.get("/api/v1/analytics/feedback/overrides?days=90").json()
+    legacy = FeedbackProcessor(populated).get_override_statistics(days=90)
+    assert overrides["override_breakdown"] == legacy["override_breakdown"]
+
+    refreshed = client.post("/api/v1/analytics/refresh?full=true").json()
+    assert refreshed["audit_trail"]["rows"] == AUDIT_ROWS and refreshed["feedback_log"]["rows"] == FEEDBACK_ROWS
+
+    assert client.get("/api/v1/analytics/audit/group-by?by=task_description").status_code == 400
+    assert client.get("/api/v1/analytics/audit/timeseries?interval=fortnight").status_code == 400
+    assert client.get("/api/v1/analytics/audit/percentiles?q=2").status_code == 400
+
+
+def test_analytics_benchmark_small(analytics_dirs):
+    results = benchmark(rows=300, repeats=1, workdir=str(analytics_dirs))
+    assert results["rows"] == 300
+    assert set(results["speedup"]) == {"audit_statistics", "feedback_stats", "feedback_overrides"}
+    assert results["analytics"]["snapshot_build"] > 0
@@ -0,0 +1,226 @@
+"""Tests for the hot/cold audit archive over a synthetic multi-year dataset"""
+
+from datetime import datetime, timedelta
+
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import event
+
+from backend.agent.audit_service import AuditService
+from backend.config import settings
+from backend.db import audit_archive
+from backend.db.audit_archive import get_archive
+from backend.db.models import ArchiveIndex, ArchivePartition, AuditTrail, FeedbackLog
+from backend.utils.audit_converter import convert_audit_trail_to_audit_summary
+
+START = datetime(2023, 1, 1, 8, 0, 0)
+CUTOFF = datetime(2025, 10, 1)
+AUDIT_ROWS = 1200
+FEEDBACK_ROWS = 300
+
+FILTERS = [
+    {},
+    {"entity_name": "Entity 7"},
+    {"decision_outcome": "ESCALATE", "risk_level": "HIGH"},
+    {"agent_type": "decision_engine", "task_category": "DATA_PRIVACY"},
+    {"start_date": datetime(2025, 8, 15), "end_date": datetime(2025, 11, 1)},
+    {"start_date": datetime(2023, 6, 1), "end_date": datetime(2023, 7, 1, 12)},
+]
+
+
+def _multi_year_rows(rows):
+    for i, row in enumerate(rows):
+        # ~3 years of history, one decision every ~22 hours
+        row.timestamp = START + timedelta(hours=22 * i, seconds=i)
+        row.entity_name = f"Entity {i % 30}"
+        row.meta_data = {"api_endpoint": "/decision/analyze", "task_id": f"TASK-{i:04d}-001"}
+    feedback = [
+        FeedbackLog(
+            feedback_id=n + 1,
+            timestamp=START + timedelta(hours=88 * n, minutes=5),
+            entity_name=f"Entity {n % 30}",
+            task_description=f"Feedback on decision {n}",
+            ai_decision=("AUTONOMOUS", "REVIEW_REQUIRED", "ESCALATE")[n % 3],
+            human_decision=("AUTONOMOUS", "ESCALATE")[n % 2],
+            is_agreement=int(n % 3 == 0 and n % 2 == 0),
+            audit_trail_id=4 * n + 1,
+            meta_data={"source": "ui"},
+        )
+        for n in range(FEEDBACK_ROWS)
+    ]
+    return rows, feedback
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_DIR", str(tmp_path / "archive"))
+    return tmp_path / "archive"
+
+
+@pytest.fixture
+def populated(db_session, synthetic_audit_rows, archive_dir):
+    rows, feedback = _multi_year_rows(synthetic_audit_rows(AUDIT_ROWS))
+    db_session.add_all(rows + feedback)
+    db_session.commit()
+    db_session.expunge_all()
+    return db_session
+
+
+@pytest.fixture
+def file_reads(monkeypatch):
+    """Parquet files opened by the archive"""
+    reads = []
+    original = pq.read_table
+
+    def read_table(source, *args, **kwargs):
+        reads.append(str(source))
+        return original(source, *args, **kwargs)
+
+    monkeypatch.setattr(audit_archive.pq, "read_table", read_table)
+    return reads
+
+
+def _pages(db, fields="full", **filters):
+    """Several pages, including ones that straddle the hot/cold boundary"""
+    convert = convert_audit_trail_to_audit_summary if fields == "summary" else AuditTrail.to_dict
+    pages = []
+    for limit, offset in ((25, 0), (100, 40), (1000, 0), (7, 1150)):
+        entries = AuditService.get_audit_trail(db, limit=limit, offset=offset, fields=fields, **filters)
+        pages.append([convert(entry) for entry in entries])
+        db.expunge_all()
+    return pages
+
+
+def _rollover(db):
+    return get_archive().rollover(db, older_than=CUTOFF, batch_size=250)
+
+
+def test_rollover_moves_aged_rows_into_monthly_partitions(populated, archive_dir):
+    hot_before = populated.query(AuditTrail).count()
+    dry = get_archive().rollover(populated, older_than=CUTOFF, dry_run=True)
+    assert populated.query(AuditTrail).count() == hot_before
+
+    result = _rollover(populated)
+    archived = result["audit_trail"]["rows"]
+    assert archived == dry["audit_trail"]["rows"] == sum(dry["audit_trail"]["by_month"].values())
+    assert 0 < archived < AUDIT_ROWS
+    assert populated.query(AuditTrail).count() == AUDIT_ROWS - archived
+    assert populated.query(AuditTrail).filter(AuditTrail.timestamp < CUTOFF).count() == 0
+    assert result["feedback_log"]["rows"] == populated.query(ArchiveIndex).filter(
+        ArchiveIndex.table_name == "feedback_log").count()
+
+    partitions = populated.query(ArchivePartition).filter(ArchivePartition.table_name == "audit_trail").all()
+    assert sum(p.row_count for p in partitions) == archived
+    assert {(p.year, p.month) for p in partitions} >= {(2023, 1), (2024, 6), (2025, 9)}
+    for partition in partitions:
+        assert f"year={partition.year:04d}/month={partition.month:02d}/" in partition.path
+        assert partition.min_timestamp.month == partition.max_timestamp.month == partition.month
+        assert (archive_dir / partition.path).is_file()
+
+    again = _rollover(populated)
+    assert again["audit_trail"]["rows"] == again["feedback_log"]["rows"] == 0
+
+
+
+def test_rollover_deletes_hot_rows_in_id_batches(populated, monkeypatch):
+    monkeypatch.setattr(audit_archive, "_ID_BATCH", 100)
+    deletes = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM audit_trail"):
+            deletes.append(len(parameters))
+
+    event.listen(populated.get_bind(), "before_cursor_execute", listener)
+    try:
+        archived = get_archive().rollover(populated, older_than=CUTOFF)["audit_trail"]["rows"]
+    finally:
+        event.remove(populated.get_bind(), "before_cursor_execute", listener)
+    assert archived > 100
+    assert max(deletes) == 100 and sum(deletes) == archived
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_audit_queries_unchanged_across_tiers(populated, filters):
+    before = _pages(populated, **filters)
+    summary_before = _pages(populated, fields="summary", **filters)
+    count_before = AuditService.count_audit_trail(populated, **filters)
+
+    _rollover(populated)
+
+    assert _pages(populated, **filters) == before
+    assert _pages(populated, fields="summary", **filters) == summary_before
+    assert AuditService.count_audit_trail(populated, **filters) == count_before
+
+
+def test_recent_pages_do_not_touch_the_archive(populated, file_reads):
+    _rollover(populated)
+    entries = AuditService.get_audit_trail(populated, limit=50)
+    assert len(entries) == 50 and not file_reads
+    assert all(entry in populated for entry in entries)
+
+
+def test_entity_lookup_reads_only_its_partitions(populated, file_reads):
+    _rollover(populated)
+    entity_partitions = {
+        p.path for p in populated.query(ArchivePartition).join(
+            ArchiveIndex, ArchiveIndex.partition_id == ArchivePartition.id
+        ).filter(ArchiveIndex.entity_name == "Entity 7", ArchiveIndex.table_name == "audit_trail")
+    }
+    all_partitions = populated.query(ArchivePartition).filter(ArchivePartition.table_name == "audit_trail").count()
+
+    entries = AuditService.get_audit_trail(populated, entity_name="Entity 7", limit=1000)
+    assert len(entries) == AUDIT_ROWS // 30
+    assert {path.split("archive/", 1)[1] for path in file_reads} <= entity_partitions
+    assert len(entity_partitions) < all_partitions
+
+
+def test_archived_entry_by_id(populated, file_reads):
+    expected = populated.get(AuditTrail, 5).to_dict()
+    populated.expunge_all()
+    _rollover(populated)
+
+    entry = AuditService.get_audit_entry(populated, 5)
+    assert entry not in populated
+    assert entry.to_dict() == expected
+    assert entry.task_id == "TASK-0004-001"
+    assert len(file_reads) == 1
+    assert AuditService.get_audit_entry(populated, AUDIT_ROWS + 1) is None
+
+
+def test_rows_by_id_read_only_their_partitions(populated, file_reads):
+    _rollover(populated)
+    rows = get_archive().read_ids(populated, "audit_trail", [5, 6, 400, AUDIT_ROWS], columns=["task_category"])
+    assert sorted(rows["id"].to_pylist()) == [5, 6, 400]  # The last row is still hot
+    assert rows.column_names == ["id", "timestamp", "task_category"]
+    assert len(file_reads) == 2
+
+
+@pytest.mark.parametrize("window", [{}, {"start_date": datetime(2024, 3, 1), "end_date": datetime(2025, 12, 1)}])
+def test_statistics_and_export_span_both_tiers(populated, window):
+    stats_before = AuditService.get_audit_statistics(populated, **window)
+    export_before = AuditService.export_audit_trail_json(populated, limit=2000, **window)
+    _rollover(populated)
+    stats_after = AuditService.get_audit_statistics(populated, **window)
+
+    for stats in (stats_before, stats_after):
+        stats.pop("last_updated")
+    assert stats_after.pop("average_confidence") == pytest.approx(stats_before.pop("average_confidence"))
+    assert stats_after.pop("average_risk_score") == pytest.approx(stats_before.pop("average_risk_score"))
+    assert stats_after == stats_before
+    assert AuditService.export_audit_trail_json(populated, limit=2000, **window) == export_before
+
+
+def test_routes_read_through_archive(populated, client):
+    feedback_before = client.get("/api/v1/feedback?limit=40&skip=250").json()
+    entity_feedback_before = client.get("/api/v1/feedback?entity_name=Entity 3&limit=100").json()
+    _rollover(populated)
+
+    entries = client.get("/api/v1/audit/entries?limit=10&offset=1195").json()
+    assert entries["total_count"] == AUDIT_ROWS and entries["total_returned"] == 5
+    assert client.get("/api/v1/audit/statistics").json()["total_decisions"] == AUDIT_ROWS
+    assert client.get("/api/v1/audit/entries/3").json()["audit_id"] == 3
+
+    assert client.get("/api/v1/feedback?limit=40&skip=250").json() == feedback_before
+    assert client.get("/api/v1/feedback?entity_name=Entity 3&limit=100").json() == entity_feedback_before
+    assert client.get("/api/v1/feedback/2").json()["task_description"] == "Feedback on decision 1"
+    assert client.get(f"/api/v1/feedback/{FEEDBACK_ROWS + 1}").status_code == 404
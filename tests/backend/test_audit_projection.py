@@ -0,0 +1,77 @@
+"""Tests for the fields=summary projection of audit list queries"""
+
+import pytest
+from sqlalchemy import event
+
+from backend.agent.audit_service import AuditService
+from backend.utils.audit_converter import (
+    convert_audit_trail_to_audit_entry,
+    convert_audit_trail_to_audit_summary,
+)
+from backend.utils.serializers import audit_trail_summary_row
+
+JSON_COLUMNS = ("reasoning_chain", "risk_factors", "recommendations", "entity_context", "task_context", "meta_data")
+
+
+@pytest.fixture
+def populated(db_session, synthetic_audit_rows):
+    db_session.add_all(synthetic_audit_rows(25))
+    db_session.commit()
+    db_session.expunge_all()
+    return db_session
+
+
+def _capture_statements(session):
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_summary_selects_scalar_columns_only(populated):
+    statements = _capture_statements(populated)
+    rows = AuditService.get_audit_trail(populated, limit=25, fields="summary")
+    summaries = [convert_audit_trail_to_audit_summary(row) for row in rows]
+    serialized = [audit_trail_summary_row(row) for row in rows]
+
+    assert len(statements) == 1
+    select_list = statements[0].split("FROM")[0]
+    for column in JSON_COLUMNS:
+        assert column not in select_list
+    assert len(summaries) == len(serialized) == 25
+
+
+def test_summary_matches_full_entry_and_loads_detail_lazily(populated):
+    summary_rows = AuditService.get_audit_trail(populated, limit=25, fields="summary")
+    summaries = [convert_audit_trail_to_audit_summary(row) for row in summary_rows]
+    populated.expunge_all()
+    full = [convert_audit_trail_to_audit_entry(row) for row in AuditService.get_audit_trail(populated, limit=25)]
+
+    for summary, entry in zip(summaries, full):
+        assert summary == {key: value for key, value in entry.items() if key in summary}
+        assert not set(summary) & set(JSON_COLUMNS)
+
+    populated.expunge_all()
+    lazy = AuditService.get_audit_trail(populated, limit=1, fields="summary")[0]
+    assert lazy.reasoning_chain == full[0]["reasoning_chain"]
+
+
+def test_invalid_projection_rejected(populated, client):
+    with pytest.raises(ValueError):
+        AuditService.get_audit_trail(populated, fields="everything")
+    assert client.get("/api/v1/audit/entries?fields=everything").status_code == 422
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/audit/entries?limit=25",
+    "/api/v1/audit/recent?limit=25",
+    "/api/v1/audit/entity/Entity 3",
+])
+def test_routes_support_summary_projection(populated, client, path):
+    full = client.get(path).json()["entries"]
+    summary = client.get(f"{path}{'&' if '?' in path else '?'}fields=summary").json()["entries"]
+    assert len(summary) == len(full) > 0
+    for short, long in zip(summary, full):
+        assert not set(short) & set(JSON_COLUMNS)
+        assert {key: long[key] for key in short} == short
+    assert len(str(summary)) < len(str(full)) / 2
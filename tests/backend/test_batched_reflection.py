@@ -0,0 +1,122 @@
+"""Tests for batched and speculative step reflection"""
+
+import json
+
+import pytest
+
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.reasoning import ReasoningEngine
+from backend.utils.llm_client import LLMClient, LLMResponse
+from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider, set_mock_provider
+
+
+class _ScriptedClient:
+    """LLM client stub returning one fixed response and recording prompts"""
+
+    available = True
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def run_compliance_analysis(self, prompt, use_json_schema=False, timeout=None):
+        self.prompts.append(prompt)
+        return LLMResponse(raw_text=json.dumps(self.response), status="completed")
+
+
+@pytest.fixture
+def mock_engine():
+    set_mock_provider(MockLLMProvider(MockLLMConfig(latency_ms=2, latency_distribution="fixed", tokens_per_second=0)))
+    engine = ReasoningEngine()
+    engine.llm_client = LLMClient(provider="mock")
+    engine.mock_mode = False
+    yield engine
+    set_mock_provider(None)
+
+
+def _loop(engine, **kwargs):
+    return AgentLoop(max_steps=5, enable_reflection=True, enable_memory=False, reasoning_engine=engine, **kwargs)
+
+
+def _pairs(count):
+    return [
+        ({"step_id": f"step_{n}", "description": f"Step {n}"}, {"step_id": f"step_{n}", "output": f"Done {n}"})
+        for n in range(1, count + 1)
+    ]
+
+
+def test_reflect_batch_maps_scores_back_by_step_id():
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.mock_mode = False
+    engine.llm_client = _ScriptedClient({"reflections": [
+        {"step_id": "step_3", "overall_quality": 0.4, "issues": "Unsupported claim"},
+        {"step_id": "step_1", "overall_quality": 1.5},
+    ]})
+
+    reflections = engine.reflect_batch(_pairs(3))
+
+    assert len(engine.llm_client.prompts) == 1
+    assert [r["overall_quality"] for r in reflections] == [1.0, 0.7, 0.4]
+    assert reflections[2]["issues"] == ["Unsupported claim"]
+    assert engine.prompt_builder.get_metrics()["reflect_batch"]["calls"] == 1
+
+
+def test_reflect_batch_falls_back_to_position_without_ids():
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.mock_mode = False
+    engine.llm_client = _ScriptedClient([{"overall_quality": 0.9}, {"overall_quality": 0.6}])
+    assert [r["overall_quality"] for r in engine.reflect_batch(_pairs(2))] == [0.9, 0.6]
+
+
+@pytest.mark.parametrize("window, speculative", [(2, False), (0, False), (2, True)])
+def test_batched_loop_reflects_every_step_with_fewer_calls(mock_engine, window, speculative):
+    loop = _loop(mock_engine, reflection_mode="batched", reflection_window=window, speculative_reflection=speculative)
+    events = []
+    result = loop.execute("Acme", "Review policy", on_event=lambda event, payload: events.append((event, payload)))
+
+    steps = result["step_outputs"]
+    assert len(result["reflections"]) == len(steps) >= 3
+    reflected_ids = [payload["step_id"] for event, payload in events if event == "reflection"]
+    assert reflected_ids == [step["step_id"] for step in steps]
+    prompts = result["metrics"]["prompt_tokens"]
+    batches = len(steps) // 2 if window else 1
+    assert prompts["reflect_batch"]["calls"] == batches
+    assert prompts["reflect"]["calls"] == (len(steps) % 2 if window else 0)
+
+
+def test_speculative_reflection_overlaps_next_step(mock_engine):
+    loop = _loop(mock_engine, speculative_reflection=True)
+    events = []
+    result = loop.execute("Acme", "Review policy", on_event=lambda event, payload: events.append(event))
+
+    order = [event for event in events if event in ("step", "reflection")]
+    # Each reflection is collected only after the following step has run
+    assert order[:3] == ["step", "step", "reflection"]
+    assert order.count("reflection") == len(result["step_outputs"])
+    assert result["metrics"]["prompt_tokens"]["reflect"]["calls"] == len(result["step_outputs"])
+
+
+def test_low_batch_score_replans_and_discards_pending(mock_engine):
+    loop = _loop(mock_engine, reflection_mode="batched", reflection_window=2)
+    batch_reflect = loop.reflect_on_steps
+    calls = []
+
+    def _first_batch_poor(items):
+        calls.append(len(items))
+        reflections = batch_reflect(items)
+        if len(calls) == 1:
+            reflections[-1]["overall_quality"] = 0.2
+        return reflections
+
+    loop.reflect_on_steps = _first_batch_poor
+    result = loop.execute("Acme", "Review policy")
+
+    assert result["metrics"]["replan_count"] == 1
+    assert result["revised_plan"]
+    assert len(result["reflections"]) == len(result["step_outputs"])
+    assert all(r["overall_quality"] >= 0.75 for r in result["reflections"])
+
+
+def test_unknown_reflection_mode_is_rejected(mock_engine):
+    with pytest.raises(ValueError):
+        _loop(mock_engine, reflection_mode="sometimes")
@@ -0,0 +1,75 @@
+"""Tests for the concurrent benchmark harness"""
+
+import copy
+import json
+
+import pyarrow.parquet as pq
+import pytest
+
+from backend.agentic_engine.testing import (
+    BenchmarkHarness,
+    HarnessConfig,
+    compare_to_baseline,
+    save_report,
+    summarize_latencies,
+)
+from backend.agentic_engine.testing.benchmark_harness import PHASES
+
+
+def _config(**overrides):
+    values = {
+        "concurrency": 2,
+        "mode": "async",
+        "levels": ["light"],
+        "max_cases_per_level": 2,
+        "max_steps": 3,
+        "mock_llm": {"latency_ms": 0.0, "tokens_per_second": 0.0},
+    }
+    values.update(overrides)
+    return HarnessConfig(**values)
+
+
+def test_summarize_latencies_percentiles_and_histogram():
+    summary = summarize_latencies([i / 1000 for i in range(1, 101)])  # 1..100 ms
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == pytest.approx(50.5)
+    assert summary["p99_ms"] == pytest.approx(99.01)
+    assert sum(summary["histogram"]["counts"]) == 100
+    assert summarize_latencies([])["count"] == 0
+
+
+def test_async_run_reports_all_phases(tmp_path):
+    report = BenchmarkHarness(_config(repeat=2)).run()
+    summary = report["summary"]
+
+    assert summary["cases"] == 4
+    assert summary["failed"] == 0
+    assert summary["throughput_cases_per_s"] > 0
+    assert summary["peak_rss_bytes"] > 0
+    for phase in ("plan", "tools", "reflect", "db", "llm_wait"):
+        assert summary["phases"][phase]["count"] > 0, phase
+    assert report["meta"]["git_revision"]
+
+    save_report(report, json_path=tmp_path / "bench.json", parquet_path=tmp_path / "bench.parquet")
+    assert json.loads((tmp_path / "bench.json").read_text())["summary"]["cases"] == 4
+    table = pq.read_table(tmp_path / "bench.parquet")
+    assert table.num_rows == 4
+    assert {f"{phase}_s" for phase in PHASES} <= set(table.column_names)
+
+
+def test_process_pool_run():
+    report = BenchmarkHarness(_config(mode="process", max_cases_per_level=1, with_db=False)).run()
+    assert report["summary"]["succeeded"] == 1
+    assert report["summary"]["phases"]["db"]["count"] == 0
+
+
+def test_compare_to_baseline_flags_regressions():
+    report = BenchmarkHarness(_config(max_cases_per_level=1, enable_reflection=False)).run()
+    assert compare_to_baseline(report, report)["passed"]
+
+    slower = copy.deepcopy(report)
+    slower["summary"]["latency"]["p95_ms"] = report["summary"]["latency"]["p95_ms"] * 2 + 10
+    slower["summary"]["throughput_cases_per_s"] = report["summary"]["throughput_cases_per_s"] / 2
+    comparison = compare_to_baseline(slower, report)
+    assert not comparison["passed"]
+    assert {r["metric"] for r in comparison["regressions"]} >= {"latency.p95_ms", "throughput_cases_per_s"}
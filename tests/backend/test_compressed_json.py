@@ -0,0 +1,219 @@
+"""Tests for the compressed audit JSON columns and their migration"""
+
+import json
+
+import pytest
+import zstandard
+from sqlalchemy import JSON, Column, DateTime, Float, Integer, MetaData, String, Table, Text, create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.db.base import Base
+from backend.db.compressed_json import (
+    ZSTD_MAGIC,
+    JSONCodec,
+    benchmark,
+    get_codec,
+    train_dictionary,
+)
+from backend.db.migrate_compressed_json import migrate
+from backend.db.models import AuditTrail
+
+AGENTIC_META = {
+    "agent_type": "agentic_engine",
+    "plan_steps": 3,
+    "audit_log": {
+        "plan": {"original": [{"step_id": f"step_{n}", "description": "Assess data sensitivity"} for n in range(3)]},
+        "execution": {"steps": [{"step_id": "step_1", "status": "success", "confidence": 0.7999999999999999}]},
+        "reflections": [{"overall_quality": 0.86, "issues": []}],
+    },
+}
+
+VALUES = [
+    ["Step 1: jurisdiction risk", "Step 2: ünïcode ✓"],
+    {"name": "Acme", "jurisdictions": ["EU", "US_FEDERAL"], "employee_count": 420, "nested": {"1": None}},
+    AGENTIC_META,
+    [],
+    {},
+    "plain string",
+    12.5,
+]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+def _legacy_table(metadata):
+    """audit_trail as it was created before the columns were compressed"""
+    return Table(
+        "audit_trail", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("timestamp", DateTime(timezone=True)),
+        Column("agent_type", String(100), nullable=False),
+        Column("task_description", Text, nullable=False),
+        Column("task_category", String(100)),
+        Column("entity_name", String(255)),
+        Column("entity_type", String(100)),
+        Column("decision_outcome", String(50), nullable=False),
+        Column("confidence_score", Float, nullable=False),
+        Column("risk_level", String(50)),
+        Column("risk_score", Float),
+        Column("reasoning_chain", JSON, nullable=False),
+        Column("risk_factors", JSON),
+        Column("recommendations", JSON),
+        Column("escalation_reason", Text),
+        Column("entity_context", JSON),
+        Column("task_context", JSON),
+        Column("meta_data", JSON),
+    )
+
+
+def _with_first_meta(rows):
+    rows[0].meta_data = {**AGENTIC_META, "task_id": "TASK-0001-001"}
+    rows[1].entity_context = None
+    return rows
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_codec_round_trip(value):
+    codec = get_codec()
+    encoded = codec.encode(value)
+    assert encoded[:4] == ZSTD_MAGIC
+    assert zstandard.get_frame_parameters(encoded).dict_id == codec.dict_id != 0
+    assert codec.decode(encoded) == value
+    assert codec.decode(memoryview(encoded)) == value
+    # Legacy rows: JSON text as str or bytes
+    assert codec.decode(json.dumps(value)) == value
+    assert codec.decode(json.dumps(value).encode("utf-8")) == value
+
+
+def test_codec_reads_frames_from_other_dictionaries():
+    samples = [{"k": f"value {n}", "n": n, "tags": ["a", "b"]} for n in range(500)]
+    old = JSONCodec(train_dictionary(samples, dict_size=2048))
+    frame = old.encode({"k": "value 3"})
+
+    assert JSONCodec(read_dictionaries=[old.dictionary]).decode(frame) == {"k": "value 3"}
+    with pytest.raises(ValueError):
+        JSONCodec().decode(frame)
+
+
+def test_codec_handles_stdlib_only_values():
+    codec = get_codec()
+    assert codec.decode(codec.encode({"big": 2 ** 70})) == {"big": 2 ** 70}
+    assert codec.decode(codec.encode({1: "int key"})) == {"1": "int key"}
+    assert codec.decode('{"x": NaN}')["x"] != 0
+
+
+def test_model_stores_compressed_blobs(engine, synthetic_audit_rows):
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(_with_first_meta(synthetic_audit_rows(10)))
+    session.commit()
+    session.expunge_all()
+
+    stored = session.execute(text("SELECT reasoning_chain, entity_context, meta_data, task_id FROM audit_trail ORDER BY id")).all()
+    assert all(bytes(row.reasoning_chain[:4]) == ZSTD_MAGIC for row in stored)
+    assert stored[1].entity_context is None
+    assert stored[0].task_id == "TASK-0001-001" and stored[1].task_id is None
+
+    loaded = session.query(AuditTrail).order_by(AuditTrail.id).all()
+    assert [row.to_dict() for row in loaded] == [row.to_dict() for row in _with_first_meta(synthetic_audit_rows(10))]
+    session.close()
+
+
+def test_migration_compresses_legacy_rows(engine, synthetic_audit_rows):
+    legacy = _legacy_table(MetaData())
+    legacy.metadata.create_all(engine)
+    originals = [row.to_dict() for row in _with_first_meta(synthetic_audit_rows(25))]
+    with engine.begin() as conn:
+        conn.execute(legacy.insert(), [
+            {column.name: getattr(row, column.name) for column in legacy.columns}
+            for row in _with_first_meta(synthetic_audit_rows(25))
+        ])
+    legacy_bytes = engine.connect().execute(text("SELECT sum(length(meta_data)) FROM audit_trail")).scalar()
+
+    dry = migrate(engine, dry_run=True)
+    assert dry["statements"][0].endswith("ADD COLUMN task_id VARCHAR(100)")
+
+    result = migrate(engine, batch_size=7)
+    assert result["rows"] == result["rows_updated"] == 25
+    # The legacy JSON type stored None as the text 'null', which is compressed too
+    assert result["values_compressed"] == 25 * 4
+    assert result["bytes_after"] < result["bytes_before"] / 2
+
+    session = sessionmaker(bind=engine)()
+    migrated = session.query(AuditTrail).order_by(AuditTrail.id).all()
+    assert [row.to_dict() for row in migrated] == originals
+    assert session.query(AuditTrail).filter(AuditTrail.task_id == "TASK-0001-001").one().id == 1
+    compressed_bytes = session.execute(text("SELECT sum(length(meta_data)) FROM audit_trail")).scalar()
+    assert compressed_bytes < legacy_bytes
+    session.close()
+
+    again = migrate(engine)
+    assert again["statements"] == [] and again["rows_updated"] == 0
+
+
+def test_model_reads_legacy_text_rows(engine, synthetic_audit_rows):
+    legacy = _legacy_table(MetaData())
+    legacy.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(legacy.insert(), [
+            {column.name: getattr(row, column.name) for column in legacy.columns}
+            for row in synthetic_audit_rows(4)
+        ])
+        conn.execute(text("ALTER TABLE audit_trail ADD COLUMN task_id VARCHAR(100)"))
+
+    session = sessionmaker(bind=engine)()
+    before = [row.to_dict() for row in session.query(AuditTrail).order_by(AuditTrail.id)]
+    assert before == [row.to_dict() for row in synthetic_audit_rows(4)]
+    session.close()
+
+
+def test_audit_log_lookup_uses_task_id(db_session, client, synthetic_audit_rows):
+    rows = synthetic_audit_rows(3)
+    for n, row in enumerate(rows):
+        row.meta_data = {"api_endpoint": "/entity/analyze", "task_id": f"TASK-0042-00{n}"}
+    db_session.add_all(rows)
+    db_session.commit()
+
+    response = client.get("/api/v1/audit_log/TASK-0042-002")
+    assert response.status_code == 200
+    assert response.json()["audit_id"] == 3
+    assert client.get("/api/v1/audit_log/TASK-9999-000").status_code == 404
+
+
+def test_storage_benchmark_small():
+    results = benchmark(rows=40, agentic_share=0.25, repeats=1)
+    assert results["rows"] == 40
+    assert results["zstd+dict"]["bytes"] < results["zstd"]["bytes"] < results["json"]["bytes"]
+    assert results["agentic_engine_bytes_per_row"]["zstd+dict"] < results["agentic_engine_bytes_per_row"]["json"]
+
+
+def test_startup_upgrades_legacy_schema(engine, monkeypatch, synthetic_audit_rows):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import inspect
+
+    import backend.main
+
+    legacy = _legacy_table(MetaData())
+    legacy.metadata.create_all(engine)
+    rows = _with_first_meta(synthetic_audit_rows(2))
+    with engine.begin() as conn:
+        conn.execute(legacy.insert(), [{column.name: getattr(row, column.name) for column in legacy.columns} for row in rows])
+
+    monkeypatch.setattr(backend.main, "engine", engine)
+    with TestClient(backend.main.app):
+        pass
+
+    inspector = inspect(engine)
+    assert "task_id" in {column["name"] for column in inspector.get_columns("audit_trail")}
+    assert "ix_audit_trail_task_id" in {index["name"] for index in inspector.get_indexes("audit_trail")}
+    session = sessionmaker(bind=engine)()
+    assert [row.id for row in session.query(AuditTrail).order_by(AuditTrail.id)] == [1, 2]
+    # Existing rows are found by task id without running the row migration
+    assert [row.id for row in session.query(AuditTrail).filter(AuditTrail.task_id == "TASK-0001-001")] == [1]
+    session.close()
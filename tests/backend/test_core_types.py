@@ -0,0 +1,134 @@
+"""Tests for the slotted engine types and the edge conversions"""
+
+import itertools
+
+import pytest
+
+from backend.agent.core_types import DecisionCore, FactorScores
+from backend.agent.decision_engine import DecisionEngine
+from backend.agent.risk_models import (
+    DecisionAnalysis,
+    EntityContext,
+    EntityType,
+    IndustryCategory,
+    Jurisdiction,
+    RiskFactors,
+    TaskCategory,
+    TaskContext,
+)
+from backend.utils.schema_converter import convert_decision_analysis_to_analysis_result
+from shared.schemas.analysis_result import (
+    AnalysisResult,
+    DecisionOutcome,
+    RiskAnalysisItem,
+    RiskLevel,
+    WhyReasoning,
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return DecisionEngine()
+
+
+def _cases():
+    entities = [
+        EntityContext(
+            name="Core Co",
+            entity_type=entity_type,
+            industry=IndustryCategory.FINANCIAL_SERVICES,
+            jurisdictions=jurisdictions,
+            employee_count=300,
+            previous_violations=violations,
+        )
+        for entity_type, jurisdictions, violations in itertools.product(
+            (EntityType.STARTUP, EntityType.PUBLIC_COMPANY, EntityType.HEALTHCARE),
+            ([Jurisdiction.US_FEDERAL], [Jurisdiction.EU, Jurisdiction.UK]),
+            (0, 2),
+        )
+    ]
+    tasks = [
+        TaskContext(
+            description="Core task",
+            category=category,
+            affects_personal_data=personal,
+            potential_impact=impact,
+        )
+        for category, personal, impact in itertools.product(
+            TaskCategory, (False, True), (None, "Severe penalties")
+        )
+    ]
+    return list(itertools.product(entities, tasks))
+
+
+def _reference_result(analysis: DecisionAnalysis, detailed: bool) -> dict:
+    """The converter's previous output, built through the AnalysisResult models"""
+    rf = analysis.risk_factors
+    labels = (
+        ("jurisdiction_risk", 0.15, "Jurisdiction complexity risk"),
+        ("entity_risk", 0.15, "Entity risk profile"),
+        ("task_risk", 0.20, "Task complexity risk"),
+        ("data_sensitivity_risk", 0.20, "Data sensitivity risk"),
+        ("regulatory_risk", 0.20, "Regulatory oversight risk"),
+        ("impact_risk", 0.10, "Impact severity risk"),
+    )
+    result = AnalysisResult(
+        decision=DecisionOutcome(analysis.decision.value),
+        confidence=analysis.confidence,
+        risk_level=RiskLevel(analysis.risk_level.value),
+        risk_score=rf.overall_score,
+        risk_analysis=[
+            RiskAnalysisItem(factor=name, score=getattr(rf, name), weight=weight,
+                             explanation=f"{label}: {getattr(rf, name):.2f}")
+            for name, weight, label in labels
+        ],
+        why=WhyReasoning(reasoning_steps=analysis.reasoning),
+        recommendations=analysis.recommendations,
+        escalation_reason=analysis.escalation_reason,
+        similar_cases=analysis.similar_cases,
+        pattern_analysis=analysis.pattern_analysis,
+        proactive_suggestions=analysis.proactive_suggestions,
+        timestamp=analysis.timestamp,
+    )
+    return result.to_detailed_dict() if detailed else result.to_simple_dict()
+
+
+def test_factor_scores_match_risk_factors_bit_for_bit():
+    for values in itertools.product((0.0, 0.1, 0.35, 0.7, 0.95, 1.0), repeat=3):
+        args = values + values[::-1]
+        scores = FactorScores(*args)
+        model = scores.to_model()
+        assert isinstance(model, RiskFactors)
+        assert scores.overall_score == model.overall_score
+        assert FactorScores.from_model(model) == scores
+
+
+def test_assess_matches_validated_analysis(engine):
+    for entity, task in _cases():
+        core = engine.assess(entity, task)
+        assert isinstance(core, DecisionCore)
+        analysis = engine.analyze_and_decide(entity, task, explain="summary")
+        assert core.overall_score == analysis.risk_factors.overall_score
+        assert (core.risk_level, core.decision, core.confidence) == (
+            analysis.risk_level, analysis.decision, analysis.confidence
+        )
+        assert core.factors.to_model() == analysis.risk_factors
+
+
+def test_to_analysis_equals_full_validation(engine):
+    for entity, task in _cases()[::9]:
+        analysis = engine.analyze_and_decide(entity, task)
+        validated = DecisionAnalysis.model_validate(analysis.model_dump())
+        assert validated.model_dump(exclude={"timestamp"}) == analysis.model_dump(exclude={"timestamp"})
+
+
+@pytest.mark.parametrize("explain", DecisionEngine.EXPLAIN_LEVELS)
+@pytest.mark.parametrize("detailed", [True, False])
+def test_converter_output_unchanged(engine, explain, detailed):
+    for entity, task in _cases()[::5]:
+        analysis = engine.analyze_and_decide(entity, task, explain=explain)
+        analysis.similar_cases = [{"decision": "AUTONOMOUS", "similarity": 0.9}]
+        analysis.pattern_analysis = "Consistent history"
+        result = convert_decision_analysis_to_analysis_result(analysis, detailed=detailed)
+        assert result == _reference_result(analysis, detailed)
+        assert list(result) == list(_reference_result(analysis, detailed))
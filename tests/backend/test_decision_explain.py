@@ -0,0 +1,140 @@
+"""Tests for the numeric decision core and the lazy explanation levels"""
+
+import itertools
+
+import pytest
+
+from backend.agent.decision_engine import DecisionEngine
+from backend.api import decision_routes
+from backend.agent.risk_models import (
+    EntityContext,
+    EntityType,
+    IndustryCategory,
+    Jurisdiction,
+    TaskCategory,
+    TaskContext,
+)
+from backend.db.models import AuditTrail
+
+NUMERIC_FIELDS = ("risk_factors", "risk_level", "decision", "confidence")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return DecisionEngine()
+
+
+def _cases():
+    entities = [
+        EntityContext(
+            name="Explain Co",
+            entity_type=entity_type,
+            industry=industry,
+            jurisdictions=jurisdictions,
+            employee_count=employees,
+            annual_revenue=revenue,
+            is_regulated=regulated,
+            previous_violations=violations,
+        )
+        for entity_type, industry, jurisdictions, employees, revenue, regulated, violations in itertools.product(
+            (EntityType.STARTUP, EntityType.FINANCIAL_INSTITUTION, EntityType.HEALTHCARE),
+            (IndustryCategory.FINANCIAL_SERVICES, IndustryCategory.HEALTHCARE, IndustryCategory.RETAIL),
+            ([], [Jurisdiction.EU], [Jurisdiction.US_FEDERAL, Jurisdiction.UK, Jurisdiction.CANADA]),
+            (None, 20, 900, 9000),
+            (None, 5e7, 5e9),
+            (False, True),
+            (0, 3),
+        )
+    ][::13]
+    tasks = [
+        TaskContext(
+            description="Explain task",
+            category=category,
+            affects_personal_data=personal,
+            affects_financial_data=financial,
+            involves_cross_border=cross_border,
+            potential_impact=impact,
+            stakeholder_count=stakeholders,
+        )
+        for category, personal, financial, cross_border, impact, stakeholders in itertools.product(
+            TaskCategory, (False, True), (False, True), (False, True),
+            (None, "moderate", "severe fines"), (None, 5000),
+        )
+    ][::7]
+    return list(itertools.product(entities, tasks))
+
+
+def test_numeric_core_matches_full_analysis(engine):
+    for entity, task in _cases():
+        full = engine.analyze_and_decide(entity, task)
+        assert engine.score_risk_factors(entity, task) == full.risk_factors
+        for level in ("none", "summary"):
+            light = engine.analyze_and_decide(entity, task, explain=level)
+            assert {f: getattr(light, f) for f in NUMERIC_FIELDS} == {f: getattr(full, f) for f in NUMERIC_FIELDS}
+
+
+def test_explain_levels_control_rendered_text(engine):
+    entity, task = _cases()[5]
+    full = engine.analyze_and_decide(entity, task, explain="full")
+    none = engine.analyze_and_decide(entity, task, explain="none")
+    summary = engine.analyze_and_decide(entity, task, explain="summary")
+
+    assert none.reasoning == [] and none.recommendations == [] and none.escalation_reason is None
+    assert len(summary.reasoning) == 3
+    assert summary.reasoning[2].startswith(f"Decision: {full.decision.value}")
+    assert summary.recommendations == full.recommendations
+    assert summary.escalation_reason == full.escalation_reason
+    assert len(full.reasoning) > 3
+
+
+def test_explain_renders_lazily_on_demand(engine):
+    for entity, task in _cases()[::25]:
+        none = engine.analyze_and_decide(entity, task, explain="none")
+        full = engine.analyze_and_decide(entity, task)
+        upgraded = engine.explain(none, "full")
+        assert upgraded.model_dump(exclude={"timestamp"}) == full.model_dump(exclude={"timestamp"})
+        assert none.reasoning == []  # Original left untouched
+        assert engine.explain(full, "none").reasoning == []
+
+
+def test_unknown_explain_level_is_rejected(engine):
+    entity, task = _cases()[0]
+    with pytest.raises(ValueError):
+        engine.analyze_and_decide(entity, task, explain="verbose")
+
+
+def test_audit_rows_keep_full_reasoning_at_any_explain_level(client, db_session, engine):
+    entity, task = _cases()[0]
+    body = {"entity": entity.model_dump(mode="json"), "task": task.model_dump(mode="json")}
+    full = engine.analyze_and_decide(entity, task).reasoning
+
+    quick = client.post("/api/v1/decision/quick-check", params={"explain": "none"}, json=body)
+    batch = client.post(
+        "/api/v1/decision/batch-analyze", params={"explain": "none"},
+        json={"entity": body["entity"], "tasks": [body["task"]]},
+    )
+    analyze = client.post("/api/v1/decision/analyze", params={"explain": "summary"}, json=body)
+    assert quick.status_code == batch.status_code == analyze.status_code == 200
+    assert len(analyze.json()["why"]["reasoning_steps"]) < len(full)
+
+    rows = db_session.query(AuditTrail).all()
+    assert len(rows) == 3
+    assert all(row.reasoning_chain == full for row in rows)
+
+
+def test_quick_check_defers_the_full_analysis(client, db_session, monkeypatch):
+    entity, task = _cases()[0]
+    body = {"entity": entity.model_dump(mode="json"), "task": task.model_dump(mode="json")}
+    deferred = []
+
+    def no_full_analysis(*args):
+        raise AssertionError("_analyze_full called on the quick-check path")
+
+    monkeypatch.setattr(decision_routes.decision_engine, "_analyze_full", no_full_analysis)
+    monkeypatch.setattr(decision_routes, "_complete_audit_reasoning", lambda bind, audited: deferred.extend(audited))
+    response = client.post("/api/v1/decision/quick-check", json=body)
+
+    assert response.status_code == 200
+    row = db_session.query(AuditTrail).one()
+    assert [audit_id for audit_id, _ in deferred] == [row.id]
+    assert row.recommendations and len(row.reasoning_chain) == 3
@@ -0,0 +1,121 @@
+"""Differential tests: compiled decision policy vs the reference conditional logic"""
+
+import itertools
+from datetime import datetime
+
+import pytest
+
+from backend.agent.decision_engine import DecisionEngine
+from backend.agent.decision_policy import benchmark, compile_policy
+from backend.agent.risk_models import (
+    ActionDecision,
+    EntityContext,
+    EntityType,
+    IndustryCategory,
+    Jurisdiction,
+    RiskFactors,
+    RiskLevel,
+    TaskCategory,
+    TaskContext,
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return DecisionEngine()
+
+
+def _entities(violation_counts=(0, 1, 3)):
+    return [
+        EntityContext(
+            name="Grid Co",
+            entity_type=entity_type,
+            industry=IndustryCategory.OTHER,
+            jurisdictions=[Jurisdiction.EU],
+            employee_count=employees,
+            previous_violations=violations,
+        )
+        for entity_type, employees, violations in itertools.product(
+            EntityType, (None, 10, 200, 900), violation_counts
+        )
+    ]
+
+
+def _tasks(impacts=(None, "minor", "Serious fines"), deadlines=(False, True)):
+    return [
+        TaskContext(
+            description="Grid task",
+            category=category,
+            affects_personal_data=personal,
+            affects_financial_data=financial,
+            involves_cross_border=cross_border,
+            potential_impact=impact,
+            regulatory_deadline=datetime(2030, 1, 1) if deadline else None,
+        )
+        for category, personal, financial, cross_border, impact, deadline in itertools.product(
+            TaskCategory, (False, True), (False, True), (False, True), impacts, deadlines
+        )
+    ]
+
+
+def _factors(data, regulatory, impact):
+    return RiskFactors(
+        jurisdiction_risk=0.5, entity_risk=0.5, task_risk=0.5,
+        data_sensitivity_risk=data, regulatory_risk=regulatory, impact_risk=impact,
+    )
+
+
+def test_decisions_identical_on_exhaustive_grid(engine):
+    policy = engine.policy
+    levels = [(RiskLevel.LOW, 0.1), (RiskLevel.LOW, 0.3499), (RiskLevel.MEDIUM, 0.35), (RiskLevel.MEDIUM, 0.5499),
+              (RiskLevel.MEDIUM, 0.55), (RiskLevel.MEDIUM, 0.6499), (RiskLevel.HIGH, 0.65), (RiskLevel.HIGH, 0.95)]
+    factors = _factors(0.5, 0.5, 0.5)
+    tasks = _tasks(deadlines=(False,))  # The decision matrix never reads the deadline
+    checked = 0
+    for entity in _entities():
+        for task in tasks:
+            for level, score in levels:
+                expected = engine._make_decision(level, score, entity, task, factors)
+                assert policy.decide(engine, level, score, entity, task) == expected, (entity, task, level, score)
+                checked += 1
+    assert checked > 100_000
+
+
+def test_recommendations_and_escalations_identical_on_exhaustive_grid(engine):
+    policy = engine.policy
+    # Values straddle the 0.7 / 0.8 cut-offs, including the boundaries themselves
+    profiles = [_factors(*values) for values in itertools.product((0.7, 0.75, 0.85), (0.8, 0.9), (0.8, 0.95))]
+    entities = _entities()[::5]
+    tasks = _tasks(impacts=(None,))
+    for entity, task, factors in itertools.product(entities, tasks, profiles):
+        for decision in ActionDecision:
+            assert policy.recommend(decision, entity, task, factors) == engine._generate_recommendations(
+                decision, RiskLevel.MEDIUM, entity, task, factors
+            )
+        for level in RiskLevel:
+            expected = engine._generate_escalation_reason(ActionDecision.ESCALATE, level, factors, entity, task)
+            assert policy.escalation_reason(level, factors, entity, task) == expected
+            assert policy.escalation_reason(level, factors, entity, task, factors.overall_score) == expected
+
+
+def test_analyze_and_decide_matches_reference_engine(engine):
+    reference = DecisionEngine()
+    reference.policy = None
+    for entity, task in itertools.product(_entities()[::7], _tasks()[::11]):
+        compiled = engine.analyze_and_decide(entity, task).model_dump(exclude={"timestamp"})
+        assert compiled == reference.analyze_and_decide(entity, task).model_dump(exclude={"timestamp"})
+
+
+def test_policy_is_compiled_once_per_engine_class(engine):
+    assert DecisionEngine().policy is engine.policy
+    sizes = compile_policy(engine).size
+    assert sizes == engine.policy.size
+    assert all(count > 0 for count in sizes.values())
+
+
+def test_benchmark_reports_per_call_latency(engine):
+    results = benchmark(iterations=500, engine=engine)
+    for path in ("reference", "compiled"):
+        assert results[path]["mean_us"] > 0
+        assert results[path]["p50_us"] <= results[path]["p99_us"]
+    assert results["speedup"]["mean"] > 0
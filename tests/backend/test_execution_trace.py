@@ -0,0 +1,134 @@
+"""Tests for execution trace recording and replay"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.reasoning import PlanLibrary, ReasoningEngine
+from backend.agentic_engine.run_context import RunContext
+from backend.agentic_engine.tracing import ExecutionTrace, ReplayEngine, TraceRecorder
+from backend.agentic_engine.tracing.recorder import install_db_hooks, prompt_hash
+from backend.utils.llm_client import LLMClient
+from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider, set_mock_provider
+
+CONTEXT = {
+    "entity": {"entity_name": "Acme", "entity_type": "private_company", "locations": ["EU"]},
+    "task": {"task_description": "Article 30 records", "task_category": "DATA_PROTECTION"},
+}
+
+
+class _Tool:
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, input):
+        self.calls += 1
+        return {"success": True, "risk_level": "MEDIUM", "calls": self.calls}
+
+
+@pytest.fixture
+def engine():
+    set_mock_provider(MockLLMProvider(MockLLMConfig(latency_ms=0, tokens_per_second=0)))
+    engine = ReasoningEngine()
+    engine.llm_client = LLMClient(provider="mock")
+    engine.mock_mode = False
+    yield engine
+    set_mock_provider(None)
+
+
+def _loop(engine, tmp_path, **kwargs):
+    options = dict(
+        max_steps=4, enable_reflection=True, enable_memory=False, reasoning_engine=engine,
+        tools={"task_tool": _Tool()}, enable_plan_cache=False, record_traces=True, trace_dir=str(tmp_path),
+    )
+    options.update(kwargs)
+    return AgentLoop(**options)
+
+
+def _run(loop):
+    return loop.execute("Acme", "Article 30 records", {"entity": dict(CONTEXT["entity"]), "task": dict(CONTEXT["task"])})
+
+
+def test_prompt_hash_ignores_timestamps_and_timings():
+    a = '{"timestamp":"2026-01-01T10:00:00.123+00:00","metrics":{"execution_time":0.012}}'
+    b = '{"timestamp":"2026-03-04T11:22:33.456+00:00","metrics":{"execution_time":0.5}}'
+    assert prompt_hash(a) == prompt_hash(b)
+    assert prompt_hash(a) != prompt_hash(a.replace("metrics", "other"))
+
+
+def test_trace_round_trip():
+    recorder = TraceRecorder(config={"max_steps": 3})
+    with RunContext(trace=recorder).activate():
+        with recorder.span("run", "execute"):
+            recorder.add_span("tool", "task_tool", 0.0, 0.0, {"cache_hit": True}, payload={"result": {"ok": 1}})
+    trace = recorder.finish({"success": True})
+
+    loaded = ExecutionTrace.from_bytes(trace.to_bytes())
+    assert loaded == trace
+    assert loaded.spans_of("tool")[0].parent_id == loaded.spans_of("run")[0].span_id
+    assert loaded.summary()["cache_hits"] == 1
+    with pytest.raises(ValueError):
+        ExecutionTrace.from_bytes(b"not a trace")
+
+
+def test_traced_run_records_spans_and_saves_trace(engine, tmp_path):
+    result = _run(_loop(engine, tmp_path))
+    trace = ExecutionTrace.load(result["metrics"]["trace_path"])
+
+    kinds = {span.kind for span in trace.spans}
+    assert {"run", "plan", "step", "tool", "llm", "reflection"} <= kinds
+    run_span = trace.spans_of("run")[0]
+    assert all(span.parent_id == run_span.span_id for span in trace.spans_of("step"))
+    llm = trace.spans_of("llm")
+    assert {span.name for span in llm} >= {"plan", "execute", "reflect"}
+    assert all(span.attrs["prompt_tokens"] > 0 and span.payload["raw_text"] for span in llm)
+    assert trace.spans_of("tool")[0].payload["result"]["success"] is True
+    assert trace.context["task"]["task_category"] == "DATA_PROTECTION"
+    assert trace.outcome["success"] == result["success"]
+
+
+def test_untraced_run_records_nothing(engine, tmp_path):
+    result = _run(_loop(engine, tmp_path, record_traces=False))
+    assert "trace_id" not in result["metrics"]
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("options", [
+    {"reflection_mode": "per_step"},
+    {"reflection_mode": "batched", "reflection_window": 2, "speculative_reflection": True},
+])
+def test_replay_reproduces_run_from_trace(engine, tmp_path, options):
+    loop = _loop(engine, tmp_path, **options)
+    trace = ExecutionTrace.load(_run(loop)["metrics"]["trace_path"])
+    tool_calls = loop.tools["task_tool"].calls
+
+    set_mock_provider(None)  # replay needs no provider
+    report = ReplayEngine(trace).run()
+    assert report["matches"]
+    assert report["llm_calls"] == {"served": len(trace.spans_of("llm")), "divergences": 0, "unused": 0}
+    assert report["tool_calls"]["divergences"] == 0
+    assert loop.tools["task_tool"].calls == tool_calls
+    assert len(report["replayed"].spans_of("llm")) == len(trace.spans_of("llm"))
+
+
+def test_replay_of_cached_plan(engine, tmp_path):
+    loop = _loop(engine, tmp_path, enable_plan_cache=True, plan_library=PlanLibrary(min_quality=0.0, reuse_quality=0.0))
+    _run(loop)
+    trace = ExecutionTrace.load(_run(loop)["metrics"]["trace_path"])
+    assert trace.spans_of("plan")[0].attrs == {"source": "cache", "cache_hit": True}
+
+    report = ReplayEngine(trace).run()
+    assert report["matches"]
+    assert report["result"]["metrics"]["plan_source"] == "cache"
+
+
+def test_db_queries_are_recorded_in_traced_runs():
+    install_db_hooks()
+    db = create_engine("sqlite://")
+    recorder = TraceRecorder()
+    with db.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with RunContext(trace=recorder).activate():
+            conn.execute(text("SELECT 2"))
+    spans = recorder.finish().spans_of("db")
+    assert [(span.name, span.attrs["statement"]) for span in spans] == [("SELECT", "SELECT 2")]
@@ -0,0 +1,108 @@
+"""Tests for orjson response rendering, row serializers and content encoding"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import zstandard
+from fastapi.encoders import jsonable_encoder
+
+from backend.agent.risk_models import RiskLevel
+from backend.db.models import AuditTrail, EntityHistory, FeedbackLog
+from backend.utils.serializers import (
+    benchmark,
+    dumps,
+    encode_body,
+    negotiate_encoding,
+)
+
+
+def _legacy(content):
+    return json.loads(json.dumps(jsonable_encoder(content)))
+
+
+def test_rows_serialize_like_to_dict(synthetic_audit_rows):
+    timestamp = datetime(2025, 3, 1, 12, 0, 0, 250000)
+    rows = synthetic_audit_rows(20)
+    feedback = FeedbackLog(feedback_id=1, timestamp=timestamp.replace(tzinfo=timezone.utc), task_description="t",
+                           ai_decision="AUTONOMOUS", human_decision="ESCALATE", is_agreement=0, meta_data={"a": 1})
+    history = EntityHistory(id=3, entity_name="Acme", task_category="DATA_PRIVACY", decision="AUTONOMOUS",
+                            timestamp=timestamp, jurisdictions=["EU"], meta_data={})
+    for row in rows + [feedback, history]:
+        assert json.loads(dumps(row)) == _legacy(row.to_dict())
+
+
+def test_dumps_handles_enums_models_and_datetimes():
+    content = {
+        "level": RiskLevel.HIGH,
+        "when": datetime(2025, 1, 2, 3, 4, 5),
+        "aware": datetime(2025, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+        "elapsed": timedelta(seconds=1.5),
+        "tags": {"b"},
+        "nested": [{1: "int key"}],
+    }
+    assert json.loads(dumps(content)) == _legacy(content)
+    with pytest.raises(TypeError):
+        dumps({"unknown": object()})
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, None),
+    ("", None),
+    ("gzip, deflate", "gzip"),
+    ("gzip, zstd", "zstd"),
+    ("zstd;q=0, gzip", "gzip"),
+    ("br", None),
+    ("*", "zstd"),
+    ("zstd;q=0, *", "gzip"),
+    ("gzip;q=1, zstd;q=0.5", "gzip"),
+    ("gzip;q=0.8, zstd;q=0.8", "zstd"),
+    ("*;q=0", None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_encode_body_compresses_only_large_bodies(synthetic_audit_rows):
+    small, encoding = encode_body({"a": 1}, "zstd", min_bytes=1024)
+    assert encoding is None and small == b'{"a":1}'
+
+    content = {"entries": synthetic_audit_rows(50)}
+    body, encoding = encode_body(content, "zstd", min_bytes=1024)
+    assert encoding == "zstd"
+    assert zstandard.ZstdDecompressor().decompress(body) == dumps(content)
+    assert encode_body(content, None, min_bytes=1024)[1] is None
+
+
+def test_audit_routes_render_and_compress(client, db_session, synthetic_audit_rows):
+    db_session.add_all(synthetic_audit_rows(30))
+    db_session.commit()
+
+    plain = client.get("/api/v1/audit/entity/Entity 1", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    expected = [_legacy(row.to_dict()) for row in db_session.query(AuditTrail).filter(
+        AuditTrail.entity_name == "Entity 1").order_by(AuditTrail.timestamp.desc())]
+    assert plain.json()["entries"] == expected
+
+    zstd = client.get("/api/v1/audit/entries?limit=30", headers={"Accept-Encoding": "zstd"})
+    assert zstd.headers["content-encoding"] == "zstd"
+    assert zstd.headers["vary"] == "Accept-Encoding"
+    entries = json.loads(zstandard.ZstdDecompressor().decompress(zstd.content, max_output_size=10**7))
+    assert entries["total_returned"] == 30
+
+    gzipped = client.get("/api/v1/audit/export/json", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.json()["total_entries"] == 30
+
+
+def test_default_response_class_is_orjson(client):
+    response = client.get("/")
+    assert response.json()["status"] == "running"
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_serialization_benchmark_small():
+    results = benchmark(rows=200, repeats=1)
+    assert results["orjson"]["bytes"] == results["jsonable_encoder_json"]["bytes"]
+    assert results["orjson+gzip"]["bytes"] < results["orjson"]["bytes"]
@@ -0,0 +1,178 @@
+"""Tests for the grouped feedback statistics"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, event, inspect, text
+from sqlalchemy.pool import StaticPool
+
+from backend.agent.feedback_processor import DECISIONS, FeedbackProcessor
+from backend.config import settings
+from backend.db.audit_archive import get_archive
+from backend.db.base import create_missing_indexes
+from backend.db.models import FeedbackLog
+
+NOW = datetime.utcnow().replace(microsecond=0)
+ROWS = 300
+CATEGORIES = ("DATA_PRIVACY", "SECURITY", None)
+
+
+def _feedback(n):
+    ai, human = DECISIONS[n % 3], DECISIONS[(n * 5 // 3) % 3]
+    return FeedbackLog(
+        feedback_id=n + 1,
+        timestamp=NOW - timedelta(hours=13 * (ROWS - n)),
+        entity_name=f"Entity {n % 7}",
+        task_description="Feedback " + "x" * (n % 150),
+        ai_decision=ai,
+        human_decision=human,
+        is_agreement=int(ai == human),
+        audit_trail_id=n + 1 if n % 10 else None,
+    )
+
+
+@pytest.fixture
+def populated(db_session, synthetic_audit_rows, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_DIR", str(tmp_path / "archive"))
+    audit = synthetic_audit_rows(ROWS)
+    for n, row in enumerate(audit):
+        row.timestamp = NOW - timedelta(hours=13 * (ROWS - n), minutes=5)
+        row.task_category = CATEGORIES[n % 3]
+    feedback = [_feedback(n) for n in range(ROWS)]
+    db_session.add_all(audit + feedback)
+    db_session.commit()
+    db_session.expunge_all()
+    return db_session
+
+
+def _expected(rows):
+    pairs = Counter((row.ai_decision, row.human_decision) for row in rows)
+    agreement = sum(row.is_agreement for row in rows)
+    overrides = Counter(row.ai_decision for row in rows if not row.is_agreement)
+    return {
+        "total_feedback_count": len(rows),
+        "agreement_count": agreement,
+        "override_count": len(rows) - agreement,
+        "accuracy_percent": round(agreement / len(rows) * 100, 2),
+        "most_overridden_decision": max(DECISIONS, key=overrides.__getitem__),
+        "override_breakdown": {decision: overrides[decision] for decision in DECISIONS},
+        "confusion_matrix": {
+            "labels": list(DECISIONS),
+            "matrix": [[pairs[(ai, human)] for human in DECISIONS] for ai in DECISIONS],
+        },
+        "override_types": dict(Counter(
+            FeedbackProcessor._classify_override_type(row) for row in rows if not row.is_agreement
+        )),
+    }
+
+
+def _statements(db):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    return statements, lambda: event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+
+def test_stats_use_one_grouped_query(populated, client):
+    statements, stop = _statements(populated)
+    try:
+        stats = client.get("/api/v1/feedback/stats").json()
+    finally:
+        stop()
+    feedback_queries = [s for s in statements if "FROM feedback_log" in s]
+    assert len(feedback_queries) == 1 and "GROUP BY" in feedback_queries[0]
+
+    expected = _expected([_feedback(n) for n in range(ROWS)])
+    assert stats == {field: expected[field] for field in stats}
+
+
+def test_stats_pick_up_new_feedback(populated, client):
+    before = client.get("/api/v1/feedback/stats").json()
+    populated.add(_feedback(ROWS))
+    populated.commit()
+    after = client.get("/api/v1/feedback/stats").json()
+    assert after["total_feedback_count"] == before["total_feedback_count"] + 1
+
+
+def test_statistics_per_entity_and_category(populated):
+    rows = [_feedback(n) for n in range(ROWS)]
+    processor = FeedbackProcessor(populated)
+
+    by_entity = processor.get_feedback_statistics(group_by="entity_name")
+    assert by_entity["overall"] == _expected(rows)
+    for group in by_entity["groups"]:
+        entity = group.pop("group")
+        assert group == _expected([row for row in rows if row.entity_name == entity])
+
+    start, end = NOW - timedelta(days=60), NOW - timedelta(days=20)
+    by_category = processor.get_feedback_statistics(start_date=start, end_date=end, group_by="task_category")
+    in_window = [row for row in rows if start <= row.timestamp <= end]
+    category = lambda row: CATEGORIES[(row.audit_trail_id - 1) % 3] if row.audit_trail_id else None  # noqa: E731
+    assert {group["group"]: group["total_feedback_count"] for group in by_category["groups"]} == Counter(
+        category(row) for row in in_window)
+    assert by_category["overall"]["total_feedback_count"] == len(in_window)
+
+    with pytest.raises(ValueError):
+        processor.decision_counts(group_by="notes")
+
+
+def test_statistics_include_archived_feedback(populated):
+    processor = FeedbackProcessor(populated)
+    before = processor.get_feedback_statistics(group_by="task_category")
+    overrides_before = processor.get_override_statistics(days=120)
+
+    archived = get_archive().rollover(populated, older_than=NOW - timedelta(days=60), batch_size=100)
+    assert archived["feedback_log"]["rows"] > 0 and archived["audit_trail"]["rows"] > 0
+    assert processor.get_feedback_statistics(group_by="task_category") == before
+    assert processor.get_override_statistics(days=120) == overrides_before
+
+
+def test_override_route(populated, client):
+    response = client.get("/api/v1/feedback/overrides?days=365")
+    assert response.status_code == 200
+    body = response.json()
+    overrides = [row for row in (_feedback(n) for n in range(ROWS)) if not row.is_agreement]
+    assert body["total_overrides"] == body["total_tracked"] == len(overrides)
+    assert body["override_breakdown"] == _expected(overrides)["override_types"]
+    assert len(body["override_details"]) == 50
+    assert body["override_details"][0]["feedback_id"] == overrides[-1].feedback_id
+
+    assert client.get("/api/v1/feedback/accuracy?group_by=entity_name&entity_name=Entity 2").json()["groups"][0]["group"] == "Entity 2"
+    assert client.get("/api/v1/feedback/accuracy?group_by=notes").status_code == 422
+    assert client.get("/api/v1/feedback/7").json()["feedback_id"] == 7
+
+
+def test_aggregate_uses_composite_index(populated):
+    plan = populated.execute(text(
+        "EXPLAIN QUERY PLAN SELECT ai_decision, human_decision, is_agreement, count(*) FROM feedback_log "
+        "WHERE is_agreement = 0 AND timestamp >= :cutoff GROUP BY ai_decision, human_decision, is_agreement"
+    ), {"cutoff": NOW - timedelta(days=30)}).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "COVERING INDEX ix_feedback_log_agreement_decision_time" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_missing_indexes_are_created_on_existing_tables():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    legacy = Table(
+        "feedback_log", MetaData(),
+        Column("feedback_id", Integer, primary_key=True),
+        Column("timestamp", DateTime(timezone=True)),
+        Column("entity_name", String(255)),
+        Column("task_description", Text),
+        Column("ai_decision", String(50)),
+        Column("human_decision", String(50)),
+        Column("notes", Text),
+        Column("is_agreement", Integer),
+        Column("audit_trail_id", Integer),
+        Column("meta_data", Text),
+    )
+    legacy.metadata.create_all(engine)
+
+    created = create_missing_indexes(engine)
+    assert "ix_feedback_log_agreement_decision_time" in created
+    names = {index["name"] for index in inspect(engine).get_indexes("feedback_log")}
+    assert "ix_feedback_log_agreement_decision_time" in names
+    assert create_missing_indexes(engine) == []
+    engine.dispose()
@@ -0,0 +1,191 @@
+"""Tests for incremental plan parsing and pipelined plan execution"""
+
+import json
+import time
+
+import pytest
+
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.reasoning import IncrementalJSONArrayParser, ReasoningEngine, iter_json_array
+from backend.utils.llm_client import LLMResponse
+
+
+PLAN = [
+    {"step_id": "step_1", "description": "Identify {GDPR} scope", "rationale": "Needs \"Art. 3\" review"},
+    {"step_id": "step_2", "description": "Map data flows [EU -> US]", "tools": ["jurisdiction_analyzer"]},
+    {"step_id": "step_3", "description": "Check notice text \\ wording", "rationale": "Escapes: \\\" }]"},
+]
+DOC = json.dumps(PLAN)
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 64, len(DOC)])
+def test_any_chunking_yields_same_elements(size):
+    assert list(iter_json_array(_chunks(DOC, size))) == PLAN
+
+
+def test_elements_emitted_as_soon_as_they_close():
+    parser = IncrementalJSONArrayParser()
+    first_end = DOC.index("},") + 1
+    assert parser.feed(DOC[:first_end - 1]) == []
+    assert parser.feed(DOC[first_end - 1:first_end]) == [PLAN[0]]
+    assert parser.feed(DOC[first_end:]) == PLAN[1:]
+    assert parser.complete
+
+
+def test_ignores_code_fences_and_trailing_prose():
+    text = "Here is the plan:\n```json\n" + DOC + "\n```\nLet me know [if] you need more."
+    assert list(iter_json_array(_chunks(text, 5))) == PLAN
+
+
+def test_malformed_element_is_skipped():
+    text = '[{"a": 1}, {"b": nope}, {"c": 3}]'
+    parser = IncrementalJSONArrayParser()
+    elements = parser.feed(text)
+    assert elements == [{"a": 1}, {"c": 3}]
+    assert len(parser.errors) == 1
+
+
+def test_scalars_and_nested_arrays():
+    text = '[1, "x]", true, null, [2, [3]], -4.5e1]'
+    assert list(iter_json_array(_chunks(text, 2))) == [1, "x]", True, None, [2, [3]], -45.0]
+
+
+@pytest.mark.parametrize("cut", range(len(DOC)))
+def test_truncated_stream_returns_completed_prefix(cut):
+    """A stream cut at any position yields only whole elements, never garbage"""
+    parser = IncrementalJSONArrayParser()
+    elements = parser.feed(DOC[:cut]) + parser.close()
+    assert elements == PLAN[:len(elements)]
+    assert parser.closed
+    assert parser.truncated
+
+
+def test_no_array_yields_nothing():
+    parser = IncrementalJSONArrayParser()
+    assert parser.feed("I cannot produce a plan for this request.") == []
+    assert parser.close() == []
+    assert not parser.complete
+
+
+class _SlowStreamingClient:
+    """Local stand-in for a streaming provider: one chunk every ``delay`` seconds"""
+
+    available = True
+
+    def __init__(self, text, chunk_size=8, delay=0.01):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.delay = delay
+
+    def stream_compliance_analysis(self, prompt, timeout=None):
+        for chunk in _chunks(self.text, self.chunk_size):
+            time.sleep(self.delay)
+            yield chunk
+
+
+def _streaming_engine(text, **kwargs):
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.mock_mode = False
+    engine.llm_client = _SlowStreamingClient(text, **kwargs)
+    return engine
+
+
+def test_stream_plan_falls_back_to_default_plan_on_garbage():
+    engine = _streaming_engine("no json here", delay=0)
+    steps = list(engine.stream_plan("Acme", "Review policy"))
+    assert steps == engine._create_default_plan("Acme", "Review policy")
+
+
+def test_pipelined_loop_starts_step_one_before_stream_ends():
+    """Step 1 runs while later steps are still streaming from the provider"""
+    plan = [{"step_id": f"step_{i}", "description": f"Step {i}"} for i in range(1, 6)]
+    engine = _streaming_engine(json.dumps(plan), chunk_size=8, delay=0.01)
+    loop = AgentLoop(enable_reflection=False, enable_memory=False, reasoning_engine=engine)
+
+    started = []
+    loop.execute_step = lambda step, context=None: (
+        started.append((step["step_id"], time.perf_counter()))
+        or {"step_id": step["step_id"], "status": "success", "output": "ok", "tool_outputs": []}
+    )
+    events = []
+    t0 = time.perf_counter()
+    result = loop.execute("Acme", "Review policy", on_event=lambda name, data: events.append(name))
+    total = time.perf_counter() - t0
+
+    assert [s for s, _ in started] == [p["step_id"] for p in plan]
+    assert [s["step_id"] for s in result["plan"]] == [p["step_id"] for p in plan]
+    first_step_latency = started[0][1] - t0
+    # The stream takes len(DOC)/8 chunks * 10ms; step 1 should begin well inside it
+    assert first_step_latency < total / 2
+    assert events.index("plan_step") < events.index("plan")
+
+
+class _BrokenStreamClient(_SlowStreamingClient):
+    """Streams part of the plan, fails, then answers the blocking fallback"""
+
+    def stream_compliance_analysis(self, prompt, timeout=None):
+        yield self.text[:10]
+        raise ConnectionError("stream dropped")
+
+    def run_compliance_analysis(self, prompt, use_json_schema=False, timeout=None):
+        return LLMResponse(raw_text=self.text, status="completed")
+
+
+def test_failed_stream_resets_forwarded_tokens_before_fallback():
+    plan = [{"step_id": f"step_{i}", "description": f"Step {i}"} for i in range(1, 4)]
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.mock_mode = False
+    engine.llm_client = _BrokenStreamClient(json.dumps(plan))
+
+    events = []
+    steps = engine.generate_plan(
+        "Acme", "Review policy",
+        on_token=lambda delta: events.append(("token", delta)),
+        on_reset=lambda: events.append(("reset", None)),
+    )
+    assert events == [("token", json.dumps(plan)[:10]), ("reset", None)]
+    assert [s["step_id"] for s in steps] == ["step_1", "step_2", "step_3"]
+
+
+class _PartialStreamClient(_BrokenStreamClient):
+    """Streams ``streamed`` (then fails if ``fail``); the blocking call answers with the full plan"""
+
+    def __init__(self, text, streamed, fail=False):
+        super().__init__(text)
+        self.streamed = streamed
+        self.fail = fail
+
+    def stream_compliance_analysis(self, prompt, timeout=None):
+        yield from _chunks(self.streamed, 8)
+        if self.fail:
+            raise ConnectionError("stream dropped")
+
+
+def test_stream_plan_completes_a_short_plan_from_the_planner():
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.mock_mode = False
+    engine.llm_client = _PartialStreamClient(DOC, '```json\n[{"description": "Only step"}]\n```')
+
+    steps = list(engine.stream_plan("Acme", "Review policy"))
+    assert [s["description"] for s in steps] == ["Only step"] + [p["description"] for p in PLAN[1:]]
+    assert steps[0]["step_id"] == "step_1"
+    assert steps[0]["expected_outcome"] == "Progress toward goal"
+
+
+def test_stream_plan_completes_from_the_planner_after_a_failure():
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.mock_mode = False
+    engine.llm_client = _PartialStreamClient(DOC, json.dumps(PLAN[:1])[:-1] + ', {"step_id": "st', fail=True)
+
+    events = []
+    steps = list(engine.stream_plan(
+        "Acme", "Review policy",
+        on_token=lambda delta: events.append("token"),
+        on_reset=lambda: events.append("reset"),
+    ))
+    assert [s["description"] for s in steps] == [p["description"] for p in PLAN]
+    assert events[-1] == "reset" and events.count("reset") == 1
@@ -0,0 +1,125 @@
+"""Tests for the Prometheus metrics store, the /metrics endpoint and its overhead"""
+
+import multiprocessing
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.telemetry.benchmark import benchmark_overhead
+from backend.telemetry.metrics import CACHE_REQUESTS, render_metrics
+from backend.telemetry.prometheus import REGISTRY, Counter, Gauge, Histogram, MetricsRegistry
+from backend.utils.llm_client import LLMClient
+from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider, set_mock_provider
+
+
+def _metrics(registry):
+    return (
+        Counter("jobs", "Jobs run", ["queue"], registry=registry),
+        Gauge("jobs_running", "Jobs running", registry=registry),
+        Histogram("job_seconds", "Job time", ["queue"], buckets=(0.1, 1.0), registry=registry),
+    )
+
+
+def _worker(directory, n):
+    jobs, running, seconds = _METRICS
+    _REGISTRY.configure(directory)
+    for _ in range(n):
+        jobs.labels("a").inc()
+        seconds.labels("a").observe(0.5)
+    running.inc(n)
+
+
+_REGISTRY = MetricsRegistry()
+_METRICS = _metrics(_REGISTRY)
+
+
+def test_render_counter_gauge_and_histogram():
+    registry = MetricsRegistry()
+    jobs, running, seconds = _metrics(registry)
+    jobs.labels('x "1"').inc(2)
+    running.inc(3)
+    running.dec()
+    for value in (0.05, 0.1, 5.0):
+        seconds.labels("a").observe(value)
+    text = registry.render()
+
+    assert '# TYPE jobs_total counter\njobs_total{queue="x \\"1\\""} 2.0' in text
+    assert "jobs_running 2.0" in text
+    assert 'job_seconds_bucket{queue="a",le="0.1"} 2.0' in text
+    assert 'job_seconds_bucket{queue="a",le="1.0"} 2.0' in text
+    assert 'job_seconds_bucket{queue="a",le="+Inf"} 3.0' in text
+    assert 'job_seconds_count{queue="a"} 3.0' in text
+    with pytest.raises(ValueError):
+        jobs.labels("a").inc(-1)
+    with pytest.raises(ValueError):
+        Counter("jobs", "Again", registry=registry)
+
+
+def test_thread_shards_are_summed():
+    registry = MetricsRegistry()
+    jobs, _, _ = _metrics(registry)
+    threads = [threading.Thread(target=lambda: [jobs.labels("a").inc() for _ in range(1000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.samples("jobs") == {(("a",), ""): 4000.0}
+
+
+def test_multiprocess_directory_aggregates_workers(tmp_path):
+    directory = str(tmp_path)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_worker, args=(directory, n)) for n in (3, 5)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    jobs, running, _ = _METRICS
+    _REGISTRY.configure(directory)
+    try:
+        running.inc()
+        jobs.labels("a").inc()
+        assert len(list(tmp_path.glob("*.db"))) == 3
+        assert _REGISTRY.samples("jobs") == {(("a",), ""): 9.0}
+        # Gauges only count live processes: the workers have exited
+        assert _REGISTRY.samples("jobs_running") == {((), ""): 1.0}
+        assert 'job_seconds_count{queue="a"} 8.0' in _REGISTRY.render()
+    finally:
+        _REGISTRY.configure(None)
+
+
+def test_metrics_endpoint_records_routes_llm_calls_and_cache_ratio():
+    client = TestClient(app)
+    client.get("/health")
+    client.get("/no/such/route")
+    set_mock_provider(MockLLMProvider(MockLLMConfig(latency_ms=0, tokens_per_second=0)))
+    try:
+        tokens_before = sum(REGISTRY.samples("llm_tokens").values())
+        LLMClient(provider="mock").run_compliance_analysis("Assess GDPR obligations")
+    finally:
+        set_mock_provider(None)
+    CACHE_REQUESTS.labels("test", "hit").inc(3)
+    CACHE_REQUESTS.labels("test", "miss").inc()
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in text
+    assert 'route="unmatched",status="404"' in text
+    assert 'route="/metrics"' not in text
+    assert "http_requests_in_flight 0.0" in text
+    assert "db_pool_checkout_wait_seconds_count" in text
+    assert 'llm_request_duration_seconds_count{provider="mock",' in text
+    assert sum(REGISTRY.samples("llm_tokens").values()) > tokens_before
+    assert 'cache_hit_ratio{cache="test"} 0.75' in render_metrics()
+
+
+def test_metrics_overhead_per_request_under_50_microseconds():
+    results = benchmark_overhead(requests=2000, repeats=3)
+    assert results["single_process"]["overhead_us"] < 50
+    assert results["multiprocess"]["overhead_us"] < 50
@@ -0,0 +1,113 @@
+"""Tests for adaptive multi-pass step reasoning"""
+
+import json
+
+import pytest
+
+from backend.agentic_engine.reasoning import PassController, ReasoningEngine, StepComplexityClassifier
+from backend.config import settings
+from backend.utils.llm_client import LLMResponse
+
+SINGLE = {"entity": {"locations": ["EU"], "has_personal_data": True}}
+GLOBAL = {"entity": {"locations": ["US", "EU", "UK", "SG"], "is_regulated": True, "previous_violations": 2}}
+
+
+class _ScriptedClient:
+    """LLM client stub returning one scripted step result per call"""
+
+    available = True
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def run_compliance_analysis(self, prompt, use_json_schema=False, timeout=None):
+        result = self.results[min(self.calls, len(self.results) - 1)]
+        self.calls += 1
+        if isinstance(result, Exception):
+            raise result
+        return LLMResponse(raw_text=json.dumps(result), status="completed")
+
+
+def _engine(results):
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.llm_client = _ScriptedClient(results)
+    engine.mock_mode = False
+    return engine
+
+
+def _result(confidence, findings):
+    return {"output": "done", "findings": findings, "risks": [], "confidence": confidence}
+
+
+def test_classifier_needs_more_than_an_analysis_verb():
+    classifier = StepComplexityClassifier()
+    assess = {"description": "Assess data sensitivity and processing risks"}
+    assert not classifier.is_complex(assess, SINGLE)
+    assert classifier.is_complex(assess, GLOBAL)
+    assert classifier.is_complex({"description": "Comprehensive analysis of multiple conflicting regimes"}, SINGLE)
+    assert not classifier.is_complex({"description": "Generate compliance recommendations"}, SINGLE)
+
+
+def test_classifier_fit_and_load(tmp_path, monkeypatch):
+    steps = [{"description": "Review the regulatory scope"}, {"description": "Assess processing risks"}]
+    samples = [(step, context, context is GLOBAL) for step in steps for context in (SINGLE, GLOBAL)] * 10
+    classifier = StepComplexityClassifier({"extra_jurisdictions": 0.0}).fit(samples, epochs=2000, learning_rate=0.5)
+    assert classifier.weights["extra_jurisdictions"] > 0
+    assert all(classifier.is_complex(step, context) == label for step, context, label in samples)
+
+    path = tmp_path / "complexity.json"
+    classifier.save(str(path))
+    monkeypatch.setattr(settings, "AGENTIC_COMPLEXITY_MODEL_PATH", str(path))
+    assert StepComplexityClassifier.from_settings().weights == classifier.weights
+    monkeypatch.setattr(settings, "AGENTIC_COMPLEXITY_MODEL_PATH", str(tmp_path / "missing.json"))
+    assert StepComplexityClassifier.from_settings().weights["extra_jurisdictions"] == 0.75
+
+
+def test_controller_stop_reasons():
+    controller = PassController(confident_exit=0.85, confidence_epsilon=0.05, min_findings_overlap=0.5)
+    assert controller.stop_reason([_result(0.9, ["a"])]) == "confident"
+    assert controller.stop_reason([_result(0.7, ["a"])]) is None
+    assert controller.stop_reason([_result(0.7, ["a", "b"]), _result(0.73, ["a", "b", "c"])]) == "converged"
+    assert controller.stop_reason([_result(0.7, ["a"]), _result(0.72, ["c"])]) == "no_gain"
+    assert controller.stop_reason([_result(0.6, ["a"]), _result(0.8, ["a"])]) is None
+
+
+@pytest.mark.parametrize("results, passes, reason", [
+    ([_result(0.9, ["a"])], 1, "confident"),
+    ([_result(0.6, ["a"]), _result(0.75, ["b"]), _result(0.77, ["c"])], 3, "no_gain"),
+    ([_result(0.6, ["a"]), _result(0.75, ["b"]), _result(0.9, ["c"])], 3, "max_passes"),
+])
+def test_multi_pass_stops_early_and_accounts_each_pass(results, passes, reason):
+    engine = _engine(results)
+    step = {"step_id": "step_1", "description": "Comprehensive analysis of multiple regimes"}
+    result = engine.run_step(step, GLOBAL)
+
+    assert result["reasoning_passes"] == engine.llm_client.calls == passes
+    assert result["stop_reason"] == reason
+    metrics = engine.reasoning_metrics
+    assert metrics["total_passes"] == passes
+    assert metrics["passes_saved"] == engine.max_reasoning_passes - passes
+    assert metrics["stop_reasons"][reason] == 1
+    for entry in list(metrics["pass_history"]):
+        assert entry["prompt_tokens"] > 0 and entry["completion_tokens"] > 0
+        assert entry["latency_ms"] >= 0 and entry["cost_usd"] > 0
+    assert metrics["cost_usd"] == pytest.approx(sum(p["cost_usd"] for p in result["pass_results"]))
+
+
+def test_failed_later_pass_stops_the_step_with_the_passes_made():
+    engine = _engine([_result(0.6, ["a"]), RuntimeError("connection reset"), _result(0.7, ["b"])])
+    step = {"step_id": "step_1", "description": "Comprehensive analysis of multiple regimes"}
+    result = engine.run_step(step, GLOBAL)
+
+    assert engine.llm_client.calls == 2
+    assert (result["reasoning_passes"], result["stop_reason"], result["findings"]) == (1, "error", ["a"])
+    assert engine.reasoning_metrics["stop_reasons"]["error"] == 1
+
+
+def test_simple_step_runs_single_pass():
+    engine = _engine([_result(0.6, ["a"])])
+    result = engine.run_step({"step_id": "step_1", "description": "Check deadlines"}, SINGLE)
+    assert engine.llm_client.calls == 1
+    assert "reasoning_passes" not in result
+    assert engine.reasoning_metrics["multi_pass_steps"] == 0
@@ -0,0 +1,122 @@
+"""Tests for the plan template cache"""
+
+import pytest
+
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.reasoning import PlanLibrary, ReasoningEngine, plan_key
+from backend.agentic_engine.reasoning.plan_library import instantiate_plan, normalize_plan
+from backend.utils.llm_client import LLMClient
+from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider, set_mock_provider
+
+CONTEXT = {
+    "entity": {"entity_name": "Acme", "entity_type": "private_company", "locations": ["US", "EU"]},
+    "task": {"task_description": "Article 30 records", "task_category": "DATA_PROTECTION"},
+}
+PLAN = [
+    {"step_id": "a", "description": "Map Acme processing activities", "rationale": "Scope", "status": "success"},
+    {"step_id": "b", "description": "Review retention periods", "expected_outcome": "Gaps listed"},
+]
+
+
+def _context(**entity):
+    return {"entity": {**CONTEXT["entity"], **entity}, "task": dict(CONTEXT["task"])}
+
+
+def test_plan_key_normalizes_jurisdictions_and_needs_a_category():
+    assert plan_key(CONTEXT) == ("DATA_PROTECTION", ("EU", "US"), "PRIVATE_COMPANY")
+    assert plan_key(_context(locations=["eu", "US"])) == plan_key(CONTEXT)
+    assert plan_key(_context(locations=["EU"])) != plan_key(CONTEXT)
+    assert plan_key({"entity": CONTEXT["entity"], "task": {"task_description": "x"}}) is None
+
+
+def test_record_normalizes_and_lookup_reuses_for_other_entities():
+    library = PlanLibrary(reuse_quality=0.85, min_quality=0.8)
+    assert library.record(CONTEXT, PLAN, 0.9, entity="Acme")
+
+    entry, mode = library.lookup(_context(entity_name="Globex"))
+    assert mode == "reuse"
+    assert entry.plan == [
+        {"step_id": "step_1", "description": "Map <ENTITY> processing activities", "rationale": "Scope"},
+        {"step_id": "step_2", "description": "Review retention periods", "expected_outcome": "Gaps listed"},
+    ]
+    assert library.lookup(_context(entity_type="bank")) == (None, None)
+
+
+
+def test_normalize_replaces_the_entity_as_a_whole_word():
+    plan = [{"description": "Map Acme (Acme Corp.) data, not Acmeville or NewAcme", "rationale": "Acme"}]
+    assert normalize_plan(plan, entity="Acme")[0] == {
+        "step_id": "step_1",
+        "description": "Map <ENTITY> (<ENTITY> Corp.) data, not Acmeville or NewAcme",
+        "rationale": "<ENTITY>",
+    }
+    normalized = normalize_plan([{"description": "Audit Acme Inc. vendors"}], entity="Acme Inc.")
+    assert instantiate_plan(normalized, "Globex")[0]["description"] == "Audit Globex vendors"
+
+
+def test_quality_thresholds_and_feedback():
+    library = PlanLibrary(reuse_quality=0.85, min_quality=0.8, quality_smoothing=0.5)
+    assert not library.record(CONTEXT, PLAN, 0.7)
+    assert library.lookup(CONTEXT) == (None, None)
+
+    library.record(CONTEXT, PLAN, 0.82)
+    assert library.lookup(CONTEXT)[1] == "seed"
+    # A poor run on the cached plan pulls its running quality down until it is evicted
+    library.record(CONTEXT, PLAN, 0.0)
+    library.record(CONTEXT, PLAN, 0.0)
+    assert library.lookup(CONTEXT) == (None, None)
+    assert library.get_metrics()["evicted"] == 1
+
+
+def test_recency_decay_and_capacity():
+    library = PlanLibrary(max_entries=2, half_life_hours=1.0)
+    library.record(CONTEXT, PLAN, 0.9)
+    entry, _ = library.lookup(CONTEXT)
+    entry.last_used -= 3600
+    assert library.score(entry) == pytest.approx(0.45, abs=0.01)
+    assert library.lookup(CONTEXT)[1] == "seed"
+
+    for location in ("SG", "UK", "JP"):
+        library.record(_context(locations=[location]), PLAN, 0.9)
+    assert len(library) == 2
+
+
+@pytest.fixture
+def loop():
+    set_mock_provider(MockLLMProvider(MockLLMConfig(latency_ms=0, tokens_per_second=0)))
+    engine = ReasoningEngine()
+    engine.llm_client = LLMClient(provider="mock")
+    engine.mock_mode = False
+    yield AgentLoop(
+        max_steps=5, enable_reflection=True, enable_memory=False, reasoning_engine=engine,
+        plan_library=PlanLibrary(min_quality=0.0, reuse_quality=0.0), enable_plan_cache=True,
+    )
+    set_mock_provider(None)
+
+
+def test_agent_loop_reuses_cached_plan(loop):
+    first = loop.execute("Acme", "Article 30 records", _context())
+    assert first["metrics"]["plan_source"] == "planner"
+
+    second = loop.execute("Globex", "Article 30 records", _context(entity_name="Globex"))
+    metrics = second["metrics"]
+    assert metrics["plan_source"] == "cache"
+    assert metrics["prompt_tokens"]["plan"]["calls"] == 0
+    assert [s["description"] for s in second["plan"]] == [s["description"] for s in first["plan"]]
+    assert metrics["plan_cache"]["reused"] == 1
+    assert metrics["plan_cache"]["hit_rate"] == 0.5
+    assert metrics["plan_cache"]["plan_generation_ms_saved"] > 0
+
+
+def test_agent_loop_seeds_planner_with_low_scoring_plan(loop):
+    loop.plan_library.reuse_quality = 1.1
+    loop.execute("Acme", "Article 30 records", _context())
+    result = loop.execute("Globex", "Article 30 records", _context(entity_name="Globex"))
+    assert result["metrics"]["plan_source"] == "seeded_planner"
+    assert result["metrics"]["prompt_tokens"]["plan"]["calls"] == 1
+
+
+def test_plan_cache_can_be_disabled(loop):
+    no_cache = AgentLoop(enable_memory=False, reasoning_engine=loop.reasoning_engine, enable_plan_cache=False)
+    assert no_cache.plan_library is None
+    assert "plan_cache" not in no_cache.execute("Acme", "Article 30 records", _context())["metrics"]
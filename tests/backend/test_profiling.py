@@ -0,0 +1,203 @@
+"""Tests for the sampling profiler, request profiling, tracemalloc snapshots and the profiling API"""
+
+import asyncio
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.auth.security import DemoUser, get_current_user
+from backend.main import app
+from backend.profiling import MemoryProfiler, ProfilingMiddleware, SamplingProfiler, profiler, to_collapsed, to_speedscope
+
+
+def burn(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def other_burn(seconds):
+    burn(seconds)
+
+
+def _functions(profile):
+    return {frame[0] for stack in profile.stacks for frame in stack}
+
+
+def _profiled_app(sampler):
+    profiled = FastAPI()
+    profiled.add_middleware(ProfilingMiddleware, profiler=sampler)
+
+    @profiled.get("/sync")
+    def sync_endpoint():
+        burn(0.15)
+        return {}
+
+    @profiled.get("/thread")
+    async def thread_endpoint():
+        await asyncio.to_thread(other_burn, 0.3)
+        return {}
+
+    return profiled
+
+
+def test_collapsed_and_speedscope_formats():
+    stacks = {
+        (("MainThread", "", 0), ("main", "app.py", 1), ("work", "app.py", 10)): 3,
+        (("MainThread", "", 0), ("main", "app.py", 1)): 1,
+        (("worker", "", 0), ("run", "a;b.py", 5)): 2,
+    }
+    assert to_collapsed(stacks).splitlines() == [
+        "MainThread;main (app.py:1);work (app.py:10) 3",
+        "worker;run (a:b.py:5) 2",
+        "MainThread;main (app.py:1) 1",
+    ]
+    document = to_speedscope(stacks, name="cpu", exporter="api")
+    assert document["$schema"].startswith("https://www.speedscope.app/")
+    frames = document["shared"]["frames"]
+    main, worker = document["profiles"]
+    assert (main["name"], main["type"], main["endValue"]) == ("cpu [MainThread]", "sampled", 4)
+    assert [[frames[i]["name"] for i in sample] for sample in main["samples"]] == [["main", "work"], ["main"]]
+    assert main["weights"] == [3, 1] and worker["weights"] == [2]
+    assert frames[0] == {"name": "main", "file": "app.py", "line": 1}
+
+
+def test_process_profile_records_busy_threads_only():
+    sampler = SamplingProfiler(interval_s=0.001)
+    idle = threading.Event()
+    waiter = threading.Thread(target=idle.wait, name="idle-waiter")
+    waiter.start()
+    busy = threading.Thread(target=burn, args=(0.2,), name="busy-worker")
+    try:
+        sampler.start()
+        busy.start()
+        busy.join()
+        profile = sampler.stop()
+    finally:
+        idle.set()
+        waiter.join()
+
+    assert profile.samples > 0 and sampler.get(profile.id) is profile
+    threads = {stack[0][0] for stack in profile.stacks}
+    assert "busy-worker" in threads and "idle-waiter" not in threads
+    assert "burn" in _functions(profile)
+    assert "busy-worker;" in profile.collapsed()
+    assert profile.summary()["top"][0]["function"].startswith("burn (tests/backend/test_profiling.py:")
+    for _ in range(100):
+        if sampler._thread is None:
+            break
+        time.sleep(0.01)
+    assert sampler._thread is None
+
+
+def test_request_profiles_only_contain_their_own_request():
+    sampler = SamplingProfiler(interval_s=0.001)
+    client = TestClient(_profiled_app(sampler))
+    sampler.arm(sample_rate=1.0, duration_s=60, path_prefix="/sync")
+
+    # An unprofiled request burning CPU in a worker thread at the same time
+    neighbour = threading.Thread(target=lambda: client.get("/thread", headers={"X-Profile": "1"}))
+    neighbour.start()
+    time.sleep(0.05)
+    response = client.get("/sync", headers={"X-Profile": "1"})
+    neighbour.join()
+
+    profile = sampler.get(response.headers["x-profile-id"])
+    assert (profile.kind, profile.name) == ("request", "GET /sync")
+    assert "burn" in _functions(profile)
+    assert "other_burn" not in _functions(profile)
+    assert len(sampler.profiles) == 1
+
+    # Work moved to a thread with asyncio.to_thread is attributed to its request
+    sampler.arm(sample_rate=1.0, duration_s=60)
+    response = client.get("/thread", headers={"X-Profile": "1"})
+    assert "other_burn" in _functions(sampler.get(response.headers["x-profile-id"]))
+
+
+def test_requests_are_profiled_only_when_armed_and_selected():
+    sampler = SamplingProfiler(interval_s=0.001)
+    client = TestClient(_profiled_app(sampler))
+
+    assert "x-profile-id" not in client.get("/sync", headers={"X-Profile": "1"}).headers
+    sampler.arm(sample_rate=1.0, duration_s=60)
+    assert "x-profile-id" not in client.get("/sync").headers
+    sampler.arm(sample_rate=0.000001, duration_s=60)
+    assert "x-profile-id" not in client.get("/sync", headers={"X-Profile": "1"}).headers
+    sampler.arm(sample_rate=1.0, duration_s=0.01)
+    time.sleep(0.02)
+    assert "x-profile-id" not in client.get("/sync", headers={"X-Profile": "1"}).headers
+    assert sampler.request_sampling is None and not sampler.profiles
+
+
+def test_memory_snapshots_diff_and_flame_graph():
+    memory = MemoryProfiler(keep=2)
+    memory.start(frames=10)
+    try:
+        before = memory.snapshot()
+        retained = [bytearray(4096) for _ in range(500)]
+        after = memory.snapshot()
+    finally:
+        memory.stop()
+
+    diff = memory.diff(before["id"], after["id"], limit=5)
+    grown = [entry for entry in diff if entry["location"].startswith("tests/backend/test_profiling.py:")]
+    assert grown and grown[0]["size_diff_kb"] >= 2000 and grown[0]["count_diff"] >= 500
+    assert grown[0]["function"] == "test_memory_snapshots_diff_and_flame_graph"
+    assert memory.top(after["id"], key_type="filename")[0]["size_kb"] > 0
+    assert "allocations;" in memory.collapsed(after["id"])
+    assert memory.speedscope(after["id"])["profiles"][0]["unit"] == "bytes"
+    assert len(retained) == 500
+
+
+class _User(DemoUser):
+    def __init__(self, username):
+        super().__init__()
+        self.username = username
+
+
+def test_profiling_api_is_admin_only():
+    client = TestClient(app)
+    assert client.get("/api/v1/profiling/status").status_code == 401
+    app.dependency_overrides[get_current_user] = lambda: _User("analyst")
+    try:
+        assert client.get("/api/v1/profiling/status").status_code == 403
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_profiling_api_cpu_request_and_memory_flow():
+    app.dependency_overrides[get_current_user] = lambda: DemoUser()
+    client = TestClient(app)
+    try:
+        assert client.post("/api/v1/profiling/cpu/start", json={"max_seconds": 30}).status_code == 200
+        assert client.post("/api/v1/profiling/cpu/start").status_code == 409
+        client.get("/health")
+        stopped = client.post("/api/v1/profiling/cpu/stop").json()
+        collapsed = client.get(f"/api/v1/profiling/profiles/{stopped['id']}", params={"format": "collapsed"})
+        assert collapsed.headers["content-disposition"].endswith('.collapsed.txt"')
+
+        armed = client.post("/api/v1/profiling/requests/arm", json={"sample_rate": 1, "path_prefix": "/health"})
+        assert armed.json()["sample_rate"] == 1
+        profile_id = client.get("/health", headers={"X-Profile": "1"}).headers["x-profile-id"]
+        client.post("/api/v1/profiling/requests/disarm")
+        speedscope = client.get(f"/api/v1/profiling/profiles/{profile_id}", params={"format": "speedscope"}).json()
+        assert speedscope["name"] == "request GET /health"
+        assert client.get("/api/v1/profiling/profiles/missing").status_code == 404
+        assert profile_id in {profile["id"] for profile in client.get("/api/v1/profiling/profiles").json()}
+
+        assert client.post("/api/v1/profiling/memory/snapshots").status_code == 409
+        client.post("/api/v1/profiling/memory/start", json={"frames": 5})
+        base = client.post("/api/v1/profiling/memory/snapshots").json()["id"]
+        target = client.post("/api/v1/profiling/memory/snapshots").json()["id"]
+        diff = client.get("/api/v1/profiling/memory/diff", params={"base": base, "target": target})
+        assert diff.status_code == 200 and diff.json()["base"] == base
+        assert client.get(f"/api/v1/profiling/memory/snapshots/{target}", params={"key_type": "bogus"}).status_code == 400
+        assert client.get("/api/v1/profiling/status").json()["memory"]["tracing"] is True
+    finally:
+        if profiler.running:
+            profiler.stop()
+        profiler.disarm()
+        client.post("/api/v1/profiling/memory/stop")
+        app.dependency_overrides.clear()
@@ -0,0 +1,95 @@
+"""Tests for precompiled prompt templates and context budgeting"""
+
+import json
+
+from backend.agentic_engine.reasoning import PromptBuilder, PromptTemplate, ReasoningEngine, TokenCounter
+from backend.agentic_engine.reasoning.prompt_builder import PLANNER_BODY, compact_payload
+
+
+def _attempts(n):
+    return [
+        {
+            "step_id": f"step_{i}",
+            "status": "success",
+            "output": "Detailed findings " * 200,
+            "tool_outputs": [{"tool": "jurisdiction_analyzer", "data": "x" * 4000}],
+            "confidence": 0.6,
+        }
+        for i in range(n)
+    ]
+
+
+def _reflections(n):
+    return [
+        {"step_id": f"step_{i}", "overall_quality": 0.5, "issues": ["Missing citation " * 30] * 4}
+        for i in range(n)
+    ]
+
+
+def test_template_render_matches_str_format():
+    template = PromptTemplate("planner", "Header {{literal}}" + PLANNER_BODY)
+    values = {"entity": "Acme", "task": "Review notice", "context": "\n\nAdditional Context:\n{}"}
+    assert template.render(**values) == ("Header {{literal}}" + PLANNER_BODY).format(**values)
+    assert template.fields == ("entity", "task", "context")
+
+
+def test_prompt_headers_with_braces_stay_literal():
+    builder = PromptBuilder({"planner": "Return {json} only"})
+    prompt = builder.build("planner", entity="Acme", task="Review", context=None)
+    assert prompt.startswith("Return {json} only\n\nEntity/Subject: Acme")
+    assert "Additional Context" not in prompt
+
+
+def test_small_context_is_minified_not_trimmed():
+    builder = PromptBuilder({})
+    context = {"jurisdictions": ["EU", "US"], "employee_count": 120}
+    prompt = builder.build("executor", step_id="step_1", description="Check", rationale="Why", context=context)
+    assert "Execution Context:\n" + json.dumps(context, separators=(",", ":")) in prompt
+    assert builder.last_call["compacted"] is False
+
+
+def test_compaction_fits_budget_and_summarises_history():
+    counter = TokenCounter()
+    context = {"previous_attempts": _attempts(6), "reflections": _reflections(6)}
+    text, stats = compact_payload(context, 800, counter)
+    assert stats["tokens"] <= 800
+    assert stats["raw_tokens"] > 800
+    compacted = json.loads(text)
+    assert [a["step_id"] for a in compacted["previous_attempts"]] == ["step_3", "step_4", "step_5"]
+    assert "tool_outputs" not in compacted["previous_attempts"][0]
+
+
+def test_hard_truncation_when_nothing_else_fits():
+    counter = TokenCounter()
+    text, stats = compact_payload({f"field_{i}": i for i in range(500)}, 50, counter)
+    assert stats["tokens"] <= 50
+    assert text.endswith("...[truncated]")
+
+
+def test_replan_prompts_stay_within_budget():
+    """Prompt size is bounded no matter how many replans have accumulated"""
+    builder = PromptBuilder({}, budgets={"plan": 2000})
+    sizes = []
+    for n in (1, 4, 16):
+        builder.build(
+            "planner", entity="Acme", task="Review",
+            context={"previous_attempts": _attempts(n), "reflections": _reflections(n)},
+        )
+        sizes.append(builder.last_call["prompt_tokens"])
+    assert max(sizes) <= 2000
+    metrics = builder.get_metrics()["plan"]
+    assert metrics["calls"] == 3
+    assert metrics["over_budget_calls"] == 0
+    assert metrics["context_tokens_raw"] > metrics["context_tokens_sent"]
+
+
+def test_engine_reports_prompt_metrics_per_call_type():
+    engine = ReasoningEngine(api_key="sk-mock")
+    engine.generate_plan("Acme", "Review notice", {"employee_count": 120})
+    engine.run_step({"step_id": "step_1", "description": "Check scope"}, {"employee_count": 120})
+    engine.reflect({"step_id": "step_1"}, {"output": "ok"})
+    metrics = engine.prompt_builder.get_metrics()
+    assert metrics["plan"]["calls"] == 1
+    assert metrics["execute"]["calls"] >= 1
+    assert metrics["reflect"]["calls"] == 1
+    assert metrics["reflect"]["prompt_tokens_max"] <= metrics["reflect"]["budget"]
@@ -0,0 +1,96 @@
+"""Tests for re-entrant agent runs and the shared orchestrator pool"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.orchestrator import clear_orchestrator_pool, get_orchestrator
+from backend.agentic_engine.reasoning import ReasoningEngine
+from backend.agentic_engine.run_context import RunContext, current_run
+from backend.agentic_engine.tools.entity_tool import EntityTool
+from backend.db.models import MemoryRecord
+from backend.utils.llm_client import LLMClient
+from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider, set_mock_provider
+
+RUNS = 8
+
+
+@pytest.fixture
+def loop():
+    """One shared loop wired to a low-latency mock provider"""
+    set_mock_provider(MockLLMProvider(MockLLMConfig(latency_ms=2, latency_distribution="fixed", tokens_per_second=0)))
+    engine = ReasoningEngine()
+    engine.llm_client = LLMClient(provider="mock")
+    engine.mock_mode = False
+    yield AgentLoop(max_steps=3, enable_reflection=True, enable_memory=False, reasoning_engine=engine)
+    set_mock_provider(None)
+
+
+def test_concurrent_runs_on_one_loop_keep_separate_state(loop):
+    barrier = threading.Barrier(RUNS)
+
+    def _run(n):
+        barrier.wait()
+        return loop.execute(f"Entity {n}", f"Review policy {n}", {"task": {"description": f"Review policy {n}"}})
+
+    with ThreadPoolExecutor(RUNS) as executor:
+        results = list(executor.map(_run, range(RUNS)))
+
+    for n, result in enumerate(results):
+        assert result["audit_log"]["entity"] == f"Entity {n}"
+        assert len(result["step_outputs"]) == 3
+        assert len(result["reflections"]) == 3
+        metrics = result["metrics"]
+        assert metrics["total_steps"] == metrics["successful_steps"] == 3
+        assert len(metrics["step_times"]) == 3
+        assert metrics["prompt_tokens"]["plan"]["calls"] == 1
+        assert metrics["prompt_tokens"]["reflect"]["calls"] == 3
+    assert current_run() is None
+    # Nothing recorded on the shared builder while runs were active
+    assert loop.reasoning_engine.prompt_builder.get_metrics()["plan"]["calls"] == 0
+
+
+def test_get_metrics_reports_last_finished_run(loop):
+    assert loop.get_metrics()["total_steps"] == 0
+    loop.execute("Acme", "Review policy", max_steps=2)
+    assert loop.get_metrics()["total_steps"] == 2
+    loop.reset_metrics()
+    assert loop.get_metrics()["total_steps"] == 0
+
+
+def test_finished_run_state_is_not_retained(loop):
+    session = object()
+    loop.execute("Acme", "Review policy", max_steps=2, db_session=session)
+    kept = loop._last_run
+    assert kept.db_session is None and kept.trace is None
+    assert kept.tool_cache == {} and kept.execution_history == []
+    assert kept.metrics["total_steps"] == 2
+
+
+def test_run_session_overrides_tool_and_memory_sessions(loop, db_session):
+    tool = EntityTool()
+    assert tool.db_session is None
+    with RunContext(db_session=db_session).activate():
+        assert tool.db_session is db_session
+    assert tool.db_session is None
+
+    loop.enable_memory = True
+    result = loop.execute("Acme", "Review policy", db_session=db_session)
+    assert result["memory_saved"] is True
+    assert loop.db_session is None
+    assert db_session.query(MemoryRecord).filter_by(entity_name="Acme").count() == 1
+
+
+def test_orchestrator_pool_shares_instances_per_config():
+    clear_orchestrator_pool()
+    try:
+        first = get_orchestrator({"enable_reflection": False, "enable_memory": True})
+        assert get_orchestrator({"enable_memory": True, "enable_reflection": False}) is first
+        assert get_orchestrator({"enable_reflection": True, "enable_memory": True}) is not first
+        assert first.agent_loop.db_session is None
+    finally:
+        clear_orchestrator_pool()
+    assert get_orchestrator({"enable_reflection": False, "enable_memory": True}) is not first
+    clear_orchestrator_pool()
@@ -0,0 +1,111 @@
+"""Tests for the vectorized what-if scenario sweep"""
+
+import numpy as np
+import pytest
+
+from backend.agent.decision_engine import DecisionEngine
+from backend.agent.risk_models import (
+    EntityContext,
+    EntityType,
+    IndustryCategory,
+    Jurisdiction,
+    TaskCategory,
+    TaskContext,
+)
+from backend.agent.scenario_sweep import DECISIONS, FACTOR_NAMES, ScenarioSweep
+from backend.agent.what_if_engine import WhatIfEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return DecisionEngine()
+
+
+def _baseline(engine, category=TaskCategory.SECURITY_AUDIT, **entity_overrides):
+    entity = EntityContext(
+        name="Acme Corp",
+        entity_type=entity_overrides.pop("entity_type", EntityType.PRIVATE_COMPANY),
+        industry=IndustryCategory.TECHNOLOGY,
+        jurisdictions=[Jurisdiction.US_FEDERAL],
+        employee_count=800,
+        **entity_overrides,
+    )
+    task = TaskContext(description="Review access controls", category=category)
+    return engine.analyze_and_decide(entity, task)
+
+
+@pytest.mark.parametrize(
+    "category",
+    [TaskCategory.SECURITY_AUDIT, TaskCategory.DATA_PRIVACY, TaskCategory.INCIDENT_RESPONSE, TaskCategory.GENERAL_INQUIRY],
+)
+def test_random_sweep_matches_scalar_what_if(engine, category):
+    baseline = _baseline(engine, category=category)
+    what_if = WhatIfEngine(engine)
+    result = what_if.sweeper.run(baseline, factors={name: {} for name in FACTOR_NAMES}, mode="random", samples=300, seed=1)
+
+    for row, score, decision in zip(result.factors, result.scores, result.decisions):
+        scalar = what_if.analyze_scenario(baseline, dict(zip(FACTOR_NAMES, row.tolist())))
+        assert DECISIONS[decision].value == scalar["new_decision"]
+        assert round(float(score), 3) == scalar["new_score"]
+
+
+def test_attribute_combinations_match_full_analysis(engine):
+    baseline = _baseline(engine)
+    result = ScenarioSweep(engine).run(
+        baseline,
+        entity_attributes={"entity_type": ["STARTUP", "FINANCIAL_INSTITUTION"], "previous_violations": [0, 3]},
+        task_attributes={"category": ["GENERAL_INQUIRY", "POLICY_REVIEW", "INCIDENT_RESPONSE"]},
+    )
+    assert result.size == len(result.contexts) == 12
+    for context, decision, score in zip(result.contexts, result.decisions, result.scores):
+        expected = engine.analyze_and_decide(context.entity, context.task)
+        assert DECISIONS[decision] == expected.decision
+        assert score == expected.risk_factors.overall_score
+
+
+def test_thresholds_are_exact_decision_flips(engine):
+    baseline = _baseline(engine)
+    what_if = WhatIfEngine(engine)
+    summary = what_if.sweep(baseline, factors={"task_risk": {"steps": 5}})
+
+    assert summary["thresholds"]
+    for threshold in summary["thresholds"]:
+        value = threshold["value"]
+        below = np.nextafter(value, -np.inf)
+        above = what_if.analyze_scenario(baseline, {threshold["factor"]: value})
+        under = what_if.analyze_scenario(baseline, {threshold["factor"]: float(below)})
+        assert above["new_decision"] == threshold["decision_above"]
+        assert under["new_decision"] == threshold["decision_below"]
+        assert above["new_decision"] != under["new_decision"]
+
+
+def test_grid_surface_and_sensitivities(engine):
+    baseline = _baseline(engine)
+    summary = WhatIfEngine(engine).sweep(
+        baseline, factors={"task_risk": [0.0, 0.5, 1.0], "regulatory_risk": {"min": 0.2, "max": 0.8, "steps": 4}}
+    )
+    assert summary["scenario_count"] == 12
+    assert np.array(summary["surface"]["scores"]).shape == (1, 3, 4)
+    assert summary["sensitivities"]["task_risk"]["score_swing"] == pytest.approx(0.2)
+    assert summary["sensitivities"]["regulatory_risk"]["range"] == [0.2, 0.8]
+    assert sum(summary["decision_counts"].values()) == 12
+
+
+def test_fifty_thousand_scenarios_under_a_second(engine):
+    baseline = _baseline(engine)
+    result = ScenarioSweep(engine).run(
+        baseline, factors={name: {} for name in FACTOR_NAMES}, mode="random", samples=50_000, seed=7
+    )
+    assert result.size == 50_000
+    assert result.elapsed_ms < 1000
+
+
+def test_invalid_specs_raise_value_error(engine):
+    sweep = ScenarioSweep(engine)
+    baseline = _baseline(engine)
+    with pytest.raises(ValueError):
+        sweep.run(baseline, factors={"unknown_risk": [0.1]})
+    with pytest.raises(ValueError):
+        sweep.run(baseline, factors={"task_risk": [1.5]})
+    with pytest.raises(ValueError):
+        sweep.run(baseline, task_attributes={"not_a_field": [1]})
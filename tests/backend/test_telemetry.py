@@ -0,0 +1,148 @@
+"""Tests for telemetry spans, metrics, exporters and instrumentation"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.agent.decision_engine import DecisionEngine
+from backend.agent.risk_models import EntityContext, EntityType, IndustryCategory, Jurisdiction, TaskCategory, TaskContext
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.reasoning import ReasoningEngine
+from backend.auth.security import DemoUser, get_current_user
+from backend.main import app
+from backend.telemetry import InMemorySpanExporter, encode_spans, telemetry
+from backend.telemetry.core import NOOP_SPAN
+from backend.telemetry.instrumentation import INSTRUMENTORS
+from backend.telemetry.prometheus import REGISTRY
+from backend.utils.llm_client import LLMClient
+from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider, set_mock_provider
+
+ENTITY = EntityContext(name="Acme", entity_type=EntityType.PRIVATE_COMPANY, industry=IndustryCategory.TECHNOLOGY,
+                       jurisdictions=[Jurisdiction.EU])
+TASK = TaskContext(description="Update the privacy notice", category=TaskCategory.DATA_PRIVACY)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    telemetry.enable([exporter])
+    yield exporter
+    telemetry.disable()
+
+
+def _by_name(spans):
+    return {span.name: span for span in spans}
+
+
+def _observations(operation):
+    samples = REGISTRY.samples("operation_duration_seconds").items()
+    return sum(value for (labels, sample), value in samples if labels == (operation,) and sample != "sum")
+
+
+def test_disabled_telemetry_leaves_components_untouched():
+    assert not telemetry.enabled
+    assert telemetry.span("anything") is NOOP_SPAN
+    originals = DecisionEngine.__dict__["assess"], LLMClient.__dict__["_make_request_with_retries"]
+
+    telemetry.enable()
+    assert DecisionEngine.__dict__["assess"] is not originals[0]
+    assert all(instrumentor.instrumented for instrumentor in INSTRUMENTORS)
+    telemetry.disable()
+    assert (DecisionEngine.__dict__["assess"], LLMClient.__dict__["_make_request_with_retries"]) == originals
+    assert not any(instrumentor.instrumented for instrumentor in INSTRUMENTORS)
+
+
+def test_decision_engine_phases_are_nested_spans(exporter):
+    before = _observations("decision.analyze")
+    DecisionEngine().analyze_and_decide(ENTITY, TASK, explain="summary")
+    spans = _by_name(exporter.get_finished_spans())
+
+    root = spans["decision.analyze"]
+    assert root.parent_span_id is None
+    assert root.attributes == {"decision.task_category": "DATA_PRIVACY", "decision.explain": "summary"}
+    assert spans["decision.assess"].parent_span_id == root.span_id
+    assert spans["decision.score_factors"].parent_span_id == spans["decision.assess"].span_id
+    assert spans["decision.recommend"].parent_span_id == root.span_id
+    assert {span.trace_id for span in spans.values()} == {root.trace_id}
+
+    assert _observations("decision.analyze") == before + 1
+
+
+def test_llm_error_response_marks_span_failed(exporter):
+    errors = REGISTRY.samples("operation_errors").get((("llm.request", "llm_error"), ""), 0.0)
+    response = LLMClient(api_key="sk-mock-key").run_compliance_analysis("prompt")
+    span, = exporter.get_finished_spans()
+
+    assert response.status == "error"
+    assert (span.name, span.kind, span.status_code) == ("llm.request", "CLIENT", "ERROR")
+    assert span.attributes["gen_ai.request.model"]
+    assert REGISTRY.samples("operation_errors")[(("llm.request", "llm_error"), "")] == errors + 1
+
+
+def test_agent_loop_run_plan_step_and_reflect_spans(exporter):
+    set_mock_provider(MockLLMProvider(MockLLMConfig(latency_ms=0, tokens_per_second=0)))
+    try:
+        engine = ReasoningEngine()
+        engine.llm_client = LLMClient(provider="mock")
+        engine.mock_mode = False
+        loop = AgentLoop(max_steps=2, enable_memory=False, reasoning_engine=engine, enable_plan_cache=False)
+        loop.execute("Acme", "Article 30 records", {"task": {"task_category": "DATA_PROTECTION"}})
+    finally:
+        set_mock_provider(None)
+
+    spans = exporter.get_finished_spans()
+    run = _by_name(spans)["agent.run"]
+    children = [span for span in spans if span.parent_span_id == run.span_id]
+    assert {span.name for span in children} == {"agent.plan", "agent.step", "agent.reflect"}
+    steps = {span.span_id for span in children if span.name == "agent.step"}
+    assert len(steps) == 2
+    assert any(span.name == "llm.request" and span.parent_span_id in steps for span in spans)
+    plan = _by_name(children)["agent.plan"]
+    assert any(span.name == "llm.stream" and span.parent_span_id == plan.span_id for span in spans)
+    assert telemetry.current_span() is None
+
+
+def test_http_request_span_with_db_child(exporter):
+    client = TestClient(app)
+    assert client.get("/health").status_code == 200
+    client.get("/no/such/route")
+    spans = exporter.get_finished_spans()
+
+    request = _by_name(spans)["GET /health"]
+    assert request.kind == "SERVER"
+    assert request.attributes["http.route"] == "/health"
+    assert request.attributes["http.response.status_code"] == 200
+    db = [span for span in spans if span.name == "db.select"]
+    assert db and db[0].parent_span_id == request.span_id and db[0].attributes["db.system"] == "sqlite"
+    assert _by_name(spans)["GET"].attributes["http.response.status_code"] == 404
+
+
+def test_traces_route_serves_otlp_and_span_metrics_go_to_metrics(exporter):
+    app.dependency_overrides[get_current_user] = lambda: DemoUser()
+    try:
+        client = TestClient(app)
+        client.get("/health")
+        traces = client.get("/api/v1/telemetry/traces", params={"limit": 50}).json()
+        assert client.get("/api/v1/telemetry/metrics").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+    metrics = client.get("/metrics").text
+    assert 'operation_duration_seconds_bucket{operation="GET /health",le="+Inf"}' in metrics
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in metrics
+    names = {span["name"] for span in traces["resourceSpans"][0]["scopeSpans"][0]["spans"]}
+    assert {"GET /health", "db.select"} <= names
+
+
+def test_otlp_encoding():
+    telemetry.enable()
+    try:
+        with telemetry.span("outer", {"n": 1}) as outer:
+            with telemetry.span("inner", kind="CLIENT"):
+                pass
+    finally:
+        telemetry.disable()
+    encoded = encode_spans([outer])["resourceSpans"][0]
+    span = encoded["scopeSpans"][0]["spans"][0]
+    assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+    assert span["kind"] == 1 and span["attributes"] == [{"key": "n", "value": {"intValue": "1"}}]
+    assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
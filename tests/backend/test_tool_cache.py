@@ -0,0 +1,138 @@
+"""Tests for the tool result cache"""
+
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.reasoning import ReasoningEngine
+from backend.agentic_engine.run_context import RunContext
+from backend.agentic_engine.tools import CalendarTool, EntityTool, TaskTool
+from backend.agentic_engine.tools import tool_cache
+from backend.agentic_engine.tools.tool_cache import ToolResultCache, params_key
+from backend.agentic_engine.tools.tool_registry import ToolRegistry
+from backend.utils.llm_client import LLMClient
+from backend.utils.mock_llm_provider import MockLLMConfig, MockLLMProvider, set_mock_provider
+
+OK = {"success": True, "risk_level": "HIGH"}
+
+
+def test_params_key_ignores_parameter_order():
+    assert params_key("task_tool", {"a": 1, "b": [2]}) == params_key("task_tool", {"b": [2], "a": 1})
+    assert params_key("task_tool", {"a": 1}) != params_key("calendar_tool", {"a": 1})
+
+
+def test_policy_comes_from_registry_metadata():
+    registry = ToolRegistry()
+    cache = ToolResultCache(registry)
+    assert cache.policy("task_tool") == ("process", None)
+    assert cache.policy("calendar_tool") == ("process", 3600.0)
+    assert cache.policy("entity_tool") == ("run", None)
+    assert cache.policy("unknown_tool") == ("none", None)
+
+    registry.get_tool_metadata("task_tool").read_only = False
+    assert cache.policy("task_tool") == ("none", None)
+    assert not cache.put(RunContext(), "task_tool", {}, OK, 0.1)
+
+
+def test_process_scope_is_shared_and_run_scope_is_not():
+    cache = ToolResultCache()
+    first, second = RunContext(), RunContext()
+    cache.put(first, "task_tool", {"task_description": "x"}, OK, 0.2)
+    cache.put(first, "entity_tool", {"entity_name": "Acme"}, OK, 0.3)
+
+    assert cache.get(second, "task_tool", {"task_description": "x"}) == OK
+    assert cache.get(second, "entity_tool", {"entity_name": "Acme"}) is None
+    assert cache.get(first, "entity_tool", {"entity_name": "Acme"}) == OK
+    metrics = cache.get_metrics()
+    assert (metrics["process_hits"], metrics["run_hits"], metrics["misses"]) == (1, 1, 1)
+    assert metrics["time_saved_ms"] == 500.0
+
+
+def test_failures_are_not_cached_and_hits_are_copies():
+    cache = ToolResultCache()
+    run = RunContext()
+    assert not cache.put(run, "task_tool", {}, {"success": False, "error": "boom"}, 0.1)
+    cache.put(run, "task_tool", {}, {"success": True, "data": {"n": 1}}, 0.1)
+    cache.get(run, "task_tool", {})["data"]["n"] = 2
+    assert cache.get(run, "task_tool", {})["data"]["n"] == 1
+
+
+def test_ttl_expiry_and_capacity():
+    cache = ToolResultCache(max_entries=2)
+    run = RunContext()
+    cache.put(run, "calendar_tool", {"deadline": "2026-01-01"}, OK, 0.1)
+    key = cache._key("calendar_tool", {"deadline": "2026-01-01"})
+    _, seconds, result = cache._entries[key]
+    cache._entries[key] = (0.0, seconds, result)
+    assert cache.get(run, "calendar_tool", {"deadline": "2026-01-01"}) is None
+    assert cache.get_metrics()["expired"] == 1
+
+    for n in range(3):
+        cache.put(run, "task_tool", {"n": n}, OK, 0.1)
+    assert len(cache) == 2
+    assert cache.get_metrics()["evicted"] == 1
+
+
+def test_date_relative_results_are_not_reused_the_next_day(monkeypatch):
+    cache = ToolResultCache()
+    run = RunContext()
+    monkeypatch.setattr(tool_cache, "_today", lambda: "2026-03-01")
+    cache.put(run, "calendar_tool", {"deadline": "2026-03-10"}, OK, 0.1)
+    cache.put(run, "task_tool", {"deadline": "2026-03-10"}, OK, 0.1)
+    assert cache.get(run, "calendar_tool", {"deadline": "2026-03-10"}) == OK
+
+    monkeypatch.setattr(tool_cache, "_today", lambda: "2026-03-02")
+    assert cache.get(run, "calendar_tool", {"deadline": "2026-03-10"}) is None
+    assert cache.get(run, "task_tool", {"deadline": "2026-03-10"}) == OK
+
+
+class _Tool:
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, input):
+        self.calls += 1
+        return {"success": True, "calls": self.calls}
+
+
+def test_agent_loop_serves_repeated_tool_calls_from_cache():
+    task_tool, entity_tool = _Tool(), _Tool()
+    loop = AgentLoop(
+        enable_memory=False, reasoning_engine=ReasoningEngine(), enable_plan_cache=False,
+        enable_tool_router=False, tools={"task_tool": task_tool, "entity_tool": entity_tool},
+    )
+    step = {"step_id": "step_1", "description": "Review", "tools": ["task_tool", "entity_tool"]}
+    context = {"entity": {"name": "Acme"}, "task": {"description": "GDPR audit"}}
+    for _ in range(2):
+        with RunContext().activate():
+            outputs = [loop.execute_tools(step, context) for _ in range(3)]
+
+    # Task results are pure (shared across runs); entity results only within a run
+    assert (task_tool.calls, entity_tool.calls) == (1, 2)
+    assert [output.get("cached", False) for output in outputs[1]] == [True, True]
+    assert loop.get_metrics()["tool_cache"]["hits"] == 9
+
+    uncached = AgentLoop(enable_memory=False, reasoning_engine=ReasoningEngine(), enable_tool_cache=False)
+    assert uncached.tool_cache is None
+
+
+def test_real_tool_results_are_stored_and_reused_by_a_run():
+    set_mock_provider(MockLLMProvider(MockLLMConfig(latency_ms=0, tokens_per_second=0)))
+    try:
+        engine = ReasoningEngine()
+        engine.llm_client = LLMClient(provider="mock")
+        engine.mock_mode = False
+        loop = AgentLoop(
+            enable_memory=False, reasoning_engine=engine, enable_plan_cache=False, enable_tool_router=False,
+            tools={"entity_tool": EntityTool(), "calendar_tool": CalendarTool(), "task_tool": TaskTool()},
+            tool_cache=ToolResultCache(),
+        )
+        context = {
+            "entity": {"entity_name": "Acme", "entity_type": "PRIVATE_COMPANY", "industry": "TECHNOLOGY", "locations": ["EU"]},
+            "task": {"task_description": "Article 30 records", "task_category": "DATA_PROTECTION", "deadline": "2026-12-31"},
+        }
+        result = loop.execute("Acme", "Article 30 records", context)
+    finally:
+        set_mock_provider(None)
+
+    assert not result["metrics"]["errors_encountered"]
+    metrics = result["metrics"]["tool_cache"]
+    assert metrics["stored"] == 3 and metrics["hits"] > 0
+    assert metrics["run_hits"] > 0 and metrics["process_hits"] > 0
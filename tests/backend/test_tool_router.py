@@ -0,0 +1,122 @@
+"""Tests for compiled tool matching and the cost-aware tool router"""
+
+import pytest
+
+from backend.agentic_engine.agent_loop import AgentLoop
+from backend.agentic_engine.reasoning import ReasoningEngine
+from backend.agentic_engine.testing.tool_routing_benchmark import reference_scores
+from backend.agentic_engine.tools import CalendarTool, EntityTool, TaskTool
+from backend.agentic_engine.tools.tool_registry import KeywordMatcher, ToolRegistry
+from backend.agentic_engine.tools.tool_router import ToolRouter, step_type, tool_contributed
+
+STEP = {"step_id": "step_1", "description": "Assess the compliance risk level"}
+CONTEXT = {"entity": {"entity_name": "Acme"}, "task": {"task_description": "GDPR", "deadline": "2026-12-01"}}
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "check the deadline and due date",
+    "deadlines deadline dead",
+    "assess compliance risk for the organization",
+    "call the https://example.com api endpoint",
+    "RISK Assessment Of Entity",
+])
+def test_keyword_matcher_equals_substring_scan(text):
+    keywords = ["dead", "deadline", "due date", "risk", "risk assessment", "entity", "api", "ap", "https://"]
+    matcher = KeywordMatcher(keywords)
+    assert matcher.find(text) == {keyword for keyword in keywords if keyword in text.lower()}
+
+
+@pytest.mark.parametrize("description", [
+    "Identify applicable regulations for the entity",
+    "Calculate the deadline and schedule reminders",
+    "Fetch data from the regulatory API",
+    "Summarize findings",
+])
+@pytest.mark.parametrize("context", [None, CONTEXT])
+def test_score_tools_matches_reference_scan(description, context):
+    registry = ToolRegistry()
+    assert registry.score_tools(description, context) == pytest.approx(reference_scores(registry, description, context))
+
+
+def test_step_type_and_contribution():
+    assert step_type(STEP) == "assess"
+    assert step_type({}) == "other"
+    assert tool_contributed({"success": True, "data": {"level": "high"}})
+    assert not tool_contributed({"success": False, "error": "boom"})
+    assert not tool_contributed({"success": True, "data": []})
+    assert not tool_contributed(None)
+
+
+def test_router_skips_low_value_tools_and_explores():
+    router = ToolRouter(min_samples=3, min_value=0.3, explore_every=4, latency_budget_ms=0)
+    for _ in range(3):
+        router.record(STEP, "http_tool", 0.01, {"success": False, "error": "timeout"})
+        router.record(STEP, "task_tool", 0.01, {"success": True, "data": {"risk": "high"}})
+
+    routes = [router.route(STEP, ["http_tool", "task_tool"]) for _ in range(4)]
+    assert routes[:3] == [["task_tool"]] * 3
+    assert routes[3] == ["http_tool", "task_tool"]
+    # Learned per step type: other kinds of step still run the tool
+    assert router.route({"description": "Fetch filings"}, ["http_tool"]) == ["http_tool"]
+    metrics = router.get_metrics()
+    assert metrics["skipped_low_value"] == 3
+    assert metrics["explored"] == 1
+    assert metrics["tools"]["assess/http_tool"]["runs"] == 3
+
+
+def test_router_spends_latency_budget_on_valuable_tools():
+    router = ToolRouter(latency_budget_ms=100, min_samples=100, explore_every=0)
+    for _ in range(5):
+        router.record(STEP, "task_tool", 0.08, {"success": True, "data": {"risk": "high"}})
+        router.record(STEP, "http_tool", 0.06, {"success": False})
+
+    assert router.expected_latency_ms("http_tool") == pytest.approx(60)
+    assert router.route(STEP, ["http_tool", "task_tool"]) == ["task_tool"]
+    assert router.get_metrics()["skipped_budget"] == 1
+    router.latency_budget_ms = 200
+    assert router.route(STEP, ["http_tool", "task_tool"]) == ["http_tool", "task_tool"]
+
+
+class _Tool:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def run(self, input):
+        self.calls += 1
+        return self.result
+
+
+def test_agent_loop_routes_tools_and_reports_metrics():
+    useless, useful = _Tool({"success": False, "error": "no data"}), _Tool({"success": True, "data": {"risk": "high"}})
+    loop = AgentLoop(
+        enable_memory=False, reasoning_engine=ReasoningEngine(), enable_plan_cache=False,
+        tools={"calendar_tool": useless, "task_tool": useful},
+        tool_router=ToolRouter(min_samples=2, min_value=0.4, explore_every=0), enable_tool_router=True,
+        enable_tool_cache=False,
+    )
+    step = {"step_id": "step_1", "description": "Assess the deadline risk", "tools": ["calendar_tool", "task_tool"]}
+    for _ in range(5):
+        loop.execute_tools(step, {})
+
+    assert (useless.calls, useful.calls) == (2, 5)
+    assert loop.get_metrics()["tool_router"]["skipped_low_value"] == 3
+
+    unrouted = AgentLoop(enable_memory=False, reasoning_engine=ReasoningEngine(), enable_tool_router=False)
+    assert unrouted.tool_router is None
+
+
+def test_real_tools_receive_their_run_input():
+    loop = AgentLoop(
+        enable_memory=False, reasoning_engine=ReasoningEngine(), enable_plan_cache=False, enable_tool_cache=False,
+        tools={"entity_tool": EntityTool(), "calendar_tool": CalendarTool(), "task_tool": TaskTool()},
+        tool_router=ToolRouter(), enable_tool_router=True,
+    )
+    step = {**STEP, "tools": ["entity_tool", "calendar_tool", "task_tool"]}
+    outputs = loop.execute_tools(step, CONTEXT)
+
+    assert all(output["result"]["success"] for output in outputs)
+    actions = {output["tool_name"]: output["params"].get("action") for output in outputs}
+    assert actions == {"entity_tool": "fetch_entity_details", "calendar_tool": "calculate_urgency", "task_tool": None}
+    assert all(stats["contributed"] == 1 for stats in loop.get_metrics()["tool_router"]["tools"].values())